@@ -29,6 +29,7 @@ import sys
 from unittest import skipIf
 
 from osgeo import gdal
+from django.test import Client, TransactionTestCase, override_settings
 
 from eoxserver.testing.utils import tag
 from autotest_services import base as testbase
@@ -636,6 +637,50 @@ class WCS20GetCoverageFormatUnknownFaultTestCase(testbase.ExceptionTestCase):
     def getExpectedExceptionCode(self):
         return "InvalidParameterValue"
 
+@tag('wcs', 'wcs20')
+@override_settings(EOXS_STREAMING_RESPONSE_THRESHOLD=0)
+class WCS20GetCoverageStreamingTestCase(TransactionTestCase):
+    """ GetCoverage responses larger than the streaming threshold are streamed
+        in chunks instead of being buffered in memory.
+    """
+    fixtures = testbase.BASE_FIXTURES
+
+    def _get_coverage(self, params):
+        response = Client().get('/ows?%s' % params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        chunks = list(response.streaming_content)
+        self.assertGreater(len(chunks), 1)
+        return response, b"".join(chunks)
+
+    def _open(self, content):
+        path = "/vsimem/streamed.tif"
+        gdal.FileFromMemBuffer(path, content)
+        try:
+            ds = gdal.Open(path)
+            return ds and (ds.RasterXSize, ds.RasterYSize)
+        finally:
+            gdal.Unlink(path)
+
+    def test_rectified_dataset(self):
+        response, content = self._get_coverage(
+            "service=wcs&version=2.0.1&request=GetCoverage&CoverageId="
+            "MER_FRS_1PNPDE20060822_092058_000001972050_00308_23408_0077_"
+            "uint16_reduced_compressed&format=image/tiff"
+        )
+        self.assertEqual(int(response["Content-Length"]), len(content))
+        self.assertIsNotNone(self._open(content))
+
+    def test_referenceable_dataset(self):
+        response, content = self._get_coverage(
+            "service=wcs&version=2.0.1&request=GetCoverage&CoverageId="
+            "ASA_WSM_1PNDPA20050331_075939_000000552036_00035_16121_0775&"
+            "format=image/tiff"
+        )
+        self.assertEqual(int(response["Content-Length"]), len(content))
+        self.assertIsNotNone(self._open(content))
+
+
 # ==============================================================================
 # WCS 2.0: Simple requests
 # ==============================================================================
@@ -182,6 +182,27 @@ def config_env(env, fail_on_override=False, reset_old=True):
         set_env(old_env, False, False)
 
 
+@contextlib.contextmanager
+def thread_config_env(env):
+    """ Like :func:`config_env`, but sets the values as thread-local GDAL
+        configuration options instead of process wide environment variables.
+        This allows concurrent threads to access different storages.
+    """
+    old_env = {
+        key: GetThreadLocalConfigOption(str(key), None)
+        for key in env
+    }
+    for key, value in env.items():
+        SetThreadLocalConfigOption(
+            str(key), str(value) if value is not None else None
+        )
+    try:
+        yield
+    finally:
+        for key, value in old_env.items():
+            SetThreadLocalConfigOption(str(key), value)
+
+
 def open_with_env(path, env, shared=True):
     with config_env(env, False):
         # if attempting to load NETCDF file with additional indexing, need to extract only base path
@@ -88,20 +88,26 @@ class VRTBuilder(object):
         for key, value in ds.GetMetadata().items():
             self._ds.SetMetadataItem(key, value)
 
-    def copy_gcps(self, ds, offset=None):
+    def copy_gcps(self, ds, offset=None, scale=None):
         """ Copy the GCPs from the given :class:`GDAL Dataset
-        <eoxserver.contrib.gdal.Dataset>`, optionally offsetting them
+        <eoxserver.contrib.gdal.Dataset>`, optionally offsetting and scaling
+        them
 
         :param ds: a :class:`GDAL Dataset <eoxserver.contrib.gdal.Dataset>`
         :param offset: a 2-tuple of integers; the pixel offset to be applied to
                        any GCP copied
+        :param scale: a 2-tuple of floats; the factors the (offsetted) pixel
+                      coordinates of any GCP copied are multiplied with
         """
         gcps = ds.GetGCPs()
-        if offset:
+        if offset or scale:
+            offset_x, offset_y = offset[:2] if offset else (0, 0)
+            scale_x, scale_y = scale if scale else (1.0, 1.0)
             gcps = [
                 gdal.GCP(
                     gcp.GCPX, gcp.GCPY, gcp.GCPZ,
-                    gcp.GCPPixel-offset[0], gcp.GCPLine-offset[1],
+                    (gcp.GCPPixel - offset_x) * scale_x,
+                    (gcp.GCPLine - offset_y) * scale_y,
                     gcp.Info, gcp.Id
                 ) for gcp in gcps
             ]
@@ -128,7 +134,7 @@ class VRTBuilder(object):
         band.SetMetadataItem("source_0", str(source), "new_vrt_sources")
 
     def add_simple_source(self, band_index, src, src_band,
-                          src_rect=None, dst_rect=None):
+                          src_rect=None, dst_rect=None, overview_level=None):
         """ Add a new simple source to the VRT.
 
         :param band_index: the band index the source shall contribute to
@@ -145,6 +151,9 @@ class VRTBuilder(object):
                          size-x, size-y) or a :class:`Rect
                          <eoxserver.core.util.rect.Rect>` specifying the target
                          area to contribute
+        :param overview_level: the index of the overview of the source dataset
+                               to read from. ``src_rect`` is then interpreted
+                               in the pixel space of that overview
         """
         if isinstance(src, str):
             pass
@@ -160,8 +169,13 @@ class VRTBuilder(object):
         lines = [
             "<SimpleSource>",
             '<SourceFilename relativeToVRT="1">%s</SourceFilename>' % src,
-            "<SourceBand>%d</SourceBand>" % src_band
         ]
+        if overview_level is not None:
+            lines.append(
+                '<OpenOptions><OOI key="OVERVIEW_LEVEL">%d</OOI></OpenOptions>'
+                % overview_level
+            )
+        lines.append("<SourceBand>%d</SourceBand>" % src_band)
         if src_rect:
             lines.append(
                 '<SrcRect xOff="%d" yOff="%d" xSize="%d" ySize="%d"/>'
@@ -31,12 +31,15 @@
 
 
 import os
+import re
 from uuid import uuid4
 from functools import wraps
 import mimetypes
 from urllib.parse import quote
+import builtins
 
 from django.http import StreamingHttpResponse
+from django.utils.http import http_date, parse_http_date_safe
 
 
 if os.environ.get('READTHEDOCS', None) != 'True':
@@ -233,6 +236,13 @@ class VSIFile(object):
         stat = VSIStatL(self.name)
         return stat.size
 
+    @property
+    @_ensure_open
+    def stat(self):
+        """ Return the VSI stat of the file, providing ``size`` and ``mtime``
+        """
+        return VSIStatL(self.name)
+
     @_ensure_open
     def flush(self):
         pass
@@ -305,26 +315,157 @@ def join(first, *paths):
     return '/'.join(parts)
 
 
+_RANGE_RE = re.compile(r'^\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*$', re.I)
+
+
+def parse_range_header(header, size):
+    """ Parses an HTTP ``Range`` header value for a resource of the given
+        ``size``. Only single byte ranges are supported, as multipart
+        ``byteranges`` responses are not generated.
+
+    :param header: the value of the ``Range`` header
+    :param size: the size of the resource in bytes
+    :returns: a tuple ``(start, end)`` with ``end`` being inclusive or
+              ``None`` if the header is malformed or uses multiple ranges and
+              shall be ignored
+    :raises ValueError: if the range is not satisfiable
+    """
+    match = _RANGE_RE.match(header)
+    if not match:
+        return None
+
+    start, end = match.groups()
+    if not start:
+        # suffix range: the last N bytes of the file
+        if not end or int(end) == 0:
+            raise ValueError('Unsatisfiable range %r' % header)
+        return max(size - int(end), 0), size - 1
+
+    start = int(start)
+    end = int(end) if end else size - 1
+    if end < start:
+        return None
+    elif start >= size:
+        raise ValueError('Unsatisfiable range %r' % header)
+
+    return start, min(end, size - 1)
+
+
+def _iter_range(filelike, start, length, block_size):
+    filelike.seek(start)
+    while length > 0:
+        data = filelike.read(min(block_size, length))
+        if not data:
+            break
+        length -= len(data)
+        yield data
+
+
 class VSIFileResponse(StreamingHttpResponse):
     """ Subclass of StreamingHttpResponse, a replacement for Django's
         FileResponse which does not work for VSIFiles in Django v3.2.15
+
+        When the ``request`` is passed, single byte ``Range`` requests are
+        answered with partial content, honoring ``If-Range`` against the
+        ``ETag`` and ``Last-Modified`` values derived from the files stat.
+        Ranged reads seek the VSI file, so for remote files only the requested
+        bytes are fetched. Complete responses for files on the local
+        filesystem are handed to the WSGI servers file wrapper (which
+        typically uses ``sendfile``), just like Django's FileResponse.
     """
     # inspired from https://github.com/django/django/blob/bd062445cffd3f6cc6dcd20d13e2abed818fa173/django/http/response.py#L500
 
-    block_size = 4096
+    block_size = 65536
 
-    def __init__(self, *args, as_attachment=False, filename='', **kwargs):
+    def __init__(self, *args, as_attachment=False, filename='', request=None,
+                 **kwargs):
         self.as_attachment = as_attachment
         self.filename = filename
+        self._request = request
         super().__init__(*args, **kwargs)
 
     def _set_streaming_content(self, value):
         filelike = value
         self._resource_closers.append(filelike.close)
-        value = iter(lambda: filelike.read(self.block_size), b'')
+        stat = filelike.stat
+        size = stat.size
         self.set_headers(filelike)
+        self.set_validators(stat)
+
+        try:
+            byte_range = self.get_byte_range(size)
+        except ValueError:
+            self.status_code = 416
+            self.headers["Content-Range"] = "bytes */%d" % size
+            self.headers["Content-Length"] = 0
+            super()._set_streaming_content(iter(()))
+            return
+
+        local_file = self._open_local(filelike)
+        if local_file is not None:
+            self._resource_closers.append(local_file.close)
+            filelike = local_file
+
+        if byte_range is not None:
+            start, end = byte_range
+            self.status_code = 206
+            self.headers["Content-Range"] = "bytes %d-%d/%d" % (
+                start, end, size
+            )
+            self.headers["Content-Length"] = end - start + 1
+            value = _iter_range(
+                filelike, start, end - start + 1, self.block_size
+            )
+        else:
+            if local_file is not None:
+                # allow the WSGI handler to use the servers file wrapper
+                self.file_to_stream = local_file
+            value = iter(lambda: filelike.read(self.block_size), b'')
+
         super()._set_streaming_content(value)
 
+    def _open_local(self, filelike):
+        """ Opens the file directly, when it resides on the local filesystem.
+        """
+        name = filelike.name
+        if name.startswith('/vsi') or not os.path.isfile(name):
+            return None
+        try:
+            return builtins.open(name, 'rb')
+        except IOError:
+            return None
+
+    def get_byte_range(self, size):
+        """ Returns the requested byte range as a tuple ``(start, end)`` or
+            ``None`` when the complete file shall be sent.
+        """
+        if self._request is None or self._request.method != 'GET':
+            return None
+
+        header = self._request.META.get('HTTP_RANGE')
+        if not header or size == 0:
+            return None
+
+        if_range = self._request.META.get('HTTP_IF_RANGE')
+        if if_range:
+            if if_range.startswith(('"', 'W/')):
+                if if_range != self.headers.get("ETag"):
+                    return None
+            else:
+                last_modified = self.headers.get("Last-Modified")
+                if (not last_modified or parse_http_date_safe(if_range)
+                        != parse_http_date_safe(last_modified)):
+                    return None
+
+        return parse_range_header(header, size)
+
+    def set_validators(self, stat):
+        self.headers["Accept-Ranges"] = "bytes"
+        mtime = int(getattr(stat, 'mtime', 0) or 0)
+        self.headers["ETag"] = '"%x-%x"' % (mtime, stat.size)
+        if mtime:
+            self.headers["Last-Modified"] = http_date(mtime)
+
     def set_headers(self, filelike):
         self.headers["Content-Length"] = filelike.size
         content_type, encoding = mimetypes.guess_type(filelike.name)
@@ -30,14 +30,18 @@
 This module provides an implementation of a system configuration that relies
 on different configuration files.
 """
+from contextlib import contextmanager
+from contextvars import ContextVar
 from os.path import join, getmtime, dirname
 from sys import prefix
 import threading
 import logging
-from time import time
+from time import time, monotonic
 from configparser import RawConfigParser
 
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 
 import eoxserver
 
@@ -45,25 +49,103 @@ import eoxserver
 config_lock = threading.RLock()
 logger = logging.getLogger(__name__)
 
+# the default number of seconds between two checks of the instance config
+# for modifications
+DEFAULT_CHECK_INTERVAL = 5
+
 # configuration singleton
 _cached_config = None
 _last_access_time = None
+_next_check_time = 0
+
+# the snapshot pinned for the current context, e.g. a request
+_current_config = ContextVar("eoxserver_config", default=None)
+
+
+class ConfigSnapshot(RawConfigParser):
+    """ An immutable, parsed state of the EOxServer configuration. Reloading
+        the configuration creates a new snapshot, so that the values of a
+        snapshot can be safely cached: :class:`Reader
+        <eoxserver.core.decoders.config.Reader>` options store their parsed
+        values in :attr:`reader_values`.
+
+        :param paths: the configuration files to read
+        :param values: a dictionary of sections to override values with
+    """
+
+    def __init__(self, paths=(), values=None):
+        self._frozen = False
+        super(ConfigSnapshot, self).__init__()
+        self.paths = list(paths)
+        self.read(self.paths)
+        if values:
+            self.read_dict(values)
+        self.reader_values = {}
+        self._frozen = True
+
+    def replace(self, values):
+        """ Returns a new snapshot with the given values overridden. The
+            configuration files are read again.
+        """
+        return ConfigSnapshot(self.paths, values)
+
+    def _check_mutable(self):
+        if self._frozen:
+            raise TypeError("EOxServer configuration snapshots are immutable.")
+
+    def set(self, section, option, value=None):
+        self._check_mutable()
+        super(ConfigSnapshot, self).set(section, option, value)
+
+    def add_section(self, section):
+        self._check_mutable()
+        super(ConfigSnapshot, self).add_section(section)
+
+    def remove_section(self, section):
+        self._check_mutable()
+        return super(ConfigSnapshot, self).remove_section(section)
+
+    def remove_option(self, section, option):
+        self._check_mutable()
+        return super(ConfigSnapshot, self).remove_option(section, option)
 
 
 def get_eoxserver_config():
-    """ Returns the EOxServer config as a :class:`ConfigParser.RawConfigParser`
+    """ Returns the EOxServer config as a :class:`ConfigSnapshot`. Within a
+        :func:`pinned_eoxserver_config` block, the pinned snapshot is
+        returned. Otherwise the instance config file is checked for
+        modifications at most every ``EOXS_CONFIG_CHECK_INTERVAL`` seconds.
     """
-    with config_lock:
-        if not _cached_config or \
-                getmtime(get_instance_config_path()) > _last_access_time:
-            reload_eoxserver_config()
+    config = _current_config.get()
+    if config is not None:
+        return config
+
+    if _cached_config is None or monotonic() >= _next_check_time:
+        with config_lock:
+            _check_eoxserver_config()
 
     return _cached_config
 
 
+def _check_eoxserver_config():
+    global _next_check_time
+    now = monotonic()
+    if _cached_config is not None and now < _next_check_time:
+        # checked by another thread in the meantime
+        return
+
+    if not _cached_config or \
+            getmtime(get_instance_config_path()) > _last_access_time:
+        reload_eoxserver_config()
+
+    _next_check_time = now + getattr(
+        settings, "EOXS_CONFIG_CHECK_INTERVAL", DEFAULT_CHECK_INTERVAL
+    )
+
+
 def reload_eoxserver_config():
     """ Triggers the loading or reloading of the EOxServer config as a
-        :class:`ConfigParser.RawConfigParser`.
+        :class:`ConfigSnapshot`.
     """
     global _cached_config, _last_access_time
     paths = [
@@ -78,9 +160,43 @@ def reload_eoxserver_config():
     )
 
     with config_lock:
-        _cached_config = RawConfigParser()
-        _cached_config.read(paths)
         _last_access_time = time()
+        _cached_config = ConfigSnapshot(paths)
+
+
+def set_eoxserver_config(config):
+    """ Replaces the current EOxServer config with the given
+        :class:`ConfigSnapshot` until it is reloaded.
+    """
+    global _cached_config, _last_access_time
+    with config_lock:
+        _last_access_time = time()
+        _cached_config = config
+
+
+@contextmanager
+def pinned_eoxserver_config():
+    """ Context manager to use the same snapshot of the EOxServer config for
+        all calls of :func:`get_eoxserver_config` within its scope, typically
+        a single request. Yields the snapshot.
+    """
+    config = get_eoxserver_config()
+    token = _current_config.set(config)
+    try:
+        yield config
+    finally:
+        _current_config.reset(token)
+
+
+@receiver(setting_changed)
+def _invalidate_eoxserver_config(setting, **kwargs):
+    # check the config on the next access when relevant settings change
+    global _next_check_time
+    if setting in ("PROJECT_DIR", "EOXS_CONFIG_CHECK_INTERVAL"):
+        with config_lock:
+            if setting == "PROJECT_DIR":
+                set_eoxserver_config(None)
+            _next_check_time = 0
 
 
 def get_instance_config_path():
@@ -56,7 +56,24 @@ class BaseParameter(property):
         return ""
 
     def fget(self, decoder):
-        """ Property getter function.
+        """ Property getter function. The decoded value is memoized per
+            decoder instance, so that selection and type conversion are only
+            performed once.
+        """
+        try:
+            values = decoder._decoded_values
+        except AttributeError:
+            values = decoder._decoded_values = {}
+
+        try:
+            return values[self]
+        except KeyError:
+            value = values[self] = self.decode(decoder)
+            return value
+
+    def decode(self, decoder):
+        """ Select the raw values from the decoder, check their multiplicity
+            and parse them.
         """
 
         results = self.select(decoder)
@@ -0,0 +1,76 @@
+# ------------------------------------------------------------------------------
+#
+# Project: EOxServer <http://eoxserver.org>
+#
+# ------------------------------------------------------------------------------
+# Copyright (C) 2026 EOX IT Services GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies of this Software or works derived from this Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# ------------------------------------------------------------------------------
+
+""" This module provides a per-request cache for parsed decoder inputs, so
+    that the request body or query string is only parsed once, although
+    several decoders are created for the same request.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+_parse_cache = ContextVar("eoxserver_decoder_parse_cache", default=None)
+
+
+@contextmanager
+def parse_cache():
+    """ Context manager to enable the sharing of parsed inputs for the
+        decoders created within its scope, typically a single request.
+    """
+    token = _parse_cache.set({})
+    try:
+        yield
+    finally:
+        _parse_cache.reset(token)
+
+
+def cached_parse(kind, source, parse):
+    """ Returns the result of ``parse(source)``. When a :func:`parse_cache` is
+        active, the result is shared for the identical ``source`` object.
+        The parsed result must be treated as read-only.
+
+        :param kind: the kind of input, e.g "xml" or "kvp"
+        :param source: the raw input; must not be changed while the cache is
+                       active
+        :param parse: the function to parse the input
+    """
+    cache = _parse_cache.get()
+    if cache is None:
+        return parse(source)
+
+    key = (kind, id(source))
+    try:
+        cached_source, result = cache[key]
+        if cached_source is source:
+            return result
+    except KeyError:
+        pass
+
+    result = parse(source)
+    # keep a reference to the source, so that its id cannot be reused
+    cache[key] = (source, result)
+    return result
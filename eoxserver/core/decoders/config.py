@@ -82,20 +82,38 @@ class Option(property):
         self.section = section
 
     def fget(self, reader):
-
+        """ Property getter function. When the config is a
+            :class:`ConfigSnapshot <eoxserver.core.config.ConfigSnapshot>`,
+            the parsed value is cached on the snapshot.
+        """
         section = self.section or reader.section
+        values = getattr(reader._config, "reader_values", None)
+        if values is None:
+            return self.parse(reader._config, section)
+
+        key = (self, section)
+        try:
+            return values[key]
+        except KeyError:
+            value = values[key] = self.parse(reader._config, section)
+            return value
+
+    def parse(self, config, section):
+        """ Read and parse the raw value from the config.
+        """
         try:
             if self.type is bool:
-                raw_value = reader._config.getboolean(section, self.key)
+                raw_value = config.getboolean(section, self.key)
             else:
-                raw_value = reader._config.get(section, self.key)
+                raw_value = config.get(section, self.key)
         except (NoOptionError, NoSectionError) as e:
             if not self.required:
                 return self.default
             raise e
 
         if self.separator is not None:
-            return map(self.type, raw_value.split(self.separator))
+            type_ = self.type or str
+            return [type_(v) for v in raw_value.split(self.separator)]
 
         elif self.type:
             return self.type(raw_value)
@@ -33,6 +33,7 @@ from urllib.parse import parse_qs
 from django.http import QueryDict
 
 from eoxserver.core.decoders.base import BaseParameter
+from eoxserver.core.decoders.cache import cached_parse
 
 
 class Parameter(BaseParameter):
@@ -143,23 +144,34 @@ class Decoder(metaclass=DecoderMetaclass):
     __metaclass__ = DecoderMetaclass
 
     def __init__(self, params):
-        query_dict = {}
-        if isinstance(params, QueryDict):
-            for key, values in params.lists():
-                query_dict[key.lower()] = values
-
-        elif isinstance(params, str):
-            tmp = parse_qs(params)
-            for key, values in tmp.items():
-                query_dict[key.lower()] = values
+        self.kvp = params
+        if isinstance(params, QueryDict) and not params._mutable:
+            # request.GET: share the parsed dictionary within the request
+            self._query_dict = cached_parse("kvp", params, _parse_params)
+        else:
+            self._query_dict = _parse_params(params)
 
-        elif isinstance(params, dict):
-            for key, value in params.items():
-                query_dict[key.lower()] = (value,)
 
-        else:
-            raise ValueError(
-                "Decoder input '%s' not supported." % type(params).__name__
-            )
-        self.kvp = params
-        self._query_dict = query_dict
+def _parse_params(params):
+    """ Parse the KVP input to a dictionary of lower case keys to the list of
+        values.
+    """
+    query_dict = {}
+    if isinstance(params, QueryDict):
+        for key, values in params.lists():
+            query_dict[key.lower()] = values
+
+    elif isinstance(params, str):
+        tmp = parse_qs(params)
+        for key, values in tmp.items():
+            query_dict[key.lower()] = values
+
+    elif isinstance(params, dict):
+        for key, value in params.items():
+            query_dict[key.lower()] = (value,)
+
+    else:
+        raise ValueError(
+            "Decoder input '%s' not supported." % type(params).__name__
+        )
+    return query_dict
@@ -31,6 +31,7 @@
 from lxml import etree
 
 from eoxserver.core.decoders.base import BaseParameter
+from eoxserver.core.decoders.cache import cached_parse
 
 
 class Parameter(BaseParameter):
@@ -59,11 +60,18 @@ class Parameter(BaseParameter):
         self.namespaces = namespaces
         self._locator = locator
 
-    def select(self, decoder):
-        # prepare the XPath selector if necessary
+    def compile(self, namespaces):
+        """ Prepare the XPath selector, if it was passed as a string.
+        """
         if isinstance(self.selector, str):
-            namespaces = self.namespaces or decoder.namespaces
-            self.selector = etree.XPath(self.selector, namespaces=namespaces)
+            self.selector = etree.XPath(
+                self.selector, namespaces=self.namespaces or namespaces
+            )
+
+    def select(self, decoder):
+        # parameters declared on a decoder class are already compiled by the
+        # metaclass, others are compiled on first use
+        self.compile(decoder.namespaces)
         results = self.selector(decoder._tree)
         if isinstance(results, (str, float, int)):
             results = [results]
@@ -75,7 +83,19 @@ class Parameter(BaseParameter):
         return self._locator or str(self.selector)
 
 
-class Decoder(object):
+class DecoderMetaclass(type):
+    """ Metaclass for XML Decoders to precompile the XPath selectors of all
+        declared parameters once, when the class is created.
+    """
+    def __init__(cls, name, bases, dct):
+        for value in dct.values():
+            if isinstance(value, Parameter):
+                value.compile(cls.namespaces)
+
+        super(DecoderMetaclass, cls).__init__(name, bases, dct)
+
+
+class Decoder(metaclass=DecoderMetaclass):
     """ Base class for XML Decoders.
 
         :param params: an instance of either :class:`lxml.etree.ElementTree`,
@@ -119,7 +139,7 @@ class Decoder(object):
     def __init__(self, tree):
         if isinstance(tree, str) or isinstance(tree, bytes):
             try:
-                tree = etree.fromstring(tree)
+                tree = cached_parse("xml", tree, etree.fromstring)
 
             except etree.XMLSyntaxError as exc:
                 # NOTE: lxml.etree.XMLSyntaxError is incorretly identified as
@@ -25,3 +25,113 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 # ------------------------------------------------------------------------------
+
+""" This module provides helpers to extract and format the coordinates of
+    geometries in bulk. The coordinates are read from the WKB representation
+    of a geometry into NumPy arrays instead of accessing each point via GEOS.
+"""
+
+import struct
+
+import numpy as np
+
+
+WKB_POINT = 1
+WKB_LINESTRING = 2
+WKB_POLYGON = 3
+WKB_MULTIPOINT = 4
+WKB_MULTILINESTRING = 5
+WKB_MULTIPOLYGON = 6
+WKB_GEOMETRYCOLLECTION = 7
+
+
+def _parse_wkb(buf, offset):
+    """ Parses the 2D WKB geometry at the given offset. Points and line
+        strings are returned as ``(n, 2)`` arrays, polygons as lists of rings
+        and multi geometries as lists of their parts. Returns a tuple of the
+        geometry type, the parsed coordinates and the offset after the
+        geometry.
+    """
+    byteorder = "<" if buf[offset] == 1 else ">"
+    uint = struct.Struct(byteorder + "I")
+    dtype = np.dtype(byteorder + "f8")
+
+    def read_points(offset):
+        count, = uint.unpack_from(buf, offset)
+        offset += 4
+        points = np.frombuffer(
+            buf, dtype, count * 2, offset
+        ).reshape(count, 2)
+        return points, offset + count * 16
+
+    geom_type, = uint.unpack_from(buf, offset + 1)
+    offset += 5
+
+    if geom_type == WKB_POINT:
+        return geom_type, np.frombuffer(
+            buf, dtype, 2, offset
+        ).reshape(1, 2), offset + 16
+
+    elif geom_type == WKB_LINESTRING:
+        points, offset = read_points(offset)
+        return geom_type, points, offset
+
+    elif geom_type == WKB_POLYGON:
+        count, = uint.unpack_from(buf, offset)
+        offset += 4
+        rings = []
+        for _ in range(count):
+            ring, offset = read_points(offset)
+            rings.append(ring)
+        return geom_type, rings, offset
+
+    elif geom_type in (WKB_MULTIPOINT, WKB_MULTILINESTRING,
+                       WKB_MULTIPOLYGON, WKB_GEOMETRYCOLLECTION):
+        count, = uint.unpack_from(buf, offset)
+        offset += 4
+        parts = []
+        for _ in range(count):
+            part_type, part, offset = _parse_wkb(buf, offset)
+            parts.append((part_type, part))
+        return geom_type, parts, offset
+
+    raise ValueError("Unsupported WKB geometry type %d" % geom_type)
+
+
+def get_polygons(geometry):
+    """ Returns the polygons of the given GEOS geometry as a list of lists of
+        rings, each ring being a ``(n, 2)`` NumPy array of coordinates.
+        Polygons are returned as a single item list, multi polygons and
+        geometry collections as a list of all contained polygons. Other
+        geometry types yield an empty list.
+    """
+    geom_type, parsed, _ = _parse_wkb(bytes(geometry.wkb), 0)
+
+    if geom_type == WKB_POLYGON:
+        return [parsed]
+    elif geom_type in (WKB_MULTIPOLYGON, WKB_GEOMETRYCOLLECTION):
+        return [
+            part for part_type, part in parsed if part_type == WKB_POLYGON
+        ]
+    return []
+
+
+def format_coordinates(coordinates, precision, swap=False, separator=" "):
+    """ Formats the ``(n, 2)`` array of coordinates as a single string with
+        a fixed number of decimal places. All values are formatted in a
+        single operation.
+
+        :param coordinates: the coordinates to format
+        :param precision: the number of decimal places
+        :param swap: whether the axes shall be swapped
+        :param separator: the separator between two points
+        :returns: the formatted coordinates, e.g. ``"1.0 2.0 3.0 4.0"``
+    """
+    coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+    if swap:
+        coordinates = coordinates[:, ::-1]
+
+    frmt = separator.join(
+        ["%%.%df %%.%df" % (precision, precision)] * len(coordinates)
+    )
+    return frmt % tuple(coordinates.ravel().tolist())
@@ -30,6 +30,11 @@ import ctypes as C
 from ctypes.util import find_library
 import logging
 from itertools import chain
+from collections import OrderedDict
+import hashlib
+import struct
+import threading
+from uuid import uuid4
 
 import math
 
@@ -58,6 +63,11 @@ METHOD2STR = {
     METHOD_TPS_LSQ: "METHOD_TPS_LSQ"
 }
 
+# ------------------------------------------------------------------------------
+# maximum number of entries kept per cache and thread
+
+CACHE_SIZE = 32
+
 # ------------------------------------------------------------------------------
 
 logger = logging.getLogger(__name__)
@@ -267,6 +277,92 @@ def _create_referenceable_grid_transformer(ds, method, order):
     return Transformer(handle)
 
 
+class _LRUCache(threading.local):
+    """ A least-recently-used cache. As GDAL transformers and coordinate
+    transformations must not be shared between threads, each thread uses its
+    own set of cached items.
+    """
+
+    def __init__(self, max_size=CACHE_SIZE):
+        self.max_size = max_size
+        self._items = OrderedDict()
+
+    def get(self, key, factory):
+        """ Returns the cached item for the given key or creates it by calling
+        ``factory``. If the key is ``None``, the item is never cached.
+        """
+        if key is None:
+            return factory()
+
+        try:
+            value = self._items.pop(key)
+        except KeyError:
+            value = factory()
+
+        self._items[key] = value
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+        return value
+
+    def clear(self):
+        self._items.clear()
+
+
+# the caches for GCP transformers, coordinate transformations and the XML
+# definitions of warped VRTs
+_transformer_cache = _LRUCache()
+_coordinate_transformation_cache = _LRUCache()
+_warped_vrt_cache = _LRUCache()
+
+
+def clear_caches():
+    """ Clears all cached transformers, coordinate transformations and warped
+    VRT definitions of the current thread.
+    """
+    _transformer_cache.clear()
+    _coordinate_transformation_cache.clear()
+    _warped_vrt_cache.clear()
+
+
+def _gcp_key(ds):
+    """ Returns a key identifying the GCPs and their projection of the given
+    dataset. The key is independent of the datasets name, so that anonymous
+    datasets with the same GCPs share the key.
+    """
+    digest = hashlib.sha1(ds.GetGCPProjection().encode('utf-8'))
+    for gcp in ds.GetGCPs():
+        digest.update(struct.pack(
+            '5d', gcp.GCPPixel, gcp.GCPLine, gcp.GCPX, gcp.GCPY, gcp.GCPZ
+        ))
+    return (ds.RasterXSize, ds.RasterYSize, digest.hexdigest())
+
+
+def _get_referenceable_grid_transformer(ds, method, order):
+    """ Cached version of :func:`_create_referenceable_grid_transformer`.
+    """
+    return _transformer_cache.get(
+        (_gcp_key(ds), method, order),
+        lambda: _create_referenceable_grid_transformer(ds, method, order)
+    )
+
+
+def _get_coordinate_transformation(srid, dst_wkt):
+    """ Returns a cached :class:`CoordinateTransformation` from the given EPSG
+    code to the spatial reference given as WKT.
+    """
+    def create():
+        src_srs = osr.SpatialReference()
+        src_srs.ImportFromEPSG(srid)
+        dst_srs = osr.SpatialReference(dst_wkt)
+        # keep references to the spatial references, as they must outlive the
+        # transformation
+        ct = CoordinateTransformation(src_srs, dst_srs)
+        ct.srss = (src_srs, dst_srs)
+        return ct
+
+    return _coordinate_transformation_cache.get((srid, dst_wkt), create)
+
+
 CSLFetchNameValue = _libgdal.CSLFetchNameValue
 CSLFetchNameValue.restype = C.c_char_p
 CSLFetchNameValue.argtypes = [C.POINTER(C.c_char_p), C.c_char_p]
@@ -498,12 +594,7 @@ def rect_from_subset(path_or_ds, srid, minx, miny, maxx, maxy,
     x_size = ds.RasterXSize
     y_size = ds.RasterYSize
 
-    transformer = _create_referenceable_grid_transformer(ds, method, order)
-
-    gcp_srs = osr.SpatialReference(ds.GetGCPProjection())
-
-    subset_srs = osr.SpatialReference()
-    subset_srs.ImportFromEPSG(srid)
+    transformer = _get_referenceable_grid_transformer(ds, method, order)
 
     coord_array_type = (C.c_double * 4)
     x = coord_array_type()
@@ -533,7 +624,7 @@ def rect_from_subset(path_or_ds, srid, minx, miny, maxx, maxy,
     y[0] = y[1] = miny
     y[2] = y[3] = maxy
 
-    ct = CoordinateTransformation(subset_srs, gcp_srs)
+    ct = _get_coordinate_transformation(srid, ds.GetGCPProjection())
 
     OCTTransform(ct, 4, x, y, z)
 
@@ -610,13 +701,61 @@ def create_rectified_vrt(path_or_ds, vrt_path, srid_or_wkt=None,
                    :const:`METHOD_TPS_LSQ`.
     :param order: the order of the function; see :func:`get_footprint_wkt` for
                   reference
+
+    The definition of the warped VRT is cached per source and target
+    spatial reference, so that subsequent calls for the same source do not
+    need to open it and re-compute the transformation. Source files are
+    identified by their path, size and modification time, datasets by their
+    description and GCPs.
     """
 
     if size and resolution:
         raise ValueError('size and resolution ar mutually exclusive')
 
+    source_key = _source_key(path_or_ds)
+
+    cache_key = None
+    if source_key is not None:
+        cache_key = (
+            source_key, srid_or_wkt, resample, max_error, method, order
+        )
+
+    vrt_xml = _warped_vrt_cache.get(cache_key, lambda: _create_warped_vrt_xml(
+        path_or_ds, srid_or_wkt, resample, max_error
+    ))
+
+    with vsi.open(vrt_path, "w") as f:
+        f.write(vrt_xml)
+
+    # if size of resolution is overridden parse the VRT and adjust settings
+    if size or resolution:
+        _adjust_warped_vrt(vrt_path, size, resolution)
+
+
+def _source_key(path_or_ds):
+    """ Returns a key identifying the source of a warped VRT or ``None`` if
+    the source cannot be identified. The key changes when the source file is
+    replaced or its GCPs change.
+    """
+    if isinstance(path_or_ds, str):
+        stat = gdal.VSIStatL(path_or_ds)
+        if stat is None:
+            return None
+        return (path_or_ds, stat.size, stat.mtime)
+
+    description = path_or_ds.GetDescription()
+    if not description:
+        return None
+    return (description, _gcp_key(path_or_ds))
+
+
+def _create_warped_vrt_xml(path_or_ds, srid_or_wkt, resample, max_error):
+    """ Creates the definition of a warped VRT for the given referenceable
+    dataset and returns it as XML.
+    """
     ds = _open_ds(path_or_ds)
     ptr = C.c_void_p(int(ds.this))
+    vrt_path = "/vsimem/%s.vrt" % uuid4().hex
 
     if isinstance(srid_or_wkt, int):
         srs = osr.SpatialReference()
@@ -698,60 +837,132 @@ def create_rectified_vrt(path_or_ds, vrt_path, srid_or_wkt=None,
         wkt = wkt.encode()
     vrt_ds = GDALAutoCreateWarpedVRT(ptr, None, wkt, resample, max_error, None)
     # GDALSetProjection(vrt_ds, wkt)
-    if isinstance(vrt_path, str):
-        vrt_path = vrt_path.encode()
-
-    GDALSetDescription(vrt_ds, vrt_path)
+    GDALSetDescription(vrt_ds, vrt_path.encode())
     GDALClose(vrt_ds)
     # GDALDestroyWarpOptions(options)
 
-    # if size of resolution is overridden parse the VRT and adjust settings
-    if size or resolution:
+    try:
         with vsi.open(vrt_path) as f:
             root = parse(f).getroot()
+    finally:
+        vsi.remove(vrt_path)
 
-        size_x = int(root.attrib['rasterXSize'])
-        size_y = int(root.attrib['rasterYSize'])
-        gt_elem = root.find('GeoTransform')
+    # make sure the source is referenced absolutely, as the definition is
+    # reused for VRTs in other locations
+    source_elem = root.find('GDALWarpOptions/SourceDataset')
+    if source_elem is not None and source_elem.get('relativeToVRT') == '1':
+        source_elem.text = ds.GetDescription()
+        source_elem.set('relativeToVRT', '0')
 
-        gt = [
-            float(value.strip())
-            for value in gt_elem.text.strip().split(',')
-        ]
+    return etree.tostring(root, pretty_print=True)
 
-        if size:
-            extent = _to_extent(size_x, size_y, gt)
-            size_x, size_y = size
-            gt = _to_gt(size[0], size[1], extent)
 
-        elif resolution:
-            extent = _to_extent(size_x, size_y, gt)
+def _adjust_warped_vrt(vrt_path, size=None, resolution=None):
+    """ Adjusts the size or resolution of the warped VRT stored at the given
+    path.
+    """
+    with vsi.open(vrt_path) as f:
+        root = parse(f).getroot()
+
+    size_x = int(root.attrib['rasterXSize'])
+    size_y = int(root.attrib['rasterYSize'])
+    gt_elem = root.find('GeoTransform')
+
+    gt = [
+        float(value.strip())
+        for value in gt_elem.text.strip().split(',')
+    ]
 
-            gt[1] = resolution[0]
-            gt[5] = resolution[1]
+    if size:
+        extent = _to_extent(size_x, size_y, gt)
+        size_x, size_y = size
+        gt = _to_gt(size[0], size[1], extent)
 
-            size_x, size_y = _to_size(gt, extent)
+    elif resolution:
+        extent = _to_extent(size_x, size_y, gt)
 
-        # Adjust XML
-        root.attrib['rasterXSize'] = str(size_x)
-        root.attrib['rasterYSize'] = str(size_y)
+        gt[1] = resolution[0]
+        gt[5] = resolution[1]
 
-        gt_str = ",".join(str(v) for v in gt)
-        gt_elem.text = gt_str
-        root.find(
-            'GDALWarpOptions/Transformer/ApproxTransformer/'
-            'BaseTransformer/GenImgProjTransformer/DstGeoTransform'
-        ).text = gt_str
+        size_x, size_y = _to_size(gt, extent)
 
-        inv_gt = gdal.InvGeoTransform(gt)
-        root.find(
-            'GDALWarpOptions/Transformer/ApproxTransformer/'
-            'BaseTransformer/GenImgProjTransformer/DstInvGeoTransform'
-        ).text = ",".join(str(v) for v in inv_gt)
+    # Adjust XML
+    root.attrib['rasterXSize'] = str(size_x)
+    root.attrib['rasterYSize'] = str(size_y)
 
-        # write XML back to file
-        with vsi.open(vrt_path, "w") as f:
-            f.write(etree.tostring(root, pretty_print=True))
+    gt_str = ",".join(str(v) for v in gt)
+    gt_elem.text = gt_str
+    root.find(
+        'GDALWarpOptions/Transformer/ApproxTransformer/'
+        'BaseTransformer/GenImgProjTransformer/DstGeoTransform'
+    ).text = gt_str
+
+    inv_gt = gdal.InvGeoTransform(gt)
+    root.find(
+        'GDALWarpOptions/Transformer/ApproxTransformer/'
+        'BaseTransformer/GenImgProjTransformer/DstInvGeoTransform'
+    ).text = ",".join(str(v) for v in inv_gt)
+
+    # write XML back to file
+    with vsi.open(vrt_path, "w") as f:
+        f.write(etree.tostring(root, pretty_print=True))
+
+
+def create_rectified_overview(path_or_ds, output_path, srid_or_wkt=None,
+                              resample=0, max_error=APPROX_ERR_TOL,
+                              method=METHOD_GCP, order=0):
+    """ Materializes a rectified version of the passed "referenceable" GDAL
+    dataset as a tiled GeoTIFF with internal overviews. When available, the
+    Cloud Optimized GeoTIFF driver is used.
+
+    :param path_or_ds: a :class:`GDAL Dataset <eoxserver.contrib.gdal.Dataset>`
+                       or a path to such
+    :param output_path: the path to write the rectified file to
+    :param srid_or_wkt: the target spatial reference, either as an EPSG code
+                        or WKT
+    :param resample: the resample method to be used; defaults to 0 which means
+                     a nearest neighbour resampling
+    :returns: the opened output :class:`GDAL Dataset
+              <eoxserver.contrib.gdal.Dataset>`
+    """
+    vrt_path = "/vsimem/%s.vrt" % uuid4().hex
+    create_rectified_vrt(
+        path_or_ds, vrt_path, srid_or_wkt, resample=resample,
+        max_error=max_error, method=method, order=order
+    )
+
+    try:
+        if gdal.GetDriverByName('COG'):
+            out_ds = gdal.Translate(
+                output_path, vrt_path, format='COG',
+                creationOptions=[
+                    'COMPRESS=DEFLATE', 'BLOCKSIZE=512', 'OVERVIEWS=AUTO',
+                ]
+            )
+        else:
+            out_ds = gdal.Translate(
+                output_path, vrt_path, format='GTiff',
+                creationOptions=[
+                    'TILED=YES', 'COMPRESS=DEFLATE',
+                    'BLOCKXSIZE=512', 'BLOCKYSIZE=512',
+                ]
+            )
+            levels = []
+            factor = 2
+            while (min(out_ds.RasterXSize, out_ds.RasterYSize) // factor
+                    >= 256):
+                levels.append(factor)
+                factor *= 2
+            if levels:
+                out_ds.BuildOverviews('AVERAGE', levels)
+    finally:
+        gdal.Unlink(vrt_path)
+
+    if out_ds is None:
+        raise RuntimeError(
+            'Failed to create rectified overview %r' % output_path
+        )
+    return out_ds
 
 
 def _to_extent(size_x, size_y, gt):
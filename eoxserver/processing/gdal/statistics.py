@@ -0,0 +1,341 @@
+# ------------------------------------------------------------------------------
+#
+# Project: EOxServer <http://eoxserver.org>
+#
+# ------------------------------------------------------------------------------
+# Copyright (C) 2026 EOX IT Services GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies of this Software or works derived from this Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# ------------------------------------------------------------------------------
+
+
+""" Single pass, block-wise computation of raster band statistics. The bands
+are read in strips aligned to their natural block size, so that the memory
+consumption is bounded regardless of the size of the raster.
+"""
+
+import math
+
+import numpy as np
+
+from eoxserver.contrib import gdal_array
+
+
+HISTOGRAM_BINS = 25
+
+# number of bins of the intermediate histogram of non-integer data
+FINE_HISTOGRAM_BINS = 4096
+
+# fraction of the range an intermediate histogram is extended by additionally
+RANGE_MARGIN = 0.25
+
+# maximum number of pixels read at once
+MAX_CHUNK_PIXELS = 4 * 1024 * 1024
+
+# the approximate mode uses the finest overview not exceeding this size
+APPROXIMATE_MAX_SIZE = 2048
+
+
+class BandStatisticsAccumulator(object):
+    """ Accumulates the minimum, maximum, mean, standard deviation and the
+        histogram of the valid values of consecutive blocks of a band. Values
+        equal to any of the ``nil_values`` (and NaNs) are excluded using a
+        single combined mask.
+
+        For integer data types of at most 16 bits the histogram is exact. For
+        other types, an intermediate histogram is accumulated. Unless a fixed
+        ``histogram_range`` is passed (values outside of it are counted in its
+        outermost bins), its range follows the valid values: it starts with
+        the range of the first block and the counts are rebinned whenever a
+        block exceeds it.
+    """
+
+    def __init__(self, dtype, nil_values=None, histogram_range=None):
+        self.dtype = np.dtype(dtype)
+        nil_values = nil_values or []
+        if self.dtype.kind in 'iu':
+            # values not representable in the data type cannot occur
+            info = np.iinfo(self.dtype)
+            nil_values = [
+                value for value in nil_values
+                if float(value).is_integer() and info.min <= value <= info.max
+            ]
+        self.nil_values = np.array(nil_values, dtype=self.dtype)
+        self.count = 0
+        self.nodata_count = 0
+        self.minimum = None
+        self.maximum = None
+        self._mean = 0.0
+        self._m2 = 0.0
+
+        if self.dtype.kind in 'iu' and self.dtype.itemsize <= 2:
+            info = np.iinfo(self.dtype)
+            self._offset = int(info.min)
+            self._counts = np.zeros(int(info.max) - int(info.min) + 1,
+                                    dtype=np.int64)
+            self._range = None
+        else:
+            self._offset = None
+            self._counts = np.zeros(FINE_HISTOGRAM_BINS, dtype=np.int64)
+            self._range = histogram_range
+            self._fixed_range = histogram_range is not None
+
+    def add(self, array):
+        """ Adds a block of values. """
+        array = np.asarray(array)
+        if len(self.nil_values):
+            mask = np.isin(array, self.nil_values)
+        else:
+            mask = np.zeros(array.shape, dtype=bool)
+        if self.dtype.kind == 'f':
+            mask |= np.isnan(array)
+
+        valid = array[~mask]
+        self.nodata_count += int(mask.sum())
+        if not valid.size:
+            return
+
+        block_min = valid.min().item()
+        block_max = valid.max().item()
+        self.minimum = (
+            block_min if self.minimum is None else min(self.minimum, block_min)
+        )
+        self.maximum = (
+            block_max if self.maximum is None else max(self.maximum, block_max)
+        )
+
+        # combine the moments of the block with the previous ones
+        block_count = valid.size
+        block_mean = valid.mean(dtype=np.float64)
+        block_m2 = np.square(valid - block_mean, dtype=np.float64).sum()
+        total = self.count + block_count
+        delta = block_mean - self._mean
+        self._mean += delta * block_count / total
+        self._m2 += block_m2 + delta * delta * self.count * block_count / total
+        self.count = total
+
+        if self._offset is not None:
+            self._counts += np.bincount(
+                valid.astype(np.int64) - self._offset,
+                minlength=len(self._counts)
+            )
+        else:
+            if self._range is None:
+                self._range = (block_min, block_max)
+            elif not self._fixed_range and (
+                    block_min < self._range[0] or block_max > self._range[1]):
+                low = min(block_min, self._range[0])
+                high = max(block_max, self._range[1])
+                # leave some room on the extended sides to avoid rebinning
+                # for every block of steadily growing values
+                margin = (high - low) * RANGE_MARGIN
+                self._rebin(
+                    low - margin if low < self._range[0] else low,
+                    high + margin if high > self._range[1] else high,
+                )
+            self._counts += np.bincount(
+                _bin_indices(valid, *self._range),
+                minlength=FINE_HISTOGRAM_BINS
+            )
+
+    def _rebin(self, low, high):
+        """ Moves the counts of the intermediate histogram to a larger range.
+            The counts of each bin are assigned to the new bin containing its
+            center.
+        """
+        centers = _bin_centers(*self._range)
+        self._counts = np.bincount(
+            _bin_indices(centers, low, high), weights=self._counts,
+            minlength=FINE_HISTOGRAM_BINS
+        ).astype(np.int64)
+        self._range = (low, high)
+
+    @property
+    def mean(self):
+        return self._mean if self.count else None
+
+    @property
+    def stddev(self):
+        return math.sqrt(self._m2 / self.count) if self.count else None
+
+    def histogram(self, bins=HISTOGRAM_BINS):
+        """ Returns the counts and the edges of ``bins`` equally sized bins
+            between the minimum and the maximum.
+        """
+        if not self.count:
+            return [], []
+        if self.minimum == self.maximum:
+            return [self.count], [self.minimum, self.maximum]
+
+        if self._offset is not None:
+            values = np.arange(len(self._counts)) + self._offset
+        else:
+            values = _bin_centers(*self._range)
+
+        return rebin_histogram(
+            self._counts, values, self.minimum, self.maximum, bins
+        )
+
+
+def _bin_edges(low, high):
+    if high <= low:
+        high = low + 1
+    return low, high
+
+
+def _bin_indices(values, low, high):
+    """ Returns the indices of the intermediate histogram bins between
+        ``low`` and ``high`` for the values.
+    """
+    low, high = _bin_edges(low, high)
+    indices = (
+        (np.asarray(values, dtype=np.float64) - low) / (high - low)
+        * FINE_HISTOGRAM_BINS
+    ).astype(np.int64)
+    np.clip(indices, 0, FINE_HISTOGRAM_BINS - 1, out=indices)
+    return indices
+
+
+def _bin_centers(low, high, bins=FINE_HISTOGRAM_BINS):
+    low, high = _bin_edges(low, high)
+    return low + (np.arange(bins) + 0.5) * ((high - low) / bins)
+
+
+def rebin_histogram(counts, values, minimum, maximum, bins=HISTOGRAM_BINS):
+    """ Redistributes histogram ``counts`` of the given bin (center)
+        ``values`` to ``bins`` equally sized bins between the ``minimum`` and
+        the ``maximum``. Returns the counts and the edges of the bins.
+    """
+    if minimum == maximum:
+        return [int(np.sum(counts))], [minimum, maximum]
+
+    counts, edges = np.histogram(
+        np.clip(values, minimum, maximum), bins=bins,
+        range=(minimum, maximum), weights=counts
+    )
+    return counts.astype(np.int64).tolist(), edges.tolist()
+
+
+def get_window(ds, bbox):
+    """ Returns the pixel window ``(xoff, yoff, xsize, ysize)`` of the
+        dataset covered by the ``bbox`` (in the datasets CRS) or ``None`` if
+        they do not intersect. Without a ``bbox`` the whole dataset is
+        returned.
+    """
+    if bbox is None:
+        return 0, 0, ds.RasterXSize, ds.RasterYSize
+
+    origin_x, res_x, _, origin_y, _, res_y = ds.GetGeoTransform()
+    minx, miny, maxx, maxy = bbox
+
+    x1 = (minx - origin_x) / res_x
+    x2 = (maxx - origin_x) / res_x
+    y1 = (maxy - origin_y) / res_y
+    y2 = (miny - origin_y) / res_y
+
+    xoff = max(0, int(math.floor(min(x1, x2))))
+    yoff = max(0, int(math.floor(min(y1, y2))))
+    xend = min(ds.RasterXSize, int(math.ceil(max(x1, x2))))
+    yend = min(ds.RasterYSize, int(math.ceil(max(y1, y2))))
+
+    if xend <= xoff or yend <= yoff:
+        return None
+    return xoff, yoff, xend - xoff, yend - yoff
+
+
+def get_approximate_band(band, window):
+    """ Returns the finest overview of the band not exceeding
+        ``APPROXIMATE_MAX_SIZE`` in the requested window, and the window
+        scaled to the overview.
+    """
+    xoff, yoff, xsize, ysize = window
+    selected = band
+    for i in range(band.GetOverviewCount()):
+        overview = band.GetOverview(i)
+        selected = overview
+        scale = overview.XSize / band.XSize
+        if max(xsize, ysize) * scale <= APPROXIMATE_MAX_SIZE:
+            break
+
+    if selected is band:
+        return band, window
+
+    scale_x = selected.XSize / band.XSize
+    scale_y = selected.YSize / band.YSize
+    xoff_o = int(xoff * scale_x)
+    yoff_o = int(yoff * scale_y)
+    return selected, (
+        xoff_o, yoff_o,
+        max(1, min(selected.XSize - xoff_o, int(math.ceil(xsize * scale_x)))),
+        max(1, min(selected.YSize - yoff_o, int(math.ceil(ysize * scale_y)))),
+    )
+
+
+def iter_band_chunks(band, window):
+    """ Yields the arrays of the window of the band in horizontal strips
+        aligned to the block size of the band.
+    """
+    xoff, yoff, xsize, ysize = window
+    _, block_y = band.GetBlockSize()
+    block_y = max(1, block_y)
+    rows = max(
+        block_y, (MAX_CHUNK_PIXELS // max(1, xsize)) // block_y * block_y
+    )
+
+    y = yoff
+    end = yoff + ysize
+    while y < end:
+        # align the strips to the block boundaries
+        next_y = min(end, (y // block_y) * block_y + rows)
+        yield band.ReadAsArray(xoff, y, xsize, next_y - y)
+        y = next_y
+
+
+def compute_band_statistics(band, nil_values=None, window=None,
+                            approximate=False, bins=HISTOGRAM_BINS):
+    """ Computes the statistics of a band (or a window of it) in a single
+        pass. When ``approximate`` is set, an overview is used if available.
+
+        :returns: a dict with the ``minimum``, ``maximum``, ``mean``,
+                  ``stddev``, ``count``, ``nodata_count`` and the
+                  ``histogram`` as a tuple of counts and edges, or ``None``
+                  when there are no valid pixels
+    """
+    if window is None:
+        window = (0, 0, band.XSize, band.YSize)
+    if approximate:
+        band, window = get_approximate_band(band, window)
+
+    dtype = np.dtype(gdal_array.GDALTypeCodeToNumericTypeCode(band.DataType))
+    accumulator = BandStatisticsAccumulator(dtype, nil_values)
+    for array in iter_band_chunks(band, window):
+        accumulator.add(array)
+
+    if not accumulator.count:
+        return None
+
+    return {
+        "minimum": accumulator.minimum,
+        "maximum": accumulator.maximum,
+        "mean": accumulator.mean,
+        "stddev": accumulator.stddev,
+        "count": accumulator.count,
+        "nodata_count": accumulator.nodata_count,
+        "histogram": accumulator.histogram(bins),
+    }
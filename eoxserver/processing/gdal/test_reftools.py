@@ -0,0 +1,142 @@
+# ------------------------------------------------------------------------------
+#
+#  Rectification caches of the GDAL reftools - unit-tests
+#
+# Project: EOxServer <http://eoxserver.org>
+#
+# ------------------------------------------------------------------------------
+# Copyright (C) 2026 EOX IT Services GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies of this Software or works derived from this Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# ------------------------------------------------------------------------------
+# pylint: disable=missing-docstring
+
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main, mock
+
+from eoxserver.contrib import gdal, osr
+from eoxserver.processing.gdal import reftools
+
+# -----------------------------------------------------------------------------
+
+
+def create_gcp_dataset(path, size=10, offset=0.0):
+    ds = gdal.GetDriverByName("GTiff").Create(path, size, size, 1)
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(4326)
+    ds.SetGCPs([
+        gdal.GCP(offset + x, offset + y, 0.0, x * size, y * size)
+        for x in (0, 1) for y in (0, 1)
+    ], srs.ExportToWkt())
+    ds.FlushCache()
+    return ds
+
+
+class TestLRUCache(TestCase):
+    def test_hit(self):
+        cache = reftools._LRUCache(max_size=2)
+        factory = mock.Mock(side_effect=lambda: object())
+        value = cache.get("a", factory)
+        self.assertIs(cache.get("a", factory), value)
+        self.assertEqual(factory.call_count, 1)
+
+    def test_none_key(self):
+        cache = reftools._LRUCache(max_size=2)
+        factory = mock.Mock(side_effect=lambda: object())
+        self.assertIsNot(cache.get(None, factory), cache.get(None, factory))
+        self.assertEqual(factory.call_count, 2)
+
+    def test_eviction(self):
+        cache = reftools._LRUCache(max_size=2)
+        cache.get("a", lambda: 1)
+        cache.get("b", lambda: 2)
+        # "a" is now the most recently used item, so "b" is evicted
+        cache.get("a", lambda: None)
+        cache.get("c", lambda: 3)
+
+        self.assertEqual(cache.get("a", lambda: None), 1)
+        self.assertEqual(cache.get("c", lambda: None), 3)
+        self.assertIsNone(cache.get("b", lambda: None))
+
+
+class TestRectificationCaches(TestCase):
+    def setUp(self):
+        reftools.clear_caches()
+        self.tmpdir = TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "source.tif")
+        self.vrt_path = "/vsimem/%s.vrt" % id(self)
+
+    def tearDown(self):
+        reftools.clear_caches()
+        gdal.Unlink(self.vrt_path)
+        self.tmpdir.cleanup()
+
+    def test_transformer_cache(self):
+        ds = create_gcp_dataset(self.path)
+        transformer = reftools._get_referenceable_grid_transformer(
+            ds, reftools.METHOD_GCP, 0
+        )
+        self.assertIs(
+            reftools._get_referenceable_grid_transformer(
+                ds, reftools.METHOD_GCP, 0
+            ),
+            transformer
+        )
+        other = create_gcp_dataset(
+            os.path.join(self.tmpdir.name, "other.tif"), offset=1.0
+        )
+        self.assertIsNot(
+            reftools._get_referenceable_grid_transformer(
+                other, reftools.METHOD_GCP, 0
+            ),
+            transformer
+        )
+
+    def test_warped_vrt_cache(self):
+        create_gcp_dataset(self.path)
+        with mock.patch.object(
+                reftools, "_create_warped_vrt_xml",
+                wraps=reftools._create_warped_vrt_xml) as create:
+            reftools.create_rectified_vrt(self.path, self.vrt_path)
+            reftools.create_rectified_vrt(self.path, self.vrt_path)
+            self.assertEqual(create.call_count, 1)
+
+            reftools.create_rectified_vrt(self.path, self.vrt_path, 3857)
+            self.assertEqual(create.call_count, 2)
+
+    def test_warped_vrt_cache_invalidation(self):
+        create_gcp_dataset(self.path)
+        reftools.create_rectified_vrt(self.path, self.vrt_path)
+        ds = gdal.Open(self.vrt_path)
+        size = (ds.RasterXSize, ds.RasterYSize)
+        ds = None
+
+        # replace the source with a larger one at the same path
+        os.remove(self.path)
+        create_gcp_dataset(self.path, size=20)
+        reftools.create_rectified_vrt(self.path, self.vrt_path)
+        ds = gdal.Open(self.vrt_path)
+        self.assertNotEqual((ds.RasterXSize, ds.RasterYSize), size)
+
+# -----------------------------------------------------------------------------
+
+
+if __name__ == '__main__':
+    main()
@@ -43,7 +43,7 @@ from django.contrib.gis.geos import (
 from eoxserver.contrib import gdal, ogr, osr
 from eoxserver.core.util.xmltools import XMLEncoder
 from eoxserver.processing.preprocessing.util import (
-    create_mem, create_mem_copy, copy_projection, cleanup_temp
+    create_temp, create_vrt_copy, copy_projection, cleanup_temp, iter_blocks
 )
 
 from eoxserver.processing.preprocessing.optimization import (
@@ -134,10 +134,25 @@ class PreProcessor(object):
     def process(self, input_filename, output_filename,
                 geo_reference=None, generate_metadata=True):
 
-        # open the dataset and create an In-Memory Dataset as copy
-        # to perform optimizations
-        ds = create_mem_copy(gdal.Open(input_filename))
+        # open the dataset and create a VRT Dataset referencing it to perform
+        # optimizations. The optimizations are chained as VRTs where possible,
+        # so that the pixel data is only processed block-wise when the output
+        # is written. Intermediate datasets are referenced by later steps and
+        # can thus only be cleaned up at the very end.
+        ds = create_vrt_copy(gdal.Open(input_filename))
+        temporary_datasets = [ds]
 
+        try:
+            return self._process(
+                ds, temporary_datasets, output_filename, geo_reference,
+                generate_metadata
+            )
+        finally:
+            for temporary_ds in reversed(temporary_datasets):
+                cleanup_temp(temporary_ds)
+
+    def _process(self, ds, temporary_datasets, output_filename,
+                 geo_reference, generate_metadata):
         gt = ds.GetGeoTransform()
         footprint_wkt = None
 
@@ -149,23 +164,25 @@ class PreProcessor(object):
         else:
             logger.debug("Applying geo reference '%s'."
                          % type(geo_reference).__name__)
-            ds, footprint_wkt = geo_reference.apply(ds)
+            ds.FlushCache()
+            new_ds, footprint_wkt = geo_reference.apply(ds)
+            if new_ds is not ds:
+                temporary_datasets.append(new_ds)
+                ds = new_ds
 
         # apply optimizations
         for optimization in self.get_optimizations(ds):
             logger.debug("Applying optimization '%s'."
                          % type(optimization).__name__)
 
-            try:
-                new_ds = optimization(ds)
+            # write pending changes, as following VRT steps reference the
+            # dataset by its filename
+            ds.FlushCache()
+            new_ds = optimization(ds)
 
-                if new_ds is not ds:
-                    # cleanup afterwards
-                    cleanup_temp(ds)
-                    ds = new_ds
-            except:
-                cleanup_temp(ds)
-                raise
+            if new_ds is not ds:
+                temporary_datasets.append(new_ds)
+                ds = new_ds
 
         # generate the footprint from the dataset
         if not footprint_wkt:
@@ -183,8 +200,12 @@ class PreProcessor(object):
 
         if self.footprint_alpha:
             logger.debug("Applying optimization 'AlphaBandOptimization'.")
-            opt = AlphaBandOptimization()
-            opt(ds, footprint_wkt)
+            opt = AlphaBandOptimization(self.temporary_directory)
+            ds.FlushCache()
+            try:
+                ds = opt(ds, footprint_wkt)
+            finally:
+                temporary_datasets.extend(opt.temporary_datasets)
 
         output_filename = self.generate_filename(output_filename)
 
@@ -194,7 +215,9 @@ class PreProcessor(object):
         logger.debug("Metadata tags to be written: %s"
                      % ", ".join(ds.GetMetadata_List("") or []))
 
-        # save the file to the disc
+        # save the file to the disc. This is the only step where the whole
+        # chain of optimizations is actually evaluated.
+        ds.FlushCache()
         driver = gdal.GetDriverByName(self.format_selection.driver_name)
         ds = driver.CreateCopy(output_filename, ds,
                                options=self.format_selection.creation_options)
@@ -253,29 +276,44 @@ class PreProcessor(object):
         """ Generate a footprint from a raster, using black/no-data as exclusion
         """
 
-        # create an empty boolean array initialized as 'False' to store where
-        # values exist as a mask array.
-        nodata_map = numpy.zeros((ds.RasterYSize, ds.RasterXSize),
-                                 dtype=numpy.bool)
-
-        for idx in range(1, ds.RasterCount + 1):
-            band = ds.GetRasterBand(idx)
-            raster_data = band.ReadAsArray()
-            nodata = band.GetNoDataValue()
-
-            if nodata is None:
-                nodata = 0
-
-            # apply the output to the map
-            nodata_map |= (raster_data != nodata)
+        # create a temporary dataset and write the nodata mask into its
+        # single band. The mask is computed block by block to keep the memory
+        # consumption bounded.
+        tmp_ds = create_temp(ds.RasterXSize + 2, ds.RasterYSize + 2, 1,
+                             gdal.GDT_Byte,
+                             temp_root=self.temporary_directory)
+        try:
+            return self._polygonize_footprint_wkt(ds, tmp_ds)
+        finally:
+            cleanup_temp(tmp_ds)
 
-        # create a temporary in-memory dataset and write the nodata mask
-        # into its single band
-        tmp_ds = create_mem(ds.RasterXSize + 2, ds.RasterYSize + 2, 1,
-                            gdal.GDT_Byte)
+    def _polygonize_footprint_wkt(self, ds, tmp_ds):
         copy_projection(ds, tmp_ds)
         tmp_band = tmp_ds.GetRasterBand(1)
-        tmp_band.WriteArray(nodata_map.astype(numpy.uint8))
+
+        bands = [
+            ds.GetRasterBand(idx) for idx in range(1, ds.RasterCount + 1)
+        ]
+        nodata_values = [
+            band.GetNoDataValue() if band.GetNoDataValue() is not None else 0
+            for band in bands
+        ]
+
+        for offset_x, offset_y, size_x, size_y in iter_blocks(bands[0]):
+            # create an empty boolean array initialized as 'False' to store
+            # where values exist as a mask array.
+            nodata_map = numpy.zeros((size_y, size_x), dtype=bool)
+
+            for band, nodata in zip(bands, nodata_values):
+                raster_data = band.ReadAsArray(
+                    offset_x, offset_y, size_x, size_y
+                )
+                # apply the output to the map
+                nodata_map |= (raster_data != nodata)
+
+            tmp_band.WriteArray(
+                nodata_map.astype(numpy.uint8), offset_x, offset_y
+            )
 
         # create an OGR in memory layer to hold the created polygon
         sr = osr.SpatialReference()
@@ -31,7 +31,7 @@ import logging
 from eoxserver.contrib import gdal, ogr, osr
 from eoxserver.processing.gdal import reftools as rt
 from eoxserver.processing.preprocessing.util import (
-    create_mem, copy_metadata
+    create_temp, copy_metadata, cleanup_temp
 )
 from eoxserver.processing.preprocessing.exceptions import GCPTransformException
 
@@ -114,6 +114,7 @@ class GCPList(GeographicReference):
         for min_gcpnum, max_gcpnum, order in [(3, None, -1), (10, None, 3), (6, None, 2), (3, None, 1)]:
             # if the number of GCP matches
             if len(self.gcps) >= min_gcpnum and (max_gcpnum is None or len(self.gcps) <= max_gcpnum):
+                dst_ds = None
                 try:
 
                     if ( order < 0 ) :
@@ -137,9 +138,9 @@ class GCPList(GeographicReference):
                     logger.debug("New size is '%i x %i'" % (size_x, size_y))
 
                     # create the output dataset
-                    dst_ds = create_mem(size_x, size_y,
-                                        src_ds.RasterCount,
-                                        src_ds.GetRasterBand(1).DataType)
+                    dst_ds = create_temp(size_x, size_y,
+                                         src_ds.RasterCount,
+                                         src_ds.GetRasterBand(1).DataType)
 
                     # reproject the image
                     dst_ds.SetProjection(dst_sr.ExportToWkt())
@@ -155,6 +156,8 @@ class GCPList(GeographicReference):
                 except RuntimeError as e:
                     logger.debug("Failed using order '%i'. Error was '%s'."
                                  % (order, str(e)))
+                    if dst_ds is not None:
+                        cleanup_temp(dst_ds)
                     # the given method was not applicable, use the next one
                     continue
 
@@ -27,13 +27,14 @@
 # ------------------------------------------------------------------------------
 
 import logging
-import math
-from itertools import product
+from uuid import uuid4
+
 import numpy
 
-from eoxserver.contrib import gdal, gdal_array, osr, ogr
+from eoxserver.contrib import gdal, osr, ogr
 from eoxserver.processing.preprocessing.util import (
-    get_limits, create_temp, copy_metadata, copy_projection, cleanup_temp
+    get_limits, create_temp, create_vrt, create_vrt_copy,
+    copy_metadata, copy_projection, cleanup_temp
 )
 from eoxserver.resources.coverages.crss import (
     parseEPSGCode, fromShortCode, fromURL, fromURN, fromProj4Str
@@ -49,7 +50,9 @@ logger = logging.getLogger(__name__)
 class DatasetOptimization(object):
     """ Abstract base class for dataset optimization steps. Each optimization
         step shall be callable and return the dataset or a copy thereof if
-        necessary.
+        necessary. Wherever possible, the returned copy is a VRT referencing
+        its input, so that the pixel data is only processed once when the
+        final output is written.
     """
 
     def __call__(self, ds):
@@ -92,36 +95,18 @@ class ReprojectionOptimization(DatasetOptimization):
                         "reprojection is required.")
             return src_ds
 
-        # create a temporary dataset to get information about the output size
-        tmp_ds = gdal.AutoCreateWarpedVRT(src_ds, None, dst_sr.ExportToWkt(),
-                                          gdal.GRA_Bilinear, 0.125)
+        # create a warped VRT: the reprojection is only performed when the
+        # pixels are actually read. No-data values of the source are used as
+        # destination no-data values and to initialize the output.
+        dst_ds = gdal.Warp(
+            '/vsimem/%s.vrt' % uuid4().hex, src_ds, format='VRT',
+            srcSRS=src_sr.ExportToWkt(), dstSRS=dst_sr.ExportToWkt(),
+            resampleAlg=gdal.GRA_Bilinear, errorThreshold=0.125
+        )
+        if dst_ds is None:
+            raise RuntimeError("Failed to create the reprojected dataset.")
 
         try:
-            # create the output dataset
-            dst_ds = create_temp(tmp_ds.RasterXSize, tmp_ds.RasterYSize,
-                                 src_ds.RasterCount,
-                                 src_ds.GetRasterBand(1).DataType,
-                                 temp_root=self.temporary_directory)
-
-            # initialize with no data
-            for i in range(src_ds.RasterCount):
-                src_band = src_ds.GetRasterBand(i+1)
-                if src_band.GetNoDataValue() is not None:
-                    dst_band = dst_ds.GetRasterBand(i+1)
-                    dst_band.SetNoDataValue(src_band.GetNoDataValue())
-                    dst_band.Fill(src_band.GetNoDataValue())
-
-            # reproject the image
-            dst_ds.SetProjection(dst_sr.ExportToWkt())
-            dst_ds.SetGeoTransform(tmp_ds.GetGeoTransform())
-
-            gdal.ReprojectImage(src_ds, dst_ds,
-                                src_sr.ExportToWkt(),
-                                dst_sr.ExportToWkt(),
-                                gdal.GRA_Bilinear)
-
-            tmp_ds = None
-
             # copy the metadata
             copy_metadata(src_ds, dst_ds)
 
@@ -133,48 +118,39 @@ class ReprojectionOptimization(DatasetOptimization):
 
 class BandSelectionOptimization(DatasetOptimization):
     """ Dataset optimization step which selects a number of bands and their
-    respective scale and copies them to the result dataset.
+    respective scale and references them in the resulting VRT dataset.
     """
 
     def __init__(self, bands, datatype=gdal.GDT_Byte, temporary_directory=None):
         # preprocess bands list
         # TODO: improve
-        self.bands = map(lambda b: b if len(b) == 3 else (b[0], None, None),
-                         bands)
+        self.bands = [
+            b if len(b) == 3 else (b[0], None, None)
+            for b in bands
+        ]
         self.datatype = datatype
         self.temporary_directory = temporary_directory
 
     def __call__(self, src_ds):
         logger.info("Applying BandSelectionOptimization")
+        dst_ds = None
         try:
-            dst_ds = create_temp(src_ds.RasterXSize, src_ds.RasterYSize,
-                                 len(self.bands), self.datatype,
-                                 temp_root=self.temporary_directory)
+            dst_ds = create_vrt(src_ds.RasterXSize, src_ds.RasterYSize,
+                                len(self.bands), self.datatype)
             dst_range = get_limits(self.datatype)
-
-            multiple, multiple_written = 0, False
+            src_filename = src_ds.GetDescription()
 
             for dst_index, (src_index, dmin, dmax) in enumerate(self.bands, 1):
-                # check if next band is equal
-                if dst_index < len(self.bands) and \
-                        (src_index, dmin, dmax) == self.bands[dst_index]:
-                    multiple += 1
-                    continue
                 # check that src band is available
                 if src_index > src_ds.RasterCount:
                     continue
 
-                # initialize with zeros if band is 0
+                # a band without sources is initialized with zeros
                 if src_index == 0:
-                    src_band = src_ds.GetRasterBand(1)
-                    data = numpy.zeros(
-                        (src_band.YSize, src_band.XSize),
-                        dtype=gdal_array.codes[self.datatype]
-                    )
-                    src_min, src_max = (0, 0)
-                # use src_ds band otherwise
-                else:
-                    src_band = src_ds.GetRasterBand(src_index)
+                    continue
+
+                src_band = src_ds.GetRasterBand(src_index)
+                if dmin == "min" or dmax == "max":
                     src_min, src_max = src_band.ComputeRasterMinMax()
 
                 # get min/max values or calculate from band
@@ -188,49 +164,31 @@ class BandSelectionOptimization(DatasetOptimization):
                     dmax = src_max
                 src_range = (float(dmin), float(dmax))
 
-                block_x_size, block_y_size = src_band.GetBlockSize()
-
-                num_x = int(math.ceil(float(src_band.XSize) / block_x_size))
-                num_y = int(math.ceil(float(src_band.YSize) / block_y_size))
-
                 dst_band = dst_ds.GetRasterBand(dst_index)
                 if src_band.GetNoDataValue() is not None:
                     dst_band.SetNoDataValue(src_band.GetNoDataValue())
 
-                for block_x, block_y in product(range(num_x), range(num_y)):
-                    offset_x = block_x * block_x_size
-                    offset_y = block_y * block_y_size
-                    size_x = min(src_band.XSize - offset_x, block_x_size)
-                    size_y = min(src_band.YSize - offset_y, block_y_size)
-                    data = src_band.ReadAsArray(
-                        offset_x, offset_y, size_x, size_y
+                # perform the scaling lazily. Clipping is implied by the
+                # conversion to the output data type, which saturates at the
+                # limits of its range.
+                if src_range[1] != src_range[0]:
+                    ratio = (
+                        (dst_range[1] - dst_range[0]) /
+                        (src_range[1] - src_range[0])
                     )
-
-                    # perform clipping and scaling
-                    data = ((dst_range[1] - dst_range[0]) *
-                            ((numpy.clip(data, dmin, dmax) - src_range[0]) /
-                            (src_range[1] - src_range[0])))
-
-                    # set new datatype
-                    data = data.astype(gdal_array.codes[self.datatype])
-
-                    # write result
-                    dst_band.WriteArray(data, offset_x, offset_y)
-
-                    # write equal bands at once
-                    if multiple > 0:
-                        for i in range(multiple):
-                            dst_band_multiple = dst_ds.GetRasterBand(
-                                dst_index-1-i
-                            )
-                            dst_band_multiple.WriteArray(
-                                data, offset_x, offset_y
-                            )
-                        multiple_written = True
-
-                if multiple_written:
-                    multiple = 0
-                    multiple_written = False
+                else:
+                    ratio = 0.0
+
+                dst_band.SetMetadataItem("source_0", (
+                    '<ComplexSource>'
+                    '<SourceFilename relativeToVRT="0">%s</SourceFilename>'
+                    '<SourceBand>%d</SourceBand>'
+                    '<ScaleOffset>%r</ScaleOffset>'
+                    '<ScaleRatio>%r</ScaleRatio>'
+                    '</ComplexSource>'
+                ) % (src_filename, src_index, -src_range[0] * ratio, ratio),
+                    "new_vrt_sources"
+                )
 
             copy_projection(src_ds, dst_ds)
             copy_metadata(src_ds, dst_ds)
@@ -238,7 +196,8 @@ class BandSelectionOptimization(DatasetOptimization):
             return dst_ds
 
         except:
-            cleanup_temp(dst_ds)
+            if dst_ds is not None:
+                cleanup_temp(dst_ds)
             raise
 
 
@@ -383,21 +342,37 @@ class OverviewOptimization(DatasetPostOptimization):
 
 class AlphaBandOptimization(object):
     """ This optimization renders the footprint into the alpha channel of the
-    image. """
+    image. The footprint is rasterized into a temporary single band dataset,
+    which is referenced as the alpha band of a VRT on top of the image. The
+    temporary datasets created are collected in ``temporary_datasets``.
+    """
+
+    def __init__(self, temporary_directory=None):
+        self.temporary_directory = temporary_directory
+        self.temporary_datasets = []
 
     def __call__(self, src_ds, footprint_wkt):
         logger.info("Applying AlphaBandOptimization")
         dt = src_ds.GetRasterBand(1).DataType
         if src_ds.RasterCount == 3:
-            src_ds.AddBand(dt)
+            dst_ds = create_vrt_copy(src_ds)
         elif src_ds.RasterCount == 4:
-            pass  # okay
+            # replace the existing alpha band
+            dst_ds = gdal.Translate(
+                '/vsimem/%s.vrt' % uuid4().hex, src_ds, format='VRT',
+                bandList=[1, 2, 3]
+            )
         else:
             raise Exception("Cannot add alpha band, as the current number of "
                             "bands '%d' does not match" % src_ds.RasterCount)
+        self.temporary_datasets.append(dst_ds)
 
         # initialize the alpha band with zeroes (completely transparent)
-        band = src_ds.GetRasterBand(4)
+        alpha_ds = create_temp(src_ds.RasterXSize, src_ds.RasterYSize, 1, dt,
+                               temp_root=self.temporary_directory)
+        self.temporary_datasets.append(alpha_ds)
+        copy_projection(src_ds, alpha_ds)
+        band = alpha_ds.GetRasterBand(1)
         band.Fill(0)
 
         # set up the layer with geometry
@@ -412,7 +387,20 @@ class AlphaBandOptimization(object):
         layer.CreateFeature(feat)
 
         # rasterize the polygon, burning the opaque value into the alpha band
-        gdal.RasterizeLayer(src_ds, [4], layer, burn_values=[get_limits(dt)[1]])
+        gdal.RasterizeLayer(
+            alpha_ds, [1], layer, burn_values=[get_limits(dt)[1]]
+        )
+        alpha_ds.FlushCache()
+
+        dst_ds.AddBand(dt)
+        dst_ds.GetRasterBand(4).SetMetadataItem("source_0", (
+            '<SimpleSource>'
+            '<SourceFilename relativeToVRT="0">%s</SourceFilename>'
+            '<SourceBand>1</SourceBand>'
+            '</SimpleSource>'
+        ) % alpha_ds.GetDescription(), "new_vrt_sources")
+
+        return dst_ds
 
 
 # ==============================================================================
@@ -27,7 +27,9 @@
 # ------------------------------------------------------------------------------
 
 from os.path import exists, join
+from itertools import product
 from uuid import uuid4
+import math
 import tempfile
 import contextlib
 import logging
@@ -63,6 +65,49 @@ def create_mem_copy(ds, *args, **kwargs):
     return mem_drv.CreateCopy('', ds, *args, **kwargs)
 
 
+def create_vrt_copy(ds, *args, **kwargs):
+    """ Create a new VRT Dataset referencing an existing dataset. Contrary to
+        :func:`create_mem_copy` no pixel data is copied. The VRT is stored in
+        ``/vsimem`` so that subsequent VRT steps can reference it by its path.
+    """
+    vrt_drv = gdal.GetDriverByName('VRT')
+    return vrt_drv.CreateCopy(
+        '/vsimem/%s.vrt' % uuid4().hex, ds, *args, **kwargs
+    )
+
+
+def create_vrt(sizex, sizey, numbands=0, datatype=gdal.GDT_Byte):
+    """ Create a new, empty VRT Dataset stored in ``/vsimem``. """
+    vrt_drv = gdal.GetDriverByName('VRT')
+    return vrt_drv.Create(
+        '/vsimem/%s.vrt' % uuid4().hex, sizex, sizey, numbands, datatype
+    )
+
+
+def is_vrt(ds):
+    """ Check whether the dataset is a (lazy) VRT Dataset. """
+    return ds.GetDriver().ShortName == 'VRT'
+
+
+def iter_blocks(band):
+    """ Iterate over the blocks of a raster band, yielding tuples in the form
+        (offset_x, offset_y, size_x, size_y).
+    """
+    block_x_size, block_y_size = band.GetBlockSize()
+
+    num_x = int(math.ceil(float(band.XSize) / block_x_size))
+    num_y = int(math.ceil(float(band.YSize) / block_y_size))
+
+    for block_y, block_x in product(range(num_y), range(num_x)):
+        offset_x = block_x * block_x_size
+        offset_y = block_y * block_y_size
+        yield (
+            offset_x, offset_y,
+            min(band.XSize - offset_x, block_x_size),
+            min(band.YSize - offset_y, block_y_size),
+        )
+
+
 def create_mem(sizex, sizey, numbands, datatype=gdal.GDT_Byte,
                options=None):
     """ Create a new In-Memory Dataset. """
@@ -95,6 +140,16 @@ def create_temp(sizex, sizey, numbands, datatype=gdal.GDT_Byte,
 def cleanup_temp(ds):
     """ Delete a temporary dataset.
     """
+    if not isinstance(ds, str) and is_vrt(ds):
+        # the file list of a VRT also contains its sources, so only the VRT
+        # file itself is removed
+        filename = ds.GetDescription()
+        ds = None
+        if filename.startswith('/vsimem/'):
+            logger.debug("Cleaning up temporary VRT '%s'." % filename)
+            gdal.Unlink(filename)
+        return
+
     if isinstance(ds, str):
         driver = gdal.IdentifyDriver(ds)
         filelist = [ds]
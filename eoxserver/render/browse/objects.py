@@ -28,12 +28,13 @@
 from typing import List, Tuple, Optional, Union
 
 from django.contrib.gis.geos import Polygon
-from django.contrib.gis.gdal import SpatialReference, CoordTransform, DataSource
+from django.contrib.gis.gdal import DataSource
 from django.conf import settings
 
 from eoxserver.contrib import gdal
 from eoxserver.backends.access import get_vsi_path, get_vsi_env, gdal_open
 from eoxserver.render.coverage.objects import Coverage
+from eoxserver.resources.coverages import crss
 
 
 BROWSE_MODE_RGB = "rgb"
@@ -84,7 +85,7 @@ class Browse(object):
 
     @property
     def spatial_reference(self):
-        return SpatialReference(self.crs)
+        return crss.get_gis_spatial_reference(self.crs)
 
     @property
     def mode(self):
@@ -96,10 +97,9 @@ class Browse(object):
             return self._footprint
         else:
             polygon = Polygon.from_bbox(self.extent)
-            srs = SpatialReference(self.crs)
+            srs = crss.get_gis_spatial_reference(self.crs)
             if srs.srid != 4326:
-                ct = CoordTransform(srs, SpatialReference(4326))
-                polygon.transform(ct)
+                polygon.transform(crss.get_gis_coord_transform(self.crs, 4326))
             return polygon
 
     @classmethod
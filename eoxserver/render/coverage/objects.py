@@ -30,9 +30,9 @@ from copy import deepcopy
 from typing import List, Optional, Union
 
 from eoxserver.core.util.timetools import parse_iso8601, parse_duration
-from eoxserver.contrib import gdal, osr
-from eoxserver.contrib.osr import SpatialReference
+from eoxserver.contrib import gdal
 from eoxserver.backends.access import get_vsi_path, get_vsi_env
+from eoxserver.resources.coverages import crss
 
 GRID_TYPE_ELEVATION = 1
 GRID_TYPE_TEMPORAL = 2
@@ -350,7 +350,7 @@ class Grid(list):
     def from_gdal_dataset(cls, ds):
         projection = ds.GetProjection()
         gt = ds.GetGeoTransform()
-        sr = osr.SpatialReference(projection)
+        sr = crss.get_spatial_reference(projection)
 
         axis_names = ['x', 'y'] if sr.IsProjected() else ['long', 'lat']
 
@@ -361,7 +361,7 @@ class Grid(list):
 
     @property
     def spatial_reference(self):
-        return SpatialReference(self.coordinate_reference_system)
+        return crss.get_spatial_reference(self.coordinate_reference_system)
 
     @property
     def coordinate_reference_system(self):
@@ -491,12 +491,64 @@ class ArraydataLocation(Location):
         return self._band_statistics[band_index]
 
 
+class RectifiedOverviewLocation(Location):
+    """ Location of a rectified overview of a referenceable coverage.
+    """
+    def __init__(self, path, env, format, coordinate_reference_system,
+                 extent, size):
+        super(RectifiedOverviewLocation, self).__init__(path, env, format)
+        self._coordinate_reference_system = coordinate_reference_system
+        self._extent = extent
+        self._size = size
+
+    @property
+    def coordinate_reference_system(self):
+        return self._coordinate_reference_system
+
+    @property
+    def spatial_reference(self):
+        return crss.get_spatial_reference(self.coordinate_reference_system)
+
+    @property
+    def extent(self):
+        return self._extent
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def resolution(self):
+        return (
+            (self._extent[2] - self._extent[0]) / float(self._size[0]),
+            (self._extent[3] - self._extent[1]) / float(self._size[1]),
+        )
+
+
+def _get_range_type(coverage_type, range_types=None):
+    """ Get the :class:`RangeType` for the given coverage type model. When a
+        ``dict`` of ``range_types`` is passed, it is used as a cache, so that
+        each coverage type is only translated once.
+    """
+    if range_types is None:
+        return RangeType.from_coverage_type(coverage_type)
+
+    try:
+        return range_types[coverage_type.pk]
+    except KeyError:
+        range_type = RangeType.from_coverage_type(coverage_type)
+        range_types[coverage_type.pk] = range_type
+        return range_type
+
+
 class Coverage(object):
     """ Representation of a coverage for internal processing.
     """
     def __init__(self, identifier, eo_metadata, range_type, grid, origin, size,
-                 arraydata_locations, metadata_locations, native_format=None):
+                 arraydata_locations, metadata_locations, native_format=None,
+                 rectified_overviews=None, updated=None):
         self._identifier = identifier
+        self._updated = updated
         self._eo_metadata = eo_metadata
         self._range_type = range_type
         self._origin = origin
@@ -505,11 +557,16 @@ class Coverage(object):
         self._arraydata_locations = arraydata_locations
         self._metadata_locations = metadata_locations
         self._native_format = native_format
+        self._rectified_overviews = rectified_overviews or []
 
     @property
     def identifier(self):
         return self._identifier
 
+    @property
+    def updated(self):
+        return self._updated
+
     @property
     def eo_metadata(self):
         return self._eo_metadata
@@ -558,6 +615,10 @@ class Coverage(object):
     def metadata_locations(self):
         return self._metadata_locations
 
+    @property
+    def rectified_overviews(self) -> List[RectifiedOverviewLocation]:
+        return self._rectified_overviews
+
     @property
     def coverage_subtype(self):
         subtype = "RectifiedDataset"
@@ -635,7 +696,7 @@ class Coverage(object):
         return location.field_statistics(field.index)
 
     @classmethod
-    def from_model(cls, model):
+    def from_model(cls, model, range_types=None):
         # use coverages EO metadata by default and fill up with
         # EO metadata from Product
         begin_time = model.begin_time
@@ -649,6 +710,12 @@ class Coverage(object):
             footprint = model.parent_product.footprint
         eo_metadata = EOMetadata(begin_time, end_time, footprint)
 
+        # the version of the coverage, including the inherited EO metadata
+        updated = model.updated
+        if model.parent_product and updated and \
+                model.parent_product.updated > updated:
+            updated = model.parent_product.updated
+
         arraydata_locations = []
         for item in model.arraydata_items.all():
             statistics = [None] * item.band_count
@@ -682,9 +749,7 @@ class Coverage(object):
         ]
 
         if model.coverage_type:
-            range_type = RangeType.from_coverage_type(
-                model.coverage_type
-            )
+            range_type = _get_range_type(model.coverage_type, range_types)
         else:
             range_type = RangeType.from_gdal_dataset(
                 gdal.OpenShared(arraydata_locations[0].path),
@@ -695,6 +760,18 @@ class Coverage(object):
 
         origin = Origin.from_description(grid.types, model.origin)
 
+        rectified_overviews = []
+        if grid.is_referenceable:
+            rectified_overviews = [
+                RectifiedOverviewLocation(
+                    get_vsi_path(item), get_vsi_env(item.storage),
+                    item.format, item.coordinate_reference_system,
+                    (item.min_x, item.min_y, item.max_x, item.max_y),
+                    (item.width, item.height),
+                )
+                for item in model.rectified_overviews.all()
+            ]
+
         return cls(
             identifier=model.identifier,
             eo_metadata=eo_metadata,
@@ -703,14 +780,17 @@ class Coverage(object):
             grid=grid,
             size=model.size,
             arraydata_locations=arraydata_locations,
-            metadata_locations=metadata_locations
+            metadata_locations=metadata_locations,
+            rectified_overviews=rectified_overviews,
+            updated=updated,
         )
 
 
 class Mosaic(object):
     def __init__(self, identifier, eo_metadata, range_type, grid, origin, size,
-                 coverages=None):
+                 coverages=None, updated=None):
         self._identifier = identifier
+        self._updated = updated
         self._eo_metadata = eo_metadata
         self._range_type = range_type
         self._origin = origin
@@ -722,6 +802,10 @@ class Mosaic(object):
     def identifier(self):
         return self._identifier
 
+    @property
+    def updated(self):
+        return self._updated
+
     @property
     def eo_metadata(self):
         return self._eo_metadata
@@ -793,7 +877,7 @@ class Mosaic(object):
         return self._coverages
 
     @classmethod
-    def from_model(cls, mosaic_model, coverage_models=None):
+    def from_model(cls, mosaic_model, coverage_models=None, range_types=None):
         eo_metadata = EOMetadata(None, None, None)
         if mosaic_model.begin_time and mosaic_model.end_time and \
                 mosaic_model.footprint:
@@ -802,9 +886,7 @@ class Mosaic(object):
                 mosaic_model.footprint
             )
 
-        range_type = RangeType.from_coverage_type(
-            mosaic_model.coverage_type
-        )
+        range_type = _get_range_type(mosaic_model.coverage_type, range_types)
 
         grid_model = mosaic_model.grid
         grid = None
@@ -814,14 +896,15 @@ class Mosaic(object):
             origin = Origin.from_description(grid.types, mosaic_model.origin)
 
         coverages = [
-            Coverage.from_model(coverage_model)
+            Coverage.from_model(coverage_model, range_types)
             for coverage_model in coverage_models
         ] if coverage_models is not None else None
 
         return cls(
             identifier=mosaic_model.identifier,
             eo_metadata=eo_metadata, range_type=range_type, origin=origin,
-            grid=grid, size=mosaic_model.size, coverages=coverages
+            grid=grid, size=mosaic_model.size, coverages=coverages,
+            updated=mosaic_model.updated
         )
 
 
@@ -856,10 +939,72 @@ class DatasetSeries(object):
         )
 
 
-def from_model(eo_object_model):
+def from_model(eo_object_model, range_types=None):
     from eoxserver.resources.coverages import models
 
     if isinstance(eo_object_model, models.Coverage):
-        return Coverage.from_model(eo_object_model)
+        return Coverage.from_model(eo_object_model, range_types)
     elif isinstance(eo_object_model, models.Mosaic):
-        return Mosaic.from_model(eo_object_model)
+        return Mosaic.from_model(eo_object_model, range_types=range_types)
+
+
+def prefetch_models(eo_object_models):
+    """ Fetch the related objects required by :func:`from_model` for all
+        given Coverage and Mosaic models with a fixed number of queries.
+    """
+    from django.db.models import Prefetch, prefetch_related_objects
+    from eoxserver.resources.coverages import models
+
+    storage_related = ('storage__parent', 'storage__storage_auth')
+    coverage_type_lookups = (
+        'coverage_type__field_types__allowed_value_ranges',
+        'coverage_type__field_types__nil_values',
+    )
+
+    prefetch_related_objects(
+        [
+            model for model in eo_object_models
+            if isinstance(model, models.Coverage)
+        ],
+        'grid', 'parent_product', *coverage_type_lookups,
+        Prefetch(
+            'arraydata_items',
+            queryset=models.ArrayDataItem.objects.select_related(
+                *storage_related
+            ).prefetch_related('array_statistics')
+        ),
+        Prefetch(
+            'metadata_items',
+            queryset=models.MetaDataItem.objects.select_related(
+                *storage_related
+            )
+        ),
+        Prefetch(
+            'rectified_overviews',
+            queryset=models.RectifiedOverview.objects.select_related(
+                *storage_related
+            )
+        ),
+    )
+    prefetch_related_objects(
+        [
+            model for model in eo_object_models
+            if isinstance(model, models.Mosaic)
+        ],
+        'grid', *coverage_type_lookups
+    )
+
+
+def from_models(eo_object_models):
+    """ Batched version of :func:`from_model`. The related objects of all
+        models are prefetched and the range types are only created once per
+        coverage type.
+    """
+    eo_object_models = list(eo_object_models)
+    prefetch_models(eo_object_models)
+
+    range_types = {}
+    return [
+        from_model(eo_object_model, range_types)
+        for eo_object_model in eo_object_models
+    ]
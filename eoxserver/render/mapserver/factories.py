@@ -145,9 +145,17 @@ class CoverageLayerFactoryMixIn(object):
         num_locations = len(set(locations))
         if num_locations == 1:
             location = field_locations[0][1]
+            overview = None
+            if coverage.grid.is_referenceable:
+                overview = _select_rectified_overview(coverage, map_obj)
+
             if not coverage.grid.is_referenceable:
                 data = location.path
                 ms.set_env(map_obj, location.env, True)
+            elif overview:
+                location = overview
+                data = overview.path
+                ms.set_env(map_obj, overview.env, True)
             else:
                 vrt_path = filename_generator.generate()
                 e = map_obj.extent
@@ -181,6 +189,9 @@ class CoverageLayerFactoryMixIn(object):
         if not coverage.grid.is_referenceable:
             extent = coverage.extent
             sr = coverage.grid.spatial_reference
+        elif overview:
+            extent = overview.extent
+            sr = overview.spatial_reference
         else:
             map_extent = map_obj.extent
             extent = (
@@ -912,6 +923,49 @@ def _create_geometry_class(color_name, background_color_name=None,
     return cls_obj
 
 
+def _select_rectified_overview(coverage, map_obj):
+    """ Select the coarsest rectified overview of a referenceable coverage
+        whose resolution is still at least as fine as the one requested by the
+        map. Returns ``None`` when no such overview is available, in which
+        case the coverage has to be rectified on the fly.
+    """
+    if not coverage.rectified_overviews:
+        return None
+
+    map_projection = map_obj.getProjection()
+    e = map_obj.extent
+
+    candidates = []
+    for overview in coverage.rectified_overviews:
+        # the cached transformation uses the traditional GIS axis order and
+        # leaves the shared spatial references untouched
+        try:
+            transformation = crss.get_coordinate_transformation(
+                map_projection, overview.coordinate_reference_system
+            )
+            minx, miny, maxx, maxy = transformation.TransformBounds(
+                e.minx, e.miny, e.maxx, e.maxy, 21
+            )
+        except Exception:
+            logger.debug(
+                "Failed to transform map extent to the CRS of rectified "
+                "overview '%s'", overview.path
+            )
+            continue
+
+        map_resolution = min(
+            (maxx - minx) / map_obj.width, (maxy - miny) / map_obj.height
+        )
+        overview_resolution = max(overview.resolution)
+        if overview_resolution <= map_resolution:
+            candidates.append((overview_resolution, overview))
+
+    if not candidates:
+        return None
+
+    return max(candidates, key=lambda candidate: candidate[0])[1]
+
+
 def _build_vrt(size, field_locations):
     path = join("/vsimem", uuid4().hex)
     size_x, size_y = size[:2]
@@ -113,6 +113,11 @@ class BrowseInline(admin.StackedInline):
     extra = 0
 
 
+class RectifiedOverviewInline(admin.StackedInline):
+    model = models.RectifiedOverview
+    extra = 0
+
+
 class ProductDataItemInline(admin.StackedInline):
     model = models.ProductDataItem
     extra = 0
@@ -239,7 +244,10 @@ admin.site.register(models.Grid, GridAdmin)
 
 
 class CoverageAdmin(EOObjectAdmin):
-    inlines = [CoverageMetadataInline, MetaDataItemInline, ArrayDataItemInline]
+    inlines = [
+        CoverageMetadataInline, MetaDataItemInline, ArrayDataItemInline,
+        RectifiedOverviewInline
+    ]
 
 
 admin.site.register(models.Coverage, CoverageAdmin)
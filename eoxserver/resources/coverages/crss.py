@@ -34,6 +34,8 @@
 import re
 import logging
 import math
+import threading
+from functools import lru_cache
 
 from eoxserver.contrib import osr
 from eoxserver.core.config import get_eoxserver_config
@@ -383,19 +385,19 @@ def getAxesSwapper(epsg, swapAxes=None):
         return (lambda x, y: (y, x)) if swapAxes else (lambda x, y: (x, y))
 
 
+@lru_cache(maxsize=None)
 def isProjected(epsg):
     """Is the coordinate system projected (True) or Geographic (False)? """
 
-    spat_ref = osr.SpatialReference()
-    spat_ref.ImportFromEPSG(epsg)
+    spat_ref = get_spatial_reference(int(epsg))
     return bool(spat_ref.IsProjected())
 
 
+@lru_cache(maxsize=None)
 def crs_bounds(srid):
     """ Get the maximum bounds of the CRS. """
 
-    srs = osr.SpatialReference()
-    srs.ImportFromEPSG(srid)
+    srs = get_spatial_reference(int(srid))
 
     if srs.IsGeographic():
         return (-180.0, -90.0, 180.0, 90.0)
@@ -410,11 +412,11 @@ def crs_bounds(srid):
         )
 
 
+@lru_cache(maxsize=None)
 def crs_tolerance(srid):
     """ Get the "tolerance" of the CRS """
 
-    srs = osr.SpatialReference()
-    srs.ImportFromEPSG(srid)
+    srs = get_spatial_reference(int(srid))
 
     if srs.IsGeographic():
         return 1e-8
@@ -432,6 +434,121 @@ image_crss_ids = set((
 def is_image_crs(string):
     return string in image_crss_ids
 
+# ------------------------------------------------------------------------------
+# cached spatial references and coordinate transformations
+
+#: the maximum number of cached items per thread and kind
+SRS_CACHE_SIZE = 256
+
+
+class _SpatialReferenceCache(threading.local):
+    """ A cache for spatial references and coordinate transformations. Their
+    creation requires lookups in the PROJ database, so they are created only
+    once and then reused for all requests. As the GDAL/OGR objects must not
+    be shared between threads, each thread uses its own set of cached items.
+    """
+
+    def __init__(self, max_size=SRS_CACHE_SIZE):
+        self.max_size = max_size
+        self._items = {}
+
+    def get(self, key, factory):
+        try:
+            return self._items[key]
+        except KeyError:
+            pass
+
+        if len(self._items) >= self.max_size:
+            self._items.clear()
+        value = self._items[key] = factory()
+        return value
+
+    def clear(self):
+        self._items.clear()
+
+
+_spatial_reference_cache = _SpatialReferenceCache()
+_transformation_cache = _SpatialReferenceCache()
+_gis_spatial_reference_cache = _SpatialReferenceCache()
+_gis_transformation_cache = _SpatialReferenceCache()
+
+
+def get_spatial_reference(definition):
+    """ Returns a cached :class:`eoxserver.contrib.osr.SpatialReference` for
+    the given EPSG code or definition string (e.g. WKT). The returned object
+    is shared and must not be modified.
+    """
+    return _spatial_reference_cache.get(
+        definition, lambda: osr.SpatialReference(definition)
+    )
+
+
+def get_coordinate_transformation(source, target):
+    """ Returns a cached OSR coordinate transformation between the spatial
+    references given as EPSG codes or definition strings. Both use the
+    traditional GIS axis order, i.e. x/y or lon/lat.
+    """
+    def create():
+        srss = []
+        for definition in (source, target):
+            srs = osr.SpatialReference(definition).sr
+            srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+            srss.append(srs)
+        return osr.CoordinateTransformation(*srss)
+
+    return _transformation_cache.get((source, target), create)
+
+
+def get_gis_spatial_reference(definition):
+    """ Returns a cached :class:`django.contrib.gis.gdal.SpatialReference` for
+    the given EPSG code or definition string. The returned object is shared
+    and must not be modified.
+    """
+    from django.contrib.gis.gdal import SpatialReference
+    return _gis_spatial_reference_cache.get(
+        definition, lambda: SpatialReference(definition)
+    )
+
+
+def get_gis_coord_transform(source, target):
+    """ Returns a cached :class:`django.contrib.gis.gdal.CoordTransform`
+    between the spatial references given as EPSG codes or definition strings.
+    """
+    from django.contrib.gis.gdal import CoordTransform
+    return _gis_transformation_cache.get(
+        (source, target), lambda: CoordTransform(
+            get_gis_spatial_reference(source),
+            get_gis_spatial_reference(target),
+        )
+    )
+
+
+def transform_geometry(geometry, srid, clone=False):
+    """ Transform the GEOS geometry to the given SRID using a cached
+    transformation. The geometry is transformed in place, unless ``clone`` is
+    set. Returns the transformed geometry.
+    """
+    if clone:
+        geometry = geometry.clone()
+
+    if geometry.srid is None:
+        # let GEOS raise the appropriate error
+        geometry.transform(srid)
+    elif geometry.srid != srid:
+        geometry.transform(get_gis_coord_transform(geometry.srid, srid))
+        geometry.srid = srid
+    return geometry
+
+
+def clear_caches():
+    """ Clears the cached spatial references and transformations of the
+    current thread.
+    """
+    _spatial_reference_cache.clear()
+    _transformation_cache.clear()
+    _gis_spatial_reference_cache.clear()
+    _gis_transformation_cache.clear()
+
 
 # ------------------------------------------------------------------------------
 
@@ -30,7 +30,9 @@
 from osgeo import ogr
 from osgeo import osr
 
-from eoxserver.resources.coverages.crss import crs_bounds
+from eoxserver.resources.coverages.crss import (
+    crs_bounds, get_spatial_reference, get_coordinate_transformation
+)
 
 
 EXTENT_EPSG_4326 = ogr.CreateGeometryFromWkt(
@@ -64,17 +66,8 @@ def extent_crosses_dateline(extent, srid=4326):
         )
     )
 
-    sr = osr.SpatialReference()
-    sr.ImportFromEPSG(srid)
-    try:
-        sr.SetAxisMappingStrategy(0)
-    except AttributeError:
-        # earlier version did not have this behavior
-        pass
-
-    if not sr.IsSame(SR_EPSG_4326):
-        transform = osr.CoordinateTransformation(sr, SR_EPSG_4326)
-        poly.Transform(transform)
+    if not get_spatial_reference(srid).IsSame(SR_EPSG_4326):
+        poly.Transform(get_coordinate_transformation(srid, 4326))
 
     if not EXTENT_EPSG_4326.Contains(poly):
         return True
@@ -28,11 +28,12 @@
 # ------------------------------------------------------------------------------
 
 import logging
+import os
 import traceback
 from optparse import OptionValueError
 
 import django
-from django.core.management.base import CommandParser
+from django.core.management.base import CommandParser, CommandError
 
 
 logger = logging.getLogger(__name__)
@@ -150,3 +151,95 @@ class SubParserMixIn:
         subparser.add_argument('--no-color', action="store_true", default=False)
 
         return subparser
+
+
+class ListingRegistrationMixIn(object):
+    """ Helper mix-in class for registration commands, allowing to register
+        all items of a listing in parallel and resumable.
+    """
+
+    def add_listing_arguments(self, parser):
+        parser.add_argument(
+            '--listing', dest='listing', default=None,
+            help=(
+                'Register all items of a listing file, one location per line '
+                'in the form "[[... storage] storage] path". Use "-" to read '
+                'from stdin.'
+            )
+        )
+        parser.add_argument(
+            '--list-storage', dest='list_storage', default=None,
+            help='Register all files of the given storage.'
+        )
+        parser.add_argument(
+            '--list-location', dest='list_location', default=None,
+            help='Only list the files in this location of the storage.'
+        )
+        parser.add_argument(
+            '--list-pattern', dest='list_pattern', default=None,
+            help='Only register the listed files matching the glob pattern.'
+        )
+        parser.add_argument(
+            '--workers', '-j', dest='workers', type=int,
+            default=os.cpu_count() or 1,
+            help=(
+                'The number of worker processes when registering a listing. '
+                'Defaults to the number of CPUs.'
+            )
+        )
+        parser.add_argument(
+            '--checkpoint', dest='checkpoint', default=None,
+            help=(
+                'A checkpoint file recording the registered items of a '
+                'listing. Items in it are skipped, so that an interrupted run '
+                'can be resumed.'
+            )
+        )
+
+    def is_listing(self, kwargs):
+        return bool(kwargs.get('listing') or kwargs.get('list_storage'))
+
+    def handle_listing(self, register, listing=None, list_storage=None,
+                       list_location=None, list_pattern=None, workers=1,
+                       checkpoint=None, prefetch=None, **kwargs):
+        """ Registers all items of the listing using the ``register``
+            callable, printing the progress and throughput. The metadata of
+            batches of items is read concurrently using the ``prefetch``
+            callable, if given.
+        """
+        # imported here, as it requires GDAL
+        from eoxserver.resources.coverages.registration.listing import (
+            read_listing, list_storage as list_storage_files,
+            register_listing, get_location_key,
+        )
+
+        try:
+            if listing:
+                locations = read_listing(listing)
+            else:
+                locations = list_storage_files(
+                    list_storage, list_location, list_pattern
+                )
+        except (IOError, ValueError) as e:
+            raise CommandError('Failed to read listing: %s' % e)
+
+        def progress(report, location, result, error):
+            key = get_location_key(location)
+            if error:
+                self.print_err('Failed to register %s: %s' % (key, error))
+            else:
+                self.print_msg('Registered %s as %s' % (key, result), 2)
+            if report.processed % 100 == 0:
+                self.print_msg(str(report))
+
+        report = register_listing(
+            locations, register, workers, checkpoint, progress, prefetch
+        )
+        self.print_msg('Finished registration of listing: %s' % report)
+
+        if report.failed:
+            raise CommandError(
+                'Failed to register %d of %d items'
+                % (report.failed, report.total)
+            )
+
@@ -25,6 +25,8 @@
 # THE SOFTWARE.
 # ------------------------------------------------------------------------------
 
+import sys
+
 from django.core.management.base import CommandError, BaseCommand
 from django.db import transaction
 from django.db.models import Q
@@ -98,12 +100,30 @@ class Command(CommandOutputMixIn, SubParserMixIn, BaseCommand):
         )
         # common arguments for insertion/exclusion
         insert_parser.add_argument(
-            'object_identifiers', nargs='+',
+            'object_identifiers', nargs='*',
             help=(
                 'The identifiers of the objects (Product or Coverage) '
                 'to insert'
             )
         )
+        insert_parser.add_argument(
+            '--identifiers-file', dest='identifiers_file', default=None,
+            help=(
+                'Read additional object identifiers from a file, one per '
+                'line. Use "-" to read from stdin.'
+            )
+        )
+        insert_parser.add_argument(
+            '--bulk', action='store_true', default=False,
+            help=(
+                'Check the allowed types only once, insert the objects in '
+                'batches and recompute the collection metadata only once.'
+            )
+        )
+        insert_parser.add_argument(
+            '--batch-size', dest='batch_size', type=int, default=1000,
+            help='The number of objects per batch when using --bulk.'
+        )
         insert_parser.add_argument(
             '--use-extent', action='store_true', default=False,
             help=(
@@ -112,12 +132,30 @@ class Command(CommandOutputMixIn, SubParserMixIn, BaseCommand):
             )
         )
         exclude_parser.add_argument(
-            'object_identifiers', nargs='+',
+            'object_identifiers', nargs='*',
             help=(
                 'The identifiers of the objects (Product or Coverage) '
                 'to exclude'
             )
         )
+        exclude_parser.add_argument(
+            '--identifiers-file', dest='identifiers_file', default=None,
+            help=(
+                'Read additional object identifiers from a file, one per '
+                'line. Use "-" to read from stdin.'
+            )
+        )
+        exclude_parser.add_argument(
+            '--bulk', action='store_true', default=False,
+            help=(
+                'Check the allowed types only once, exclude the objects in '
+                'batches and recompute the collection metadata only once.'
+            )
+        )
+        exclude_parser.add_argument(
+            '--batch-size', dest='batch_size', type=int, default=1000,
+            help='The number of objects per batch when using --bulk.'
+        )
         exclude_parser.add_argument(
             '--use-extent', action='store_true', default=False,
             help=(
@@ -270,20 +308,31 @@ class Command(CommandOutputMixIn, SubParserMixIn, BaseCommand):
         """ Handle the insertion of arbitrary objects into a collection
         """
         collection = self.get_collection(identifier)
-
-        objects = list(
-            models.EOObject.objects.filter(
-                identifier__in=object_identifiers
-            ).select_subclasses()
+        object_identifiers = self.get_object_identifiers(
+            object_identifiers, kwargs.get('identifiers_file')
         )
 
-        if len(objects) != len(set(object_identifiers)):
-            actual = set(obj.identifier for obj in objects)
-            missing = set(object_identifiers) - actual
-            raise CommandError(
-                "No such object with ID%s: %s"
-                % (len(missing) > 1, ", ".join(missing))
+        if kwargs.get('bulk'):
+            objects = self.get_objects_bulk(
+                object_identifiers, kwargs['batch_size']
+            )
+            try:
+                models.collection_insert_eo_objects(
+                    collection, objects, kwargs.get('use_extent', False),
+                    kwargs['batch_size']
+                )
+            except models.ManagementError as e:
+                raise CommandError(
+                    "Could not insert objects into collection %r. "
+                    "Error was: %s" % (collection.identifier, e)
+                )
+            print(
+                'Successfully inserted %d objects into collection %r'
+                % (len(objects), collection.identifier)
             )
+            return
+
+        objects = self.get_objects(object_identifiers)
 
         for eo_object in objects:
             try:
@@ -306,20 +355,31 @@ class Command(CommandOutputMixIn, SubParserMixIn, BaseCommand):
         """ Handle the exclusion of arbitrary objects from a collection
         """
         collection = self.get_collection(identifier)
-
-        objects = list(
-            models.EOObject.objects.filter(
-                identifier__in=object_identifiers
-            ).select_subclasses()
+        object_identifiers = self.get_object_identifiers(
+            object_identifiers, kwargs.get('identifiers_file')
         )
 
-        if len(objects) != len(set(object_identifiers)):
-            actual = set(obj.identifier for obj in objects)
-            missing = set(object_identifiers) - actual
-            raise CommandError(
-                "No such object with ID%s: %s"
-                % (len(missing) > 1, ", ".join(missing))
+        if kwargs.get('bulk'):
+            objects = self.get_objects_bulk(
+                object_identifiers, kwargs['batch_size']
+            )
+            try:
+                models.collection_exclude_eo_objects(
+                    collection, objects, kwargs.get('use_extent', False),
+                    batch_size=kwargs['batch_size']
+                )
+            except models.ManagementError as e:
+                raise CommandError(
+                    "Could not exclude objects from collection %r. "
+                    "Error was: %s" % (collection.identifier, e)
+                )
+            print(
+                'Successfully excluded %d objects from collection %r'
+                % (len(objects), collection.identifier)
             )
+            return
+
+        objects = self.get_objects(object_identifiers)
 
         for eo_object in objects:
             try:
@@ -381,9 +441,11 @@ class Command(CommandOutputMixIn, SubParserMixIn, BaseCommand):
                 | Q(product_type__in=product_types)
             ).exclude(collections__in=[collection])
 
-            num_products = len(qs)
-            for product in qs:
-                models.collection_insert_eo_object(collection, product, use_extent)
+            products = list(qs.distinct())
+            num_products = len(products)
+            models.collection_insert_eo_objects(
+                collection, products, use_extent
+            )
             print("Imported %d products into collection %r." % (num_products, collection))
 
         if coverage_import:
@@ -399,15 +461,74 @@ class Command(CommandOutputMixIn, SubParserMixIn, BaseCommand):
                 | Q(coverage_type__in=coverage_types)
             ).exclude(collections__in=[collection])
 
-            num_coverages = len(qs)
-            for coverage in qs:
-                models.collection_insert_eo_object(collection, coverage, use_extent)
+            coverages = list(qs.distinct())
+            num_coverages = len(coverages)
+            models.collection_insert_eo_objects(
+                collection, coverages, use_extent
+            )
             print(
                 "Imported %d coverages into collection %r." % (
                     num_coverages, collection
                 )
             )
 
+    def get_object_identifiers(self, object_identifiers, identifiers_file):
+        """ Helper method to combine the identifiers passed as arguments and
+            read from a file or stdin.
+        """
+        object_identifiers = list(object_identifiers)
+        if identifiers_file:
+            if identifiers_file == '-':
+                lines = sys.stdin.readlines()
+            else:
+                with open(identifiers_file) as f:
+                    lines = f.readlines()
+            object_identifiers.extend(
+                line.strip() for line in lines if line.strip()
+            )
+
+        if not object_identifiers:
+            raise CommandError('No object identifiers specified.')
+        return object_identifiers
+
+    def get_objects(self, object_identifiers):
+        """ Helper method to get the objects by identifier or raise a
+            CommandError if any of them does not exist.
+        """
+        objects = list(
+            models.EOObject.objects.filter(
+                identifier__in=object_identifiers
+            ).select_subclasses()
+        )
+        self.check_missing(object_identifiers, objects)
+        return objects
+
+    def get_objects_bulk(self, object_identifiers, batch_size):
+        """ Helper method to get large numbers of Products and Coverages by
+            identifier in batches, without downcasting each object.
+        """
+        identifiers = list(set(object_identifiers))
+        objects = []
+        for i in range(0, len(identifiers), batch_size):
+            chunk = identifiers[i:i + batch_size]
+            objects.extend(
+                models.Product.objects.filter(identifier__in=chunk)
+            )
+            objects.extend(
+                models.Coverage.objects.filter(identifier__in=chunk)
+            )
+        self.check_missing(object_identifiers, objects)
+        return objects
+
+    def check_missing(self, object_identifiers, objects):
+        if len(objects) != len(set(object_identifiers)):
+            actual = set(obj.identifier for obj in objects)
+            missing = set(object_identifiers) - actual
+            raise CommandError(
+                "No such object with ID%s: %s"
+                % ("s" if len(missing) > 1 else "", ", ".join(missing))
+            )
+
     def get_collection(self, identifier):
         """ Helper method to get a collection by identifier or raise a
             CommandError.
@@ -25,6 +25,7 @@
 # THE SOFTWARE.
 # ------------------------------------------------------------------------------
 
+from functools import partial
 from pprint import pprint
 
 from django.core.management.base import CommandError, BaseCommand
@@ -34,20 +35,45 @@ from django.db.models import Q
 from eoxserver.core.util.timetools import parse_iso8601
 from eoxserver.resources.coverages import models
 from eoxserver.resources.coverages.management.commands import (
-    CommandOutputMixIn, SubParserMixIn
+    CommandOutputMixIn, SubParserMixIn, ListingRegistrationMixIn
 )
 from eoxserver.resources.coverages.registration.registrators.gdal import (
     GDALRegistrator
 )
+from eoxserver.resources.coverages.registration.rectified_overview import (
+    RectifiedOverviewRegistrator
+)
+from eoxserver.resources.coverages.registration.exceptions import (
+    RegistrationError
+)
+from eoxserver.resources.coverages.registration.base import (
+    parse_data_location
+)
+from eoxserver.resources.coverages.registration.prefetch import (
+    MetadataPrefetcher, CONTENT, DATA_HEADER
+)
+from eoxserver.backends.util import resolve_storage
 
 
-class Command(CommandOutputMixIn, SubParserMixIn, BaseCommand):
+RESAMPLING_METHODS = {
+    'nearest': 0,
+    'bilinear': 1,
+    'cubic': 2,
+    'cubicspline': 3,
+    'lanczos': 4,
+    'average': 5,
+}
+
+
+class Command(CommandOutputMixIn, SubParserMixIn, ListingRegistrationMixIn,
+              BaseCommand):
     """ Command to manage coverages. This command uses sub-commands for the
-        specific tasks: register, deregister
+        specific tasks: register, deregister, rectify
     """
     def add_arguments(self, parser):
         register_parser = self.add_subparser(parser, 'register')
         deregister_parser = self.add_subparser(parser, 'deregister')
+        rectify_parser = self.add_subparser(parser, 'rectify')
 
         register_parser.add_argument(
             "--data", "--data-location", "-d",
@@ -175,6 +201,8 @@ class Command(CommandOutputMixIn, SubParserMixIn, BaseCommand):
             )
         )
 
+        self.add_listing_arguments(register_parser)
+
         deregister_parser.add_argument(
             '--all', '-a', action="store_true",
             default=False, dest='all_coverages',
@@ -196,67 +224,83 @@ class Command(CommandOutputMixIn, SubParserMixIn, BaseCommand):
             )
         )
 
-    @transaction.atomic
+        rectify_parser.add_argument(
+            'identifier',
+            help='The identifier of the referenceable coverage.'
+        )
+        rectify_parser.add_argument(
+            'location', nargs='+',
+            help=(
+                'The location of the rectified overview. In the form '
+                '[[... storage] storage] path'
+            )
+        )
+        rectify_parser.add_argument(
+            '--crs', dest='crs', default=None,
+            help=(
+                'The CRS to rectify the coverage to. Defaults to the '
+                'EOXS_RECTIFIED_OVERVIEW_CRS setting or EPSG:4326.'
+            )
+        )
+        rectify_parser.add_argument(
+            '--resampling', dest='resampling', default='nearest',
+            choices=sorted(RESAMPLING_METHODS),
+            help='The resampling method to use. Default is nearest.'
+        )
+        rectify_parser.add_argument(
+            '--no-generate', dest='generate', action='store_false',
+            default=True,
+            help=(
+                'Only register an already existing rectified overview '
+                'instead of generating it.'
+            )
+        )
+        rectify_parser.add_argument(
+            "--replace", "-r",
+            dest="replace", action="store_true", default=False,
+            help=(
+                "Optional. If a rectified overview with the given location "
+                "already exists, replace it."
+            )
+        )
+
     def handle(self, subcommand, *args, **kwargs):
-        """ Dispatch sub-commands: register, deregister.
+        """ Dispatch sub-commands: register, deregister, rectify.
         """
         if subcommand == "register":
             self.handle_register(*args, **kwargs)
         elif subcommand == "deregister":
-            self.handle_deregister(*args, **kwargs)
+            with transaction.atomic():
+                self.handle_deregister(*args, **kwargs)
+        elif subcommand == "rectify":
+            with transaction.atomic():
+                self.handle_rectify(*args, **kwargs)
 
     def handle_register(self, coverage_type_name,
                         data_locations, metadata_locations,
                         **kwargs):
         """ Handle the creation of a new coverage.
         """
-        overrides = {
-            key: kwargs[key]
-            for key in [
-                'begin_time', 'end_time', 'footprint', 'identifier',
-                'origin', 'size', 'grid'
-            ]
-            if kwargs.get(key)
-        }
-
-        report = GDALRegistrator().register(
-            data_locations=data_locations,
-            metadata_locations=metadata_locations,
-            coverage_type_name=coverage_type_name,
-            footprint_from_extent=kwargs['footprint_from_extent'],
-            overrides=overrides,
-            identifier_template=kwargs['identifier_template'],
-            highest_resolution=kwargs['highest_resolution'],
-            replace=kwargs['replace'],
-            use_subdatasets=kwargs['use_subdatasets'],
-            simplify_footprint_tolerance=kwargs.get(
-                'simplify_footprint_tolerance'
-            ),
-        )
+        if self.is_listing(kwargs):
+            options = {
+                key: kwargs[key] for key in REGISTER_OPTIONS if key in kwargs
+            }
+            options.update(
+                coverage_type_name=coverage_type_name,
+                metadata_locations=metadata_locations,
+            )
+            self.handle_listing(
+                partial(register_listed_coverage, options=options),
+                prefetch=partial(prefetch_listed_coverages, options=options),
+                **kwargs
+            )
+            return
 
-        product_identifier = kwargs['product_identifier']
-        if product_identifier:
-            product_identifier = product_identifier.format(
-                identifier=report.coverage.identifier
+        with transaction.atomic():
+            report = register_coverage(
+                coverage_type_name, data_locations, metadata_locations,
+                **kwargs
             )
-            try:
-                product = models.Product.objects.get(
-                    identifier=product_identifier
-                )
-            except models.Product.DoesNotExist:
-                raise CommandError('No such product %r' % product_identifier)
-            models.product_add_coverage(product, report.coverage)
-
-        for collection_identifier in kwargs['collection_identifiers']:
-            try:
-                collection = models.Collection.objects.get(
-                    identifier=collection_identifier
-                )
-            except models.Collection.DoesNotExist:
-                raise CommandError(
-                    'No such collection %r' % collection_identifier
-                )
-            models.collection_insert_eo_object(collection, report.coverage)
 
         if kwargs['print_identifier']:
             print(report.coverage.identifier)
@@ -311,3 +355,132 @@ class Command(CommandOutputMixIn, SubParserMixIn, BaseCommand):
 
                 except models.Coverage.DoesNotExist:
                     raise CommandError('No such Coverage %r' % identifier)
+
+    def handle_rectify(self, identifier, location, crs, resampling, generate,
+                       replace, **kwargs):
+        """ Handle the generation and registration of a rectified overview
+            for a referenceable coverage.
+        """
+        try:
+            overview = RectifiedOverviewRegistrator().register(
+                identifier, location, generate=generate, crs=crs,
+                resampling=RESAMPLING_METHODS[resampling], replace=replace,
+            )
+        except RegistrationError as e:
+            raise CommandError(str(e))
+
+        self.print_msg(
+            'Successfully registered rectified overview %s for coverage %s'
+            % (overview.location, identifier)
+        )
+
+
+REGISTER_OPTIONS = (
+    'begin_time', 'end_time', 'footprint', 'identifier', 'origin', 'size',
+    'grid', 'footprint_from_extent', 'identifier_template',
+    'highest_resolution', 'replace', 'use_subdatasets',
+    'simplify_footprint_tolerance', 'product_identifier',
+    'collection_identifiers',
+)
+
+
+def get_overrides(kwargs):
+    return {
+        key: kwargs[key]
+        for key in [
+            'begin_time', 'end_time', 'footprint', 'identifier',
+            'origin', 'size', 'grid'
+        ]
+        if kwargs.get(key)
+    }
+
+
+def register_coverage(coverage_type_name, data_locations, metadata_locations,
+                      prefetched=None, **kwargs):
+    """ Registers a coverage with the options of the ``register`` sub-command
+        and adds it to the specified product and collections.
+    """
+    overrides = get_overrides(kwargs)
+
+    report = GDALRegistrator().register(
+        data_locations=data_locations,
+        metadata_locations=metadata_locations,
+        coverage_type_name=coverage_type_name,
+        footprint_from_extent=kwargs['footprint_from_extent'],
+        overrides=overrides,
+        identifier_template=kwargs['identifier_template'],
+        highest_resolution=kwargs['highest_resolution'],
+        replace=kwargs['replace'],
+        use_subdatasets=kwargs['use_subdatasets'],
+        simplify_footprint_tolerance=kwargs.get(
+            'simplify_footprint_tolerance'
+        ),
+        prefetched=prefetched,
+    )
+
+    product_identifier = kwargs['product_identifier']
+    if product_identifier:
+        product_identifier = product_identifier.format(
+            identifier=report.coverage.identifier
+        )
+        try:
+            product = models.Product.objects.get(
+                identifier=product_identifier
+            )
+        except models.Product.DoesNotExist:
+            raise CommandError('No such product %r' % product_identifier)
+        models.product_add_coverage(product, report.coverage)
+
+    for collection_identifier in kwargs['collection_identifiers']:
+        try:
+            collection = models.Collection.objects.get(
+                identifier=collection_identifier
+            )
+        except models.Collection.DoesNotExist:
+            raise CommandError(
+                'No such collection %r' % collection_identifier
+            )
+        models.collection_insert_eo_object(collection, report.coverage)
+
+    return report
+
+
+def prefetch_listed_coverages(locations, options):
+    """ Concurrently reads the metadata files and, unless all metadata is
+        overridden, the data headers of a batch of listed data locations.
+    """
+    prefetcher = MetadataPrefetcher()
+    for location in options['metadata_locations']:
+        prefetcher.add(CONTENT, models.MetaDataItem(
+            location=location[-1],
+            storage=resolve_storage(location[:-1], save=False),
+        ))
+
+    if GDALRegistrator().missing_metadata_keys(get_overrides(options)):
+        for location in locations:
+            path, subdataset_type, subdataset_locator = parse_data_location(
+                location[-1], options.get('use_subdatasets', False)
+            )
+            prefetcher.add(DATA_HEADER, models.ArrayDataItem(
+                location=path,
+                storage=resolve_storage(location[:-1], save=False),
+                subdataset_type=subdataset_type,
+                subdataset_locator=subdataset_locator,
+            ))
+
+    return prefetcher.fetch()
+
+
+def register_listed_coverage(location, options, prefetched=None):
+    """ Registers a single data location of a listing as a coverage in its own
+        transaction.
+    """
+    options = dict(options)
+    coverage_type_name = options.pop('coverage_type_name')
+    metadata_locations = options.pop('metadata_locations')
+
+    with transaction.atomic():
+        return register_coverage(
+            coverage_type_name, [location], metadata_locations, prefetched,
+            **options
+        ).coverage.identifier
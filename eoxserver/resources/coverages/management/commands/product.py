@@ -26,6 +26,7 @@
 # ------------------------------------------------------------------------------
 
 import re
+from functools import partial
 
 from django.core.management.base import CommandError, BaseCommand
 from django.db import transaction
@@ -36,7 +37,7 @@ from eoxserver.core.util.timetools import parse_iso8601
 from eoxserver.backends.storages import get_handler_class_for_model
 from eoxserver.resources.coverages import models
 from eoxserver.resources.coverages.management.commands import (
-    CommandOutputMixIn, SubParserMixIn
+    CommandOutputMixIn, SubParserMixIn, ListingRegistrationMixIn
 )
 from eoxserver.resources.coverages.registration.product import (
     ProductRegistrator
@@ -44,9 +45,14 @@ from eoxserver.resources.coverages.registration.product import (
 from eoxserver.resources.coverages.registration.exceptions import (
     RegistrationError
 )
+from eoxserver.resources.coverages.registration.prefetch import (
+    MetadataPrefetcher, PRODUCT_METADATA
+)
+from eoxserver.backends.util import resolve_storage
 
 
-class Command(CommandOutputMixIn, SubParserMixIn, BaseCommand):
+class Command(CommandOutputMixIn, SubParserMixIn, ListingRegistrationMixIn,
+              BaseCommand):
     """ Command to manage product types. This command uses sub-commands for the
         specific tasks: register, deregister
     """
@@ -200,6 +206,16 @@ class Command(CommandOutputMixIn, SubParserMixIn, BaseCommand):
                 'product will be printed to stdout.'
             )
         )
+        self.add_listing_arguments(register_parser)
+        register_parser.add_argument(
+            '--listing-items', dest='listing_items', default='metadata',
+            choices=['metadata', 'package'],
+            help=(
+                'Whether the items of a listing are metadata files or '
+                'packages. Default is metadata.'
+            )
+        )
+
         deregister_parser.add_argument(
             '--all', '-a', action="store_true",
             default=False, dest='all_products',
@@ -231,64 +247,40 @@ class Command(CommandOutputMixIn, SubParserMixIn, BaseCommand):
         #     # help='The name of the grid to associate the product with.'
         # )
 
-    @transaction.atomic
     def handle(self, subcommand, *args, **kwargs):
         """ Dispatch sub-commands: register, deregister.
         """
         if subcommand == "register":
             self.handle_register(*args, **kwargs)
         elif subcommand == "deregister":
-            self.handle_deregister(*args, **kwargs)
+            with transaction.atomic():
+                self.handle_deregister(*args, **kwargs)
         elif subcommand == "discover":
             self.handle_discover(kwargs.pop('identifier')[0], *args, **kwargs)
 
     def handle_register(self, **kwargs):
         """ Handle the creation of a new product
         """
-        try:
-            overrides = dict(
-                identifier=kwargs['identifier'],
-                footprint=kwargs['footprint'],
-                begin_time=kwargs['begin_time'],
-                end_time=kwargs['end_time'],
-            )
-
-            for name, value in kwargs['set_overrides']:
-                overrides[convert_name(name)] = value
-
-            mask_locations = kwargs['mask_locations'] + [
-                (name, GEOSGeometry(geom))
-                for name, geom in kwargs['mask_geometries']
-            ]
-
-            product, replaced = ProductRegistrator().register(
-                metadata_locations=kwargs['metadata_locations'],
-                mask_locations=mask_locations,
-                package_path=kwargs['package'],
-                overrides=overrides,
-                identifier_template=kwargs['identifier_template'],
-                type_name=kwargs['type_name'],
-                extended_metadata=kwargs['extended_metadata'],
-                discover_masks=kwargs['discover_masks'],
-                discover_browses=kwargs['discover_browses'],
-                discover_metadata=kwargs['discover_metadata'],
-                replace=kwargs['replace'],
-                simplify_footprint_tolerance=kwargs.get(
-                    'simplify_footprint_tolerance'
+        if self.is_listing(kwargs):
+            options = {
+                key: kwargs[key] for key in REGISTER_OPTIONS if key in kwargs
+            }
+            self.handle_listing(
+                partial(
+                    register_listed_product,
+                    listing_items=kwargs['listing_items'], options=options
+                ),
+                prefetch=partial(
+                    prefetch_listed_products,
+                    listing_items=kwargs['listing_items'], options=options
                 ),
+                **kwargs
             )
+            return
 
-            for collection_identifier in kwargs['collection_identifiers']:
-                try:
-                    collection = models.Collection.objects.get(
-                        identifier=collection_identifier
-                    )
-                except models.Collection.DoesNotExist:
-                    raise CommandError(
-                        'No such collection %r' % collection_identifier
-                    )
-                models.collection_insert_eo_object(collection, product)
-
+        try:
+            with transaction.atomic():
+                product = register_product(**kwargs)
         except RegistrationError as e:
             raise CommandError('Failed to register product. Error was %s' % e)
 
@@ -348,6 +340,105 @@ class Command(CommandOutputMixIn, SubParserMixIn, BaseCommand):
                         print(item)
 
 
+REGISTER_OPTIONS = (
+    'identifier', 'footprint', 'begin_time', 'end_time', 'set_overrides',
+    'mask_locations', 'mask_geometries', 'metadata_locations', 'package',
+    'identifier_template', 'type_name', 'extended_metadata', 'discover_masks',
+    'discover_browses', 'discover_metadata', 'replace',
+    'simplify_footprint_tolerance', 'collection_identifiers',
+)
+
+
+def register_product(**kwargs):
+    """ Registers a product with the options of the ``register`` sub-command
+        and inserts it into the specified collections.
+    """
+    overrides = dict(
+        identifier=kwargs['identifier'],
+        footprint=kwargs['footprint'],
+        begin_time=kwargs['begin_time'],
+        end_time=kwargs['end_time'],
+    )
+
+    for name, value in kwargs['set_overrides']:
+        overrides[convert_name(name)] = value
+
+    mask_locations = kwargs['mask_locations'] + [
+        (name, GEOSGeometry(geom))
+        for name, geom in kwargs['mask_geometries']
+    ]
+
+    product, replaced = ProductRegistrator().register(
+        metadata_locations=kwargs['metadata_locations'],
+        mask_locations=mask_locations,
+        package_path=kwargs['package'],
+        overrides=overrides,
+        identifier_template=kwargs['identifier_template'],
+        type_name=kwargs['type_name'],
+        extended_metadata=kwargs['extended_metadata'],
+        discover_masks=kwargs['discover_masks'],
+        discover_browses=kwargs['discover_browses'],
+        discover_metadata=kwargs['discover_metadata'],
+        replace=kwargs['replace'],
+        simplify_footprint_tolerance=kwargs.get(
+            'simplify_footprint_tolerance'
+        ),
+        prefetched=kwargs.get('prefetched'),
+    )
+
+    for collection_identifier in kwargs['collection_identifiers']:
+        try:
+            collection = models.Collection.objects.get(
+                identifier=collection_identifier
+            )
+        except models.Collection.DoesNotExist:
+            raise CommandError(
+                'No such collection %r' % collection_identifier
+            )
+        models.collection_insert_eo_object(collection, product)
+
+    return product
+
+
+def prefetch_listed_products(locations, listing_items, options):
+    """ Concurrently reads the metadata files of a batch of listed products.
+        The metadata of packages is discovered during the registration.
+    """
+    metadata_locations = list(options['metadata_locations'])
+    if listing_items != 'package':
+        metadata_locations.extend(locations)
+
+    prefetcher = MetadataPrefetcher()
+    for location in metadata_locations:
+        prefetcher.add(PRODUCT_METADATA, models.MetaDataItem(
+            location=location[-1],
+            storage=resolve_storage(location[:-1], save=False),
+        ))
+    return prefetcher.fetch()
+
+
+def register_listed_product(location, listing_items, options,
+                            prefetched=None):
+    """ Registers a single item of a listing in its own transaction, either
+        as a metadata file or as a package.
+    """
+    options = dict(options, prefetched=prefetched)
+    if listing_items == 'package':
+        if len(location) > 1:
+            raise RegistrationError(
+                'Packages cannot be located on a storage: %r'
+                % ' '.join(location)
+            )
+        options['package'] = location[-1]
+    else:
+        options['metadata_locations'] = (
+            options['metadata_locations'] + [location]
+        )
+
+    with transaction.atomic():
+        return register_product(**options).identifier
+
+
 def camel_to_underscore(name):
     s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
     return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
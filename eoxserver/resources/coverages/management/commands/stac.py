@@ -27,12 +27,18 @@
 
 import sys
 import json
+from itertools import chain
 
 from django.core.management.base import CommandError, BaseCommand
 from django.db import transaction
 
 from eoxserver.resources.coverages.registration.stac import (
-    create_product_type_from_stac_item, register_stac_product
+    create_product_type_from_stac_item, register_stac_product,
+    register_stac_products_bulk, iter_stac_items
+)
+from eoxserver.resources.coverages.registration.bulk import DEFAULT_BATCH_SIZE
+from eoxserver.resources.coverages.registration.prefetch import (
+    DEFAULT_MAX_WORKERS
 )
 from eoxserver.resources.coverages import models
 from eoxserver.resources.coverages.management.commands import (
@@ -85,6 +91,30 @@ class Command(CommandOutputMixIn, SubParserMixIn, BaseCommand):
                 "an error."
             )
         )
+        register_parser.add_argument(
+            '--bulk', dest='bulk', action='store_true', default=False,
+            help=(
+                'Optional. Register all STAC Items of an ItemCollection or a '
+                'newline delimited stream of Items in batches.'
+            )
+        )
+        register_parser.add_argument(
+            '--batch-size', dest='batch_size', type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=(
+                'Optional. The number of Items registered and committed at '
+                'once in bulk mode. Default is %d.' % DEFAULT_BATCH_SIZE
+            )
+        )
+        register_parser.add_argument(
+            '--prefetch-workers', dest='prefetch_workers', type=int,
+            default=DEFAULT_MAX_WORKERS,
+            help=(
+                'Optional. The number of concurrent reads of metadata files '
+                'and data headers in bulk mode. Default is %d.'
+                % DEFAULT_MAX_WORKERS
+            )
+        )
 
         types_parser.add_argument(
             '--type', '--product-type', '-t', dest='type_name', default=None,
@@ -114,12 +144,17 @@ class Command(CommandOutputMixIn, SubParserMixIn, BaseCommand):
         #     )
         # )
 
-    @transaction.atomic
     def handle(self, subcommand, *args, **kwargs):
         if subcommand == "register":
-            self.handle_register(*args, **kwargs)
+            if kwargs.get('bulk'):
+                # bulk registrations commit per batch
+                self.handle_register_bulk(*args, **kwargs)
+            else:
+                with transaction.atomic():
+                    self.handle_register(*args, **kwargs)
         elif subcommand == "types":
-            self.handle_types(*args, **kwargs)
+            with transaction.atomic():
+                self.handle_types(*args, **kwargs)
 
     def handle_register(self, location, stdin, type_name, create_type, replace,
                         *args, **kw):
@@ -148,6 +183,48 @@ class Command(CommandOutputMixIn, SubParserMixIn, BaseCommand):
             )
         )
 
+    def handle_register_bulk(self, location, stdin, type_name, create_type,
+                             replace, batch_size, prefetch_workers, *args,
+                             **kwargs):
+        if stdin:
+            self_href = None
+            f = sys.stdin
+        else:
+            self_href = location[0]
+            f = open(self_href)
+
+        with f:
+            stac_items = iter_stac_items(f)
+
+            if create_type:
+                first = next(stac_items, None)
+                if first is None:
+                    raise CommandError('No STAC Items found')
+
+                with transaction.atomic():
+                    product_type, is_new = create_product_type_from_stac_item(
+                        first, type_name, ignore_existing=True
+                    )
+                if is_new:
+                    self.print_msg(
+                        "Created new product type %s" % product_type.name
+                    )
+                type_name = product_type.name
+                stac_items = chain([first], stac_items)
+
+            report = register_stac_products_bulk(
+                stac_items, type_name, replace=replace,
+                self_href=self_href, batch_size=batch_size,
+                prefetch_workers=prefetch_workers,
+                progress=lambda report: self.print_msg(
+                    "Registered %d products (%.1f items/s)" % (
+                        report.registered, report.items_per_second
+                    ), 2
+                )
+            )
+
+        self.print_msg("Successfully bulk registered products: %s" % report)
+
     def handle_types(self, location, stdin, type_name, ignore_existing,
                      *args, **kwargs):
         if stdin:
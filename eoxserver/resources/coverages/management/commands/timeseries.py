@@ -30,6 +30,7 @@ from django.core.management.base import BaseCommand
 from django.db import transaction
 
 from eoxserver.resources.coverages.registration.timeseries import register_time_series
+from eoxserver.resources.coverages.registration.bulk import DEFAULT_BATCH_SIZE
 from eoxserver.resources.coverages import models
 from eoxserver.resources.coverages.management.commands import (
     CommandOutputMixIn,
@@ -125,6 +126,27 @@ class Command(CommandOutputMixIn, SubParserMixIn, BaseCommand):
                 "an error."
             ),
         )
+        register_parser.add_argument(
+            "--bulk",
+            dest="bulk",
+            action="store_true",
+            default=False,
+            help=(
+                "Optional. Build all products and coverages in memory and "
+                "insert them in batches. The collection metadata is only "
+                "updated once."
+            ),
+        )
+        register_parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=(
+                "Optional. The number of products inserted per batch when "
+                "using --bulk. Default is %d." % DEFAULT_BATCH_SIZE
+            ),
+        )
 
     @transaction.atomic
     def handle(self, subcommand, *args, **kwargs):
@@ -146,6 +168,8 @@ class Command(CommandOutputMixIn, SubParserMixIn, BaseCommand):
         time_dim_name,
         product_template,
         replace,
+        bulk=False,
+        batch_size=DEFAULT_BATCH_SIZE,
         **kwargs,
     ):
         timeseries_path, replaced = register_time_series(
@@ -159,6 +183,8 @@ class Command(CommandOutputMixIn, SubParserMixIn, BaseCommand):
             time_dim_name=time_dim_name,
             product_template=product_template,
             replace=replace,
+            bulk=bulk,
+            batch_size=batch_size,
         )
 
         self.print_msg(
@@ -0,0 +1,35 @@
+# Generated by Django 5.2 on 2026-10-19 09:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backends', '0005_alter_storage_id_alter_storageauth_id'),
+        ('coverages', '0015_alter_bandstatistics_histogram'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RectifiedOverview',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('location', models.CharField(max_length=1024)),
+                ('format', models.CharField(blank=True, max_length=64, null=True)),
+                ('coordinate_reference_system', models.TextField()),
+                ('min_x', models.FloatField()),
+                ('min_y', models.FloatField()),
+                ('max_x', models.FloatField()),
+                ('max_y', models.FloatField()),
+                ('width', models.PositiveIntegerField()),
+                ('height', models.PositiveIntegerField()),
+                ('coverage', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rectified_overviews', to='coverages.coverage')),
+                ('storage', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='backends.storage')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -545,6 +545,21 @@ class BandStatistics(models.Model):
         unique_together = [('arraydata_item', 'band_index')]
 
 
+class RectifiedOverview(backends.DataItem):
+    """ A rectified, tiled and overviewed rendition of a referenceable
+        coverage in a specific CRS, used for requests at low resolutions.
+    """
+    coverage = models.ForeignKey(Coverage, on_delete=models.CASCADE, related_name='rectified_overviews', **mandatory)
+
+    coordinate_reference_system = models.TextField(**mandatory)
+    min_x = models.FloatField(**mandatory)
+    min_y = models.FloatField(**mandatory)
+    max_x = models.FloatField(**mandatory)
+    max_y = models.FloatField(**mandatory)
+    width = models.PositiveIntegerField(**mandatory)
+    height = models.PositiveIntegerField(**mandatory)
+
+
 # ==============================================================================
 # Additional Metadata Models for Collections, Products and Coverages
 # ==============================================================================
@@ -868,6 +883,112 @@ def collection_insert_eo_object(collection, eo_object, use_extent=False):
     collection.save()
 
 
+def _split_eo_objects(eo_objects, action):
+    products = []
+    coverages = []
+    for eo_object in eo_objects:
+        if not isinstance(eo_object, (Product, Coverage)):
+            eo_object = cast_eo_object(eo_object)
+
+        if isinstance(eo_object, Product):
+            products.append(eo_object)
+        elif isinstance(eo_object, Coverage):
+            coverages.append(eo_object)
+        else:
+            raise ManagementError(
+                'Cannot %s object of type %r'
+                % (action, type(eo_object).__name__)
+            )
+    return products, coverages
+
+
+def _chunks(objs, batch_size):
+    for i in range(0, len(objs), batch_size):
+        yield objs[i:i + batch_size]
+
+
+def collection_insert_eo_objects(collection, eo_objects, use_extent=False,
+                                 batch_size=1000):
+    """ Inserts multiple EOObjects (Products or Coverages) into a collection.
+        Contrary to :func:`collection_insert_eo_object`, the allowed types
+        are only checked once per distinct type, the relations are added in
+        batches of ``batch_size`` and the collections footprint and
+        time-stamps are recomputed with a single aggregate at the end.
+    """
+    products, coverages = _split_eo_objects(eo_objects, 'insert')
+    collection_type = collection.collection_type
+
+    if collection_type:
+        allowed_product_types = set(
+            collection_type.allowed_product_types.values_list('pk', flat=True)
+        )
+        for product in products:
+            if product.product_type_id not in allowed_product_types:
+                raise ManagementError(
+                    'Cannot insert Product %r as the product type %r is not '
+                    'allowed in this collection' % (
+                        product.identifier,
+                        product.product_type.name
+                        if product.product_type_id else None
+                    )
+                )
+
+        allowed_coverage_types = set(
+            collection_type.allowed_coverage_types.values_list(
+                'pk', flat=True
+            )
+        )
+        for coverage in coverages:
+            if coverage.coverage_type_id not in allowed_coverage_types:
+                raise ManagementError(
+                    'Cannot insert Coverage %r as the coverage type %r is not '
+                    'allowed in this collection' % (
+                        coverage.identifier,
+                        coverage.coverage_type.name
+                        if coverage.coverage_type_id else None
+                    )
+                )
+
+    if collection.grid_id:
+        for coverage in coverages:
+            if coverage.grid_id != collection.grid_id:
+                raise ManagementError(
+                    'Cannot insert Coverage %r as the coverage grid is not '
+                    'compatible with this collection' % coverage.identifier
+                )
+
+    for chunk in _chunks(products, batch_size):
+        collection.products.add(*chunk)
+    for chunk in _chunks(coverages, batch_size):
+        collection.coverages.add(*chunk)
+
+    if products or coverages:
+        collection_collect_metadata(collection, use_extent=use_extent)
+
+
+def collection_exclude_eo_objects(collection, eo_objects, use_extent=False,
+                                  product_summary=False,
+                                  coverage_summary=False, batch_size=1000):
+    """ Excludes multiple EOObjects (Products or Coverages) from a
+        collection. The relations are removed in batches of ``batch_size`` and
+        the collection metadata is recomputed only once at the end.
+    """
+    products, coverages = _split_eo_objects(eo_objects, 'exclude')
+
+    for chunk in _chunks(products, batch_size):
+        collection.products.remove(*chunk)
+    for chunk in _chunks(coverages, batch_size):
+        collection.coverages.remove(*chunk)
+
+    if products or coverages:
+        collection_collect_metadata(
+            collection,
+            use_extent=use_extent,
+            product_summary=product_summary,
+            coverage_summary=coverage_summary,
+        )
+
+
 def collection_exclude_eo_object(collection, eo_object, use_extent=False,
                                  product_summary=False, coverage_summary=False):
     """ Exclude an EOObject (either Product or Coverage) from the collection.
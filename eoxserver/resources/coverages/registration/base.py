@@ -31,7 +31,7 @@ from django.db.models import ForeignKey
 from django.contrib.gis.geos import Polygon
 from django.contrib.gis.gdal import SpatialReference, CoordTransform
 
-from eoxserver.backends.access import vsi_open
+from eoxserver.backends.access import vsi_open, get_vsi_path
 from eoxserver.backends.util import resolve_storage
 from eoxserver.resources.coverages import models
 from eoxserver.resources.coverages.metadata.coverage_formats import (
@@ -40,6 +40,7 @@ from eoxserver.resources.coverages.metadata.coverage_formats import (
 from eoxserver.resources.coverages.registration.exceptions import (
     RegistrationError
 )
+from eoxserver.resources.coverages.registration.prefetch import CONTENT
 
 
 class RegistrationReport(object):
@@ -68,7 +69,7 @@ class BaseRegistrator(object):
                  overrides=None, identifier_template=None,
                  highest_resolution=False, replace=False, cache=None,
                  use_subdatasets=False, simplify_footprint_tolerance=None,
-                 statistics=None):
+                 statistics=None, prefetched=None):
         """ Main registration method
 
             :param data_locations:
@@ -78,6 +79,10 @@ class BaseRegistrator(object):
                                    by best guess.
             :param metadata_locations:
             :param overrides:
+            :param prefetched: the results of a :class:`MetadataPrefetcher
+                <eoxserver.resources.coverages.registration.prefetch.MetadataPrefetcher>`;
+                metadata and data header reads are taken from it when
+                available
             :returns: A registration report
             :rtype: `RegistrationReport`
         """
@@ -114,22 +119,9 @@ class BaseRegistrator(object):
 
         for location, stats in zip(data_locations, statistics):
             # handle storages and/or subdataset specifiers
-            path = location[-1]
-            # parts = path.split(':')
-
-            parts = [
-                part.replace('\\:', ':')
-                for part in re.split(r'(?<!\\):', path)
-            ]
-
-            subdataset_type = None
-            subdataset_locator = None
-            if use_subdatasets and len(parts) > 1:
-                path = parts[1]
-                subdataset_type = parts[0]
-                subdataset_locator = ":".join(parts[2:])
-            else:
-                path = path.replace('\\:', ':')
+            path, subdataset_type, subdataset_locator = parse_data_location(
+                location[-1], use_subdatasets
+            )
 
             arraydata_items.append(
                 models.ArrayDataItem(
@@ -166,7 +158,7 @@ class BaseRegistrator(object):
 
             metadata_parsers.append(
                 self._read_metadata(
-                    metadata_item, retrieved_metadata, cache
+                    metadata_item, retrieved_metadata, cache, prefetched
                 )
             )
 
@@ -206,7 +198,7 @@ class BaseRegistrator(object):
             metadata_parsers.append(
                 self._read_metadata_from_data(
                     arraydata_item, retrieved_metadata, cache,
-                    highest_resolution
+                    highest_resolution, prefetched
                 )
             )
 
@@ -283,30 +275,35 @@ class BaseRegistrator(object):
             coverage, replaced, metadata_parsers, retrieved_metadata
         )
 
-    def _read_metadata(self, metadata_item, retrieved_metadata, cache):
+    def _read_metadata(self, metadata_item, retrieved_metadata, cache,
+                       prefetched=None):
         """ Read all available metadata of a ``data_item`` into the
         ``retrieved_metadata`` :class:`dict`.
         """
+        path = get_vsi_path(metadata_item)
+        if prefetched is not None and prefetched.has(CONTENT, path):
+            content = prefetched.get(CONTENT, path)
+        else:
+            with vsi_open(metadata_item) as f:
+                content = f.read()
 
-        with vsi_open(metadata_item) as f:
-            content = f.read()
-            reader = get_reader_by_test(content)
-            if reader:
-                values = reader.read(content)
+        reader = get_reader_by_test(content)
+        if reader:
+            values = reader.read(content)
 
-                format_ = values.pop("format", None)
-                if format_:
-                    metadata_item.format = format_
+            format_ = values.pop("format", None)
+            if format_:
+                metadata_item.format = format_
 
-                for key, value in values.items():
-                    retrieved_metadata.setdefault(key, value)
+            for key, value in values.items():
+                retrieved_metadata.setdefault(key, value)
 
-                if values:
-                    return reader, values
-            return None
+            if values:
+                return reader, values
+        return None
 
     def _read_metadata_from_data(self, data_item, retrieved_metadata, cache,
-                                 highest_resolution):
+                                 highest_resolution, prefetched=None):
         "Interface method to be overridden in subclasses"
         raise NotImplementedError
 
@@ -413,6 +410,18 @@ class BaseRegistrator(object):
             coverage=coverage, **metadata_values
         )
 
+    def read_data_metadata(self, data_item, prefetched=None):
+        """ Reads the metadata of a single data item without registering it.
+            The ``format`` of the data item is updated when it is detected.
+
+            :returns: the read metadata as a :class:`dict`
+        """
+        retrieved_metadata = {}
+        self._read_metadata_from_data(
+            data_item, retrieved_metadata, None, False, prefetched
+        )
+        return retrieved_metadata
+
     def missing_metadata_keys(self, retrieved_metadata):
         """ Return a :class:`frozenset` of metadata keys still missing.
         """
@@ -422,6 +431,28 @@ class BaseRegistrator(object):
         return get_grid(definition)
 
 
+def parse_data_location(path, use_subdatasets=False):
+    """ Splits the path of a data location into the actual path, the
+        subdataset type and the subdataset locator, when subdatasets are
+        used. Colons can be escaped using a backslash.
+    """
+    parts = [
+        part.replace('\\:', ':')
+        for part in re.split(r'(?<!\\):', path)
+    ]
+
+    subdataset_type = None
+    subdataset_locator = None
+    if use_subdatasets and len(parts) > 1:
+        path = parts[1]
+        subdataset_type = parts[0]
+        subdataset_locator = ":".join(parts[2:])
+    else:
+        path = path.replace('\\:', ':')
+
+    return path, subdataset_type, subdataset_locator
+
+
 def get_grid(definition):
     """ Get or create a grid according to our defintion
     """
@@ -0,0 +1,180 @@
+# ------------------------------------------------------------------------------
+#
+# Project: EOxServer <http://eoxserver.org>
+#
+# ------------------------------------------------------------------------------
+# Copyright (C) 2026 EOX IT Services GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies of this Software or works derived from this Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# ------------------------------------------------------------------------------
+
+from collections import Counter
+from itertools import islice
+import time
+
+from django.db import connections, router
+
+from eoxserver.resources.coverages import models
+from eoxserver.resources.coverages.registration.exceptions import (
+    RegistrationError
+)
+
+
+DEFAULT_BATCH_SIZE = 500
+
+
+class BulkRegistrationReport(object):
+    """ Summary of a bulk registration: the number of registered and replaced
+        objects and the throughput.
+    """
+    def __init__(self):
+        self.registered = 0
+        self.replaced = 0
+        self.batches = 0
+        self._start = time.monotonic()
+        self._end = None
+
+    def finish(self):
+        self._end = time.monotonic()
+
+    @property
+    def elapsed(self):
+        end = self._end if self._end is not None else time.monotonic()
+        return end - self._start
+
+    @property
+    def items_per_second(self):
+        elapsed = self.elapsed
+        return self.registered / elapsed if elapsed > 0 else 0.0
+
+    def __str__(self):
+        return (
+            '%d registered (%d replaced) in %d batches, %.2fs, %.1f items/s'
+            % (
+                self.registered, self.replaced, self.batches, self.elapsed,
+                self.items_per_second
+            )
+        )
+
+
+def batched(iterable, batch_size=DEFAULT_BATCH_SIZE):
+    """ Yields lists of at most ``batch_size`` items of the given iterable.
+    """
+    if batch_size < 1:
+        raise ValueError('Invalid batch size %r' % batch_size)
+
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def validate_eo_objects(objs):
+    """ Validates the given (unsaved) :class:`EOObject
+        <eoxserver.resources.coverages.models.EOObject>` instances prior to a
+        bulk insert. Related objects are not validated, as this would require
+        a query per object, but are still enforced by the database. The
+        identifiers are checked for uniqueness with a single query.
+
+        :raises RegistrationError: if any identifier is duplicated or already
+                                   in use, listing all colliding identifiers
+    """
+    for obj in objs:
+        obj.full_clean(
+            exclude=[
+                field.name for field in obj._meta.concrete_fields
+                if field.is_relation
+            ],
+            validate_unique=False,
+        )
+
+    counts = Counter(obj.identifier for obj in objs)
+    colliding = {
+        identifier for identifier, count in counts.items() if count > 1
+    }
+    colliding.update(
+        models.EOObject.objects.filter(
+            identifier__in=list(counts)
+        ).values_list('identifier', flat=True)
+    )
+    if colliding:
+        raise RegistrationError(
+            'Objects with the identifiers %s already exist' % ', '.join(
+                sorted(colliding)
+            )
+        )
+
+
+def bulk_create_eo_objects(model, objs):
+    """ Bulk inserts the given (unsaved) instances of an :class:`EOObject
+        <eoxserver.resources.coverages.models.EOObject>` subclass, e.g.
+        :class:`Product <eoxserver.resources.coverages.models.Product>` or
+        :class:`Coverage <eoxserver.resources.coverages.models.Coverage>`.
+
+        Django does not support ``bulk_create`` for multi-table inherited
+        models, so the ``EOObject`` rows are bulk created first and the rows of
+        the concrete model are inserted referencing them afterwards. The
+        objects are validated with :func:`validate_eo_objects` beforehand,
+        signals are skipped, as with ``bulk_create``.
+    """
+    if not objs:
+        return objs
+
+    validate_eo_objects(objs)
+
+    parent_fields = [
+        field for field in models.EOObject._meta.concrete_fields
+        if not field.primary_key
+    ]
+    parents = [
+        models.EOObject(**{
+            field.attname: getattr(obj, field.attname)
+            for field in parent_fields
+        })
+        for obj in objs
+    ]
+    models.EOObject.objects.bulk_create(parents)
+
+    for obj, parent in zip(objs, parents):
+        if parent.pk is None:
+            raise RegistrationError(
+                'The database backend does not return the primary keys of '
+                'bulk created objects.'
+            )
+        obj.pk = parent.pk
+        obj.id = parent.pk
+        obj.inserted = parent.inserted
+        obj.updated = parent.updated
+
+    using = router.db_for_write(model)
+    fields = model._meta.local_concrete_fields
+    batch_size = connections[using].ops.bulk_batch_size(fields, objs)
+    for batch in batched(objs, max(batch_size, 1)):
+        # ``Manager._insert`` is not public API, but it is what
+        # ``QuerySet.bulk_create`` uses to insert the rows of a single table,
+        # which is exactly what is needed here. Check it when upgrading Django.
+        model._base_manager._insert(batch, fields=fields, using=using)
+
+    for obj in objs:
+        obj._state.adding = False
+        obj._state.db = using
+
+    return objs
@@ -0,0 +1,264 @@
+# ------------------------------------------------------------------------------
+#
+# Project: EOxServer <http://eoxserver.org>
+#
+# ------------------------------------------------------------------------------
+# Copyright (C) 2026 EOX IT Services GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies of this Software or works derived from this Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# ------------------------------------------------------------------------------
+
+
+""" Parallel and resumable registration of the items of a listing, e.g. a file
+with one location per line or the files of a storage. Each item is registered
+in its own transaction by a pool of worker processes, each worker using its
+own database connection. Successfully registered items are recorded in an
+optional checkpoint file, so an interrupted run can be resumed.
+"""
+
+import concurrent.futures
+import logging
+import os
+import sys
+
+import django
+from django.db import connections
+
+from eoxserver.backends import models as backends
+from eoxserver.backends.access import vsi_list_storage
+from eoxserver.resources.coverages.registration.bulk import (
+    BulkRegistrationReport, batched
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+# the default number of items whose metadata is prefetched at once
+DEFAULT_PREFETCH_BATCH_SIZE = 32
+
+
+def read_listing(listing):
+    """ Reads the locations of a listing file, or of stdin when ``listing`` is
+        ``"-"``. Each non-empty line is a location in the form
+        ``[[... storage] storage] path``, separated by whitespace. Lines
+        starting with ``#`` are ignored.
+    """
+    if listing == '-':
+        return list(_parse_listing(sys.stdin))
+
+    with open(listing) as f:
+        return list(_parse_listing(f))
+
+
+def _parse_listing(lines):
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield line.split()
+
+
+def list_storage(storage_name, location=None, pattern=None):
+    """ Lists the files of a storage, optionally limited to a sub-location
+        and a glob pattern, as locations for :func:`register_listing`.
+    """
+    try:
+        storage = backends.Storage.objects.get(name=storage_name)
+    except backends.Storage.DoesNotExist:
+        raise ValueError('No such storage %r' % storage_name)
+
+    return [
+        [storage_name, os.path.join(location, filename)
+         if location else filename]
+        for filename in sorted(vsi_list_storage(storage, location, pattern))
+    ]
+
+
+def get_location_key(location):
+    return ' '.join(location)
+
+
+class Checkpoint(object):
+    """ Records the keys of successfully registered items in a file, one per
+        line, and flushes after each item, so that a crashed run can skip them
+        when resumed.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.completed = set()
+        if os.path.exists(path):
+            with open(path) as f:
+                self.completed = set(
+                    line.rstrip('\n') for line in f if line.strip()
+                )
+        self._file = open(path, 'a')
+
+    def __contains__(self, key):
+        return key in self.completed
+
+    def add(self, key):
+        self.completed.add(key)
+        self._file.write(key + '\n')
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class ListingRegistrationReport(BulkRegistrationReport):
+    """ Summary of a listing registration, additionally counting the failed
+        and (already registered) skipped items.
+    """
+    def __init__(self, total=0):
+        super(ListingRegistrationReport, self).__init__()
+        self.total = total
+        self.failed = 0
+        self.skipped = 0
+
+    @property
+    def processed(self):
+        return self.registered + self.failed + self.skipped
+
+    def __str__(self):
+        return (
+            '%d/%d processed: %d registered, %d failed, %d skipped in %.2fs, '
+            '%.1f items/s' % (
+                self.processed, self.total, self.registered, self.failed,
+                self.skipped, self.elapsed, self.items_per_second
+            )
+        )
+
+
+def _init_worker():
+    # when the processes are spawned instead of forked, Django has to be set
+    # up again. Inherited connections must never be shared with the parent.
+    if not django.apps.apps.ready:
+        django.setup()
+    connections.close_all()
+
+
+def _register_item(register, location, prefetched=None):
+    """ Runs the registration of a single item and returns its result or the
+        error message, as exceptions are not necessarily picklable.
+    """
+    try:
+        if prefetched is not None:
+            return register(location, prefetched=prefetched), None
+        return register(location), None
+    except Exception as e:
+        logger.exception('Failed to register %s', get_location_key(location))
+        return None, '%s: %s' % (type(e).__name__, e)
+
+
+def _register_items(register, locations, prefetch=None):
+    """ Registers a batch of items, after concurrently prefetching their
+        metadata using the ``prefetch`` callable, if given. Returns a list of
+        the location, the result and the error message for each item.
+    """
+    prefetched = None
+    if prefetch is not None:
+        try:
+            prefetched = prefetch(locations)
+        except Exception:
+            # the items are still registered, reading their metadata directly
+            logger.exception('Failed to prefetch the metadata of a batch')
+
+    return [
+        (location,) + _register_item(register, location, prefetched)
+        for location in locations
+    ]
+
+
+def register_listing(locations, register, workers=1, checkpoint=None,
+                     progress=None, prefetch=None,
+                     prefetch_batch_size=DEFAULT_PREFETCH_BATCH_SIZE):
+    """ Registers all ``locations`` using the ``register`` callable, which is
+        called with a single location and is responsible to handle its own
+        transaction. ``register`` must be picklable (i.e. a module level
+        function or a :func:`functools.partial` of one) when ``workers`` is
+        greater than one.
+
+        :param workers: the number of worker processes. With a single worker
+                        all items are registered in the current process.
+        :param checkpoint: the path of a checkpoint file. Items recorded in it
+                           are skipped, newly registered ones are appended.
+        :param progress: an optional callable, called with the report, the
+                         location, the result and the error message after each
+                         item
+        :param prefetch: an optional (picklable) callable, called with a batch
+                         of locations and returning a :class:`Prefetched
+            <eoxserver.resources.coverages.registration.prefetch.Prefetched>`
+                         of their metadata reads. It is then passed to
+                         ``register`` as the ``prefetched`` keyword argument.
+        :param prefetch_batch_size: the number of items prefetched at once
+        :returns: a :class:`ListingRegistrationReport`
+    """
+    report = ListingRegistrationReport(len(locations))
+    checkpoint = Checkpoint(checkpoint) if checkpoint else None
+
+    def on_result(location, result, error):
+        if error is None:
+            report.registered += 1
+            if checkpoint:
+                checkpoint.add(get_location_key(location))
+        else:
+            report.failed += 1
+        if progress:
+            progress(report, location, result, error)
+
+    try:
+        pending = []
+        for location in locations:
+            if checkpoint and get_location_key(location) in checkpoint:
+                report.skipped += 1
+            else:
+                pending.append(location)
+
+        # without prefetching, each item is a batch of its own
+        batches = batched(
+            pending, prefetch_batch_size if prefetch is not None else 1
+        )
+        if workers <= 1:
+            for batch in batches:
+                for result in _register_items(register, batch, prefetch):
+                    on_result(*result)
+        else:
+            # make sure no connection is inherited by the workers
+            connections.close_all()
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=workers, initializer=_init_worker) as executor:
+                futures = [
+                    executor.submit(_register_items, register, batch, prefetch)
+                    for batch in batches
+                ]
+                for future in concurrent.futures.as_completed(futures):
+                    for result in future.result():
+                        on_result(*result)
+    finally:
+        if checkpoint:
+            checkpoint.close()
+
+    report.finish()
+    return report
@@ -0,0 +1,200 @@
+# ------------------------------------------------------------------------------
+#
+# Project: EOxServer <http://eoxserver.org>
+#
+# ------------------------------------------------------------------------------
+# Copyright (C) 2026 EOX IT Services GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies of this Software or works derived from this Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# ------------------------------------------------------------------------------
+
+""" Concurrent prefetching of the metadata and data header reads of
+registrations. Reading from remote storages is dominated by latency, so all
+reads of a batch of registrations are issued in parallel up front, while the
+actual registration (i.e. the database work) stays serial and picks up the
+prefetched results.
+"""
+
+import concurrent.futures
+import logging
+import time
+
+from eoxserver.contrib import gdal, vsi
+from eoxserver.backends.access import get_vsi_path, get_vsi_env
+from eoxserver.resources.coverages.metadata.coverage_formats import (
+    get_reader_by_test
+)
+from eoxserver.resources.coverages.metadata.component import (
+    ProductMetadataComponent
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_MAX_WORKERS = 8
+
+
+class RetryPolicy(object):
+    """ Retries a call on transient errors with an exponential backoff.
+
+    :param max_attempts: the maximum number of attempts, including the first
+    :param backoff: the delay in seconds before the first retry
+    :param max_backoff: the maximum delay in seconds between two attempts
+    :param retry_on: the exception types to retry on
+    """
+    def __init__(self, max_attempts=3, backoff=0.5, max_backoff=10.0,
+                 retry_on=(IOError, RuntimeError)):
+        self.max_attempts = max(1, max_attempts)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_on = retry_on
+
+    def call(self, func, *args, **kwargs):
+        delay = self.backoff
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return func(*args, **kwargs)
+            except self.retry_on as e:
+                if attempt == self.max_attempts:
+                    raise
+                logger.debug(
+                    'Attempt %d of %d failed: %s. Retrying in %.1fs.'
+                    % (attempt, self.max_attempts, e, delay)
+                )
+                time.sleep(delay)
+                delay = min(delay * 2, self.max_backoff)
+
+
+class Prefetched(object):
+    """ The results of a prefetch, keyed by the VSI path they were read
+        from. Errors are stored and re-raised when the result is accessed, so
+        that they surface at the same point as without prefetching.
+    """
+    def __init__(self):
+        self._results = {}
+
+    def set(self, kind, path, value=None, error=None):
+        self._results[(kind, path)] = (value, error)
+
+    def get(self, kind, path):
+        """ Get the prefetched value. Raises a :exc:`KeyError` if nothing was
+            prefetched for the path.
+        """
+        value, error = self._results[(kind, path)]
+        if error is not None:
+            raise error
+        return value
+
+    def has(self, kind, path):
+        return (kind, path) in self._results
+
+
+CONTENT = 'content'
+DATA_HEADER = 'data_header'
+PRODUCT_METADATA = 'product_metadata'
+
+
+def _read_content(path):
+    with vsi.open(path) as f:
+        return f.read()
+
+
+def _read_data_header(path):
+    ds = gdal.Open(path)
+    try:
+        reader = get_reader_by_test(ds)
+        if reader:
+            return reader.read(ds)
+        return None
+    finally:
+        ds = None
+
+
+def _read_product_metadata(path):
+    return ProductMetadataComponent().read_product_metadata_file(path)
+
+
+_READERS = {
+    CONTENT: _read_content,
+    DATA_HEADER: _read_data_header,
+    PRODUCT_METADATA: _read_product_metadata,
+}
+
+
+class MetadataPrefetcher(object):
+    """ Reads metadata files and data headers concurrently using a bounded
+        thread pool. Each read is retried according to the
+        :class:`RetryPolicy`.
+
+        >>> prefetcher = MetadataPrefetcher(max_workers=16)
+        >>> prefetcher.add(CONTENT, metadata_item)
+        >>> prefetcher.add(DATA_HEADER, arraydata_item)
+        >>> prefetched = prefetcher.fetch()
+    """
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, retry_policy=None):
+        self.max_workers = max_workers
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._tasks = {}
+
+    def add(self, kind, data_item):
+        """ Schedule a read of the given kind for a data item.
+        """
+        self.add_path(
+            kind, get_vsi_path(data_item), get_vsi_env(data_item.storage)
+        )
+
+    def add_path(self, kind, path, env=None):
+        """ Schedule a read of the given kind for a VSI path.
+        """
+        self._tasks[(kind, path)] = env or {}
+
+    def _run(self, kind, path, env):
+        with gdal.thread_config_env(env):
+            return self.retry_policy.call(_READERS[kind], path)
+
+    def fetch(self):
+        """ Perform all scheduled reads and return the :class:`Prefetched`
+            results.
+        """
+        prefetched = Prefetched()
+        tasks, self._tasks = self._tasks, {}
+        if not tasks:
+            return prefetched
+
+        start = time.monotonic()
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._run, kind, path, env): (kind, path)
+                for (kind, path), env in tasks.items()
+            }
+            for future in concurrent.futures.as_completed(futures):
+                kind, path = futures[future]
+                try:
+                    prefetched.set(kind, path, future.result())
+                except Exception as e:
+                    prefetched.set(kind, path, error=e)
+
+        logger.debug(
+            'Prefetched %d reads in %.2fs' % (
+                len(tasks), time.monotonic() - start
+            )
+        )
+        return prefetched
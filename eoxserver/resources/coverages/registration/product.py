@@ -43,6 +43,9 @@ from eoxserver.resources.coverages.metadata.component import (
 from eoxserver.resources.coverages.registration.exceptions import (
     RegistrationError
 )
+from eoxserver.resources.coverages.registration.prefetch import (
+    PRODUCT_METADATA
+)
 
 
 class ProductRegistrator(base.BaseRegistrator):
@@ -50,7 +53,13 @@ class ProductRegistrator(base.BaseRegistrator):
                  overrides, identifier_template=None, type_name=None,
                  extended_metadata=True, discover_masks=True,
                  discover_browses=True, discover_metadata=True, replace=False,
-                 simplify_footprint_tolerance=None):
+                 simplify_footprint_tolerance=None, prefetched=None):
+        """ Registers a product.
+
+            :param prefetched: the results of a :class:`MetadataPrefetcher
+                <eoxserver.resources.coverages.registration.prefetch.MetadataPrefetcher>`;
+                metadata file reads are taken from it when available
+        """
         product_type = None
         if type_name:
             product_type = models.ProductType.objects.get(name=type_name)
@@ -110,7 +119,7 @@ class ProductRegistrator(base.BaseRegistrator):
         new_metadata = {}
         for metadata_item in reversed(metadata_items):
             new_metadata.update(self._read_product_metadata(
-                component, metadata_item
+                component, metadata_item, prefetched
             ))
 
         mask_locations.extend(new_metadata.pop('masks', []))
@@ -217,13 +226,23 @@ class ProductRegistrator(base.BaseRegistrator):
 
         return product, replaced
 
-    def _read_product_metadata(self, component, metadata_item):
+    def _read_product_metadata(self, component, metadata_item,
+                               prefetched=None):
         path = get_vsi_path(metadata_item)
+        if prefetched is not None and prefetched.has(PRODUCT_METADATA, path):
+            return prefetched.get(PRODUCT_METADATA, path)
         with gdal.config_env(get_vsi_env(metadata_item.storage)):
             return component.read_product_metadata_file(path)
 
 
 def create_metadata(product, metadata_values):
+    build_metadata(product, metadata_values).save()
+
+
+def build_metadata(product, metadata_values):
+    """ Builds an unsaved ProductMetadata for the given product. Common values
+        are fetched or created.
+    """
     value_items = [
         (convert_name(name), value)
         for name, value in metadata_values.items()
@@ -236,9 +255,7 @@ def create_metadata(product, metadata_values):
         if value is not None and has_field(models.ProductMetadata, name)
     )
 
-    models.ProductMetadata.objects.create(
-        product=product, **metadata_values
-    )
+    return models.ProductMetadata(product=product, **metadata_values)
 
 
 def is_common_value(field):
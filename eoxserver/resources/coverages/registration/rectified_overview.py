@@ -0,0 +1,125 @@
+# ------------------------------------------------------------------------------
+#
+# Project: EOxServer <http://eoxserver.org>
+#
+# ------------------------------------------------------------------------------
+# Copyright (C) 2026 EOX IT Services GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies of this Software or works derived from this Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# ------------------------------------------------------------------------------
+
+from django.conf import settings
+
+from eoxserver.contrib import gdal, osr
+from eoxserver.backends.access import get_vsi_path, get_vsi_env, gdal_open
+from eoxserver.backends.util import resolve_storage
+from eoxserver.processing.gdal import reftools
+from eoxserver.resources.coverages import models
+from eoxserver.resources.coverages.registration.exceptions import (
+    RegistrationError
+)
+
+
+DEFAULT_RECTIFIED_OVERVIEW_CRS = 'EPSG:4326'
+
+
+def get_rectified_overview_crs():
+    return getattr(
+        settings, 'EOXS_RECTIFIED_OVERVIEW_CRS', DEFAULT_RECTIFIED_OVERVIEW_CRS
+    )
+
+
+class RectifiedOverviewRegistrator(object):
+    """ Registers (and optionally generates) a rectified overview for a
+        coverage with a referenceable grid. Unlike the coverage registrators,
+        this does not create a Coverage, so it is not a
+        :class:`BaseRegistrator
+        <eoxserver.resources.coverages.registration.base.BaseRegistrator>`.
+    """
+    def register(self, coverage_identifier, location, generate=True, crs=None,
+                 resampling=0, replace=False):
+        try:
+            coverage = models.Coverage.objects.get(
+                identifier=coverage_identifier
+            )
+        except models.Coverage.DoesNotExist:
+            raise RegistrationError(
+                'No such coverage %r' % coverage_identifier
+            )
+
+        if coverage.grid is None or coverage.grid.axis_1_offset is not None:
+            raise RegistrationError(
+                'Coverage %r is not referenceable' % coverage_identifier
+            )
+
+        overview = models.RectifiedOverview(
+            coverage=coverage,
+            location=location[-1],
+            storage=resolve_storage(location[:-1]),
+        )
+
+        existing = coverage.rectified_overviews.filter(
+            location=overview.location, storage=overview.storage
+        )
+        if existing.exists():
+            if not replace:
+                raise RegistrationError(
+                    'Rectified overview %r already registered for coverage %r'
+                    % (overview.location, coverage_identifier)
+                )
+            existing.delete()
+
+        if generate:
+            if overview.storage is not None:
+                raise RegistrationError(
+                    'Rectified overviews can only be generated on the local '
+                    'file system'
+                )
+
+            arraydata_items = list(coverage.arraydata_items.all())
+            if len(arraydata_items) != 1:
+                raise RegistrationError(
+                    'Rectified overviews can only be generated for coverages '
+                    'with exactly one data item'
+                )
+            source = arraydata_items[0]
+
+            sr = osr.SpatialReference()
+            sr.SetFromUserInput(crs or get_rectified_overview_crs())
+
+            with gdal.config_env(get_vsi_env(source.storage)):
+                ds = reftools.create_rectified_overview(
+                    get_vsi_path(source), overview.location, sr.ExportToWkt(),
+                    resample=resampling
+                )
+        else:
+            # Get a VSI handle for the overview to get the size, extent and
+            # CRS via GDAL
+            ds = gdal_open(overview)
+
+        overview.width = ds.RasterXSize
+        overview.height = ds.RasterYSize
+        overview.coordinate_reference_system = ds.GetProjection()
+        extent = gdal.get_extent(ds)
+        overview.min_x, overview.min_y, overview.max_x, overview.max_y = extent
+        del ds
+
+        overview.full_clean()
+        overview.save()
+        return overview
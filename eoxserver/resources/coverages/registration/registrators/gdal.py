@@ -25,22 +25,30 @@
 # THE SOFTWARE.
 # ------------------------------------------------------------------------------
 
-from eoxserver.backends.access import gdal_open
+from eoxserver.backends.access import gdal_open, get_vsi_path
 from eoxserver.resources.coverages.metadata.coverage_formats import (
     get_reader_by_test
 )
 from eoxserver.resources.coverages.registration.base import BaseRegistrator
+from eoxserver.resources.coverages.registration.prefetch import DATA_HEADER
 
 
 class GDALRegistrator(BaseRegistrator):
     scheme = "GDAL"
 
-    def _read_metadata_from_data(self, data_item, retrieved_metadata, cache, highest_resolution):
-        ds = gdal_open(data_item)
-        reader = get_reader_by_test(ds)
-        if reader:
-            values = reader.read(ds)
+    def _read_metadata_from_data(self, data_item, retrieved_metadata, cache, highest_resolution, prefetched=None):
+        path = get_vsi_path(data_item)
+        if prefetched is not None and prefetched.has(DATA_HEADER, path):
+            # copy, as the values are altered below
+            values = prefetched.get(DATA_HEADER, path)
+            values = dict(values) if values is not None else None
+            ds = None
+        else:
+            ds = gdal_open(data_item)
+            reader = get_reader_by_test(ds)
+            values = reader.read(ds) if reader else None
 
+        if values is not None:
             format_ = values.pop("format", None)
             if format_:
                 data_item.format = format_
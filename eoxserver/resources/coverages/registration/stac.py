@@ -49,7 +49,20 @@ from eoxserver.resources.coverages.registration.registrators.gdal import (
 from eoxserver.resources.coverages.registration.exceptions import (
     RegistrationError
 )
-from eoxserver.resources.coverages.registration.product import create_metadata
+from eoxserver.resources.coverages.registration.base import (
+    BaseRegistrator, get_grid
+)
+from eoxserver.resources.coverages.registration.prefetch import (
+    MetadataPrefetcher, PRODUCT_METADATA, DATA_HEADER,
+    DEFAULT_MAX_WORKERS as DEFAULT_PREFETCH_WORKERS
+)
+from eoxserver.resources.coverages.registration.bulk import (
+    DEFAULT_BATCH_SIZE, BulkRegistrationReport, batched,
+    bulk_create_eo_objects
+)
+from eoxserver.resources.coverages.registration.product import (
+    create_metadata, build_metadata
+)
 from eoxserver.resources.coverages.metadata.component import (
     ProductMetadataComponent
 )
@@ -221,15 +234,6 @@ def register_stac_product(stac_item, product_type=None, storage=None,
             models.Product.objects.filter(identifier=identifier).delete()
             replaced = True
 
-    geometry = stac_item['geometry']
-    properties = stac_item['properties']
-    assets = stac_item['assets']
-    data_assets = dict(
-        (name, asset)
-        for name, asset in assets.items()
-        if 'data' in asset.get('roles', [])
-    )
-
     # fetch the product type by name, metadata or passed object
     if isinstance(product_type, models.ProductType):
         pass
@@ -243,6 +247,120 @@ def register_stac_product(stac_item, product_type=None, storage=None,
     if isinstance(storage, str):
         storage = backends.Storage.objects.get(name=storage)
 
+    # check if the product already exists
+    if models.Product.objects.filter(identifier=identifier).exists():
+        if replace:
+            models.Product.objects.filter(identifier=identifier).delete()
+        else:
+            raise RegistrationError('Product %s already exists' % identifier)
+
+    parsed = parse_stac_item(
+        stac_item, storage, self_href, metadata_asset_names,
+        simplify_footprint_tolerance
+    )
+
+    # finally create the product and its metadata object
+    product = models.Product.objects.create(
+        identifier=identifier,
+        begin_time=parsed.begin_time,
+        end_time=parsed.end_time,
+        footprint=parsed.footprint,
+        product_type=product_type,
+    )
+
+    create_metadata(product, parsed.metadata)
+
+    # attach all metadata items
+    for metadata_item in parsed.metadata_items:
+        metadata_item.eo_object = product
+        metadata_item.full_clean()
+        metadata_item.save()
+
+    registrator = GDALRegistrator()
+
+    if len(parsed.data_assets) == 0:
+        logger.info(
+            'No data assets found in STAC item for Product %s' % (
+                identifier,
+            )
+        )
+
+    # handling coverages
+    for asset_name, asset in parsed.data_assets.items():
+        coverage_type = get_coverage_type_for_asset(
+            identifier, asset_name, asset, product_type, coverage_mapping
+        )
+        if coverage_type is None:
+            continue
+
+        overrides = get_coverage_overrides(
+            identifier, asset_name, asset, parsed.properties
+        )
+
+        logger.debug(
+            'Adding coverage %s to Product %s' % (
+                coverage_type.name, identifier
+            )
+        )
+
+        report = registrator.register(
+            data_locations=get_data_locations(asset, storage, self_href),
+            metadata_locations=[],
+            coverage_type_name=coverage_type.name,
+            footprint_from_extent=False,
+            overrides=overrides,
+            replace=replace,
+            simplify_footprint_tolerance=simplify_footprint_tolerance,
+            statistics=[get_asset_statistics(asset)],
+        )
+
+        models.product_add_coverage(product, report.coverage)
+
+    register_browses(
+        stac_item, product, product_type, storage, self_href, browse_mapping
+    )
+
+    # adding thumbnail image, which is the first one with role thumbnail
+    thumbnail_item = get_thumbnail_item(stac_item, storage, self_href)
+    if thumbnail_item:
+        thumbnail_item.eo_object = product
+        thumbnail_item.save()
+
+    return (product, replaced)
+
+
+class ParsedSTACItem(object):
+    """ The values of a STAC Item required to register it as a Product.
+    """
+    def __init__(self, identifier, begin_time, end_time, footprint, metadata,
+                 metadata_items, properties, data_assets):
+        self.identifier = identifier
+        self.begin_time = begin_time
+        self.end_time = end_time
+        self.footprint = footprint
+        self.metadata = metadata
+        self.metadata_items = metadata_items
+        self.properties = properties
+        self.data_assets = data_assets
+
+
+def parse_stac_item(stac_item, storage=None, self_href=None,
+                    metadata_asset_names=None,
+                    simplify_footprint_tolerance=None, prefetched=None):
+    """ Parses the times, footprint and metadata of a STAC Item and prepares
+        (unsaved) MetaDataItems for its metadata assets. Metadata files are
+        taken from ``prefetched``, if they were prefetched.
+    """
+    identifier = stac_item['id']
+    geometry = stac_item['geometry']
+    properties = stac_item['properties']
+    assets = stac_item['assets']
+    data_assets = dict(
+        (name, asset)
+        for name, asset in assets.items()
+        if 'data' in asset.get('roles', [])
+    )
+
     footprint = None
     if geometry is not None:
         footprint = GEOSGeometry(json.dumps(geometry))
@@ -256,43 +374,19 @@ def register_stac_product(stac_item, product_type=None, storage=None,
     else:
         start_time = end_time = parse_iso8601(properties['datetime'])
 
-    # check if the product already exists
-    if models.Product.objects.filter(identifier=identifier).exists():
-        if replace:
-            models.Product.objects.filter(identifier=identifier).delete()
-        else:
-            raise RegistrationError('Product %s already exists' % identifier)
-
     # metadata handling
     component = ProductMetadataComponent()
     metadata = {}
 
-    # fetch all "metadata assets" (i.e with 'metadata' in roles)
-    if metadata_asset_names is not None:
-        try:
-            metadata_assets = [
-                assets[metadata_asset_name]
-                for metadata_asset_name in metadata_asset_names
-            ]
-        except KeyError as e:
-            raise RegistrationError('Failed to get asset %s' % e)
-    else:
-        metadata_assets = [
-            asset
-            for asset in assets.values()
-            if 'metadata' in asset.get('roles', [])
-        ]
-
-    metadata_items = [
-        models.MetaDataItem(
-            location=resolve_location(asset, self_href),
-            storage=resolve_storage(asset, storage),
-        )
-        for asset in metadata_assets
-    ]
+    metadata_items = get_metadata_items(
+        stac_item, storage, self_href, metadata_asset_names
+    )
 
     for metadata_item in reversed(metadata_items):
         path = get_vsi_path(metadata_item)
+        if prefetched is not None and prefetched.has(PRODUCT_METADATA, path):
+            metadata.update(prefetched.get(PRODUCT_METADATA, path))
+            continue
         with gdal.config_env(get_vsi_env(metadata_item.storage)):
             metadata.update(component.read_product_metadata_file(path))
 
@@ -367,165 +461,261 @@ def register_stac_product(stac_item, product_type=None, storage=None,
             simplify_footprint_tolerance, preserve_topology=True
         )
 
-    # finally create the product and its metadata object
-    product = models.Product.objects.create(
-        identifier=identifier,
-        begin_time=start_time,
-        end_time=end_time,
-        footprint=footprint,
-        product_type=product_type,
+    return ParsedSTACItem(
+        identifier, start_time, end_time, footprint, metadata,
+        metadata_items, properties, data_assets
     )
 
-    create_metadata(product, metadata)
 
-    # attach all metadata items
-    for metadata_item in metadata_items:
-        metadata_item.eo_object = product
-        metadata_item.full_clean()
-        metadata_item.save()
+def get_metadata_items(stac_item, storage=None, self_href=None,
+                       metadata_asset_names=None):
+    """ Prepares (unsaved) MetaDataItems for the metadata assets of a STAC
+        Item: either the assets named in ``metadata_asset_names`` or all
+        assets with the 'metadata' role.
+    """
+    assets = stac_item['assets']
 
-    registrator = GDALRegistrator()
+    # fetch all "metadata assets" (i.e with 'metadata' in roles)
+    if metadata_asset_names is not None:
+        try:
+            metadata_assets = [
+                assets[metadata_asset_name]
+                for metadata_asset_name in metadata_asset_names
+            ]
+        except KeyError as e:
+            raise RegistrationError('Failed to get asset %s' % e)
+    else:
+        metadata_assets = [
+            asset
+            for asset in assets.values()
+            if 'metadata' in asset.get('roles', [])
+        ]
 
-    if len(data_assets) == 0:
-        logger.info(
-            'No data assets found in STAC item for Product %s' % (
-                identifier,
-            )
+    return [
+        models.MetaDataItem(
+            location=resolve_location(asset, self_href),
+            storage=resolve_storage(asset, storage),
         )
+        for asset in metadata_assets
+    ]
 
-    # handling coverages
-    for asset_name, asset in data_assets.items():
-        overrides = {}
-        coverage_type = None
-        # if we have an explicit mapping defined, we only pick the coverages
-        # in that mapping
-        if coverage_mapping:
-            for coverage_type_name, mapping in coverage_mapping.items():
-                if asset_name in mapping['assets']:
-                    coverage_type = models.CoverageType.objects.get(
-                        name=coverage_type_name
-                    )
-                    break
-            else:
-                logger.info(
-                    '''Data asset "%s" was not mapped to any coverage_mapping %s.
-                    Asset will not be added as Coverage to Product %s''' % (
-                        asset_name,
-                        {
-                            coverage_type_name: mapping['assets']
-                            for coverage_type_name, mapping
-                            in coverage_mapping.items()
-                        },
-                        identifier,
-                    )
-                )
-                continue
 
-        # if no mapping is defined, we try to figure out the coverage type via
-        # the `eo:bands`
-        else:
-            bands = asset.get('eo:bands')
-            if bands is None:
-                logger.info(
-                    'No eo:bands information present in Item.'
-                    'Skipping data asset %s.' % asset_name
-                )
+def prefetch_stac_items(stac_items, storage=None, self_href=None,
+                        metadata_asset_names=None, max_workers=None,
+                        retry_policy=None, include_asset=None):
+    """ Concurrently reads the metadata files of the given STAC Items and the
+        headers of all data assets lacking the ``proj`` metadata to register
+        them without reading the data.
+
+        :param include_asset: an optional callable, called with the STAC Item,
+                              the asset name and the asset, returning whether
+                              the data asset is going to be registered. The
+                              headers of excluded assets are not read.
+        :returns: a :class:`Prefetched
+            <eoxserver.resources.coverages.registration.prefetch.Prefetched>`
+    """
+    prefetcher = MetadataPrefetcher(
+        max_workers or DEFAULT_PREFETCH_WORKERS, retry_policy
+    )
+    for stac_item in stac_items:
+        for metadata_item in get_metadata_items(
+                stac_item, storage, self_href, metadata_asset_names):
+            prefetcher.add(PRODUCT_METADATA, metadata_item)
+
+        for asset_name, asset in stac_item['assets'].items():
+            if 'data' not in asset.get('roles', []):
+                continue
+            if include_asset is not None and \
+                    not include_asset(stac_item, asset_name, asset):
                 continue
+            overrides = get_coverage_overrides(
+                stac_item['id'], asset_name, asset, stac_item['properties']
+            )
+            if BaseRegistrator.metadata_keys - frozenset(overrides):
+                location = get_data_locations(asset, storage, self_href)[0]
+                prefetcher.add(DATA_HEADER, models.ArrayDataItem(
+                    location=location[-1].replace('\\:', ':'),
+                    storage=resolve_storage(asset, storage),
+                ))
 
-            if not isinstance(bands, list):
-                bands = [bands]
+    return prefetcher.fetch()
 
-            try:
-                band_names = [band['name'] for band in bands]
-            except TypeError:
-                band_names = bands
 
-            try:
+def get_coverage_type_for_asset(identifier, asset_name, asset, product_type,
+                                coverage_mapping={}, cache=None):
+    """ Determines the CoverageType to register a data asset with. Returns
+        ``None`` when the asset shall not be registered as a Coverage.
+        Lookups can be memoized by passing a ``dict`` as ``cache``.
+    """
+    # if we have an explicit mapping defined, we only pick the coverages
+    # in that mapping
+    if coverage_mapping:
+        for coverage_type_name, mapping in coverage_mapping.items():
+            if asset_name in mapping['assets']:
+                if cache is not None and coverage_type_name in cache:
+                    return cache[coverage_type_name]
                 coverage_type = models.CoverageType.objects.get(
-                    Q(allowed_product_types=product_type),
-                    *[
-                        Q(field_types__identifier=band_name)
-                        for band_name in band_names
-                    ]
+                    name=coverage_type_name
                 )
-            except models.CoverageType.DoesNotExist:
-                try:
-                    coverage_type = models.CoverageType.objects.get(
-                        Q(allowed_product_types=product_type)
-                    )
-                except (models.CoverageType.DoesNotExist,
-                        models.CoverageType.MultipleObjectsReturned):
-                    continue
-        overrides['identifier'] = '%s_%s' % (identifier, asset_name)
-
-        coverage_footprint = None
+                if cache is not None:
+                    cache[coverage_type_name] = coverage_type
+                return coverage_type
 
-        if 'proj:geometry' in asset:
-            coverage_footprint = GEOSGeometry(
-                json.dumps(asset['proj:geometry'])
+        logger.info(
+            '''Data asset "%s" was not mapped to any coverage_mapping %s.
+            Asset will not be added as Coverage to Product %s''' % (
+                asset_name,
+                {
+                    coverage_type_name: mapping['assets']
+                    for coverage_type_name, mapping
+                    in coverage_mapping.items()
+                },
+                identifier,
             )
+        )
+        return None
 
-        if coverage_footprint:
-            overrides['footprint'] = coverage_footprint.wkt
+    # if no mapping is defined, we try to figure out the coverage type via
+    # the `eo:bands`
+    bands = asset.get('eo:bands')
+    if bands is None:
+        logger.info(
+            'No eo:bands information present in Item.'
+            'Skipping data asset %s.' % asset_name
+        )
+        return None
+
+    if not isinstance(bands, list):
+        bands = [bands]
+
+    try:
+        band_names = [band['name'] for band in bands]
+    except TypeError:
+        band_names = bands
+
+    cache_key = (product_type.pk, tuple(band_names))
+    if cache is not None and cache_key in cache:
+        return cache[cache_key]
+
+    try:
+        coverage_type = models.CoverageType.objects.get(
+            Q(allowed_product_types=product_type),
+            *[
+                Q(field_types__identifier=band_name)
+                for band_name in band_names
+            ]
+        )
+    except models.CoverageType.DoesNotExist:
+        try:
+            coverage_type = models.CoverageType.objects.get(
+                Q(allowed_product_types=product_type)
+            )
+        except (models.CoverageType.DoesNotExist,
+                models.CoverageType.MultipleObjectsReturned):
+            coverage_type = None
 
-        shape = asset.get('proj:shape') or properties.get('proj:shape')
-        transform = asset.get('proj:transform') or \
-            properties.get('proj:transform')
-        epsg = asset.get('proj:epsg') or properties.get('proj:epsg')
+    if cache is not None:
+        cache[cache_key] = coverage_type
+    return coverage_type
 
-        if shape:
-            overrides['size'] = [shape[1], shape[0]]
 
-        if transform:
-            overrides['origin'] = [transform[2], transform[5]]
+def get_coverage_overrides(identifier, asset_name, asset, properties):
+    """ Gets the coverage registration overrides (identifier, footprint, size,
+        origin and grid) from the ``proj`` extension of a data asset or its
+        STAC Item.
+    """
+    overrides = {}
+    overrides['identifier'] = '%s_%s' % (identifier, asset_name)
 
-        if epsg and transform:
-            sr = osr.SpatialReference(epsg)
-            axis_names = ['x', 'y'] if sr.IsProjected() else ['long', 'lat']
-            grid_def = {
-                'coordinate_reference_system': "EPSG:%s" % (epsg),
-                'axis_names': axis_names,
-                'axis_types': ['spatial', 'spatial'],
-                'axis_offsets': [transform[0], transform[4]],
-            }
-            overrides['grid'] = grid_def  # get_grid(grid_def)
+    coverage_footprint = None
 
-        logger.debug(
-            'Adding coverage %s to Product %s' % (
-                coverage_type.name, identifier
-            )
+    if 'proj:geometry' in asset:
+        coverage_footprint = GEOSGeometry(
+            json.dumps(asset['proj:geometry'])
         )
 
-        location = resolve_location(asset, self_href)
-        asset_storage = resolve_storage(asset, storage)
+    if coverage_footprint:
+        overrides['footprint'] = coverage_footprint.wkt
 
-        if asset_storage is None:
-            data_locations = [[location]]
-        elif asset_storage == storage:
-            data_locations = [[storage.name, location]]
-        else:
-            data_locations = [[storage.name, asset_storage.name, location]]
+    shape = asset.get('proj:shape') or properties.get('proj:shape')
+    transform = asset.get('proj:transform') or \
+        properties.get('proj:transform')
+    epsg = asset.get('proj:epsg') or properties.get('proj:epsg')
 
-        report = registrator.register(
-            data_locations=data_locations,
-            metadata_locations=[],
-            coverage_type_name=coverage_type.name,
-            footprint_from_extent=False,
-            overrides=overrides,
-            replace=replace,
-            simplify_footprint_tolerance=simplify_footprint_tolerance,
-            statistics=[
-                [
-                    dict(
-                        histogram=band.get("histogram", {}),
-                        **band.get("statistics", {})
-                    )
-                    for band in asset.get("raster:bands", [])
-                ]
-            ],
+    if shape:
+        overrides['size'] = [shape[1], shape[0]]
+
+    if transform:
+        overrides['origin'] = [transform[2], transform[5]]
+
+    if epsg and transform:
+        sr = osr.SpatialReference(epsg)
+        axis_names = ['x', 'y'] if sr.IsProjected() else ['long', 'lat']
+        grid_def = {
+            'coordinate_reference_system': "EPSG:%s" % (epsg),
+            'axis_names': axis_names,
+            'axis_types': ['spatial', 'spatial'],
+            'axis_offsets': [transform[0], transform[4]],
+        }
+        overrides['grid'] = grid_def  # get_grid(grid_def)
+
+    return overrides
+
+
+def get_data_locations(asset, storage, self_href):
+    """ Gets the data locations of a data asset as expected by the
+        registrators.
+    """
+    location = resolve_location(asset, self_href)
+    asset_storage = resolve_storage(asset, storage)
+
+    if asset_storage is None:
+        return [[location]]
+    elif asset_storage == storage:
+        return [[storage.name, location]]
+    else:
+        return [[storage.name, asset_storage.name, location]]
+
+
+def get_asset_statistics(asset):
+    """ Gets the band statistics of an asset from the ``raster`` extension.
+    """
+    return [
+        dict(
+            histogram=band.get("histogram", {}),
+            **band.get("statistics", {})
         )
+        for band in asset.get("raster:bands", [])
+    ]
 
-        models.product_add_coverage(product, report.coverage)
+
+def get_thumbnail_item(stac_item, storage, self_href):
+    """ Prepares an (unsaved) MetaDataItem for the first asset with the
+        'thumbnail' role, if any.
+    """
+    thumbnail_asset = next(
+        (
+            asset
+            for asset in stac_item['assets'].values()
+            if 'thumbnail' in asset.get('roles', [])
+        ),
+        None
+    )
+    if thumbnail_asset:
+        return models.MetaDataItem(
+            semantic=models.MetaDataItem.semantic_codes['thumbnail'],
+            storage=resolve_storage(thumbnail_asset, storage),
+            location=resolve_location(thumbnail_asset, self_href),
+        )
+    return None
+
+
+def register_browses(stac_item, product, product_type, storage, self_href,
+                     browse_mapping=None):
+    """ Registers the browses of a STAC Item for the given product.
+    """
+    assets = stac_item['assets']
+    identifier = stac_item['id']
 
     # Register browses
     if browse_mapping is not None:
@@ -572,25 +762,6 @@ def register_stac_product(stac_item, product_type=None, storage=None,
                         asset, self_href, product, storage, browse_type
                     )
 
-    # adding thumbnail image, which is the first one with role thumbnail
-    thumbnail_asset = next(
-        (
-            asset
-            for asset in assets.values()
-            if 'thumbnail' in asset.get('roles', [])
-        ),
-        None
-    )
-    if thumbnail_asset:
-        models.MetaDataItem.objects.create(
-            eo_object=product,
-            semantic=models.MetaDataItem.semantic_codes['thumbnail'],
-            storage=resolve_storage(thumbnail_asset, storage),
-            location=resolve_location(thumbnail_asset, self_href),
-        )
-
-    return (product, replaced)
-
 
 def register_browse_for_asset(asset, self_href, product, storage, browse_type):
     browse = models.Browse(
@@ -858,3 +1029,361 @@ def create_product_type_from_stac_item(stac_item, product_type_name=None,
             )
 
     return (product_type, True)
+
+
+def iter_stac_items(f):
+    """ Iterates over the STAC Items in the given file object. The file may
+        contain a single STAC Item, an ItemCollection (i.e. a GeoJSON
+        FeatureCollection) or newline delimited Items or ItemCollections. The
+        latter is read line by line, so arbitrarily large streams can be
+        processed.
+    """
+    first_line = f.readline()
+    while first_line and not first_line.strip():
+        first_line = f.readline()
+
+    if not first_line:
+        return
+
+    try:
+        value = json.loads(first_line)
+    except ValueError:
+        # a pretty printed JSON document spanning multiple lines
+        value = json.loads(first_line + f.read())
+        yield from _iter_stac_items_from_value(value)
+        return
+
+    yield from _iter_stac_items_from_value(value)
+    for line in f:
+        if line.strip():
+            yield from _iter_stac_items_from_value(json.loads(line))
+
+
+def _iter_stac_items_from_value(value):
+    if value.get('type') == 'FeatureCollection':
+        yield from value.get('features', [])
+    elif value.get('type') == 'Feature':
+        yield value
+    else:
+        raise RegistrationError(
+            'Expected a STAC Item or ItemCollection, got %r'
+            % value.get('type')
+        )
+
+
+def register_stac_products_bulk(stac_items, product_type=None, storage=None,
+                                replace=False, coverage_mapping={},
+                                browse_mapping=None, metadata_asset_names=None,
+                                simplify_footprint_tolerance=None,
+                                self_href=None, batch_size=DEFAULT_BATCH_SIZE,
+                                progress=None, prefetch_workers=None,
+                                retry_policy=None):
+    """ Registers an iterable of parsed STAC Items as Products in batches of
+        ``batch_size``. Product and coverage types are resolved once, and the
+        Products, Coverages, data items and band statistics of a batch are
+        inserted in bulk. Each batch is committed in its own transaction, so
+        a failure only rolls back the current batch.
+
+        Coverages that cannot be fully described by the ``proj`` extension of
+        their assets are registered using the GDAL registrator instead.
+
+        Before a batch is registered, all of its metadata files and required
+        data headers are read concurrently using ``prefetch_workers`` threads
+        and the given ``retry_policy``.
+
+        :param progress: an optional callable, called with the
+                         :class:`BulkRegistrationReport` after each committed
+                         batch
+        :returns: a :class:`BulkRegistrationReport`
+    """
+    if isinstance(storage, str):
+        storage = backends.Storage.objects.get(name=storage)
+
+    context = _BulkContext(
+        product_type, storage, replace, coverage_mapping, browse_mapping,
+        metadata_asset_names, simplify_footprint_tolerance, self_href
+    )
+    report = BulkRegistrationReport()
+
+    for batch in batched(stac_items, batch_size):
+        prefetched = prefetch_stac_items(
+            batch, storage, self_href, metadata_asset_names,
+            prefetch_workers, retry_policy, context.includes_asset
+        )
+        with transaction.atomic():
+            report.replaced += context.register_batch(batch, prefetched)
+        report.registered += len(batch)
+        report.batches += 1
+
+        logger.info('Bulk STAC registration: %s' % report)
+        if progress:
+            progress(report)
+
+    report.finish()
+    return report
+
+
+class _BulkContext(object):
+    """ Holds the settings and the resolved types for a bulk registration of
+        STAC Items.
+    """
+    def __init__(self, product_type, storage, replace, coverage_mapping,
+                 browse_mapping, metadata_asset_names,
+                 simplify_footprint_tolerance, self_href):
+        self.storage = storage
+        self.replace = replace
+        self.coverage_mapping = coverage_mapping
+        self.browse_mapping = browse_mapping
+        self.metadata_asset_names = metadata_asset_names
+        self.simplify_footprint_tolerance = simplify_footprint_tolerance
+        self.self_href = self_href
+        self.registrator = GDALRegistrator()
+
+        if isinstance(product_type, str):
+            product_type = models.ProductType.objects.get(name=product_type)
+        self.product_type = product_type
+
+        self.product_types = {}
+        self.coverage_types = {}
+        self.num_fields = {}
+        self.allowed_coverage_types = {}
+        self.grids = {}
+
+    def get_product_type(self, stac_item):
+        if self.product_type is not None:
+            return self.product_type
+
+        name = get_product_type_name(stac_item)
+        if name not in self.product_types:
+            self.product_types[name] = models.ProductType.objects.get(
+                name=name
+            )
+        return self.product_types[name]
+
+    def get_coverage_type(self, stac_item, asset_name, asset):
+        return get_coverage_type_for_asset(
+            stac_item['id'], asset_name, asset,
+            self.get_product_type(stac_item), self.coverage_mapping,
+            self.coverage_types
+        )
+
+    def includes_asset(self, stac_item, asset_name, asset):
+        """ Whether the data asset will be registered as a Coverage. Checks
+            the mapping and the bands first, to avoid repeated log messages
+            for skipped assets.
+        """
+        if self.coverage_mapping:
+            return any(
+                asset_name in mapping['assets']
+                for mapping in self.coverage_mapping.values()
+            )
+        if asset.get('eo:bands') is None:
+            return False
+        return self.get_coverage_type(stac_item, asset_name, asset) is not None
+
+    def get_num_fields(self, coverage_type):
+        if coverage_type.pk not in self.num_fields:
+            self.num_fields[coverage_type.pk] = \
+                coverage_type.field_types.count()
+        return self.num_fields[coverage_type.pk]
+
+    def is_allowed(self, product_type, coverage_type):
+        if product_type.pk not in self.allowed_coverage_types:
+            self.allowed_coverage_types[product_type.pk] = frozenset(
+                product_type.allowed_coverage_types.values_list(
+                    'pk', flat=True
+                )
+            )
+        return coverage_type.pk in self.allowed_coverage_types[product_type.pk]
+
+    def get_grid(self, definition):
+        key = json.dumps(definition, sort_keys=True)
+        if key not in self.grids:
+            self.grids[key] = get_grid(definition)
+        return self.grids[key]
+
+    def register_batch(self, stac_items, prefetched=None):
+        """ Registers a batch of STAC Items. Returns the number of replaced
+            Products.
+        """
+        identifiers = [stac_item['id'] for stac_item in stac_items]
+        existing = models.Product.objects.filter(identifier__in=identifiers)
+        num_replaced = 0
+        if existing.exists():
+            if not self.replace:
+                raise RegistrationError(
+                    'Products %s already exist' % ', '.join(
+                        existing.values_list('identifier', flat=True)
+                    )
+                )
+            num_replaced = existing.count()
+            existing.delete()
+
+        products = []
+        parsed_items = []
+        for stac_item in stac_items:
+            product_type = self.get_product_type(stac_item)
+            parsed = parse_stac_item(
+                stac_item, self.storage, self.self_href,
+                self.metadata_asset_names, self.simplify_footprint_tolerance,
+                prefetched
+            )
+            product = models.Product(
+                identifier=parsed.identifier,
+                begin_time=parsed.begin_time,
+                end_time=parsed.end_time,
+                footprint=parsed.footprint,
+                product_type=product_type,
+            )
+            models.eo_object_identifier_validator(product.identifier)
+            products.append(product)
+            parsed_items.append(parsed)
+
+        bulk_create_eo_objects(models.Product, products)
+
+        product_metadatas = []
+        metadata_items = []
+        coverages = []
+        arraydata_items = []
+        band_statistics = []
+
+        for stac_item, parsed, product in zip(
+                stac_items, parsed_items, products):
+            product_metadatas.append(build_metadata(product, parsed.metadata))
+
+            for metadata_item in parsed.metadata_items:
+                metadata_item.eo_object = product
+                metadata_items.append(metadata_item)
+
+            thumbnail_item = get_thumbnail_item(
+                stac_item, self.storage, self.self_href
+            )
+            if thumbnail_item:
+                thumbnail_item.eo_object = product
+                metadata_items.append(thumbnail_item)
+
+            for asset_name, asset in parsed.data_assets.items():
+                coverage_type = self.get_coverage_type(
+                    stac_item, asset_name, asset
+                )
+                if coverage_type is None:
+                    continue
+
+                if product.product_type and \
+                        not self.is_allowed(product.product_type,
+                                            coverage_type):
+                    raise RegistrationError(
+                        'Cannot insert Coverage as the coverage type %r is '
+                        'not allowed in this product' % coverage_type.name
+                    )
+
+                overrides = get_coverage_overrides(
+                    parsed.identifier, asset_name, asset, parsed.properties
+                )
+
+                if self.registrator.missing_metadata_keys(overrides):
+                    # not enough metadata in the STAC Item: read it from the
+                    # data itself
+                    self._register_coverage(
+                        product, asset, coverage_type, overrides, prefetched
+                    )
+                    continue
+
+                coverage, arraydata_item, stats = self._build_coverage(
+                    product, asset, coverage_type, overrides
+                )
+                coverages.append(coverage)
+                arraydata_items.append(arraydata_item)
+                band_statistics.append(stats)
+
+        models.ProductMetadata.objects.bulk_create(product_metadatas)
+        models.MetaDataItem.objects.bulk_create(metadata_items)
+
+        if self.replace:
+            models.Coverage.objects.filter(identifier__in=[
+                coverage.identifier for coverage in coverages
+            ]).delete()
+        bulk_create_eo_objects(models.Coverage, coverages)
+
+        for coverage, arraydata_item in zip(coverages, arraydata_items):
+            arraydata_item.coverage = coverage
+        models.ArrayDataItem.objects.bulk_create(arraydata_items)
+
+        all_band_statistics = []
+        for arraydata_item, stats in zip(arraydata_items, band_statistics):
+            for band_stats in stats:
+                band_stats.arraydata_item = arraydata_item
+                all_band_statistics.append(band_stats)
+        models.BandStatistics.objects.bulk_create(all_band_statistics)
+
+        for stac_item, product in zip(stac_items, products):
+            register_browses(
+                stac_item, product, product.product_type, self.storage,
+                self.self_href, self.browse_mapping
+            )
+
+        return num_replaced
+
+    def _build_coverage(self, product, asset, coverage_type, overrides):
+        size = list(overrides['size']) + [None] * 2
+        origin = list(overrides['origin']) + [None] * 2
+
+        footprint = overrides.get('footprint')
+        if footprint:
+            footprint = GEOSGeometry(footprint)
+            if self.simplify_footprint_tolerance is not None:
+                footprint = footprint.simplify(
+                    self.simplify_footprint_tolerance, preserve_topology=True
+                )
+
+        coverage = models.Coverage(
+            identifier=overrides['identifier'],
+            footprint=footprint,
+            coverage_type=coverage_type,
+            grid=self.get_grid(overrides['grid']),
+            parent_product=product,
+            axis_1_origin=origin[0],
+            axis_2_origin=origin[1],
+            axis_1_size=size[0],
+            axis_2_size=size[1],
+        )
+        models.eo_object_identifier_validator(coverage.identifier)
+
+        location = get_data_locations(asset, self.storage, self.self_href)[0]
+        arraydata_item = models.ArrayDataItem(
+            location=location[-1].replace('\\:', ':'),
+            storage=resolve_storage(asset, self.storage),
+            band_count=self.get_num_fields(coverage_type),
+        )
+
+        stats = [
+            models.BandStatistics(
+                band_index=i,
+                mean=stat.get('mean'),
+                minimum=stat.get('minimum'),
+                maximum=stat.get('maximum'),
+                stddev=stat.get('stddev'),
+                valid_percent=stat.get('valid_percent'),
+                histogram=stat.get('histogram'),
+            )
+            for i, stat in enumerate(get_asset_statistics(asset), start=1)
+        ]
+        return coverage, arraydata_item, stats
+
+    def _register_coverage(self, product, asset, coverage_type, overrides,
+                           prefetched=None):
+        report = self.registrator.register(
+            data_locations=get_data_locations(
+                asset, self.storage, self.self_href
+            ),
+            metadata_locations=[],
+            coverage_type_name=coverage_type.name,
+            footprint_from_extent=False,
+            overrides=overrides,
+            replace=self.replace,
+            simplify_footprint_tolerance=self.simplify_footprint_tolerance,
+            statistics=[get_asset_statistics(asset)],
+            prefetched=prefetched,
+        )
+        report.coverage.parent_product = product
+        report.coverage.save()
@@ -50,10 +50,36 @@ from eoxserver.backends import models as backends
 from eoxserver.resources.coverages.registration.registrators.gdal import (
     GDALRegistrator
 )
+from eoxserver.resources.coverages.registration.base import (
+    parse_data_location, get_grid
+)
+from eoxserver.resources.coverages.registration.bulk import (
+    DEFAULT_BATCH_SIZE, batched, bulk_create_eo_objects
+)
 
 logger = logging.getLogger(__name__)
 
 
+def get_product_identifier(
+    product_template,
+    collection,
+    file_identifier,
+    index,
+    product_type,
+    begin_time,
+    end_time,
+):
+    template_values = {
+        "collection_identifier": collection.identifier,
+        "file_identifier": file_identifier,
+        "index": index,
+        "product_type": product_type,
+        "begin_time": begin_time.strftime('%Y%m%d'),
+        "end_time": end_time.strftime('%Y%m%d')
+    }
+    return product_template.format(**template_values)
+
+
 def create_product(
     collection,
     begin_time,
@@ -69,17 +95,12 @@ def create_product(
     all_overrides,
     file_identifier,
     product_template,
+    registrator=None,
 ):
-    template_values = {
-        "collection_identifier": collection.identifier,
-        "file_identifier": file_identifier,
-        "index": index,
-        "product_type": product_type,
-        "begin_time": begin_time.strftime('%Y%m%d'),
-        "end_time": end_time.strftime('%Y%m%d')
-    }
-
-    product_identifier = product_template.format(**template_values)
+    product_identifier = get_product_identifier(
+        product_template, collection, file_identifier, index, product_type,
+        begin_time, end_time
+    )
 
     replaced = False
 
@@ -107,7 +128,7 @@ def create_product(
 
     logger.info('Successfully created product %s', product_identifier)
 
-    registrator = GDALRegistrator()
+    registrator = registrator or GDALRegistrator()
 
     # adding coverages:
     for dim_name, coverage_type_name in coverage_type_mapping.items():
@@ -153,6 +174,231 @@ def create_product(
     return (product, replaced)
 
 
+def get_coverage_types(coverage_type_mapping, product_type):
+    """ Resolves the coverage types of the ``coverage_type_mapping`` once and
+        checks whether they are allowed in the given product type.
+    """
+    coverage_types = {}
+    for dim_name, coverage_type_name in coverage_type_mapping.items():
+        try:
+            coverage_type = models.CoverageType.objects.get(
+                name=coverage_type_name
+            )
+        except models.CoverageType.DoesNotExist:
+            raise CommandError(
+                "Coverage type %r does not exist." % coverage_type_name
+            )
+
+        if not product_type.allowed_coverage_types.filter(
+                pk=coverage_type.pk).exists():
+            raise RegistrationError(
+                'Cannot insert Coverage as the coverage type %r is not '
+                'allowed in this product' % coverage_type_name
+            )
+        coverage_types[dim_name] = coverage_type
+    return coverage_types
+
+
+def read_slice_metadata(driver_name, storage, path, dim_name,
+                        registrator=None):
+    """ Reads the grid, size, origin and format of the first time slice of
+        the given dimension. All slices of a cube share these values.
+    """
+    location, subdataset_type, subdataset_locator = parse_data_location(
+        '%s:"%s":%s:%s' % (driver_name, path, dim_name, 0), True
+    )
+    arraydata_item = models.ArrayDataItem(
+        location=location,
+        storage=storage,
+        subdataset_type=subdataset_type,
+        subdataset_locator=subdataset_locator,
+    )
+    registrator = registrator or GDALRegistrator()
+    retrieved_metadata = registrator.read_data_metadata(arraydata_item)
+    missing = [
+        key for key in ('grid', 'size', 'origin')
+        if key not in retrieved_metadata
+    ]
+    if missing:
+        raise RegistrationError(
+            "Missing metadata keys %s." % ", ".join(missing)
+        )
+
+    retrieved_metadata['format'] = arraydata_item.format
+    return retrieved_metadata
+
+
+def create_products_bulk(
+    collection,
+    date_array,
+    footprint,
+    product_type,
+    coverage_type_mapping,
+    replace,
+    driver_name,
+    storage,
+    path,
+    file_identifier,
+    product_template,
+    batch_size=DEFAULT_BATCH_SIZE,
+):
+    """ Creates the Products and Coverages for all time slices of a cube in
+        memory and inserts them in batches of ``batch_size``. The allowed
+        types are checked once, and the collections footprint and time range
+        are updated once at the end.
+
+        :returns: whether existing Products were replaced
+    """
+    collection_type = collection.collection_type
+    if collection_type and not collection_type.allowed_product_types.filter(
+            pk=product_type.pk).exists():
+        raise RegistrationError(
+            'Cannot insert Product as the product type %r is not allowed in '
+            'this collection' % product_type.name
+        )
+
+    coverage_types = get_coverage_types(coverage_type_mapping, product_type)
+    num_fields = {
+        dim_name: coverage_type.field_types.count()
+        for dim_name, coverage_type in coverage_types.items()
+    }
+
+    # grid, size and origin are the same for all slices
+    registrator = GDALRegistrator()
+    slice_metadata = {}
+    grids = {}
+    for dim_name in coverage_type_mapping:
+        metadata = read_slice_metadata(
+            driver_name, storage, path, dim_name, registrator
+        )
+        slice_metadata[dim_name] = metadata
+        grid_key = repr(metadata['grid'])
+        if grid_key not in grids:
+            grids[grid_key] = get_grid(metadata['grid'])
+        metadata['grid'] = grids[grid_key]
+
+    identifiers = [
+        get_product_identifier(
+            product_template, collection, file_identifier, index,
+            product_type, begin_time, end_time
+        )
+        for index, (begin_time, end_time) in enumerate(date_array)
+    ]
+
+    replaced = False
+    existing = models.Product.objects.filter(identifier__in=identifiers)
+    if existing.exists():
+        if not replace:
+            raise RegistrationError(
+                'Products %s already exist' % ', '.join(
+                    existing.values_list('identifier', flat=True)
+                )
+            )
+        logger.info('Deleting %d existing Products', existing.count())
+        existing.delete()
+        replaced = True
+
+    product_collections = models.Product.collections.through
+
+    for batch in batched(
+            enumerate(zip(identifiers, date_array)), batch_size):
+        products = []
+        for index, (identifier, (begin_time, end_time)) in batch:
+            product = models.Product(
+                identifier=identifier,
+                begin_time=begin_time,
+                end_time=end_time,
+                footprint=footprint,
+                product_type=product_type,
+            )
+            models.eo_object_identifier_validator(identifier)
+            products.append(product)
+
+        bulk_create_eo_objects(models.Product, products)
+        product_collections.objects.bulk_create([
+            product_collections(
+                collection_id=collection.pk, product_id=product.pk
+            )
+            for product in products
+        ])
+
+        coverages = []
+        arraydata_items = []
+        for (index, _), product in zip(batch, products):
+            for dim_name, coverage_type in coverage_types.items():
+                metadata = slice_metadata[dim_name]
+                size = list(metadata['size']) + [None] * 2
+                origin = list(metadata['origin']) + [None] * 2
+                coverage = models.Coverage(
+                    identifier='%s_%s' % (
+                        product.identifier, coverage_type.name
+                    ),
+                    footprint=footprint,
+                    coverage_type=coverage_type,
+                    grid=metadata['grid'],
+                    parent_product=product,
+                    axis_1_origin=origin[0],
+                    axis_2_origin=origin[1],
+                    axis_1_size=size[0],
+                    axis_2_size=size[1],
+                )
+                models.eo_object_identifier_validator(coverage.identifier)
+                coverages.append(coverage)
+
+                location, subdataset_type, subdataset_locator = \
+                    parse_data_location(
+                        '%s:"%s":%s:%s' % (driver_name, path, dim_name, index),
+                        True
+                    )
+                arraydata_items.append(
+                    models.ArrayDataItem(
+                        location=location,
+                        storage=storage,
+                        format=metadata['format'],
+                        subdataset_type=subdataset_type,
+                        subdataset_locator=subdataset_locator,
+                        band_count=num_fields[dim_name],
+                    )
+                )
+
+        if replace:
+            models.Coverage.objects.filter(identifier__in=[
+                coverage.identifier for coverage in coverages
+            ]).delete()
+        bulk_create_eo_objects(models.Coverage, coverages)
+
+        for coverage, arraydata_item in zip(coverages, arraydata_items):
+            arraydata_item.coverage = coverage
+        models.ArrayDataItem.objects.bulk_create(arraydata_items)
+
+        logger.info(
+            'Created %d products of time series %s', len(products), path
+        )
+
+    # update the collection metadata once for all slices
+    if date_array:
+        if footprint:
+            collection.footprint = (
+                collection.footprint.union(footprint)
+                if collection.footprint else footprint
+            )
+
+        begin_time = date_array[0][0]
+        end_time = date_array[-1][1]
+        collection.begin_time = (
+            min(begin_time, collection.begin_time)
+            if collection.begin_time else begin_time
+        )
+        collection.end_time = (
+            max(end_time, collection.end_time)
+            if collection.end_time else end_time
+        )
+        collection.full_clean()
+        collection.save()
+
+    return replaced
+
+
 def extent_to_footprint(crs_wkt, extent):
     dcrs = SpatialReference()
     dcrs.ImportFromWkt(crs_wkt)
@@ -243,8 +489,19 @@ def register_time_series(
     y_dim_name,
     time_dim_name,
     product_template,
-    replace=True
+    replace=True,
+    bulk=False,
+    batch_size=DEFAULT_BATCH_SIZE,
 ):
+    """ Registers each time slice of a multidimensional file as a Product in
+        the given collection.
+
+        When ``bulk`` is set, the grid is read only once per dimension and all
+        Products and Coverages are built in memory and inserted in batches of
+        ``batch_size``. The collection metadata is then updated only once.
+
+        :returns: a tuple of the path and whether any Product was replaced
+    """
 
     file_identifier = path.split("/")[-1].split(".")[0]
 
@@ -279,9 +536,28 @@ def register_time_series(
 
     product_type = models.ProductType.objects.get(name=product_type_name)
 
+    if bulk:
+        replaced = create_products_bulk(
+            collection,
+            date_array,
+            footprint,
+            product_type,
+            coverage_type_mapping,
+            replace,
+            driver_name,
+            storage,
+            path,
+            file_identifier,
+            product_template,
+            batch_size,
+        )
+        return path, replaced
+
     overrides = {}
+    replaced = False
+    registrator = GDALRegistrator()
     for i, (begin_time, end_time) in enumerate(date_array):
-        create_product(
+        _, product_replaced = create_product(
             collection,
             begin_time,
             end_time,
@@ -295,7 +571,9 @@ def register_time_series(
             i,
             overrides,
             file_identifier,
-            product_template
+            product_template,
+            registrator,
         )
+        replaced = replaced or product_replaced
 
-    return path, replace
+    return path, replaced
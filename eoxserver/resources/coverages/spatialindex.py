@@ -0,0 +1,396 @@
+# ------------------------------------------------------------------------------
+#
+# Project: EOxServer <http://eoxserver.org>
+#
+# ------------------------------------------------------------------------------
+# Copyright (C) 2026 EOX IT Services GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies of this Software or works derived from this Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# ------------------------------------------------------------------------------
+
+""" This module provides an optional in-process spatio-temporal index of the
+    footprints and time spans of all EOObjects. It is intended for SQLite/
+    SpatiaLite deployments, where spatial filters are evaluated row by row.
+
+    The index only pre-selects candidate primary keys, which are then passed
+    to the database along with the original filters for the exact
+    evaluation. The candidates are always a superset of the actual matches.
+"""
+
+import math
+import threading
+import time
+from datetime import timedelta, timezone as dt_timezone
+
+import numpy as np
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db.models import Q
+from django.dispatch import receiver
+from django.utils import timezone
+
+from eoxserver.resources.coverages import crss, models
+
+
+# the default number of seconds between two checks for updated objects
+DEFAULT_REFRESH_INTERVAL = 5
+
+# the default number of seconds between two checks for deleted objects,
+# which require a full reload
+DEFAULT_RELOAD_INTERVAL = 300
+
+# the default number of seconds the incremental refresh looks back before
+# the latest seen ``updated`` timestamp. The timestamps are taken before the
+# transactions commit, so objects committed later may carry older values.
+DEFAULT_REFRESH_MARGIN = 60
+
+# the number of points each edge of a query box is densified with when it
+# is transformed to WGS 84
+DENSIFY_POINTS = 21
+
+# the default maximum number of candidates passed to the database. Larger
+# candidate sets are not selective enough and would exceed the maximum
+# number of SQL variables of older SQLite versions.
+DEFAULT_MAX_CANDIDATES = 999
+
+# the fields to load for each object. Coverages without own footprint or
+# time span inherit the ones of their parent product.
+INDEX_FIELDS = (
+    'pk', 'footprint', 'begin_time', 'end_time',
+    'coverage__parent_product__footprint',
+    'coverage__parent_product__begin_time',
+    'coverage__parent_product__end_time',
+    'updated', 'coverage__parent_product__updated',
+)
+
+
+class STRtree(object):
+    """ A static R-tree of bounding boxes, bulk loaded using the
+        Sort-Tile-Recursive algorithm.
+
+        :param boxes: an array-like of ``(minx, miny, maxx, maxy)`` tuples
+        :param node_capacity: the maximum number of children per node
+    """
+
+    def __init__(self, boxes, node_capacity=16):
+        boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+        self.node_capacity = node_capacity
+        count = len(boxes)
+
+        # sort the boxes into vertical slices by their center x coordinate
+        # and then by their center y coordinate within each slice
+        centers = (boxes[:, :2] + boxes[:, 2:]) / 2
+        order = np.argsort(centers[:, 0], kind='stable')
+        if count:
+            leaf_count = math.ceil(count / node_capacity)
+            slice_size = math.ceil(math.sqrt(leaf_count)) * node_capacity
+            for start in range(0, count, slice_size):
+                part = order[start:start + slice_size]
+                order[start:start + slice_size] = part[
+                    np.argsort(centers[part, 1], kind='stable')
+                ]
+        self._order = order
+
+        # build the levels bottom up, each node enclosing a consecutive
+        # run of child nodes
+        levels = [boxes[order]]
+        while len(levels[-1]) > node_capacity:
+            children = levels[-1]
+            starts = np.arange(0, len(children), node_capacity)
+            levels.append(np.column_stack((
+                np.minimum.reduceat(children[:, 0], starts),
+                np.minimum.reduceat(children[:, 1], starts),
+                np.maximum.reduceat(children[:, 2], starts),
+                np.maximum.reduceat(children[:, 3], starts),
+            )))
+        self._levels = levels[::-1]
+
+    def __len__(self):
+        return len(self._order)
+
+    def query(self, bounds):
+        """ Returns the indices of all boxes intersecting the given
+            ``(minx, miny, maxx, maxy)`` bounds.
+        """
+        minx, miny, maxx, maxy = bounds
+        capacity = self.node_capacity
+        nodes = np.arange(len(self._levels[0]))
+        for depth, level in enumerate(self._levels):
+            if depth:
+                nodes = (
+                    nodes[:, np.newaxis] * capacity + np.arange(capacity)
+                ).ravel()
+                nodes = nodes[nodes < len(level)]
+            boxes = level[nodes]
+            nodes = nodes[
+                (boxes[:, 0] <= maxx) & (boxes[:, 2] >= minx)
+                & (boxes[:, 1] <= maxy) & (boxes[:, 3] >= miny)
+            ]
+        return self._order[nodes]
+
+
+def _timestamp(value, default):
+    if value is None:
+        return default
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value, dt_timezone.utc)
+    return value.timestamp()
+
+
+class _IndexData(object):
+    """ Immutable arrays of an index state, safe to be queried concurrently.
+    """
+
+    def __init__(self, entries):
+        self.pks = np.fromiter(entries.keys(), dtype=np.int64,
+                               count=len(entries))
+        values = list(entries.values())
+        self.boxes = np.array(
+            [box or (np.nan,) * 4 for box, _, _ in values], dtype=float
+        ).reshape(-1, 4)
+        self.begin = np.array([begin for _, begin, _ in values], dtype=float)
+        self.end = np.array([end for _, _, end in values], dtype=float)
+
+        # the spatial tree only contains objects with a footprint
+        self.spatial_rows = np.flatnonzero(~np.isnan(self.boxes[:, 0]))
+        self.tree = STRtree(self.boxes[self.spatial_rows])
+
+        # the time index is sorted by the begin time
+        self.time_order = np.argsort(self.begin, kind='stable')
+        self.sorted_begin = self.begin[self.time_order]
+
+    def query(self, bounds=None, interval=None):
+        low, high = interval if interval else (-math.inf, math.inf)
+        if bounds is not None:
+            rows = self.spatial_rows[self.tree.query(bounds)]
+            if interval:
+                rows = rows[
+                    (self.begin[rows] <= high) & (self.end[rows] >= low)
+                ]
+        else:
+            stop = np.searchsorted(self.sorted_begin, high, side='right')
+            rows = self.time_order[:stop]
+            rows = rows[self.end[rows] >= low]
+        return self.pks[rows]
+
+
+class FootprintIndex(object):
+    """ A per-process index of the footprints and time spans of all
+        EOObjects. It is loaded lazily on the first query and refreshed
+        incrementally using the ``updated`` timestamps of the objects.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._data = None
+        self._last_updated = None
+        self._next_check_time = 0
+        self._next_reload_check_time = 0
+
+    def refresh(self, force=False):
+        """ Load all objects updated since the last refresh. Performs a full
+            reload when objects were deleted in the meantime, which is checked
+            less frequently. Deleted objects only make the candidates less
+            selective in the meantime.
+
+            While another thread refreshes the index, the previous state is
+            returned instead of waiting for it, unless ``force`` is set.
+        """
+        data = self._data
+        if not force and data is not None \
+                and time.monotonic() < self._next_check_time:
+            return data
+
+        if not self._lock.acquire(blocking=force or data is None):
+            return data
+        try:
+            now = time.monotonic()
+            if not force and self._data is not None \
+                    and now < self._next_check_time:
+                return self._data
+
+            self._next_check_time = now + getattr(
+                settings, 'EOXS_SPATIAL_INDEX_REFRESH_INTERVAL',
+                DEFAULT_REFRESH_INTERVAL
+            )
+            reload_interval = getattr(
+                settings, 'EOXS_SPATIAL_INDEX_RELOAD_INTERVAL',
+                DEFAULT_RELOAD_INTERVAL
+            )
+
+            if self._last_updated is None:
+                # the initial load needs no check for deleted objects
+                self._next_reload_check_time = now + reload_interval
+
+            changed = self._update()
+            # deleted objects are not reported by the incremental update
+            if force or now >= self._next_reload_check_time:
+                self._next_reload_check_time = now + reload_interval
+                if models.EOObject.objects.count() != len(self._entries):
+                    self._entries = {}
+                    self._last_updated = None
+                    changed = self._update()
+
+            if changed or self._data is None:
+                self._data = _IndexData(self._entries)
+            return self._data
+        finally:
+            self._lock.release()
+
+    def _update(self):
+        qs = models.EOObject.objects.all()
+        if self._last_updated is not None:
+            since = self._last_updated - timedelta(seconds=getattr(
+                settings, 'EOXS_SPATIAL_INDEX_REFRESH_MARGIN',
+                DEFAULT_REFRESH_MARGIN
+            ))
+            qs = qs.filter(
+                Q(updated__gte=since)
+                | Q(coverage__parent_product__updated__gte=since)
+            )
+
+        changed = False
+        for row in qs.values_list(*INDEX_FIELDS).iterator():
+            pk = row[0]
+            entry = self._create_entry(*row[1:7])
+            if self._entries.get(pk) != entry:
+                self._entries[pk] = entry
+                changed = True
+
+            for updated in row[7:]:
+                if updated is not None and (
+                        self._last_updated is None
+                        or updated > self._last_updated):
+                    self._last_updated = updated
+        return changed
+
+    @staticmethod
+    def _create_entry(footprint, begin_time, end_time, parent_footprint,
+                      parent_begin_time, parent_end_time):
+        if footprint is None:
+            footprint = parent_footprint
+        if begin_time is None:
+            begin_time = parent_begin_time
+        if end_time is None:
+            end_time = parent_end_time
+
+        return (
+            tuple(footprint.extent) if footprint else None,
+            _timestamp(begin_time, -math.inf),
+            _timestamp(end_time, math.inf),
+        )
+
+    def query(self, geometry=None, interval=None):
+        """ Returns the primary keys of all objects possibly intersecting the
+            given geometry and overlapping the given time interval.
+
+            :param geometry: a GEOS geometry
+            :param interval: a tuple of ``(low, high)`` datetimes, each may
+                             be ``None`` for an open interval
+            :returns: a numpy array of primary keys
+        """
+        data = self.refresh()
+
+        bounds = None
+        if geometry is not None:
+            bounds = _get_bounds(geometry)
+
+        if interval:
+            low, high = interval
+            interval = (
+                _timestamp(low, -math.inf), _timestamp(high, math.inf)
+            )
+
+        return data.query(bounds, interval)
+
+
+def _get_bounds(geometry):
+    """ Returns the WGS 84 bounds of the geometry. The extent is transformed
+        with densified edges, as the edges may bulge beyond the transformed
+        corners in the target CRS.
+    """
+    if geometry.srid in (None, 4326):
+        return geometry.extent
+
+    transformation = crss.get_coordinate_transformation(geometry.srid, 4326)
+    minx, miny, maxx, maxy = transformation.TransformBounds(
+        *geometry.extent, DENSIFY_POINTS
+    )
+    # the bounds cross the antimeridian
+    if minx > maxx:
+        minx, maxx = -180.0, 180.0
+    return (minx, miny, maxx, maxy)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def is_enabled():
+    """ Returns whether the footprint index is enabled via the
+        ``EOXS_SPATIAL_INDEX`` setting.
+    """
+    return getattr(settings, 'EOXS_SPATIAL_INDEX', False)
+
+
+def get_footprint_index():
+    """ Returns the process-wide :class:`FootprintIndex`.
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = FootprintIndex()
+        return _index
+
+
+def get_candidates(geometry=None, interval=None):
+    """ Returns a list of candidate primary keys for objects matching the
+        geometry and time interval, or ``None`` when the index is disabled or
+        the candidates are not selective enough.
+    """
+    if not is_enabled() or (geometry is None and not interval):
+        return None
+
+    candidates = get_footprint_index().query(geometry, interval)
+    max_candidates = getattr(
+        settings, 'EOXS_SPATIAL_INDEX_MAX_CANDIDATES', DEFAULT_MAX_CANDIDATES
+    )
+    if len(candidates) > max_candidates:
+        return None
+    return candidates.tolist()
+
+
+def get_candidate_filter(geometry=None, interval=None):
+    """ Returns a ``Q`` object to restrict a query to the candidates of
+        :func:`get_candidates`. The ``Q`` object is empty, if no
+        pre-selection is possible.
+    """
+    candidates = get_candidates(geometry, interval)
+    if candidates is None:
+        return Q()
+    return Q(pk__in=candidates)
+
+
+@receiver(setting_changed)
+def _reset_footprint_index(setting, **kwargs):
+    global _index
+    if setting.startswith('EOXS_SPATIAL_INDEX'):
+        with _index_lock:
+            _index = None
@@ -27,21 +27,45 @@
 # THE SOFTWARE.
 # -------------------------------------------------------------------------------
 
+import os
 import sys
-from datetime import datetime, timezone
+import json
+import tempfile
+from datetime import datetime, timedelta, timezone
 
 from io import StringIO
 from textwrap import dedent
 from unittest import skipIf
 
 from django.core import management
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.gis.geos import GEOSGeometry, Polygon, MultiPolygon
 from django.utils.dateparse import parse_datetime
 
 from eoxserver.core import env
-from eoxserver.resources.coverages import models
+from eoxserver.contrib import gdal, osr
+from eoxserver.resources.coverages import models, spatialindex
 from eoxserver.resources.coverages.util import collect_eo_metadata
+from eoxserver.resources.coverages.registration.prefetch import (
+    RetryPolicy, Prefetched, CONTENT, DATA_HEADER
+)
+from eoxserver.resources.coverages.registration.stac import (
+    iter_stac_items, register_stac_products_bulk, prefetch_stac_items
+)
+from eoxserver.resources.coverages.registration.listing import (
+    register_listing
+)
+from eoxserver.resources.coverages.registration.base import (
+    parse_data_location
+)
+from eoxserver.resources.coverages.registration.timeseries import (
+    register_time_series
+)
+from eoxserver.resources.coverages.registration.exceptions import (
+    RegistrationError
+)
 from eoxserver.resources.coverages.metadata.coverage_formats import (
     native,
     eoom,
@@ -319,6 +343,41 @@ class ModelTests(GeometryMixIn, TestCase):
         self.assertEqual(rectified_1_time_extent, series_1_time_extent)
         self.assertGeometryEqual(rectified_1.footprint, series_1.footprint)
 
+    def test_bulk_insertion_and_removal(self):
+        rectified_1, rectified_2, rectified_3, series_1 = (
+            self.rectified_1,
+            self.rectified_2,
+            self.rectified_3,
+            self.series_1,
+        )
+        models.collection_insert_eo_objects(
+            series_1, [rectified_1, rectified_2, rectified_3], batch_size=2
+        )
+        series_1 = refresh(series_1)
+        self.assertEqual(series_1.coverages.count(), 3)
+
+        begin_time, end_time, all_rectified_footprints = collect_eo_metadata(
+            models.Coverage.objects.filter(
+                pk__in=[rectified_1.pk, rectified_2.pk, rectified_3.pk]
+            )
+        )
+        self.assertEqual(
+            (series_1.begin_time, series_1.end_time), (begin_time, end_time)
+        )
+        self.assertGeometryEqual(series_1.footprint, all_rectified_footprints)
+
+        models.collection_exclude_eo_objects(
+            series_1, [rectified_2, rectified_3]
+        )
+        series_1 = refresh(series_1)
+
+        self.assertEqual(list(series_1.coverages.all()), [rectified_1])
+        self.assertEqual(
+            (series_1.begin_time, series_1.end_time),
+            (rectified_1.begin_time, rectified_1.end_time)
+        )
+        self.assertGeometryEqual(rectified_1.footprint, series_1.footprint)
+
     def test_propagate_eo_metadata_change(self):
         rectified_1, series_1 = self.rectified_1, self.series_1
 
@@ -577,6 +636,487 @@ class CastingTest(TestCase):
         self.assertEqual(type(cast_object), models.Coverage)
 
 
+class FootprintIndexTestCase(TestCase):
+    def setUp(self):
+        create(
+            models.Product,
+            identifier="product-1",
+            footprint=Polygon.from_bbox((0, 0, 10, 10)),
+            begin_time=datetime(2020, 1, 1, tzinfo=utc),
+            end_time=datetime(2020, 1, 2, tzinfo=utc),
+        )
+        create(
+            models.Product,
+            identifier="product-2",
+            footprint=Polygon.from_bbox((20, 20, 30, 30)),
+            begin_time=datetime(2020, 2, 1, tzinfo=utc),
+            end_time=datetime(2020, 2, 2, tzinfo=utc),
+        )
+        create(models.Product, identifier="product-3")
+
+    def get_candidates(self, geometry=None, interval=None):
+        with self.settings(EOXS_SPATIAL_INDEX=True):
+            candidates = spatialindex.get_candidates(geometry, interval)
+        return set(
+            models.EOObject.objects.filter(
+                pk__in=candidates
+            ).values_list('identifier', flat=True)
+        )
+
+    def test_strtree(self):
+        boxes = [
+            (i, j, i + 1.5, j + 1.5) for i in range(20) for j in range(20)
+        ]
+        tree = spatialindex.STRtree(boxes, node_capacity=4)
+        bounds = (4.2, 7.7, 6.1, 8.1)
+        expected = [
+            index for index, (minx, miny, maxx, maxy) in enumerate(boxes)
+            if minx <= bounds[2] and maxx >= bounds[0]
+            and miny <= bounds[3] and maxy >= bounds[1]
+        ]
+        self.assertEqual(sorted(tree.query(bounds)), expected)
+        self.assertEqual(len(spatialindex.STRtree([]).query(bounds)), 0)
+
+    def test_candidates(self):
+        self.assertEqual(
+            self.get_candidates(Polygon.from_bbox((5, 5, 25, 6))),
+            {"product-1"}
+        )
+        self.assertEqual(
+            self.get_candidates(interval=(
+                datetime(2020, 2, 1, 12, tzinfo=utc), None
+            )),
+            {"product-2", "product-3"}
+        )
+        self.assertEqual(
+            self.get_candidates(
+                Polygon.from_bbox((0, 0, 30, 30)),
+                (None, datetime(2020, 1, 15, tzinfo=utc))
+            ),
+            {"product-1"}
+        )
+
+    @override_settings(
+        EOXS_SPATIAL_INDEX_REFRESH_INTERVAL=0,
+        EOXS_SPATIAL_INDEX_RELOAD_INTERVAL=0,
+    )
+    def test_refresh(self):
+        index = spatialindex.FootprintIndex()
+        box = Polygon.from_bbox((40, 40, 50, 50))
+        self.assertEqual(len(index.query(box)), 0)
+
+        product = models.Product.objects.get(identifier="product-1")
+        product.footprint = box
+        product.save()
+        self.assertEqual(list(index.query(box)), [product.pk])
+
+        product.delete()
+        self.assertEqual(len(index.query(box)), 0)
+
+    @override_settings(
+        EOXS_SPATIAL_INDEX_REFRESH_INTERVAL=0,
+        EOXS_SPATIAL_INDEX_RELOAD_INTERVAL=0,
+    )
+    def test_reload_interval(self):
+        index = spatialindex.FootprintIndex()
+        index.refresh()
+        with CaptureQueriesContext(connection) as queries:
+            index.refresh()
+        # within the refresh interval nothing is queried
+        self.assertEqual(len(queries), 0)
+
+        product = models.Product.objects.get(identifier="product-1")
+        product.delete()
+        with self.settings(EOXS_SPATIAL_INDEX_REFRESH_INTERVAL=0):
+            index.refresh(force=True)
+        self.assertEqual(len(index.query(product.footprint)), 0)
+
+    def test_refresh_late_commit(self):
+        index = spatialindex.FootprintIndex()
+        index.refresh()
+        box = Polygon.from_bbox((40, 40, 50, 50))
+
+        # a change committed after the last refresh, but saved before it
+        models.EOObject.objects.filter(identifier="product-1").update(
+            footprint=box,
+            updated=index._last_updated - timedelta(seconds=10),
+        )
+        self.assertEqual(
+            set(models.EOObject.objects.filter(
+                pk__in=index.query(box)
+            ).values_list('identifier', flat=True)),
+            {"product-1"}
+        )
+
+    def test_candidates_densified_bounds(self):
+        create(
+            models.Product,
+            identifier="product-polar",
+            footprint=Polygon.from_bbox((0, 85, 10, 89)),
+        )
+        # a box around the north pole, whose corners are all at about 77°N
+        geometry = Polygon.from_bbox((-1e6, -1e6, 1e6, 1e6))
+        geometry.srid = 3413
+        self.assertIn("product-polar", self.get_candidates(geometry))
+
+
+class PrefetchTestCase(TestCase):
+    def test_retry_policy(self):
+        calls = []
+
+        def flaky():
+            calls.append(None)
+            if len(calls) < 3:
+                raise IOError("temporary failure")
+            return "content"
+
+        policy = RetryPolicy(max_attempts=3, backoff=0)
+        self.assertEqual(policy.call(flaky), "content")
+        self.assertEqual(len(calls), 3)
+
+        calls.clear()
+        policy = RetryPolicy(max_attempts=2, backoff=0)
+        with self.assertRaises(IOError):
+            policy.call(flaky)
+
+    def test_prefetched_errors(self):
+        prefetched = Prefetched()
+        prefetched.set(CONTENT, "/a", b"data")
+        prefetched.set(CONTENT, "/b", error=IOError("not found"))
+
+        self.assertEqual(prefetched.get(CONTENT, "/a"), b"data")
+        self.assertFalse(prefetched.has(CONTENT, "/c"))
+        with self.assertRaises(IOError):
+            prefetched.get(CONTENT, "/b")
+
+
+class ListingRegistrationTestCase(TestCase):
+    def test_checkpoint_resume(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            checkpoint = os.path.join(tmpdir, "checkpoint")
+            locations = [["a.tif"], ["storage", "b.tif"], ["c.tif"]]
+
+            def register(location):
+                if location == ["c.tif"]:
+                    raise RegistrationError("failed")
+                return location[-1]
+
+            report = register_listing(locations, register, 1, checkpoint)
+            self.assertEqual(report.registered, 2)
+            self.assertEqual(report.failed, 1)
+
+            # resuming skips the already registered items
+            registered = []
+
+            def register_again(location):
+                registered.append(location)
+                return location[-1]
+
+            report = register_listing(
+                locations, register_again, 1, checkpoint
+            )
+            self.assertEqual(report.skipped, 2)
+            self.assertEqual(report.registered, 1)
+            self.assertEqual(registered, [["c.tif"]])
+
+    def test_prefetch_batches(self):
+        locations = [["%d.tif" % i] for i in range(5)]
+        batches = []
+
+        def prefetch(batch):
+            batches.append(batch)
+            prefetched = Prefetched()
+            for location in batch:
+                prefetched.set(CONTENT, location[-1], location[-1].upper())
+            return prefetched
+
+        def register(location, prefetched=None):
+            return prefetched.get(CONTENT, location[-1])
+
+        results = []
+        report = register_listing(
+            locations, register, 1, prefetch=prefetch, prefetch_batch_size=2,
+            progress=lambda report, location, result, error: results.append(
+                result
+            )
+        )
+        self.assertEqual(report.registered, 5)
+        self.assertEqual(
+            batches, [locations[0:2], locations[2:4], locations[4:]]
+        )
+        self.assertEqual(results, ["%d.TIF" % i for i in range(5)])
+
+
+class BulkSTACRegistrationTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.coverage_type = create(models.CoverageType, name="RGB")
+        self.product_type = create(models.ProductType, name="PT")
+        self.product_type.allowed_coverage_types.add(self.coverage_type)
+
+    def make_item(self, identifier):
+        return {
+            "type": "Feature",
+            "id": identifier,
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]],
+            },
+            "properties": {
+                "datetime": "2020-01-01T00:00:00Z",
+                "eo:cloud_cover": 10,
+                "proj:epsg": 4326,
+                "proj:shape": [100, 200],
+                "proj:transform": [0.005, 0, 0, 0, -0.01, 1],
+            },
+            "assets": {
+                "data": {
+                    "href": "/data/%s.tif" % identifier,
+                    "roles": ["data"],
+                    "raster:bands": [{"statistics": {"mean": 1.0}}],
+                },
+            },
+        }
+
+    def test_iter_stac_items(self):
+        items = [self.make_item("a"), self.make_item("b")]
+
+        ndjson = StringIO("\n".join(json.dumps(item) for item in items))
+        self.assertEqual(
+            [item["id"] for item in iter_stac_items(ndjson)], ["a", "b"]
+        )
+
+        collection = StringIO(json.dumps({
+            "type": "FeatureCollection", "features": items
+        }, indent=2))
+        self.assertEqual(
+            [item["id"] for item in iter_stac_items(collection)], ["a", "b"]
+        )
+
+    def test_register_bulk(self):
+        items = [self.make_item("item_%d" % i) for i in range(5)]
+        report = register_stac_products_bulk(
+            items, self.product_type, batch_size=2,
+            coverage_mapping={"RGB": {"assets": ["data"]}},
+        )
+
+        self.assertEqual(report.registered, 5)
+        self.assertEqual(report.batches, 3)
+        self.assertEqual(models.Product.objects.count(), 5)
+
+        coverage = models.Coverage.objects.get(identifier="item_3_data")
+        self.assertEqual(coverage.parent_product.identifier, "item_3")
+        self.assertEqual(coverage.size, [200, 100])
+        self.assertEqual(
+            coverage.arraydata_items.get().location, "data/item_3.tif"
+        )
+        self.assertEqual(
+            coverage.arraydata_items.get().array_statistics.get().mean, 1.0
+        )
+        self.assertEqual(
+            models.Product.objects.get(
+                identifier="item_3"
+            ).product_metadata.cloud_cover, 10
+        )
+
+        report = register_stac_products_bulk(
+            items[:2], self.product_type, replace=True,
+            coverage_mapping={"RGB": {"assets": ["data"]}},
+        )
+        self.assertEqual(report.replaced, 2)
+        self.assertEqual(models.Coverage.objects.count(), 5)
+
+    def test_register_bulk_collision(self):
+        create(models.Collection, identifier="item_1")
+        items = [self.make_item("item_%d" % i) for i in range(3)]
+
+        with self.assertRaisesRegex(RegistrationError, "item_1"):
+            register_stac_products_bulk(
+                items, self.product_type,
+                coverage_mapping={"RGB": {"assets": ["data"]}},
+            )
+        self.assertEqual(models.Product.objects.count(), 0)
+
+    def test_prefetch_skips_excluded_assets(self):
+        item = self.make_item("a")
+        for key in ("proj:epsg", "proj:shape", "proj:transform"):
+            del item["properties"][key]
+        item["assets"]["other"] = {
+            "href": "/data/a_other.tif",
+            "roles": ["data"],
+        }
+
+        prefetched = prefetch_stac_items(
+            [item], retry_policy=RetryPolicy(max_attempts=1),
+            include_asset=lambda stac_item, name, asset: name == "data",
+        )
+        self.assertTrue(prefetched.has(DATA_HEADER, "data/a.tif"))
+        self.assertFalse(prefetched.has(DATA_HEADER, "data/a_other.tif"))
+
+
+class ParseDataLocationTestCase(TestCase):
+    def test_plain(self):
+        self.assertEqual(
+            parse_data_location("path/to/file.tif"),
+            ("path/to/file.tif", None, None)
+        )
+
+    def test_escaped_colons(self):
+        self.assertEqual(
+            parse_data_location("C\\:/file.tif"), ("C:/file.tif", None, None)
+        )
+        self.assertEqual(
+            parse_data_location("NETCDF:file\\:1.nc:var", True),
+            ("file:1.nc", "NETCDF", "var")
+        )
+
+    def test_subdatasets(self):
+        self.assertEqual(
+            parse_data_location("NETCDF:file.nc:var:0", True),
+            ("file.nc", "NETCDF", "var:0")
+        )
+        self.assertEqual(
+            parse_data_location("NETCDF:file.nc", True),
+            ("file.nc", "NETCDF", "")
+        )
+        # without subdatasets the location is taken as-is
+        self.assertEqual(
+            parse_data_location("NETCDF:file.nc:var", False),
+            ("NETCDF:file.nc:var", None, None)
+        )
+
+
+def create_time_series(path, num_slices=3):
+    """ Writes a small netCDF cube with a time, y and x dimension and a single
+        ``temperature`` variable.
+    """
+    driver = gdal.GetDriverByName("netCDF")
+    ds = driver.CreateMultiDimensional(path)
+    root = ds.GetRootGroup()
+    float64 = gdal.ExtendedDataType.Create(gdal.GDT_Float64)
+
+    dimensions = []
+    for name, dim_type, values, unit in [
+        ("time", gdal.DIM_TYPE_TEMPORAL, list(range(num_slices)),
+         "days since 2020-01-01"),
+        ("y", gdal.DIM_TYPE_HORIZONTAL_Y, [45.75, 45.25], "degrees_north"),
+        ("x", gdal.DIM_TYPE_HORIZONTAL_X, [10.25, 10.75, 11.25],
+         "degrees_east"),
+    ]:
+        dimension = root.CreateDimension(name, dim_type, None, len(values))
+        variable = root.CreateMDArray(name, [dimension], float64)
+        variable.Write(values)
+        variable.SetUnit(unit)
+        dimension.SetIndexingVariable(variable)
+        dimensions.append(dimension)
+
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(4326)
+    temperature = root.CreateMDArray("temperature", dimensions, float64)
+    temperature.SetSpatialRef(srs)
+    temperature.Write([float(i) for i in range(num_slices * 2 * 3)])
+    ds = None
+
+
+@skipIf(
+    gdal.GetDriverByName("netCDF") is None, "netCDF driver not available"
+)
+class TimeSeriesRegistrationTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, "cube.nc")
+        create_time_series(self.path)
+
+        coverage_type = create(models.CoverageType, name="temperature")
+        create(
+            models.FieldType, coverage_type=coverage_type, index=0,
+            identifier="temperature", is_float=True,
+        )
+        product_type = create(models.ProductType, name="cube")
+        product_type.allowed_coverage_types.add(coverage_type)
+
+    def register(self, collection_identifier, bulk):
+        collection = create(
+            models.Collection, identifier=collection_identifier
+        )
+        register_time_series(
+            collection=collection,
+            storage=None,
+            path=self.path,
+            product_type_name="cube",
+            coverage_type_mapping={"temperature": "temperature"},
+            x_dim_name="x",
+            y_dim_name="y",
+            time_dim_name="time",
+            product_template=(
+                "{collection_identifier}_{file_identifier}_{index}"
+            ),
+            replace=False,
+            bulk=bulk,
+            batch_size=2,
+        )
+        return collection
+
+    def describe(self, collection):
+        """ Returns the registered values, independent of the collection
+            identifier and database keys.
+        """
+        prefix = collection.identifier + "_"
+        products = models.Product.objects.filter(
+            collections=collection
+        ).order_by("begin_time")
+        described = []
+        for product in products:
+            coverage = product.coverages.get()
+            arraydata_item = coverage.arraydata_items.get()
+            grid = coverage.grid
+            described.append((
+                product.identifier[len(prefix):],
+                product.begin_time,
+                product.end_time,
+                product.footprint.wkt,
+                product.product_type.name,
+                coverage.identifier[len(prefix):],
+                coverage.coverage_type.name,
+                coverage.footprint.wkt,
+                coverage.size,
+                coverage.origin,
+                (
+                    grid.coordinate_reference_system,
+                    grid.axis_1_name, grid.axis_2_name,
+                    grid.axis_1_type, grid.axis_2_type,
+                    grid.axis_1_offset, grid.axis_2_offset,
+                ),
+                arraydata_item.location,
+                arraydata_item.format,
+                arraydata_item.subdataset_type,
+                arraydata_item.subdataset_locator,
+                arraydata_item.band_count,
+            ))
+        return described
+
+    def test_bulk_matches_per_slice(self):
+        per_slice = self.register("per_slice", bulk=False)
+        bulk = self.register("bulk", bulk=True)
+
+        expected = self.describe(per_slice)
+        self.assertEqual(len(expected), 3)
+        self.assertEqual(self.describe(bulk), expected)
+
+        # both paths share a single grid for all slices
+        self.assertEqual(
+            models.Coverage.objects.values("grid").distinct().count(), 1
+        )
+
+        per_slice.refresh_from_db()
+        bulk.refresh_from_db()
+        self.assertEqual(bulk.begin_time, per_slice.begin_time)
+        self.assertEqual(bulk.end_time, per_slice.end_time)
+        self.assertEqual(bulk.footprint.wkt, per_slice.footprint.wkt)
+
+
 class CommandTestCaseMixIn(object):
     def call_command(self, command_name, *args, **kwargs):
         stdout = StringIO()
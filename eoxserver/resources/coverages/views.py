@@ -93,7 +93,8 @@ def metadata(request, identifier, semantic):
 
     return VSIFileResponse(
         vsi_open(metadata_item),
-        content_type=metadata_item.format
+        content_type=metadata_item.format,
+        request=request,
     )
 
 
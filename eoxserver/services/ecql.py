@@ -25,13 +25,65 @@
 # THE SOFTWARE.
 # ------------------------------------------------------------------------------
 
+import time
+from functools import lru_cache
+
 from pycql import parse, get_repr
 from pycql.integrations.django import to_filter
 
+try:
+    from prometheus_client import Counter, Histogram
+except ImportError:
+    Counter = Histogram = None
 
 from .filters import get_field_mapping_for_model
 
 
+#: the maximum number of compiled CQL filters kept in memory
+CQL_CACHE_SIZE = 256
+
+if Histogram is not None:
+    CQL_COMPILE_SECONDS = Histogram(
+        'eoxserver_cql_compile_seconds',
+        'Time spent to parse and translate CQL filters',
+        ['step']
+    )
+    CQL_COMPILATIONS = Counter(
+        'eoxserver_cql_compilations',
+        'Number of CQL filters compiled, i.e. not found in the cache'
+    )
+else:
+    CQL_COMPILE_SECONDS = CQL_COMPILATIONS = None
+
+
+@lru_cache(maxsize=CQL_CACHE_SIZE)
+def compile_filter(cql, model_class):
+    """ Compiles the given CQL string to a filter expression for the given
+        model class. The results are cached, so that repeated filters are
+        neither parsed nor translated again. The returned object is shared
+        and must not be modified.
+
+        :param cql: a string containing the CQL expressions
+        :param model_class: the model to determine the field mappings
+        :returns: the compiled filters
+        :rtype: :class:`django.db.models.Q`
+    """
+    mapping, mapping_choices = get_field_mapping_for_model(model_class)
+
+    start = time.perf_counter()
+    ast = parse(cql)
+    parsed = time.perf_counter()
+    filters = to_filter(ast, mapping, mapping_choices)
+    translated = time.perf_counter()
+
+    if CQL_COMPILE_SECONDS is not None:
+        CQL_COMPILE_SECONDS.labels('parse').observe(parsed - start)
+        CQL_COMPILE_SECONDS.labels('translate').observe(translated - parsed)
+        CQL_COMPILATIONS.inc()
+
+    return filters
+
+
 def apply(qs, cql, exclude=False):
     """ Applies a given CQL filter on a passed queryset. The field mapping is
         deducted from the model of the passed queryset.
@@ -45,10 +97,7 @@ def apply(qs, cql, exclude=False):
         :returns: A new queryset object representing the filtered queryset.
         :rtype: :class:`django.db.models.QuerySet`
     """
-    mapping, mapping_choices = get_field_mapping_for_model(qs.model)
-    ast = parse(cql)
-
-    filters = to_filter(ast, mapping, mapping_choices)
+    filters = compile_filter(cql, qs.model)
     if exclude:
         return qs.exclude(filters)
     else:
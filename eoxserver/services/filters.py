@@ -29,6 +29,7 @@
 from operator import and_, or_, add, sub, mul, truediv as div
 from datetime import datetime, timedelta
 from collections import OrderedDict
+from functools import lru_cache
 
 from django.db.models import Q, F, ForeignKey, Value
 from django.db.models.expressions import Expression
@@ -526,8 +527,11 @@ def arithmetic(lhs, rhs, op):
     return func(lhs, rhs)
 
 
+@lru_cache(maxsize=None)
 def get_field_mapping_for_model(model_class, strict=False):
     """ Utility function to get the metadata mapping for a specific model class.
+        The mappings are only computed once per model class, the returned
+        dictionaries are shared and must not be modified.
 
         :param model_class: The django database model to create the mapping for
         :param strict: Whether only the related metadata attributes shall be
@@ -0,0 +1,88 @@
+# ------------------------------------------------------------------------------
+#
+# Project: EOxServer <http://eoxserver.org>
+#
+# ------------------------------------------------------------------------------
+# Copyright (C) 2026 EOX IT Services GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies of this Software or works derived from this Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# ------------------------------------------------------------------------------
+
+""" This module provides a cache for encoded XML fragments of EOObjects,
+    e.g. their EO metadata. The fragments are stored serialized per object,
+    encoder and version and are invalidated by the ``updated`` timestamp of
+    the object.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from lxml import etree
+
+import eoxserver
+
+
+def get_fragment_cache():
+    """ Returns the Django cache configured via the ``EOXS_FRAGMENT_CACHE``
+        setting or ``None`` if fragment caching is disabled.
+    """
+    alias = getattr(settings, 'EOXS_FRAGMENT_CACHE', None)
+    if not alias:
+        return None
+    return caches[alias]
+
+
+def get_fragment_key(name, identifier, updated):
+    """ Returns the cache key for the fragments of the given encoder name
+        and object identifier in the version identified by ``updated``.
+    """
+    digest = hashlib.sha1(
+        ("%s:%s" % (name, identifier)).encode('utf-8')
+    ).hexdigest()
+    return "eoxs-fragment:%s:%s:%s" % (
+        eoxserver.__version__, digest, updated.isoformat()
+    )
+
+
+def cached_fragments(name, eo_object, encode):
+    """ Returns the XML elements encoded by ``encode`` for the given object.
+        When available, the elements are parsed from their serialized version
+        in the fragment cache instead of being encoded again.
+
+        :param name: a unique name of the encoder and its version
+        :param eo_object: the object to encode the fragments for. Its
+                          ``updated`` timestamp is used to invalidate the
+                          cached fragments.
+        :param encode: a callable returning a list of XML elements
+        :returns: a list of XML elements
+    """
+    cache = get_fragment_cache()
+    updated = getattr(eo_object, 'updated', None)
+    if cache is None or updated is None:
+        return encode()
+
+    key = get_fragment_key(name, eo_object.identifier, updated)
+    fragments = cache.get(key)
+    if fragments is not None:
+        return [etree.fromstring(fragment) for fragment in fragments]
+
+    elements = encode()
+    cache.set(key, [etree.tostring(element) for element in elements])
+    return elements
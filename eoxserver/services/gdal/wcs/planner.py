@@ -0,0 +1,141 @@
+# ------------------------------------------------------------------------------
+#
+# Project: EOxServer <http://eoxserver.org>
+#
+# ------------------------------------------------------------------------------
+# Copyright (C) 2026 EOX IT Services GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies of this Software or works derived from this Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# ------------------------------------------------------------------------------
+
+
+""" This module provides the planning of pixel windows to be read for scaled
+GetCoverage requests. When the requested output is smaller than the source
+window, the coarsest overview still providing the requested resolution is
+selected and the window is translated to the pixel space of that overview.
+"""
+
+from collections import namedtuple
+import math
+
+from eoxserver.core.util.rect import Rect
+
+
+class WindowPlan(namedtuple('WindowPlan', [
+            'overview_level', 'src_rect', 'dst_size'
+        ])):
+    """ The result of the window planning.
+
+    :param overview_level: the index of the overview to read from or ``None``
+                           when reading from the full resolution
+    :param src_rect: the :class:`Rect <eoxserver.core.util.rect.Rect>` to read,
+                     in the pixel space of the selected overview
+    :param dst_size: the 2-tuple of the output size in pixels
+    """
+
+    __slots__ = ()
+
+
+def get_overview_sizes(dataset):
+    """ Returns the list of overview sizes of the first band of the given
+        dataset, as 2-tuples in ascending overview index.
+    """
+    band = dataset.GetRasterBand(1)
+    sizes = []
+    for i in range(band.GetOverviewCount()):
+        overview = band.GetOverview(i)
+        sizes.append((overview.XSize, overview.YSize))
+    return sizes
+
+
+def select_overview_level(full_size, overview_sizes, src_size, dst_size):
+    """ Selects the coarsest overview that still provides at least the
+        requested resolution.
+
+    :param full_size: the 2-tuple full resolution size of the dataset
+    :param overview_sizes: the list of 2-tuples of available overview sizes
+    :param src_size: the 2-tuple size of the source window in full resolution
+    :param dst_size: the 2-tuple of the requested output size
+    :returns: the index of the overview or ``None`` if the full resolution
+              shall be used
+    """
+    full_x, full_y = full_size
+    src_x, src_y = src_size
+    dst_x, dst_y = dst_size
+
+    level = None
+    level_size_x = full_x
+    for i, (overview_x, overview_y) in enumerate(overview_sizes):
+        if overview_x >= level_size_x:
+            continue
+
+        factor_x = overview_x / float(full_x)
+        factor_y = overview_y / float(full_y)
+        if src_x * factor_x >= dst_x and src_y * factor_y >= dst_y:
+            level = i
+            level_size_x = overview_x
+
+    return level
+
+
+def plan_window(dataset, src_rect, dst_size):
+    """ Plans the minimal window to read from the given dataset to produce an
+        output of ``dst_size`` for the full resolution window ``src_rect``.
+
+    :param dataset: the :class:`GDAL Dataset <eoxserver.contrib.gdal.Dataset>`
+                    to read from
+    :param src_rect: the :class:`Rect <eoxserver.core.util.rect.Rect>` in full
+                     resolution pixel coordinates
+    :param dst_size: the 2-tuple of the requested output size
+    :returns: a :class:`WindowPlan`
+    """
+    full_size = (dataset.RasterXSize, dataset.RasterYSize)
+    if dst_size[0] >= src_rect.size_x and dst_size[1] >= src_rect.size_y:
+        return WindowPlan(None, src_rect, dst_size)
+
+    overview_sizes = get_overview_sizes(dataset)
+    level = select_overview_level(
+        full_size, overview_sizes, src_rect.size, dst_size
+    )
+    if level is None:
+        return WindowPlan(None, src_rect, dst_size)
+
+    return WindowPlan(
+        level,
+        scale_rect(src_rect, full_size, overview_sizes[level]),
+        dst_size
+    )
+
+
+def scale_rect(rect, full_size, overview_size):
+    """ Translates a rect in full resolution pixel coordinates to the
+        smallest enclosing rect in the pixel space of an overview.
+    """
+    factor_x = overview_size[0] / float(full_size[0])
+    factor_y = overview_size[1] / float(full_size[1])
+
+    offset_x = max(0, int(math.floor(rect.offset_x * factor_x)))
+    offset_y = max(0, int(math.floor(rect.offset_y * factor_y)))
+    upper_x = min(overview_size[0], int(math.ceil(rect.upper_x * factor_x)))
+    upper_y = min(overview_size[1], int(math.ceil(rect.upper_y * factor_y)))
+
+    return Rect(
+        offset_x, offset_y,
+        max(1, upper_x - offset_x), max(1, upper_y - offset_y)
+    )
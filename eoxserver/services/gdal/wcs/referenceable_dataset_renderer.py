@@ -26,7 +26,8 @@
 # ------------------------------------------------------------------------------
 
 
-from os.path import abspath
+from os.path import abspath, join
+import tempfile
 from datetime import datetime
 from uuid import uuid4
 import logging
@@ -39,8 +40,10 @@ from eoxserver.core.util.rect import Rect
 from eoxserver.contrib import gdal, osr
 from eoxserver.contrib.vrt import VRTBuilder
 from eoxserver.services.ows.version import Version
-from eoxserver.services.result import ResultFile, ResultBuffer
+from eoxserver.services.result import ResultVSIFile, ResultBuffer
 from eoxserver.services.ows.wcs.v20.encoders import WCS20EOXMLEncoder
+from eoxserver.services.ows.wcs.v20.util import get_scaled_size
+from eoxserver.services.gdal.wcs.planner import plan_window
 from eoxserver.services.exceptions import (
     RenderException, OperationNotSupportedException
 )
@@ -87,11 +90,13 @@ class GDALReferenceableDatasetRenderer(object):
         if not frmt:
             raise RenderException("No format specified.", "format")
 
+        # apply any scaling to the output size and plan the window to read,
+        # preferably from an overview
         if params.scalefactor is not None or params.scales:
-            raise RenderException(
-                "ReferenceableDataset cannot be scaled.",
-                "scalefactor" if params.scalefactor is not None else "scale"
-            )
+            dst_rect = Rect(0, 0, *get_scaled_size(
+                src_rect.size, params.scalefactor, params.scales
+            ))
+        plan = plan_window(src_ds, src_rect, dst_rect.size)
 
         maxsize = WCSConfigReader(get_eoxserver_config()).maxsize
         if maxsize is not None:
@@ -105,7 +110,7 @@ class GDALReferenceableDatasetRenderer(object):
 
         # perform subsetting either with or without rangesubsetting
         subsetted_ds = self.perform_subset(
-            src_ds, range_type, src_rect, dst_rect, params.rangesubset
+            src_ds, range_type, src_rect, dst_rect, params.rangesubset, plan
         )
 
         # encode the processed dataset and save it to the filesystem
@@ -120,28 +125,35 @@ class GDALReferenceableDatasetRenderer(object):
         time_stamp = datetime.now().strftime("%Y%m%d%H%M%S")
         filename_base = "%s_%s" % (coverage.identifier, time_stamp)
 
+        file_list = out_ds.GetFileList()
+        multipart = bool(
+            params.mediatype and params.mediatype.startswith("multipart")
+        )
+        encoder_subset = None
+        if multipart and subsets.has_x and subsets.has_y:
+            footprint = GEOSGeometry(reftools.get_footprint_wkt(out_ds))
+            if not subsets.srid:
+                extent = footprint.extent
+            else:
+                extent = subsets.xy_bbox
+            encoder_subset = (
+                subsets.srid, dst_rect.size, extent, footprint
+            )
+
+        # close the dataset to flush it, the outputs are then streamed from
+        # the files in chunks
+        out_ds = None
+
         result_set = [
-            ResultFile(
+            ResultVSIFile(
                 path, mime_type, "%s.%s" % (filename_base, extension),
                 ("cid:coverage/%s" % coverage.identifier) if i == 0 else None
-            ) for i, path in enumerate(out_ds.GetFileList())
+            ) for i, path in enumerate(file_list)
         ]
 
-        if params.mediatype and params.mediatype.startswith("multipart"):
+        if multipart:
             reference = "cid:coverage/%s" % result_set[0].filename
 
-            if subsets.has_x and subsets.has_y:
-                footprint = GEOSGeometry(reftools.get_footprint_wkt(out_ds))
-                if not subsets.srid:
-                    extent = footprint.extent
-                else:
-                    extent = subsets.xy_bbox
-                encoder_subset = (
-                    subsets.srid, src_rect.size, extent, footprint
-                )
-            else:
-                encoder_subset = None
-
             encoder = WCS20EOXMLEncoder()
             content = encoder.serialize(
                 encoder.encode_referenceable_dataset(
@@ -222,8 +234,16 @@ class GDALReferenceableDatasetRenderer(object):
         return src_rect, dst_rect
 
     def perform_subset(self, src_ds, range_type, subset_rect, dst_rect,
-                       rangesubset=None):
-        vrt = VRTBuilder(*subset_rect.size)
+                       rangesubset=None, plan=None):
+        vrt = VRTBuilder(*dst_rect.size)
+
+        # the window to read, possibly from an overview
+        if plan is not None:
+            read_rect = plan.src_rect
+            overview_level = plan.overview_level
+        else:
+            read_rect = subset_rect
+            overview_level = None
 
         input_bands = list(range_type)
 
@@ -237,11 +257,15 @@ class GDALReferenceableDatasetRenderer(object):
             input_band = input_bands[src_index-1]
             vrt.add_band(input_band.data_type)
             vrt.add_simple_source(
-                dst_index, src_ds, src_index, subset_rect, dst_rect
+                dst_index, src_ds, src_index, read_rect, dst_rect,
+                overview_level
             )
 
         vrt.copy_metadata(src_ds)
-        vrt.copy_gcps(src_ds, subset_rect)
+        vrt.copy_gcps(src_ds, subset_rect, (
+            dst_rect.size_x / float(subset_rect.size_x),
+            dst_rect.size_y / float(subset_rect.size_y)
+        ))
 
         return vrt.dataset
 
@@ -254,7 +278,7 @@ class GDALReferenceableDatasetRenderer(object):
             ("%s=%s" % key, value) for key, value in options
         ]
 
-        path = "/tmp/%s" % uuid4().hex
+        path = join(tempfile.gettempdir(), uuid4().hex)
         out_driver = gdal.GetDriverByName("GTiff")
         return out_driver.CreateCopy(path, dataset, True, args), out_driver
 
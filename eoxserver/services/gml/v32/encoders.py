@@ -29,6 +29,7 @@ from lxml.builder import ElementMaker
 
 from eoxserver.core.util.xmltools import NameSpace, NameSpaceMap
 from eoxserver.core.util.timetools import isoformat
+from eoxserver.core.util.geotools import get_polygons, format_coordinates
 from eoxserver.resources.coverages import crss
 
 # namespace declarations
@@ -47,11 +48,11 @@ EOP = ElementMaker(namespace=ns_eop.uri, nsmap=nsmap)
 
 
 class GML32Encoder(object):
-    def encode_linear_ring(self, ring, sr):
-        frmt = "%.3f %.3f" if sr.projected else "%.8f %.8f"
-
-        swap = crss.getAxesSwapper(sr.srid)
-        pos_list = " ".join(frmt % swap(*point) for point in ring)
+    def encode_linear_ring(self, ring, srid):
+        pos_list = format_coordinates(
+            ring, 3 if crss.isProjected(srid) else 8,
+            crss.hasSwappedAxes(srid)
+        )
 
         return GML("LinearRing",
             GML("posList",
@@ -60,26 +61,36 @@ class GML32Encoder(object):
         )
 
     def encode_polygon(self, polygon, base_id):
+        return self._encode_polygon_rings(
+            get_polygons(polygon)[0], polygon.srid, base_id
+        )
+
+    def _encode_polygon_rings(self, rings, srid, base_id):
         return GML("Polygon",
             GML("exterior",
-                self.encode_linear_ring(polygon[0], polygon.srs)
+                self.encode_linear_ring(rings[0], srid)
             ),
             *(GML("interior",
-                self.encode_linear_ring(interior, polygon.srs)
-            ) for interior in polygon[1:]),
+                self.encode_linear_ring(interior, srid)
+            ) for interior in rings[1:]),
             **{ns_gml("id"): "polygon_%s" % base_id}
         )
 
     def encode_multi_surface(self, geom, base_id):
+        # extract the coordinates of all polygons at once
+        polygons = get_polygons(geom)
         if geom.geom_typeid in (6, 7):  # MultiPolygon and GeometryCollection
             polygons = [
-                self.encode_polygon(polygon, "%s_%d" % (base_id, i+1))
-                for i, polygon in enumerate(geom)
+                self._encode_polygon_rings(
+                    rings, geom.srid, "%s_%d" % (base_id, i+1)
+                )
+                for i, rings in enumerate(polygons)
             ]
-        elif geom.geom_typeid == 3:     # Polygon
-            polygons = [self.encode_polygon(geom, base_id)]
         else:
-            polygons = []
+            polygons = [
+                self._encode_polygon_rings(rings, geom.srid, base_id)
+                for rings in polygons
+            ]
 
         return GML("MultiSurface",
             *[GML("surfaceMember", polygon) for polygon in polygons],
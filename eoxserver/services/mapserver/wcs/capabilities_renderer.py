@@ -30,7 +30,7 @@ from lxml import etree
 from eoxserver.core.config import get_eoxserver_config
 from eoxserver.contrib.mapserver import create_request, Map, Layer, set_metadata
 from eoxserver.resources.coverages import crss
-from eoxserver.render.coverage.objects import Coverage
+from eoxserver.render.coverage.objects import from_models
 from eoxserver.services.mapserver.wcs.base_renderer import BaseRenderer
 from eoxserver.services.ows.common.config import CapabilitiesConfigReader
 from eoxserver.services.ows.version import Version
@@ -88,10 +88,17 @@ class MapServerWCSCapabilitiesRenderer(BaseRenderer):
         for outputformat in self.get_all_outputformats(False):
             map_.appendOutputFormat(outputformat)
 
-        for coverage in params.coverages:
-            layer = Layer(coverage.identifier)
+        formats = " ".join([f.wcs10name for f in self.get_wcs_formats()])
+        supported_crss = " ".join(
+            crss.getSupportedCRS_WCS(format_function=crss.asShortCode)
+        )
 
-            render_coverage = Coverage.from_model(coverage)
+        # create the render coverages of all models in one batch
+        for render_coverage in from_models(params.coverages):
+            if render_coverage is None:
+                continue
+
+            layer = Layer(render_coverage.identifier)
             layer.setProjection(render_coverage.grid.spatial_reference.proj)
             extent = render_coverage.extent
             size = render_coverage.size
@@ -100,13 +107,13 @@ class MapServerWCSCapabilitiesRenderer(BaseRenderer):
 
             layer.setExtent(*extent)
             set_metadata(layer.metadata, {
-                "title": coverage.identifier,
-                "label": coverage.identifier,
+                "title": render_coverage.identifier,
+                "label": render_coverage.identifier,
                 "extent": "%.10g %.10g %.10g %.10g" % extent,
                 "resolution": "%.10g %.10g" % resolution,
                 "size": "%d %d" % size,
-                "formats": " ".join([f.wcs10name for f in self.get_wcs_formats()]),
-                "srs": " ".join(crss.getSupportedCRS_WCS(format_function=crss.asShortCode)),
+                "formats": formats,
+                "srs": supported_crss,
             }, namespace="wcs")
 
             map_.insertLayer(layer)
@@ -32,7 +32,7 @@ from urllib.parse import unquote
 from lxml import etree
 
 from eoxserver.contrib import mapserver as ms
-from eoxserver.contrib import gdal, vsi
+from eoxserver.contrib import gdal
 from eoxserver.render.coverage import objects
 from eoxserver.resources.coverages import models, crss
 from eoxserver.resources.coverages.formats import getFormatRegistry
@@ -45,7 +45,9 @@ from eoxserver.services.mapserver.wcs.base_renderer import (
     BaseRenderer, is_format_supported
 )
 from eoxserver.services.ows.version import Version
-from eoxserver.services.result import result_set_from_raw_data, ResultBuffer
+from eoxserver.services.result import (
+    result_set_from_raw_data, result_item_to_vsi_file, ResultBuffer
+)
 from eoxserver.services.exceptions import (
     RenderException, OperationNotSupportedException,
     InterpolationMethodNotSupportedException, InvalidOutputCrsException
@@ -170,13 +172,20 @@ class RectifiedCoverageMapServerRenderer(BaseRenderer):
             # perform any required layer related cleanup
             connector.disconnect(coverage, data_locations, layer, {})
 
+        # MapServer hands over the complete output as a single buffer. The
+        # result items only reference it, so no further copies are made
         result_set = result_set_from_raw_data(raw_result)
+        del raw_result
 
         if params.version == Version(2, 0):
             mediatype = getattr(params, "mediatype", None)
             if mediatype in ("multipart/mixed", "multipart/related"):
-                with vsi.TemporaryVSIFile.from_buffer(result_set[1].data) as f:
-                    ds = gdal.Open(f.name)
+                # move the coverage to a VSI file: it has to be opened to
+                # encode its description anyways and the raw buffer is
+                # released when the XML part is replaced below
+                result_set[1] = result_item_to_vsi_file(result_set[1])
+                try:
+                    ds = gdal.Open(result_set[1].path)
                     grid = objects.Grid.from_gdal_dataset(ds)
 
                     # get the output CRS definition
@@ -187,45 +196,51 @@ class RectifiedCoverageMapServerRenderer(BaseRenderer):
 
                     origin = objects.Origin.from_gdal_dataset(ds)
                     size = [ds.RasterXSize, ds.RasterYSize]
+                    ds = None
+
+                    range_type = coverage.range_type
+                    if params.rangesubset:
+                        range_type = range_type.subset(params.rangesubset)
+
+                    coverage._grid = grid
+                    coverage._origin = origin
+                    coverage._size = size
+                    coverage._range_type = range_type
+                    if isinstance(result_set[1].filename, bytes):
+                        file_name = result_set[1].filename.decode()
+                    else:
+                        file_name = result_set[1].filename
 
-                range_type = coverage.range_type
-                if params.rangesubset:
-                    range_type = range_type.subset(params.rangesubset)
-
-                coverage._grid = grid
-                coverage._origin = origin
-                coverage._size = size
-                coverage._range_type = range_type
-                if isinstance(result_set[1].filename, bytes):
-                    file_name = result_set[1].filename.decode()
-                else:
-                    file_name = result_set[1].filename
+                    reference = 'cid:coverage/%s' % file_name
 
-                reference = 'cid:coverage/%s' % file_name
+                    encoder = WCS20EOXMLEncoder()
 
-                encoder = WCS20EOXMLEncoder()
+                    if not isinstance(coverage, objects.Mosaic):
+                        tree = encoder.encode_rectified_dataset(
+                            coverage,
+                            getattr(params, "http_request", None),
+                            reference,
+                            mime_type,
+                            subsets.bounding_polygon(coverage)
+                            if subsets else None
+                        )
+                    else:
+                        tree = encoder.encode_rectified_stitched_mosaic(
+                            coverage,
+                            getattr(params, "http_request", None),
+                            reference,
+                            mime_type,
+                            subsets.bounding_polygon(coverage)
+                            if subsets else None
+                        )
 
-                if not isinstance(coverage, objects.Mosaic):
-                    tree = encoder.encode_rectified_dataset(
-                        coverage,
-                        getattr(params, "http_request", None),
-                        reference,
-                        mime_type,
-                        subsets.bounding_polygon(coverage) if subsets else None
-                    )
-                else:
-                    tree = encoder.encode_rectified_stitched_mosaic(
-                        coverage,
-                        getattr(params, "http_request", None),
-                        reference,
-                        mime_type,
-                        subsets.bounding_polygon(coverage) if subsets else None
+                    result_set[0] = ResultBuffer(
+                        encoder.serialize(tree),
+                        encoder.content_type
                     )
-
-                result_set[0] = ResultBuffer(
-                    encoder.serialize(tree),
-                    encoder.content_type
-                )
+                except Exception:
+                    result_set[1].delete()
+                    raise
 
         # "default" response
         return result_set
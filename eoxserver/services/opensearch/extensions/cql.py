@@ -27,7 +27,7 @@
 
 from eoxserver.core.decoders import kvp
 from eoxserver.core.util.xmltools import NameSpace
-from eoxserver.services import filters, ecql
+from eoxserver.services import ecql
 
 
 class CQLExtension(object):
@@ -40,14 +40,11 @@ class CQLExtension(object):
     )
 
     def filter(self, qs, parameters):
-        mapping, mapping_choices = filters.get_field_mapping_for_model(qs.model)
         decoder = CQLExtensionDecoder(parameters)
 
         cql_text = decoder.cql
         if cql_text:
-            ast = ecql.parse(cql_text)
-            filter_expressions = ecql.to_filter(ast, mapping, mapping_choices)
-
+            filter_expressions = ecql.compile_filter(cql_text, qs.model)
             qs = qs.filter(filter_expressions)
 
         return qs
@@ -31,6 +31,7 @@ from django.contrib.gis.measure import D
 
 from eoxserver.core.decoders import kvp, enum
 from eoxserver.core.util.xmltools import NameSpace
+from eoxserver.resources.coverages import spatialindex
 
 
 class GeoExtension(object):
@@ -55,6 +56,10 @@ class GeoExtension(object):
         uid = decoder.uid
 
         if geom:
+            if relation in ("intersects", "contains"):
+                # pre-select the candidates using the in-process index
+                qs = qs.filter(spatialindex.get_candidate_filter(geom))
+
             if relation == "intersects":
                 qs = qs.filter(footprint__intersects=geom)
             elif relation == "contains":
@@ -73,6 +78,9 @@ class GeoExtension(object):
                 qs = qs.filter(footprint__distance_gt=(geom, distance))
         elif lon is not None and lat is not None:
             geom = Point(lon, lat)
+            if relation in ("intersects", "contains"):
+                qs = qs.filter(spatialindex.get_candidate_filter(geom))
+
             if relation == "intersects":
                 qs = qs.filter(footprint__intersects=geom)
             elif relation == "contains":
@@ -46,6 +46,7 @@ from eoxserver.core.util.timetools import isoformat
 from eoxserver.core.util.xmltools import NameSpace, NameSpaceMap
 from eoxserver.resources.coverages import models
 from eoxserver.services.gml.v32.encoders import GML32Encoder
+from eoxserver.services.fragments import cached_fragments
 from eoxserver.services.opensearch.config import (
     DEFAULT_EOXS_RESULT_ITEM_FEED_LINK_GENERATORS,
     DEFAULT_EOXS_OPENSEARCH_GETCOVERAGE_HTML_EXCEPTION,
@@ -121,7 +122,7 @@ class BaseOGRResultFormat(object):
         """Set the values and the geometry of the feature. This needs to be
         inline with the :meth:`create_fields` method.
         """
-        feature.SetGeometry(ogr.CreateGeometryFromWkb(str(eo_object.footprint.wkb)))
+        feature.SetGeometry(ogr.CreateGeometryFromWkb(bytes(eo_object.footprint.wkb)))
         feature.SetField("id", eo_object.identifier.encode("utf-8"))
         if eo_object.begin_time:
             feature.SetField("begin_time", isoformat(eo_object.begin_time))
@@ -453,6 +454,12 @@ class BaseFeedResultFormat(object):
         return [EOXS("coverageId", coverage.identifier) for coverage in coverages]
 
     def encode_spatio_temporal(self, item):
+        return cached_fragments(
+            "opensearch:spatio-temporal", item,
+            lambda: self._encode_spatio_temporal(item)
+        )
+
+    def _encode_spatio_temporal(self, item):
         entries = []
 
         begin_time = item.begin_time
@@ -41,13 +41,24 @@ nsmap = NameSpaceMap(ns_ows10, ns_ows11, ns_ows20)
 
 def get_decoder(request):
     """ Convenience function to return the right OWS Common request deocder for
-        the given `django.http.HttpRequest`.
+        the given `django.http.HttpRequest`. The decoder is created only once
+        per request.
     """
+    try:
+        return request._ows_common_decoder
+    except AttributeError:
+        pass
+
     if request.method == "GET":
-        return OWSCommonKVPDecoder(request.GET)
+        decoder = OWSCommonKVPDecoder(request.GET)
     elif request.method == "POST":
         # TODO: this may also be in a different format.
-        return OWSCommonXMLDecoder(request.body)
+        decoder = OWSCommonXMLDecoder(request.body)
+    else:
+        decoder = None
+
+    request._ows_common_decoder = decoder
+    return decoder
 
 
 class OWSCommonKVPDecoder(kvp.Decoder):
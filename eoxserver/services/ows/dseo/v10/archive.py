@@ -0,0 +1,265 @@
+# ------------------------------------------------------------------------------
+#
+# Project: EOxServer <http://eoxserver.org>
+#
+# ------------------------------------------------------------------------------
+# Copyright (C) 2026 EOX IT Services GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies of this Software or works derived from this Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# ------------------------------------------------------------------------------
+
+""" Helpers to stream products as ZIP archives for DSEO GetProduct requests.
+
+Already compressed formats (e.g. GeoTIFF or JPEG 2000 payloads) are stored
+instead of being deflated again, remote data items are read ahead in a
+background thread while the preceding entry is streamed and for archives
+consisting of stored entries only, the total size can be computed upfront.
+"""
+
+import os
+from os.path import splitext, normpath
+import threading
+import queue
+import time
+from zipfile import ZIP64_LIMIT
+
+from django.conf import settings
+import zipstream
+
+from eoxserver.contrib import gdal, vsi
+from eoxserver.backends.access import get_vsi_path, get_vsi_env
+
+
+DEFAULT_STORED_FORMATS = (
+    'image/tiff', 'image/jp2', 'image/jpeg', 'image/png', 'image/gif',
+    'image/webp', 'application/zip', 'application/gzip',
+    'application/x-bzip2', 'application/x-xz',
+    '.tif', '.tiff', '.jp2', '.j2k', '.jpg', '.jpeg', '.png', '.gif', '.webp',
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.zst', '.7z',
+)
+
+DEFAULT_READ_AHEAD = 16
+
+CHUNK_SIZE = 65536
+
+# seconds a read ahead thread and its consumer wait for each other
+READ_AHEAD_TIMEOUT = 60
+
+# sizes of the structures written by zipstream for each entry: local file
+# header, data descriptor and central directory record, and the end of
+# central directory record
+LOCAL_HEADER_SIZE = 30
+DATA_DESCRIPTOR_SIZE = 16
+CENTRAL_DIRECTORY_SIZE = 46
+END_RECORD_SIZE = 22
+
+
+def get_compress_type(filename, format=None):
+    """ Returns the ZIP compression type for a file: ``ZIP_STORED`` for the
+        formats configured in ``EOXS_DSEO_STORED_FORMATS`` (either MIME types
+        or file extensions), ``ZIP_DEFLATED`` for all others.
+    """
+    stored_formats = getattr(
+        settings, 'EOXS_DSEO_STORED_FORMATS', DEFAULT_STORED_FORMATS
+    )
+    extension = splitext(filename)[1].lower()
+    if extension in stored_formats or (
+            format and format.lower() in stored_formats):
+        return zipstream.ZIP_STORED
+    return zipstream.ZIP_DEFLATED
+
+
+class ZipEntry(object):
+    """ A single file of a streamed ZIP archive. Either the ``path`` of a local
+        file or a remote ``data_item`` must be passed.
+    """
+
+    def __init__(self, arcname, path=None, data_item=None, format=None):
+        self.arcname = arcname
+        self.path = path
+        self.data_item = data_item
+        self.compress_type = get_compress_type(arcname, format)
+
+    @classmethod
+    def from_data_item(cls, data_item, arcname):
+        # faster encoding when local files. Fallback on VSI API otherwise
+        if not data_item.storage:
+            return cls(arcname, path=data_item.location, format=data_item.format)
+        return cls(arcname, data_item=data_item, format=data_item.format)
+
+    @property
+    def size(self):
+        """ The size of the file in bytes or ``None`` if it cannot be
+            determined.
+        """
+        if self.path:
+            try:
+                return os.path.getsize(self.path)
+            except OSError:
+                return None
+
+        with gdal.thread_config_env(get_vsi_env(self.data_item.storage)):
+            stat = vsi.VSIStatL(get_vsi_path(self.data_item))
+        return stat.size if stat is not None else None
+
+
+class ReadAhead(object):
+    """ Reads a remote data item in a background thread into a bounded buffer
+        of ``max_chunks`` chunks. When iterated, the read ahead of the ``next``
+        one is started, so that it is fetched while this one is streamed.
+    """
+
+    def __init__(self, data_item, max_chunks, chunk_size=CHUNK_SIZE):
+        self.data_item = data_item
+        self.chunk_size = chunk_size
+        self.next = None
+        self._queue = queue.Queue(max_chunks)
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._read, daemon=True)
+            self._thread.start()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def _put(self, value):
+        deadline = time.monotonic() + READ_AHEAD_TIMEOUT
+        while not self._cancelled.is_set() and time.monotonic() < deadline:
+            try:
+                self._queue.put(value, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _read(self):
+        try:
+            env = get_vsi_env(self.data_item.storage)
+            with gdal.thread_config_env(env):
+                with vsi.open(get_vsi_path(self.data_item), 'rb') as vsi_file:
+                    while True:
+                        data = vsi_file.read(self.chunk_size)
+                        if not self._put(data) or not data:
+                            break
+        except Exception as e:
+            self._put(e)
+
+    def __iter__(self):
+        self.start()
+        if self.next is not None:
+            self.next.start()
+
+        completed = False
+        try:
+            while True:
+                try:
+                    data = self._queue.get(timeout=READ_AHEAD_TIMEOUT)
+                except queue.Empty:
+                    raise IOError(
+                        'Timeout reading %s' % self.data_item.location
+                    )
+                if isinstance(data, Exception):
+                    raise data
+                elif not data:
+                    break
+                yield data
+            completed = True
+        finally:
+            self.cancel()
+            # when the stream is aborted, e.g. by a client disconnect, the
+            # next entry is never iterated, so its read ahead must be stopped
+            # as well to release its file handle
+            if not completed and self.next is not None:
+                self.next.cancel()
+
+
+def _iter_data_item(data_item, chunk_size=CHUNK_SIZE):
+    env = get_vsi_env(data_item.storage)
+    with gdal.thread_config_env(env):
+        with vsi.open(get_vsi_path(data_item), 'rb') as vsi_file:
+            while True:
+                data = vsi_file.read(chunk_size)
+                if data:
+                    yield data
+                else:
+                    break
+
+
+def create_zip_stream(entries):
+    """ Creates a ``zipstream.ZipFile`` for the given :class:`ZipEntry`
+        objects. Unless ``EOXS_DSEO_READ_AHEAD`` is ``0``, remote entries are
+        read ahead by up to the configured number of chunks.
+    """
+    read_ahead = getattr(settings, 'EOXS_DSEO_READ_AHEAD', DEFAULT_READ_AHEAD)
+    zip_stream = zipstream.ZipFile(
+        mode='w', compression=zipstream.ZIP_DEFLATED
+    )
+
+    previous = None
+    for entry in entries:
+        if entry.path:
+            zip_stream.write(
+                entry.path, entry.arcname, compress_type=entry.compress_type
+            )
+            continue
+
+        if read_ahead:
+            iterable = ReadAhead(entry.data_item, read_ahead)
+            if previous is not None:
+                previous.next = iterable
+            previous = iterable
+        else:
+            iterable = _iter_data_item(entry.data_item)
+
+        zip_stream.write_iter(
+            entry.arcname, iterable, compress_type=entry.compress_type
+        )
+
+    return zip_stream
+
+
+def get_zip_size(entries):
+    """ Computes the size of the archive created by :func:`create_zip_stream`
+        upfront. This is only possible when all entries are stored, their sizes
+        are known and the archive does not require ZIP64 extensions. Returns
+        ``None`` otherwise.
+    """
+    size = END_RECORD_SIZE
+    for entry in entries:
+        if entry.compress_type != zipstream.ZIP_STORED:
+            return None
+
+        file_size = entry.size
+        if file_size is None:
+            return None
+
+        name_size = len(normpath(entry.arcname).lstrip('/').encode('utf-8'))
+        size += (
+            LOCAL_HEADER_SIZE + DATA_DESCRIPTOR_SIZE + CENTRAL_DIRECTORY_SIZE
+            + 2 * name_size + file_size
+        )
+
+    # zipstream switches to ZIP64 headers for entries larger than 95% of the
+    # limit, so stay clear of it entirely
+    if size * 1.05 > ZIP64_LIMIT or len(entries) >= 0xffff:
+        return None
+    return size
@@ -29,14 +29,18 @@ import os
 from os.path import basename, join, relpath, split
 from itertools import chain
 
-from django.http.response import StreamingHttpResponse, FileResponse
-import zipstream
+from django.conf import settings
+from django.http.response import StreamingHttpResponse
 
-from eoxserver.backends.access import vsi_open
+from eoxserver.contrib import vsi
+from eoxserver.contrib.vsi import VSIFileResponse
 from eoxserver.backends.storages import get_handler_for_model
 from eoxserver.core.decoders import kvp, typelist, lower
 from eoxserver.resources.coverages import models
 from eoxserver.services.ows.dseo.v10.encoders import DSEO10CapabilitiesXMLEncoder
+from eoxserver.services.ows.dseo.v10.archive import (
+    ZipEntry, create_zip_stream, get_zip_size
+)
 
 
 class MissingProductError(Exception):
@@ -78,35 +82,27 @@ class GetProductHandler(object):
         if package and package.parent is None:
             handler = get_handler_for_model(package)
             if handler.name in ('ZIP', 'TAR'):
-                response = FileResponse(
-                    open(package.url), content_type='application/octet-stream',
-                )
-                response['Content-Disposition'] = 'attachment; filename="%s"' % (
-                    basename(package.url)
+                response = VSIFileResponse(
+                    vsi.open(package.url, 'rb'), as_attachment=True,
+                    filename=basename(package.url), request=request,
                 )
+                response['Content-Type'] = 'application/octet-stream'
                 return response
 
             elif handler.name == 'directory':
-                zip_stream = zipstream.ZipFile(
-                    mode='w', compression=zipstream.ZIP_DEFLATED
-                )
                 # compute a base path name, in order to have the last part of
                 # the path always in the filename
                 base = split(
                     package.url[:-1] if package.url.endswith('/')
                     else package.url
                 )[0]
+                entries = []
                 for root, _, filenames in os.walk(package.url):
                     for filename in filenames:
                         path = join(root, filename)
-                        zip_stream.write(path, relpath(path, base))
-                response = StreamingHttpResponse(
-                    zip_stream, content_type='application/octet-stream'
-                )
-                response['Content-Disposition'] = \
-                    'attachment; filename="%s.zip"' % product.identifier
+                        entries.append(ZipEntry(relpath(path, base), path=path))
 
-                return response
+                return zip_response(entries, product.identifier)
 
         elif package:
             # TODO: determine whether the files are local. if yes then unpack
@@ -116,47 +112,23 @@ class GetProductHandler(object):
         else:
             # for each coverage iterate over all metadata and array
             # metadata files and create a ZIP on the fly
-
-            zip_stream = zipstream.ZipFile(
-                mode='w', compression=zipstream.ZIP_DEFLATED
-            )
-
+            entries = []
             for coverage in product.coverages.all():
                 items = chain(
                     coverage.arraydata_items.all(),
                     coverage.metadata_items.all()
                 )
                 for data_item in items:
-                    add_item_to_zipstream(data_item, zip_stream, product, coverage)
+                    entries.append(get_zip_entry(data_item, product, coverage))
 
             # add product metadata
-            product_items = chain(
-                product.metadata_items.all()
-            )
-            for metadata_item in product_items:
-                add_item_to_zipstream(metadata_item, zip_stream, product, None)
-
-            response = StreamingHttpResponse(
-                zip_stream, content_type='application/octet-stream'
-            )
-            response['Content-Disposition'] = 'attachment; filename="%s.zip"' % (
-                product.identifier
-            )
-            return response
-
-
-# helper function to iterate over a data item in chunks
-def _iter_data_item(data_item, chunk_size=65535):
-    with vsi_open(data_item) as vsi_file:
-        while True:
-            data = vsi_file.read(chunk_size)
-            if data:
-                yield data
-            else:
-                break
-
-
-def add_item_to_zipstream(data_item, zip_stream, product, coverage):
+            for metadata_item in product.metadata_items.all():
+                entries.append(get_zip_entry(metadata_item, product, None))
+
+            return zip_response(entries, product.identifier)
+
+
+def get_zip_entry(data_item, product, coverage):
     if coverage:
         filepath = join(
             product.identifier,
@@ -168,17 +140,25 @@ def add_item_to_zipstream(data_item, zip_stream, product, coverage):
             product.identifier,
             basename(data_item.location)
         )
-    # faster encoding when local files. Fallback on VSI API otherwise
-    if not data_item.storage:
-        zip_stream.write(
-            data_item.location,
-            filepath
-        )
-    else:
-        zip_stream.write_iter(
-            filepath,
-            _iter_data_item(data_item)
-        )
+    return ZipEntry.from_data_item(data_item, filepath)
+
+
+def zip_response(entries, identifier):
+    """ Streams the entries as a ZIP archive. When ``EOXS_DSEO_CONTENT_LENGTH``
+        is enabled and the size of the archive can be computed upfront, the
+        ``Content-Length`` header is sent.
+    """
+    response = StreamingHttpResponse(
+        create_zip_stream(entries), content_type='application/octet-stream'
+    )
+    response['Content-Disposition'] = 'attachment; filename="%s.zip"' % (
+        identifier
+    )
+    if getattr(settings, 'EOXS_DSEO_CONTENT_LENGTH', False):
+        size = get_zip_size(entries)
+        if size is not None:
+            response['Content-Length'] = size
+    return response
 
 
 class GetCapabilitiesKVPDecoder(kvp.Decoder):
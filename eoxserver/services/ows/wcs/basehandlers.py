@@ -42,9 +42,8 @@ from eoxserver.services.ows.wcs.renderers import (
     get_capabilities_renderer, get_coverage_description_renderer,
     get_coverage_renderer,
 )
-from eoxserver.render.coverage.objects import Coverage, Mosaic
-from eoxserver.services.ecql import parse, to_filter
-from eoxserver.services import filters
+from eoxserver.render.coverage.objects import Coverage, Mosaic, from_models
+from eoxserver.services.ecql import compile_filter
 
 
 class WCSGetCapabilitiesHandlerBase(object):
@@ -68,12 +67,7 @@ class WCSGetCapabilitiesHandlerBase(object):
         cql_text = decoder.cql
         if cql_text:
             qs = models.EOObject.objects.all()
-            mapping, mapping_choices = filters.get_field_mapping_for_model(
-                qs.model
-            )
-            ast = parse(cql_text)
-            filter_expressions = to_filter(ast, mapping, mapping_choices)
-            qs = qs.filter(filter_expressions)
+            qs = qs.filter(compile_filter(cql_text, qs.model))
 
         else:
             qs = models.EOObject.objects.filter(
@@ -182,11 +176,7 @@ class WCSDescribeCoverageHandlerBase(object):
             available_ids = set([coverage.identifier for coverage in objects])
             raise NoSuchCoverageException(set(ids) - available_ids)
 
-        return [
-            Coverage.from_model(obj)
-            if isinstance(obj, models.Coverage) else Mosaic.from_model(obj)
-            for obj in objects
-        ]
+        return from_models(objects)
 
     def get_params(self, coverages, decoder):
         """ Interface method to return a render params object from the given
@@ -0,0 +1,225 @@
+# ------------------------------------------------------------------------------
+#
+# Project: EOxServer <http://eoxserver.org>
+#
+# ------------------------------------------------------------------------------
+# Copyright (C) 2026 EOX IT Services GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies of this Software or works derived from this Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# ------------------------------------------------------------------------------
+
+""" This module provides the query builders to resolve the coverages and
+    dataset series of the DescribeEOCoverageSet and GetEOCoverageSet requests.
+
+    Each way an object can be referenced is issued as a separate subquery
+    able to use the spatial and many-to-many indices. The subqueries are
+    combined with ``UNION`` instead of a single large ``OR`` with
+    ``DISTINCT``.
+"""
+
+from django.db.models import Q, Count, Window
+
+from eoxserver.resources.coverages import models
+from eoxserver.services.exceptions import (
+    NoSuchDatasetSeriesOrCoverageException
+)
+
+
+def get_referenced_objects(eo_ids):
+    """ Fetch the objects referenced by the given EO IDs and split them into
+        lists of Collections, Mosaics, Products and Coverages.
+
+        :raises NoSuchDatasetSeriesOrCoverageException: if any of the EO IDs
+                                                        is not available
+    """
+    eo_objects = models.EOObject.objects.filter(
+        identifier__in=eo_ids
+    ).select_subclasses()
+
+    # check if all EOIDs are available
+    available_ids = set(eo_object.identifier for eo_object in eo_objects)
+    failed = [
+        eo_id for eo_id in eo_ids if eo_id not in available_ids
+    ]
+
+    # fail when some objects are not available
+    if failed:
+        raise NoSuchDatasetSeriesOrCoverageException(failed)
+
+    collections = []
+    mosaics = []
+    products = []
+    coverages = []
+
+    for eo_object in eo_objects:
+        if isinstance(eo_object, models.Collection):
+            collections.append(eo_object)
+        elif isinstance(eo_object, models.Mosaic):
+            mosaics.append(eo_object)
+        elif isinstance(eo_object, models.Product):
+            products.append(eo_object)
+        elif isinstance(eo_object, models.Coverage):
+            coverages.append(eo_object)
+
+    return collections, mosaics, products, coverages
+
+
+def union_queryset(branches):
+    """ Returns a QuerySet of all :class:`EOObject
+        <eoxserver.resources.coverages.models.EOObject>` matching any of the
+        given ``Q`` objects. Each branch is issued as a separate subquery and
+        combined using ``UNION``.
+    """
+    if not branches:
+        return models.EOObject.objects.none()
+
+    subqueries = [
+        models.EOObject.objects.filter(branch).values("pk")
+        for branch in branches
+    ]
+    return models.EOObject.objects.filter(
+        pk__in=subqueries[0].union(*subqueries[1:])
+    )
+
+
+def get_parent_product_filters(filters):
+    """ Translate the subset filters to ``Q`` objects, allowing metadata
+        queries on the coverage itself or on the parent product if available.
+    """
+    parent_product_filters = []
+    for key, value in filters.items():
+        prop = key.partition('__')[0]
+        if prop == 'pk':
+            # the pre-selected candidates already include the coverages
+            # inheriting the metadata of their parent product
+            parent_product_filters.append(Q(**{key: value}))
+            continue
+        parent_product_filters.append(
+            Q(**{
+                key: value
+            }) | Q(**{
+                '%s__isnull' % prop: True,
+                'coverage__parent_product__%s' % key: value
+            })
+        )
+    return parent_product_filters
+
+
+def get_dataset_series_queryset(collections, products, filters):
+    """ Returns a QuerySet of all dataset series, directly or indirectly
+        referenced.
+    """
+    branches = []
+    if collections:
+        branches.extend([
+            Q(  # directly referenced Collections
+                collection__isnull=False,
+                identifier__in=[
+                    collection.identifier for collection in collections
+                ],
+            ),
+            Q(  # Products within Collections
+                product__isnull=False,
+                product__collections__in=collections,
+                **filters
+            ),
+        ])
+    if products:
+        branches.append(
+            Q(  # directly referenced Products
+                product__isnull=False,
+                identifier__in=[product.identifier for product in products],
+            )
+        )
+    return union_queryset(branches).order_by('identifier')
+
+
+def get_coverages_queryset(collections, mosaics, products, coverages,
+                           filters):
+    """ Returns a QuerySet of all Coverages and Mosaics, directly or
+        indirectly referenced, matching the subset filters.
+    """
+    branches = []
+    if coverages:
+        branches.append(
+            Q(  # directly referenced Coverages
+                identifier__in=[
+                    coverage.identifier for coverage in coverages
+                ]
+            )
+        )
+    if products:
+        branches.append(
+            Q(  # Coverages within directly referenced Products
+                coverage__parent_product__in=products,
+            )
+        )
+    if collections:
+        branches.extend([
+            Q(  # Coverages within indirectly referenced Products
+                coverage__parent_product__collections__in=collections
+            ),
+            Q(  # Coverages within directly referenced Collections
+                coverage__collections__in=collections
+            ),
+            Q(  # Mosaics within directly referenced Collections
+                mosaic__collections__in=collections
+            ),
+        ])
+    if mosaics:
+        branches.extend([
+            Q(  # Coverages within directly referenced Mosaics
+                coverage__mosaics__in=mosaics
+            ),
+            Q(  # directly referenced Mosaics
+                identifier__in=[
+                    mosaic.identifier for mosaic in mosaics
+                ]
+            ),
+        ])
+
+    # apply the subset filters within each branch
+    parent_product_filters = Q(*get_parent_product_filters(filters))
+    return union_queryset([
+        parent_product_filters & branch for branch in branches
+    ]).select_subclasses(
+        models.Coverage, models.Mosaic
+    ).order_by('identifier')
+
+
+def paginate(queryset, offset, limit):
+    """ Returns the objects of the requested page and the number of all
+        matching objects. The total is computed with a window function in
+        the same query as the page, a separate count is only issued when the
+        page is empty.
+    """
+    if limit > 0:
+        items = list(
+            queryset.annotate(
+                number_matched=Window(expression=Count('pk'))
+            )[offset:offset + limit]
+        )
+        if items:
+            return items, items[0].number_matched
+        elif offset == 0:
+            return items, 0
+    else:
+        items = []
+
+    return items, queryset.count()
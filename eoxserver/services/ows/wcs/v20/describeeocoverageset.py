@@ -28,21 +28,20 @@
 import sys
 import logging
 
-from django.db.models import Q
-
 from eoxserver.core.config import get_eoxserver_config
 from eoxserver.core.decoders import xml, kvp, typelist, enum
 from eoxserver.render.coverage import objects
-from eoxserver.resources.coverages import models
 from eoxserver.services.ows.wcs.v20.util import (
     nsmap, SectionsMixIn, parse_subset_kvp, parse_subset_xml
 )
 from eoxserver.services.ows.wcs.v20.encoders import WCS20EOXMLEncoder
+from eoxserver.services.ows.wcs.v20.coverageset import (
+    get_referenced_objects, get_dataset_series_queryset,
+    get_coverages_queryset, paginate
+)
 from eoxserver.services.ows.common.config import WCSEOConfigReader
 from eoxserver.services.subset import Subsets, Trim
-from eoxserver.services.exceptions import (
-    NoSuchDatasetSeriesOrCoverageException, InvalidSubsettingException
-)
+from eoxserver.services.exceptions import InvalidSubsettingException
 
 
 logger = logging.getLogger(__name__)
@@ -99,127 +98,40 @@ class WCS20DescribeEOCoverageSetHandler(object):
         if len(eo_ids) == 0:
             raise
 
-        # fetch the objects directly referenced by EOID
-        eo_objects = models.EOObject.objects.filter(
-            identifier__in=eo_ids
-        ).select_subclasses()
-
-        # check if all EOIDs are available
-        available_ids = set(eo_object.identifier for eo_object in eo_objects)
-        failed = [
-            eo_id for eo_id in eo_ids if eo_id not in available_ids
-        ]
-
-        # fail when some objects are not available
-        if failed:
-            raise NoSuchDatasetSeriesOrCoverageException(failed)
-
-        # split list of objects into Collections, Products and Coverages
-        collections = []
-        mosaics = []
-        products = []
-        coverages = []
-
-        for eo_object in eo_objects:
-            if isinstance(eo_object, models.Collection):
-                collections.append(eo_object)
-            elif isinstance(eo_object, models.Mosaic):
-                mosaics.append(eo_object)
-            elif isinstance(eo_object, models.Product):
-                products.append(eo_object)
-            elif isinstance(eo_object, models.Coverage):
-                coverages.append(eo_object)
+        # fetch the objects directly referenced by EOID and split them into
+        # Collections, Mosaics, Products and Coverages
+        collections, mosaics, products, coverages = get_referenced_objects(
+            eo_ids
+        )
 
         filters = subsets.get_filters(containment=containment)
 
         # get a QuerySet of all dataset series, directly or indirectly
         # referenced
-        all_dataset_series_qs = models.EOObject.objects.filter(
-            Q(  # directly referenced Collections
-                collection__isnull=False,
-                identifier__in=[
-                    collection.identifier for collection in collections
-                ],
-            ) |
-            Q(  # directly referenced Products
-                product__isnull=False,
-                identifier__in=[product.identifier for product in products],
-            ) |
-            Q(  # Products within Collections
-                product__isnull=False,
-                product__collections__in=collections,
-                **filters
-            )
-        ).distinct().order_by('identifier')
-
-        if inc_dss_section:
-            dataset_series_qs = all_dataset_series_qs[:count]
-        else:
-            dataset_series_qs = models.EOObject.objects.none()
-
-        # Allow metadata queries on coverage itself or on the
-        # parent product if available
-        parent_product_filters = []
-        for key, value in filters.items():
-            prop = key.partition('__')[0]
-            parent_product_filters.append(
-                Q(**{
-                    key: value
-                }) | Q(**{
-                    '%s__isnull' % prop: True,
-                    'coverage__parent_product__%s' % key: value
-                })
-            )
+        all_dataset_series_qs = get_dataset_series_queryset(
+            collections, products, filters
+        )
 
         # get a QuerySet for all Coverages, directly or indirectly referenced
-        all_coverages_qs = models.EOObject.objects.filter(
-            *parent_product_filters
-        ).filter(
-            Q(  # directly referenced Coverages
-                identifier__in=[
-                    coverage.identifier for coverage in coverages
-                ]
-            ) |
-            Q(  # Coverages within directly referenced Products
-                coverage__parent_product__in=products,
-            ) |
-            Q(  # Coverages within indirectly referenced Products
-                coverage__parent_product__collections__in=collections
-            ) |
-            Q(  # Coverages within directly referenced Collections
-                coverage__collections__in=collections
-            ) |
-            Q(  # Coverages within directly referenced Mosaics
-                coverage__mosaics__in=mosaics
-            ) |
-            Q(  # directly referenced Mosaics
-                identifier__in=[
-                    mosaic.identifier for mosaic in mosaics
-                ]
-            ) |
-            Q(  # Mosaics within directly referenced Collections
-                mosaic__collections__in=collections
-            )
-        ).distinct().select_subclasses(models.Coverage, models.Mosaic)
-
-        all_coverages_qs = all_coverages_qs.order_by('identifier')
+        all_coverages_qs = get_coverages_queryset(
+            collections, mosaics, products, coverages, filters
+        )
 
-        # check if the CoverageDescriptions section is included. If not, use an
-        # empty queryset
-        if inc_cov_section:
-            coverages_qs = all_coverages_qs
-        else:
-            coverages_qs = models.Coverage.objects.none()
+        # fetch the page of dataset series and coverages along with the number
+        # of all matching items. If a section is not included, only the
+        # number of matched items is computed.
+        dataset_series, dataset_series_matched = paginate(
+            all_dataset_series_qs, 0, count if inc_dss_section else 0
+        )
 
         # limit coverages according to the number of dataset series
-        coverages_qs = coverages_qs[:max(
-            0, count - dataset_series_qs.count() - len(mosaics)
-        )]
+        coverages_count = max(0, count - len(dataset_series) - len(mosaics))
+        coverages, coverages_matched = paginate(
+            all_coverages_qs, 0, coverages_count if inc_cov_section else 0
+        )
 
         # compute the number of all items that would match
-        number_matched = (
-            all_coverages_qs.count() + all_dataset_series_qs.count()
-        )
+        number_matched = coverages_matched + dataset_series_matched
 
         # create an encoder and encode the result
         encoder = WCS20EOXMLEncoder()
@@ -228,12 +140,9 @@ class WCS20DescribeEOCoverageSetHandler(object):
                 encoder.encode_eo_coverage_set_description(
                     dataset_series_set=[
                         objects.DatasetSeries.from_model(eo_object)
-                        for eo_object in dataset_series_qs
-                    ],
-                    coverages=[
-                        objects.from_model(coverage)
-                        for coverage in coverages_qs
+                        for eo_object in dataset_series
                     ],
+                    coverages=objects.from_models(coverages),
                     number_matched=number_matched
                 ), pretty_print=True
             ),
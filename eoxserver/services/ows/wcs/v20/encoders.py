@@ -36,10 +36,10 @@ from django.utils.timezone import now
 from eoxserver.contrib import gdal, vsi
 from eoxserver.core.util.timetools import isoformat
 from eoxserver.backends.access import retrieve
-from eoxserver.contrib.osr import SpatialReference
 from eoxserver.render.coverage import objects
 from eoxserver.resources.coverages.formats import getFormatRegistry
 from eoxserver.resources.coverages import crss
+from eoxserver.services.fragments import cached_fragments
 from eoxserver.services.gml.v32.encoders import GML32Encoder, EOP20Encoder
 from eoxserver.services.ows.component import ServiceComponent, env
 from eoxserver.services.ows.common.config import CapabilitiesConfigReader
@@ -247,7 +247,7 @@ class GMLCOV10Encoder(WCS20BaseXMLEncoder, GML32Encoder):
         offsets = [axis.offset for axis in grid]
         origin = coverage.origin
 
-        sr = SpatialReference(grid.coordinate_reference_system)
+        sr = crss.get_spatial_reference(grid.coordinate_reference_system)
         url = sr.url
 
         frmt = "%.3f" if sr.IsProjected() else "%.8f"
@@ -318,7 +318,7 @@ class GMLCOV10Encoder(WCS20BaseXMLEncoder, GML32Encoder):
                           rectified=True):
         grid_name = "%s_grid" % coverage.identifier
         grid = coverage.grid
-        sr = SpatialReference(grid.coordinate_reference_system)
+        sr = crss.get_spatial_reference(grid.coordinate_reference_system)
 
         if grid and not grid.is_referenceable:
             return GML("domainSet",
@@ -340,7 +340,7 @@ class GMLCOV10Encoder(WCS20BaseXMLEncoder, GML32Encoder):
         footprint = coverage.footprint
 
         if grid and not grid.is_referenceable:
-            sr = SpatialReference(grid.coordinate_reference_system)
+            sr = crss.get_spatial_reference(grid.coordinate_reference_system)
             labels = grid.names
             axis_units = " ".join(
                 ["m" if sr.IsProjected() else "deg"] * len(labels)
@@ -366,7 +366,7 @@ class GMLCOV10Encoder(WCS20BaseXMLEncoder, GML32Encoder):
 
         elif footprint:
             minx, miny, maxx, maxy = subset_extent or footprint.extent
-            sr = SpatialReference(4326)
+            sr = crss.get_spatial_reference(4326)
             swap = crss.getAxesSwapper(sr.srid)
             labels = ("x", "y") if sr.IsProjected() else ("long", "lat")
             axis_labels = " ".join(swap(*labels))
@@ -474,7 +474,8 @@ class WCS20CoverageDescriptionXMLEncoder(GMLCOV10Encoder):
 
 class WCS20EOXMLEncoder(WCS20CoverageDescriptionXMLEncoder, EOP20Encoder,
                         OWS20Encoder):
-    def encode_eo_metadata(self, coverage, request=None, subset_polygon=None):
+    def encode_coverage_earth_observation(self, coverage,
+                                          subset_polygon=None):
         metadata_items = [
             metadata_location
             for metadata_location in getattr(coverage, 'metadata_locations', [])
@@ -501,6 +502,19 @@ class WCS20EOXMLEncoder(WCS20CoverageDescriptionXMLEncoder, EOP20Encoder,
                 coverage.identifier, coverage.begin_time, coverage.end_time,
                 coverage.footprint, subset_polygon=subset_polygon
             )
+        return earth_observation
+
+    def encode_eo_metadata(self, coverage, request=None, subset_polygon=None):
+        if subset_polygon is None:
+            # the metadata of the whole coverage only changes with the object
+            earth_observation, = cached_fragments(
+                "wcs20:EarthObservation", coverage,
+                lambda: [self.encode_coverage_earth_observation(coverage)]
+            )
+        else:
+            earth_observation = self.encode_coverage_earth_observation(
+                coverage, subset_polygon
+            )
 
         if not request:
             lineage = None
@@ -556,11 +570,11 @@ class WCS20EOXMLEncoder(WCS20CoverageDescriptionXMLEncoder, EOP20Encoder,
         # else:
         #     # TODO: improve if no native format availabe
         #     native_format = None
-        sr = SpatialReference(4326)
+        sr = crss.get_spatial_reference(4326)
         if extent:
             poly = Polygon.from_bbox(extent)
             poly.srid = srid
-            extent = poly.transform(4326).extent
+            extent = crss.transform_geometry(poly, 4326).extent
 
         else:
             # extent = coverage.extent
@@ -685,14 +699,16 @@ class WCS20EOXMLEncoder(WCS20CoverageDescriptionXMLEncoder, EOP20Encoder,
     def encode_referenceable_dataset(self, coverage, range_type, reference,
                                      mime_type, subset=None):
         # handle subset
-        dst_srid = SpatialReference(coverage.grid.coordinate_reference_system).srid
+        dst_srid = crss.get_spatial_reference(
+            coverage.grid.coordinate_reference_system
+        ).srid
 
         if not subset:
             # whole area - no subset
             domain_set = self.encode_domain_set(coverage, rectified=False)
             eo_metadata = self.encode_eo_metadata(coverage)
             extent = coverage.footprint.extent
-            sr = SpatialReference(dst_srid)
+            sr = crss.get_spatial_reference(dst_srid)
 
         else:
             # subset is given
@@ -710,9 +726,9 @@ class WCS20EOXMLEncoder(WCS20CoverageDescriptionXMLEncoder, EOP20Encoder,
             poly = Polygon.from_bbox(extent)
             poly.srid = srid
             if srid != dst_srid:
-                poly.transform(dst_srid)
+                crss.transform_geometry(poly, dst_srid)
             extent = poly.extent
-            sr = SpatialReference(srid)
+            sr = crss.get_spatial_reference(srid)
 
         return EOWCS("ReferenceableDataset",
             self.encode_bounded_by(coverage, coverage.grid, extent),
@@ -27,9 +27,11 @@
 
 from itertools import chain
 
+from django.db.models import Q
+
 from eoxserver.core.decoders import xml, kvp, typelist, lower
 from eoxserver.resources.coverages import models
-from eoxserver.render.coverage.objects import from_model
+from eoxserver.render.coverage.objects import from_models
 from eoxserver.services.ows.wcs.basehandlers import (
     WCSGetCapabilitiesHandlerBase
 )
@@ -37,8 +39,7 @@ from eoxserver.services.ows.wcs.v20.util import nsmap, SectionsMixIn
 from eoxserver.services.ows.wcs.v20.parameters import (
     WCS20CapabilitiesRenderParams
 )
-from eoxserver.services.ecql import parse, to_filter
-from eoxserver.services import filters
+from eoxserver.services.ecql import compile_filter
 
 
 class WCS20GetCapabilitiesHandler(WCSGetCapabilitiesHandlerBase):
@@ -69,13 +70,10 @@ class WCS20GetCapabilitiesHandler(WCSGetCapabilitiesHandlerBase):
         if inc_coverages:
             cql_text = decoder.cql
             if cql_text:
-                qs = models.EOObject.objects.all()
-                mapping, mapping_choices = filters.get_field_mapping_for_model(
-                    models.Coverage  # TODO: allow mapping to Mosaic as-well?
+                qs = models.EOObject.objects.filter(
+                    # TODO: allow mapping to Mosaic as-well?
+                    compile_filter(cql_text, models.Coverage)
                 )
-                ast = parse(cql_text)
-                filter_expressions = to_filter(ast, mapping, mapping_choices)
-                qs = qs.filter(filter_expressions)
 
             else:
                 qs = models.EOObject.objects.filter(
@@ -87,36 +85,31 @@ class WCS20GetCapabilitiesHandler(WCSGetCapabilitiesHandlerBase):
                 models.Coverage, models.Mosaic
             )
 
-            coverages = [
-                from_model(coverage)
-                for coverage in qs
-            ]
+            coverages = from_models(qs)
         else:
             coverages = []
 
         if inc_dataset_series:
             cql_text = decoder.datasetseriescql
             if cql_text:
-                qs = models.EOObject.objects.all()
-                mapping, mapping_choices = filters.get_field_mapping_for_model(
-                    qs.model  # TODO: mapping to Collection/Product would be better
+                # TODO: mapping to Collection/Product would be better
+                filter_expressions = compile_filter(
+                    cql_text, models.EOObject
                 )
-                ast = parse(cql_text)
-                filter_expressions = to_filter(ast, mapping, mapping_choices)
             else:
-                filter_expressions = {}
+                filter_expressions = Q()
 
             dataset_series = chain(
                 models.Collection.objects.exclude(
                     service_visibility__service='wcs',
                     service_visibility__visibility=False
-                ).filter(**filter_expressions).only(
+                ).filter(filter_expressions).only(
                     "identifier", "begin_time", "end_time", "footprint"
                 ),
                 models.Product.objects.filter(
                     service_visibility__service='wcs',
                     service_visibility__visibility=True
-                ).filter(**filter_expressions).only(
+                ).filter(filter_expressions).only(
                     "identifier", "begin_time", "end_time", "footprint"
                 ),
             )
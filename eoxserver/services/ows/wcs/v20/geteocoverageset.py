@@ -33,7 +33,6 @@ import logging
 from itertools import chain
 import mimetypes
 
-from django.db.models import Q
 from django.http import StreamingHttpResponse
 
 from django.conf import settings
@@ -42,18 +41,19 @@ from django.utils.module_loading import import_string
 from eoxserver.core.config import get_eoxserver_config
 from eoxserver.core.decoders import xml, kvp, typelist, enum
 from eoxserver.render.coverage import objects
-from eoxserver.resources.coverages import models
 from eoxserver.services.ows.wcs.v20.util import (
     nsmapGetEoCoverageSet, parse_subset_kvp, parse_subset_xml, parse_scaleaxis_kvp,
     parse_scaleaxis_xml, parse_scaleextent_kvp, parse_scaleextent_xml,
     parse_scalesize_kvp, parse_scalesize_xml, parse_interpolation
 )
 from eoxserver.services.ows.wcs.v20.parameters import WCS20CoverageRenderParams
+from eoxserver.services.ows.wcs.v20.coverageset import (
+    get_referenced_objects, get_coverages_queryset
+)
 from eoxserver.services.ows.common.config import WCSEOConfigReader
 from eoxserver.services.subset import Subsets, Trim
 from eoxserver.services.exceptions import (
-    NoSuchDatasetSeriesOrCoverageException, InvalidRequestException,
-    InvalidSubsettingException
+    InvalidRequestException, InvalidSubsettingException
 )
 
 
@@ -220,83 +220,18 @@ class WCS20GetEOCoverageSetHandler(object):
         except ValueError as e:
             raise InvalidSubsettingException(str(e))
 
-        # fetch the objects directly referenced by EOID
-        eo_objects = models.EOObject.objects.filter(
-            identifier__in=eo_ids
-        ).select_subclasses()
-
-        # check if all EOIDs are available
-        available_ids = set(eo_object.identifier for eo_object in eo_objects)
-        failed = [
-            eo_id for eo_id in eo_ids if eo_id not in available_ids
-        ]
-
-        # fail when some objects are not available
-        if failed:
-            raise NoSuchDatasetSeriesOrCoverageException(failed)
-
-        # split list of objects into Collections, Products and Coverages
-        collections = []
-        mosaics = []
-        products = []
-        coverages = []
-
-        for eo_object in eo_objects:
-            if isinstance(eo_object, models.Collection):
-                collections.append(eo_object)
-            elif isinstance(eo_object, models.Mosaic):
-                mosaics.append(eo_object)
-            elif isinstance(eo_object, models.Product):
-                products.append(eo_object)
-            elif isinstance(eo_object, models.Coverage):
-                coverages.append(eo_object)
+        # fetch the objects directly referenced by EOID and split them into
+        # Collections, Mosaics, Products and Coverages
+        collections, mosaics, products, coverages = get_referenced_objects(
+            eo_ids
+        )
 
         filters = subsets.get_filters(containment=containment)
 
-        # Allow metadata queries on coverage itself or on the
-        # parent product if available
-        parent_product_filters = []
-        for key, value in filters.items():
-            prop = key.partition('__')[0]
-            parent_product_filters.append(
-                Q(**{
-                    key: value
-                }) | Q(**{
-                    '%s__isnull' % prop: True,
-                    'coverage__parent_product__%s' % key: value
-                })
-            )
-
         # get a QuerySet for all Coverages, directly or indirectly referenced
-        all_coverages_qs = models.EOObject.objects.filter(
-            *parent_product_filters
-        ).filter(
-            Q(  # directly referenced Coverages
-                identifier__in=[
-                    coverage.identifier for coverage in coverages
-                ]
-            ) |
-            Q(  # Coverages within directly referenced Products
-                coverage__parent_product__in=products,
-            ) |
-            Q(  # Coverages within indirectly referenced Products
-                coverage__parent_product__collections__in=collections
-            ) |
-            Q(  # Coverages within directly referenced Collections
-                coverage__collections__in=collections
-            ) |
-            Q(  # Coverages within directly referenced Mosaics
-                coverage__mosaics__in=mosaics
-            ) |
-            Q(  # directly referenced Mosaics
-                identifier__in=[
-                    mosaic.identifier for mosaic in mosaics
-                ]
-            ) |
-            Q(  # Mosaics within directly referenced Collections
-                mosaic__collections__in=collections
-            )
-        ).distinct().select_subclasses(models.Coverage, models.Mosaic)
+        all_coverages_qs = get_coverages_queryset(
+            collections, mosaics, products, coverages, filters
+        )
 
         # limit coverages according to the requested or default count
         offset = decoder.start_index
@@ -309,8 +244,7 @@ class WCS20GetEOCoverageSetHandler(object):
             pkg_filename, package_format, format_params
         )
 
-        for coverage_model in coverages_qs:
-            coverage = objects.from_model(coverage_model)
+        for coverage in objects.from_models(coverages_qs):
             params = self.get_params(coverage, decoder, request)
             renderer = self.get_renderer(params)
             result_set = renderer.render(params)
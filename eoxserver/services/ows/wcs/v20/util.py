@@ -33,7 +33,9 @@ from lxml.builder import ElementMaker
 
 from eoxserver.core.util.xmltools import NameSpace, NameSpaceMap, ns_xsi
 from eoxserver.core.util.timetools import parse_iso8601
-from eoxserver.services.subset import Trim, Slice, is_temporal, all_axes
+from eoxserver.services.subset import (
+    Trim, Slice, is_temporal, all_axes, x_axes, y_axes
+)
 from eoxserver.services.gml.v32.encoders import (
     ns_gml, ns_gmlcov, ns_om, ns_eop, GML, GMLCOV, OM, EOP
 )
@@ -150,6 +152,49 @@ class ScaleExtent(Scale):
         self.high = high
 
 
+def get_scaled_size(size, scalefactor=None, scales=()):
+    """ Computes the output size in pixels for a source window of the given
+        ``size`` when the scaling parameters of a GetCoverage request are
+        applied. The semantics follow the ones of the MapServer WCS 2.0
+        implementation.
+
+        :param size: the 2-tuple of the source window size in pixels
+        :param scalefactor: the scale factor applied to all axes
+        :param scales: an iterable of :class:`ScaleAxis`, :class:`ScaleSize`
+                       and :class:`ScaleExtent` objects
+        :returns: the 2-tuple of the output size in pixels
+    """
+    size_x, size_y = size
+
+    if scalefactor is not None:
+        if scalefactor <= 0:
+            raise InvalidScaleFactorException(scalefactor)
+        return (
+            max(1, int(round(size_x / scalefactor))),
+            max(1, int(round(size_y / scalefactor)))
+        )
+
+    for scale in scales:
+        if scale.axis in x_axes:
+            size_x = _get_scaled_axis_size(size_x, scale)
+        elif scale.axis in y_axes:
+            size_y = _get_scaled_axis_size(size_y, scale)
+
+    return size_x, size_y
+
+
+def _get_scaled_axis_size(size, scale):
+    if isinstance(scale, ScaleSize):
+        return scale.size
+    elif isinstance(scale, ScaleExtent):
+        return scale.high - scale.low
+    elif isinstance(scale, ScaleAxis):
+        if scale.scale <= 0:
+            raise InvalidScaleFactorException(scale.scale)
+        return max(1, int(round(size / scale.scale)))
+    return size
+
+
 class SectionsMixIn(object):
     """ Mix-in for request decoders that use sections.
     """
@@ -40,26 +40,31 @@ from django.conf import settings
 from django.urls import reverse
 from django.http import HttpResponse
 from django.db.models import Q
+from django.contrib.gis.geos import Point, Polygon
 
 from eoxserver.core.decoders import kvp, typelist, InvalidParameterException
 from eoxserver.core.config import get_eoxserver_config
 from eoxserver.render.map.renderer import (
-    get_map_renderer, get_legend_renderer,  # get_feature_info_renderer
+    get_map_renderer, get_legend_renderer
 )
 from eoxserver.render.map.objects import Map, Legend
 from eoxserver.resources.coverages import crss
-from eoxserver.resources.coverages import models
+from eoxserver.resources.coverages import models, spatialindex
 from eoxserver.services.ows.wms.util import (
     parse_bbox, parse_time, int_or_str
 )
 from eoxserver.services.ows.wms.parsing import parse_render_variables
 from eoxserver.services.ows.common.config import CapabilitiesConfigReader
-from eoxserver.services.ows.wms.exceptions import InvalidCRS
+from eoxserver.services.ows.wms.exceptions import InvalidCRS, InvalidFormat
 from eoxserver.services.ecql import (
-    parse, to_filter, get_field_mapping_for_model
+    compile_filter, get_field_mapping_for_model
 )
 from eoxserver.services import filters
 from eoxserver.services.ows.wms.layermapper import LayerMapper
+from eoxserver.services.ows.wms.featureinfo import (
+    query_features, sample_features, encode_feature_info,
+    SUPPORTED_FORMATS as SUPPORTED_INFO_FORMATS
+)
 
 
 class WMSBaseGetCapabilitiesHandler(object):
@@ -80,12 +85,7 @@ class WMSBaseGetCapabilitiesHandler(object):
 
         cql_text = decoder.cql
         if cql_text:
-            mapping, mapping_choices = filters.get_field_mapping_for_model(
-                qs.model
-            )
-            ast = parse(cql_text)
-            filter_expressions = to_filter(ast, mapping, mapping_choices)
-            qs = qs.filter(filter_expressions)
+            qs = qs.filter(compile_filter(cql_text, qs.model))
 
             eo_objects = qs.select_subclasses()
 
@@ -176,12 +176,16 @@ class WMSBaseGetMapHandler(object):
         if time:
             filter_expressions &= filters.time_interval(time)
 
+        # pre-select the candidates using the in-process index, if enabled
+        box = Polygon.from_bbox((minx, miny, maxx, maxy))
+        box.srid = srid
+        filter_expressions &= spatialindex.get_candidate_filter(
+            box, (time[0], time[-1]) if time else None
+        )
+
         cql = getattr(decoder, 'cql', None)
         if cql:
-            cql_filters = to_filter(
-                parse(cql), field_mapping, mapping_choices
-            )
-            filter_expressions &= cql_filters
+            filter_expressions &= compile_filter(cql, models.Product)
 
         # TODO: multiple sorts per layer?
         sort_by = getattr(decoder, 'sort_by', None)
@@ -248,16 +252,19 @@ class WMSBaseGetFeatureInfoHandler(object):
         y = decoder.y
         time = decoder.time
         crs = decoder.srs
-        layer_names = decoder.layers
+        layer_names = decoder.query_layers
 
         width = decoder.width
         height = decoder.height
 
-        # calculate the zoomlevel
-        zoom = calculate_zoom((minx, miny, maxx, maxy), width, height, crs)
-
         if not layer_names:
-            raise InvalidParameterException("No layers specified", "layers")
+            raise InvalidParameterException(
+                "No layers specified", "query_layers"
+            )
+
+        info_format = decoder.info_format
+        if info_format not in SUPPORTED_INFO_FORMATS:
+            raise InvalidFormat(info_format)
 
         srid = crss.parseEPSGCode(
             crs, (crss.fromShortCode, crss.fromURN, crss.fromURL)
@@ -269,78 +276,40 @@ class WMSBaseGetFeatureInfoHandler(object):
             models.Product
         )
 
-        # calculate resolution
+        # calculate the center of the queried pixel
         # TODO: dateline
         resx = (maxx - minx) / width
         resy = (maxy - miny) / height
-
-        p_minx = x * resx
-        p_miny = y * resy
-        p_maxx = (x + 1) * resx
-        p_maxy = (y + 1) * resy
-
-        filter_expressions = filters.bbox(
-            filters.attribute('footprint', field_mapping),
-            p_minx, p_miny, p_maxx, p_maxy, crs, bboverlaps=False
+        point = Point(
+            minx + (x + 0.5) * resx, maxy - (y + 0.5) * resy, srid=srid
         )
 
+        filter_expressions = spatialindex.get_candidate_filter(
+            point, (time[0], time[-1]) if time else None
+        )
         if time:
             filter_expressions &= filters.time_interval(time)
 
         cql = getattr(decoder, 'cql', None)
         if cql:
-            cql_filters = to_filter(
-                parse(cql), field_mapping, mapping_choices
-            )
-            filter_expressions &= cql_filters
+            filter_expressions &= compile_filter(cql, models.Product)
 
-        # TODO: multiple sorts per layer?
         sort_by = getattr(decoder, 'sort_by', None)
         if sort_by:
             sort_by = (field_mapping.get(sort_by[0], sort_by[0]), sort_by[1])
 
-        styles = decoder.styles
-
-        if styles:
-            styles = styles.split(',')
-        else:
-            styles = [None] * len(layer_names)
-
-        dimensions = {
-            "time": time,
-            "elevation": decoder.elevation,
-            "ranges": decoder.dim_range,
-            "bands": decoder.dim_bands,
-            "wavelengths": decoder.dim_wavelengths,
-        }
-
-        feature_info_renderer = get_feature_info_renderer()
-
-        layer_mapper = LayerMapper(feature_info_renderer.get_supported_layer_types())
-
-        layers = []
-        for layer_name, style in zip(layer_names, styles):
-            name, suffix = layer_mapper.split_layer_suffix_name(layer_name)
-            layer = layer_mapper.lookup_layer(
-                name, suffix, style,
-                filter_expressions, sort_by, zoom=zoom, **dimensions
-            )
-            layers.append(layer)
-
-        map_ = Map(
-            width=decoder.width, height=decoder.height, format=decoder.format,
-            bbox=(minx, miny, maxx, maxy), crs=crs,
-            bgcolor=decoder.bgcolor, transparent=decoder.transparent,
-            layers=layers
+        # only find the features under the point and sample their values,
+        # without rendering any map
+        features = query_features(
+            LayerMapper([]), layer_names, point, filter_expressions, sort_by,
+            decoder.feature_count
         )
+        sample_features(features, point)
 
-        result_bytes, content_type, filename = feature_info_renderer.render_feature_info(map_)
-
-        response = HttpResponse(result_bytes, content_type=content_type)
-        if filename:
-            response['Content-Disposition'] = 'inline; filename="%s"' % filename
-
-        return response
+        result_bytes, content_type = encode_feature_info(
+            features, info_format
+        )
+        return HttpResponse(result_bytes, content_type=content_type)
 
 
 class WMSBaseGetLegendGraphicHandler(object):
@@ -463,6 +432,19 @@ def calculate_zoom(bbox, width, height, crs):
         return zoom
 
 
+class WMSBaseGetFeatureInfoDecoder(WMSBaseGetMapDecoder):
+    width = kvp.Parameter(type=int, num=1)
+    height = kvp.Parameter(type=int, num=1)
+    format = kvp.Parameter(num="?")
+
+    query_layers = kvp.Parameter(type=typelist(str, ","), num=1)
+    info_format = kvp.Parameter(num="?", default="text/html")
+    feature_count = kvp.Parameter(type=int, num="?", default=1)
+
+    x = kvp.Parameter(type=int, num=1)
+    y = kvp.Parameter(type=int, num=1)
+
+
 class WMSBaseGetLegendGraphicDecoder(kvp.Decoder):
     layer = kvp.Parameter(num=1)
     style = kvp.Parameter(num='?')
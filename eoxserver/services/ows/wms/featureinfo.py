@@ -0,0 +1,419 @@
+# ------------------------------------------------------------------------------
+#
+# Project: EOxServer <http://eoxserver.org>
+#
+# ------------------------------------------------------------------------------
+# Copyright (C) 2026 EOX IT Services GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies of this Software or works derived from this Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# ------------------------------------------------------------------------------
+
+""" This module implements the GetFeatureInfo engine: the features under the
+    queried pixel are found with a point query on the (spatially indexed)
+    footprints and the band values of their coverages are sampled with a
+    single pixel read. No map is rendered and no browse is generated.
+"""
+
+import concurrent.futures
+import json
+import math
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+from django.template.loader import render_to_string
+from lxml import etree
+from lxml.builder import ElementMaker
+
+from eoxserver.backends.access import gdal_open
+from eoxserver.contrib import gdal
+from eoxserver.core.util.timetools import isoformat
+from eoxserver.resources.coverages import crss, models
+from eoxserver.services.ows.wms.layermapper import NoSuchLayer
+
+
+DEFAULT_EOXS_FEATURE_INFO_MAX_WORKERS = 4
+
+JSON_FORMATS = ("application/json", "application/geo+json")
+HTML_FORMATS = ("text/html",)
+GML_FORMATS = (
+    "application/vnd.ogc.gml", "application/gml+xml",
+    "application/xml", "text/xml",
+)
+SUPPORTED_FORMATS = JSON_FORMATS + HTML_FORMATS + GML_FORMATS
+
+ns_gml = "http://www.opengis.net/gml"
+
+
+class Feature(object):
+    """ A feature found by a feature info query.
+
+        :param layer: the name of the queried layer
+        :param eo_object: the product or coverage model
+        :param coverages: the coverages to sample the values from
+    """
+
+    def __init__(self, layer, eo_object, coverages=()):
+        self.layer = layer
+        self.eo_object = eo_object
+        self.coverages = list(coverages)
+        # list of (band name, value) tuples, filled by sampling
+        self.values = []
+
+    @property
+    def identifier(self):
+        return self.eo_object.identifier
+
+    @property
+    def begin_time(self):
+        return self.eo_object.begin_time
+
+    @property
+    def end_time(self):
+        return self.eo_object.end_time
+
+
+def query_features(layer_mapper, layer_names, point, filter_expressions,
+                   sort_by=None, feature_count=1):
+    """ Find the features of the given layers intersecting the point.
+
+        :param layer_mapper: the layer mapper to split the layer names
+        :param layer_names: the names of the queried layers
+        :param point: the queried point as a GEOS geometry with SRID
+        :param filter_expressions: additional filters for products and
+                                   coverages, e.g. time and CQL filters
+        :param sort_by: a tuple of field name and direction
+        :param feature_count: the maximum number of features per layer
+        :returns: a list of :class:`Feature` objects
+    """
+    features = []
+    for layer_name in layer_names:
+        name, suffix = layer_mapper.split_layer_suffix_name(layer_name)
+        try:
+            eo_object = models.EOObject.objects.select_subclasses(
+                models.Collection, models.Product, models.Coverage,
+                models.Mosaic
+            ).get(identifier=name)
+        except models.EOObject.DoesNotExist:
+            raise NoSuchLayer('Layer %r does not exist' % name)
+
+        # outline layers only report the features, without any values
+        sample = suffix != 'outlines'
+        intersects = Q(footprint__intersects=point)
+
+        if isinstance(eo_object, models.Coverage):
+            coverages = models.Coverage.objects.filter(
+                filter_expressions, intersects, pk=eo_object.pk
+            )
+            features.extend(
+                Feature(layer_name, coverage, [coverage] if sample else [])
+                for coverage in coverages
+            )
+
+        elif isinstance(eo_object, models.Mosaic):
+            coverages = _order(
+                models.Coverage.objects.filter(
+                    filter_expressions, intersects, mosaics=eo_object
+                ), sort_by
+            )[:feature_count]
+            features.extend(
+                Feature(layer_name, coverage, [coverage] if sample else [])
+                for coverage in coverages
+            )
+
+        else:
+            if isinstance(eo_object, models.Collection):
+                base_filter = dict(collections=eo_object)
+            else:
+                base_filter = dict(pk=eo_object.pk)
+
+            products = list(
+                _order(
+                    models.Product.objects.filter(
+                        filter_expressions, intersects, **base_filter
+                    ), sort_by
+                )[:feature_count]
+            )
+
+            if products:
+                coverages_by_product = {}
+                if sample:
+                    coverages = models.Coverage.objects.filter(
+                        parent_product__in=products
+                    ).order_by('identifier')
+                    for coverage in coverages:
+                        coverages_by_product.setdefault(
+                            coverage.parent_product_id, []
+                        ).append(coverage)
+
+                features.extend(
+                    Feature(
+                        layer_name, product,
+                        coverages_by_product.get(product.pk, [])
+                    )
+                    for product in products
+                )
+
+            elif isinstance(eo_object, models.Collection):
+                # collections of coverages without products
+                coverages = _order(
+                    models.Coverage.objects.filter(
+                        filter_expressions, intersects, collections=eo_object
+                    ), sort_by
+                )[:feature_count]
+                features.extend(
+                    Feature(
+                        layer_name, coverage, [coverage] if sample else []
+                    )
+                    for coverage in coverages
+                )
+
+    return features
+
+
+def _order(queryset, sort_by):
+    if sort_by:
+        return queryset.order_by('%s%s' % (
+            '-' if sort_by[1] == 'DESC' else '', sort_by[0]
+        ))
+    return queryset.order_by('-begin_time', '-end_time', 'identifier')
+
+
+def sample_features(features, point):
+    """ Sample the band values of the coverages of all features at the point.
+        The data items are fetched in a single query and each of them is read
+        in parallel with a single pixel window.
+    """
+    coverages = [
+        coverage for feature in features for coverage in feature.coverages
+    ]
+    if not coverages:
+        return features
+
+    data_items = models.ArrayDataItem.objects.filter(
+        coverage__in=coverages
+    ).select_related('storage').order_by('coverage_id', 'field_index')
+
+    items_by_coverage = {}
+    for data_item in data_items:
+        items_by_coverage.setdefault(data_item.coverage_id, []).append(
+            data_item
+        )
+
+    field_names = {}
+    field_types = models.FieldType.objects.filter(
+        coverage_type__in=set(
+            coverage.coverage_type_id for coverage in coverages
+        )
+    ).order_by('index')
+    for field_type in field_types:
+        field_names.setdefault(field_type.coverage_type_id, []).append(
+            field_type.identifier
+        )
+
+    # only plain values are passed to the worker threads
+    tasks = [
+        (data_item, point.x, point.y, point.srid)
+        for coverage in coverages
+        for data_item in items_by_coverage.get(coverage.pk, [])
+    ]
+    max_workers = getattr(
+        settings, 'EOXS_FEATURE_INFO_MAX_WORKERS',
+        DEFAULT_EOXS_FEATURE_INFO_MAX_WORKERS
+    )
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        samples = dict(zip(
+            (task[0].pk for task in tasks),
+            executor.map(_sample_task, tasks)
+        ))
+
+    for feature in features:
+        for coverage in feature.coverages:
+            values = [
+                value
+                for data_item in items_by_coverage.get(coverage.pk, [])
+                for value in samples[data_item.pk]
+            ]
+            names = field_names.get(coverage.coverage_type_id, [])
+            prefix = (
+                '%s.' % coverage.identifier
+                if len(feature.coverages) > 1 else ''
+            )
+            feature.values.extend(
+                (
+                    '%s%s' % (
+                        prefix,
+                        names[index] if index < len(names)
+                        else 'band%d' % (index + 1)
+                    ),
+                    value
+                )
+                for index, value in enumerate(values)
+            )
+
+    return features
+
+
+def _sample_task(task):
+    try:
+        return sample_data_item(*task)
+    finally:
+        # close the connections opened by this worker thread
+        connections.close_all()
+
+
+def sample_data_item(data_item, x, y, srid):
+    """ Read the values of all bands of the data item at the given location
+        with a single pixel window. Returns ``None`` values when the location
+        is outside of the raster, the value is a nodata value or the raster
+        is not georeferenced.
+    """
+    ds = gdal_open(data_item)
+
+    pixel = _get_pixel(ds, x, y, srid)
+    if pixel is None:
+        return [None] * ds.RasterCount
+    column, row = pixel
+
+    values = []
+    for index in range(1, ds.RasterCount + 1):
+        band = ds.GetRasterBand(index)
+        if not (0 <= column < ds.RasterXSize and 0 <= row < ds.RasterYSize):
+            values.append(None)
+            continue
+
+        value = band.ReadAsArray(column, row, 1, 1)[0][0].item()
+        nodata = band.GetNoDataValue()
+        if nodata is not None and (
+                value == nodata or math.isnan(nodata) and math.isnan(value)):
+            value = None
+        values.append(value)
+
+    return values
+
+
+def _get_pixel(ds, x, y, srid):
+    """ Get the pixel location of the point in the dataset, either by its
+        geotransform or by its GCPs for referenceable datasets. Returns
+        ``None`` if the dataset is not georeferenced.
+    """
+    geotransform = ds.GetGeoTransform(can_return_null=True)
+    use_gcps = geotransform is None and ds.GetGCPCount() > 0
+    if geotransform is not None:
+        projection = ds.GetProjection()
+    elif use_gcps:
+        projection = ds.GetGCPProjection()
+    else:
+        return None
+
+    px, py = x, y
+    if projection and not crss.get_spatial_reference(srid).IsSame(
+            crss.get_spatial_reference(projection)):
+        transform = crss.get_coordinate_transformation(srid, projection)
+        px, py = transform.TransformPoint(x, y)[:2]
+
+    if use_gcps:
+        # the default transformer of a dataset with GCPs is a GCP based one
+        transformer = gdal.Transformer(ds, None, [])
+        success, (column, row, _) = transformer.TransformPoint(1, px, py)
+        if not success:
+            return None
+        return int(math.floor(column)), int(math.floor(row))
+
+    ox, sx, rx, oy, ry, sy = geotransform
+    # invert the affine geotransform to get the pixel location
+    det = sx * sy - rx * ry
+    column = int(((px - ox) * sy - (py - oy) * rx) // det)
+    row = int(((py - oy) * sx - (px - ox) * ry) // det)
+    return column, row
+
+
+def encode_feature_info(features, info_format):
+    """ Encode the features in the requested format. Returns a tuple of the
+        encoded bytes and the content type.
+    """
+    if info_format in JSON_FORMATS:
+        return encode_json(features), info_format
+    elif info_format in HTML_FORMATS:
+        return encode_html(features), info_format
+    return encode_gml(features), info_format
+
+
+def encode_json(features):
+    return json.dumps({
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "id": feature.identifier,
+                "geometry": None,
+                "properties": {
+                    "layer": feature.layer,
+                    "begin_time": _isoformat(feature.begin_time),
+                    "end_time": _isoformat(feature.end_time),
+                    "values": dict(feature.values),
+                },
+            }
+            for feature in features
+        ]
+    }).encode('utf-8')
+
+
+def encode_html(features):
+    return render_to_string(
+        'wms/feature_info.html', {'features': features}
+    ).encode('utf-8')
+
+
+def encode_gml(features):
+    """ Encode the features in a GML feature info document, grouped by
+        layer.
+    """
+    E = ElementMaker()
+    GML = ElementMaker(namespace=ns_gml, nsmap={'gml': ns_gml})
+
+    root = E.msGMLOutput()
+    layer_elements = {}
+    for feature in features:
+        layer_element = layer_elements.get(feature.layer)
+        if layer_element is None:
+            # layer names are not necessarily valid element names
+            layer_element = E.layer(GML.name(feature.layer))
+            root.append(layer_element)
+            layer_elements[feature.layer] = layer_element
+
+        feature_element = E.feature(E.identifier(feature.identifier))
+        if feature.begin_time:
+            feature_element.append(
+                E.begin_time(_isoformat(feature.begin_time))
+            )
+        if feature.end_time:
+            feature_element.append(E.end_time(_isoformat(feature.end_time)))
+
+        for name, value in feature.values:
+            feature_element.append(
+                E.value('' if value is None else str(value), name=name)
+            )
+        layer_element.append(feature_element)
+
+    return etree.tostring(root, pretty_print=True, encoding='UTF-8')
+
+
+def _isoformat(value):
+    return isoformat(value) if value else None
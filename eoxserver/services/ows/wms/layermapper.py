@@ -39,6 +39,9 @@ from eoxserver.render.map.objects import (
 )
 from eoxserver.render.coverage.objects import Coverage as RenderCoverage
 from eoxserver.render.coverage.objects import Mosaic as RenderMosaic
+from eoxserver.render.coverage.objects import (
+    from_models as coverages_from_models
+)
 from eoxserver.render.browse.objects import (
     Browse, GeneratedBrowse, Mask, MaskedBrowse, DEFAULT_EOXS_LAYER_SUFFIX_SEPARATOR,
     RasterStyle,
@@ -261,12 +264,10 @@ class LayerMapper(object):
             else:
                 return MosaicLayer(
                     full_name, style,
-                    RenderMosaic.from_model(eo_object), [
-                        RenderCoverage.from_model(coverage)
-                        for coverage in self.iter_coverages(
-                            eo_object, filters_expressions, sort_by
-                        )
-                    ], bands, wavelengths, time, elevation, ranges
+                    RenderMosaic.from_model(eo_object),
+                    coverages_from_models(self.iter_coverages(
+                        eo_object, filters_expressions, sort_by
+                    )), bands, wavelengths, time, elevation, ranges
                 )
 
         elif isinstance(eo_object, (models.Collection, models.Product)):
@@ -315,18 +316,14 @@ class LayerMapper(object):
 
                     if suffix == '':
                         return CoveragesLayer(
-                            full_name, style, [
-                                RenderCoverage.from_model(coverage)
-                                for coverage in coverages
-                            ],
+                            full_name, style,
+                            coverages_from_models(coverages),
                             bands, wavelengths, time, elevation, ranges
                         )
                     else:
                         return OutlinedCoveragesLayer(
-                            full_name, style, [
-                                RenderCoverage.from_model(coverage)
-                                for coverage in coverages
-                            ],
+                            full_name, style,
+                            coverages_from_models(coverages),
                             bands, wavelengths, time, elevation, ranges
                         )
 
@@ -29,6 +29,9 @@
 from lxml.builder import E, ElementMaker
 
 from eoxserver.core.util.xmltools import XMLEncoder, NameSpace, NameSpaceMap
+from eoxserver.services.ows.wms.featureinfo import (
+    SUPPORTED_FORMATS as SUPPORTED_INFO_FORMATS
+)
 
 ns_xlink = NameSpace("http://www.w3.org/1999/xlink", "xlink")
 nsmap = NameSpaceMap(ns_xlink)
@@ -85,11 +88,12 @@ class WMS11Encoder(XMLEncoder):
                             self.encode_dcptype(ows_url)
                         ]
                     ),
-                    E("GetFeatureInfo",
-                        E("Format",
-                            # TODO
-                        ),
-                        self.encode_dcptype(ows_url)
+                    E("GetFeatureInfo", *[
+                            E("Format", frmt)
+                            for frmt in SUPPORTED_INFO_FORMATS
+                        ] + [
+                            self.encode_dcptype(ows_url)
+                        ]
                     ),
                     E("GetLegendGraphic",*[
                             E("Format", frmt.mimeType)
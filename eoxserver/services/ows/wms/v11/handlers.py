@@ -26,7 +26,8 @@
 # ------------------------------------------------------------------------------
 
 from eoxserver.services.ows.wms.basehandlers import (
-    WMSBaseGetCapabilitiesHandler, WMSBaseGetMapHandler, WMSBaseGetMapDecoder
+    WMSBaseGetCapabilitiesHandler, WMSBaseGetMapHandler, WMSBaseGetMapDecoder,
+    WMSBaseGetFeatureInfoHandler, WMSBaseGetFeatureInfoDecoder
 )
 
 from eoxserver.services.ows.wms.v11.encoders import WMS11Encoder
@@ -48,3 +49,14 @@ class WMS11GetMapHandler(WMSBaseGetMapHandler):
 
 class WMS11GetMapDecoder(WMSBaseGetMapDecoder):
     pass
+
+
+class WMS11GetFeatureInfoHandler(WMSBaseGetFeatureInfoHandler):
+    versions = ("1.1", "1.1.0", "1.1.1")
+
+    def get_decoder(self, request):
+        return WMS11GetFeatureInfoDecoder(request.GET)
+
+
+class WMS11GetFeatureInfoDecoder(WMSBaseGetFeatureInfoDecoder):
+    pass
@@ -29,6 +29,9 @@
 from lxml.builder import ElementMaker
 
 from eoxserver.core.util.xmltools import XMLEncoder, NameSpace, NameSpaceMap
+from eoxserver.services.ows.wms.featureinfo import (
+    SUPPORTED_FORMATS as SUPPORTED_INFO_FORMATS
+)
 
 ns_wms = NameSpace("http://www.opengis.net/wms")
 ns_xlink = NameSpace("http://www.w3.org/1999/xlink", "xlink")
@@ -92,11 +95,12 @@ class WMS13Encoder(XMLEncoder):
                             self.encode_dcptype(ows_url)
                         ]
                     ),
-                    WMS("GetFeatureInfo",
-                        WMS("Format",
-                            # TODO
-                        ),
-                        self.encode_dcptype(ows_url)
+                    WMS("GetFeatureInfo", *[
+                            WMS("Format", frmt)
+                            for frmt in SUPPORTED_INFO_FORMATS
+                        ] + [
+                            self.encode_dcptype(ows_url)
+                        ]
                     ),
                     WMS("GetLegendGraphic",*[
                             WMS("Format", frmt.mimeType)
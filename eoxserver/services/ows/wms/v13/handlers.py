@@ -31,7 +31,8 @@ from eoxserver.services.ows.wms.util import parse_bbox
 from eoxserver.services.ows.wms.exceptions import InvalidCRS
 from eoxserver.services.ows.wms.basehandlers import (
     WMSBaseGetCapabilitiesHandler, WMSBaseGetMapHandler, WMSBaseGetMapDecoder,
-    WMSBaseGetLegendGraphicDecoder, WMSBaseGetLegendGraphicHandler
+    WMSBaseGetLegendGraphicDecoder, WMSBaseGetLegendGraphicHandler,
+    WMSBaseGetFeatureInfoHandler, WMSBaseGetFeatureInfoDecoder
 )
 from eoxserver.services.ows.wms.v13.encoders import WMS13Encoder
 
@@ -76,6 +77,20 @@ class WMS13GetMapDecoder(WMSBaseGetMapDecoder):
     srs = property(lambda self: self.crs)
 
 
+class WMS13GetFeatureInfoHandler(WMSBaseGetFeatureInfoHandler):
+    service = ("WMS", None)
+    versions = ("1.3.0", "1.3")
+
+    def get_decoder(self, request):
+        return WMS13GetFeatureInfoDecoder(request.GET)
+
+
+class WMS13GetFeatureInfoDecoder(WMS13GetMapDecoder,
+                                 WMSBaseGetFeatureInfoDecoder):
+    x = kvp.Parameter('i', type=int, num=1)
+    y = kvp.Parameter('j', type=int, num=1)
+
+
 class WMS13GetLegendGraphicHandler(WMSBaseGetLegendGraphicHandler):
     service = ("WMS", None)
     versions = ("1.3.0", "1.3")
@@ -75,10 +75,14 @@ class AsyncBackendInterface(object):
         """ Cancel the job execution. """
 
     def pause(self, job_id, **kwargs):
-        """ Pause the job execution. """
+        """ Pause the job execution. Returns ``False`` when the job cannot be
+        paused.
+        """
 
     def resume(self, job_id, **kwargs):
-        """ Resume the job execution. """
+        """ Resume the job execution. Returns ``False`` when the job cannot be
+        resumed.
+        """
 
 
 class ProcessInterface(object):
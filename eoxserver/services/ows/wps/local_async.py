@@ -0,0 +1,510 @@
+# ------------------------------------------------------------------------------
+#
+# Local asynchronous WPS back-end
+#
+# Project: EOxServer <http://eoxserver.org>
+#
+# ------------------------------------------------------------------------------
+# Copyright (C) 2026 EOX IT Services GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies of this Software or works derived from this Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# ------------------------------------------------------------------------------
+
+""" An asynchronous WPS back-end running the jobs in a local thread pool of
+the serving process, without the need of an external broker. The job status,
+the status documents and the published files are stored in a job directory,
+so that any process of the same host can serve and cancel them.
+"""
+
+import concurrent.futures
+from contextlib import contextmanager
+import inspect
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from urllib.parse import quote
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from django.conf import settings
+from django.db import connections
+from django.urls import reverse
+
+from eoxserver.services.ows.wps.context import BaseContext, ContextError
+from eoxserver.services.ows.wps.interfaces import AsyncBackendInterface
+from eoxserver.services.ows.wps.util import InMemoryURLResolver
+from eoxserver.services.ows.wps.v10.encoders import (
+    WPS10ExecuteResponseXMLEncoder
+)
+from eoxserver.services.ows.wps.v10.execute_util import (
+    parse_params, decode_raw_inputs, decode_output_requests, pack_outputs,
+)
+
+
+logger = logging.getLogger(__name__)
+
+ACCEPTED = "ACCEPTED"
+STARTED = "STARTED"
+PAUSED = "PAUSED"
+CANCELLED = "CANCELLED"
+FAILED = "FAILED"
+SUCCEEDED = "SUCCEEDED"
+
+FINISHED_STATUSES = (CANCELLED, FAILED, SUCCEEDED)
+
+DEFAULT_EOXS_ASYNC_MAX_WORKERS = 2
+DEFAULT_EOXS_ASYNC_RETENTION_PERIOD = 86400
+
+JOB_ID_RE = re.compile(r'^[A-Za-z0-9_-]{1,128}$')
+
+RESPONSE_FILENAME = "response.xml"
+JOB_FILENAME = "job.json"
+LOCK_FILENAME = "job.lock"
+WORKSPACE_DIRNAME = "workspace"
+
+# minimal interval in seconds between two purges of the expired jobs
+PURGE_INTERVAL = 60
+
+
+class JobCancelled(Exception):
+    """ Raised within a running job, when its cancellation was requested. """
+
+
+class LocalJobStore(object):
+    """ File-system based store of the job status, status documents and
+        published files. Each job has its own directory containing the
+        ``job.json`` status record, the ``response.xml`` status document and
+        the ``workspace`` directory.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def get_job_path(self, job_id, *parts):
+        if not JOB_ID_RE.match(job_id):
+            raise KeyError(job_id)
+        return os.path.join(self.path, job_id, *parts)
+
+    def create(self, job_id, record):
+        try:
+            os.makedirs(self.get_job_path(job_id, WORKSPACE_DIRNAME))
+        except FileExistsError:
+            raise ValueError("Job %r already exists." % job_id)
+        self.write(job_id, record)
+
+    def exists(self, job_id):
+        try:
+            return os.path.exists(self.get_job_path(job_id, JOB_FILENAME))
+        except KeyError:
+            return False
+
+    def read(self, job_id):
+        try:
+            with open(self.get_job_path(job_id, JOB_FILENAME)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise KeyError(job_id)
+
+    def write(self, job_id, record):
+        self._write_atomic(
+            self.get_job_path(job_id, JOB_FILENAME),
+            json.dumps(record).encode('utf-8')
+        )
+
+    @contextmanager
+    def lock(self, job_id):
+        """ Exclusively locks the status record of a job, so that concurrent
+            read-modify-write cycles of other threads and processes do not
+            overwrite each other. Without ``fcntl`` only the atomic writes
+            are guaranteed.
+        """
+        try:
+            lock_file = open(self.get_job_path(job_id, LOCK_FILENAME), 'a')
+        except FileNotFoundError:
+            raise KeyError(job_id)
+
+        with lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def update(self, job_id, **values):
+        with self.lock(job_id):
+            record = self.read(job_id)
+            record.update(values)
+            self.write(job_id, record)
+        return record
+
+    def write_response(self, job_id, payload):
+        self._write_atomic(
+            self.get_job_path(job_id, RESPONSE_FILENAME), payload
+        )
+
+    def open_file(self, job_id, filename=None):
+        """ Opens the status document or a published file of a job. """
+        if filename is None:
+            return open(self.get_job_path(job_id, RESPONSE_FILENAME), 'rb')
+
+        record = self.read(job_id)
+        if filename not in record.get('published', []):
+            raise KeyError(filename)
+        return open(
+            self.get_job_path(job_id, WORKSPACE_DIRNAME, filename), 'rb'
+        )
+
+    def remove(self, job_id):
+        shutil.rmtree(self.get_job_path(job_id), ignore_errors=True)
+
+    def iter_job_ids(self):
+        for job_id in os.listdir(self.path):
+            if JOB_ID_RE.match(job_id):
+                yield job_id
+
+    def _write_atomic(self, path, payload):
+        directory = os.path.dirname(path)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+
+class LocalContext(BaseContext):
+    """ The context passed to asynchronously executed processes accepting a
+        ``context`` argument.
+    """
+
+    def __init__(self, backend, job_id, encoder):
+        self._backend = backend
+        self._job_id = job_id
+        self._encoder = encoder
+        self._logger = logging.LoggerAdapter(logger, {"job_id": job_id})
+
+    @property
+    def identifier(self):
+        return self._job_id
+
+    @property
+    def logger(self):
+        return self._logger
+
+    @property
+    def workspace_path(self):
+        return self._backend.store.get_job_path(
+            self._job_id, WORKSPACE_DIRNAME
+        )
+
+    def publish(self, path):
+        workspace_path = os.path.realpath(self.workspace_path)
+        abs_path = os.path.realpath(os.path.join(workspace_path, path))
+        if os.path.dirname(abs_path) != workspace_path:
+            raise ContextError(
+                "Only files directly in the workspace can be published."
+            )
+
+        filename = os.path.basename(abs_path)
+        store = self._backend.store
+        with store.lock(self._job_id):
+            record = store.read(self._job_id)
+            published = record.setdefault('published', [])
+            if filename not in published:
+                published.append(filename)
+                store.write(self._job_id, record)
+
+        url = "%s/%s" % (record['response_url'], quote(filename))
+        return abs_path, url
+
+    def update_progress(self, progress, message=None):
+        self.check_cancelled()
+        self._backend.store.update(
+            self._job_id, progress=progress, message=message
+        )
+        self._backend._write_response(
+            self._job_id, self._encoder,
+            self._encoder.encode_started(progress, message)
+        )
+
+    def check_cancelled(self):
+        """ Raises :class:`JobCancelled` when the cancellation of the job was
+            requested.
+        """
+        if self._backend.store.read(self._job_id).get('cancel_requested'):
+            raise JobCancelled("The job %r was cancelled." % self._job_id)
+
+
+class LocalAsyncBackend(AsyncBackendInterface):
+    """ Asynchronous WPS 1.0 back-end executing the processes in a thread pool
+        of the current process. It is configured using the following settings:
+
+        ``EOXS_ASYNC_JOB_DIRECTORY``
+            the directory of the job store, defaulting to a directory in the
+            systems temporary directory
+        ``EOXS_ASYNC_MAX_WORKERS``
+            the maximum number of concurrently executed jobs per process
+        ``EOXS_ASYNC_RETENTION_PERIOD``
+            the default number of seconds a finished job is kept, unless the
+            process defines a ``retention_period``
+
+        Jobs cannot be interrupted: a cancellation is only noticed before the
+        process is started, when it finishes (its outputs are discarded) and
+        whenever a process accepting a ``context`` reports its progress or
+        calls ``check_cancelled``. Purging an unfinished job cancels it and
+        removes it once it has finished. Pausing and resuming jobs is not
+        supported.
+    """
+    supported_versions = ("1.0.0",)
+
+    def __init__(self):
+        self.store = LocalJobStore(getattr(
+            settings, 'EOXS_ASYNC_JOB_DIRECTORY',
+            os.path.join(tempfile.gettempdir(), 'eoxserver_wps_jobs')
+        ))
+        self.max_workers = getattr(
+            settings, 'EOXS_ASYNC_MAX_WORKERS', DEFAULT_EOXS_ASYNC_MAX_WORKERS
+        )
+        self.retention_period = getattr(
+            settings, 'EOXS_ASYNC_RETENTION_PERIOD',
+            DEFAULT_EOXS_ASYNC_RETENTION_PERIOD
+        )
+        self._executor = None
+        self._executor_pid = None
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._last_purge = 0
+
+    @property
+    def executor(self):
+        # the pool must not be shared with forked processes
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="wps-async",
+                )
+                self._executor_pid = os.getpid()
+                self._futures = {}
+            return self._executor
+
+    def execute(self, process, raw_inputs, resp_form, extra_parts=None,
+                job_id=None, version="1.0.0", request=None, **kwargs):
+        self.purge_expired()
+
+        if job_id is None:
+            job_id = uuid.uuid4().hex
+        elif not JOB_ID_RE.match(job_id):
+            raise ValueError("Invalid job identifier %r." % job_id)
+
+        response_url = reverse("wps_job", kwargs={"job_id": job_id})
+        if request is not None:
+            response_url = request.build_absolute_uri(response_url)
+
+        retention_period = getattr(process, 'retention_period', None)
+        retention_period = (
+            retention_period.total_seconds() if retention_period
+            else self.retention_period
+        )
+
+        self.store.create(job_id, {
+            "identifier": job_id,
+            "process": (
+                getattr(process, 'identifier', None)
+                or type(process).__name__
+            ),
+            "status": ACCEPTED,
+            "progress": 0,
+            "message": None,
+            "created": time.time(),
+            "finished": None,
+            "retention_period": retention_period,
+            "pid": os.getpid(),
+            "cancel_requested": False,
+            "response_url": response_url,
+            "published": [],
+        })
+
+        encoder = WPS10ExecuteResponseXMLEncoder(
+            process, resp_form, raw_inputs, status_location=response_url
+        )
+        self._write_response(job_id, encoder, encoder.encode_accepted())
+
+        future = self.executor.submit(
+            self._run, job_id, process, raw_inputs, resp_form,
+            extra_parts, encoder
+        )
+        self._futures[job_id] = future
+        future.add_done_callback(lambda f: self._futures.pop(job_id, None))
+        return job_id
+
+    def get_response_url(self, job_id):
+        return self.store.read(job_id)["response_url"]
+
+    def get_status(self, job_id):
+        record = self.store.read(job_id)
+        status = record["status"]
+        if status in (ACCEPTED, STARTED) and not _is_alive(record["pid"]):
+            # the serving process died while executing the job
+            status = FAILED
+        return status
+
+    def open_job_file(self, job_id, filename=None):
+        """ Opens the status document or a published file of a job and
+            returns it with its content type.
+        """
+        self.purge_expired()
+        if filename is None:
+            return self.store.open_file(job_id), "application/xml"
+        return self.store.open_file(job_id, filename), None
+
+    def purge(self, job_id, **kwargs):
+        """ Removes the job. An unfinished job is only cancelled, its
+            resources are removed as soon as it has finished.
+        """
+        future = self._futures.get(job_id)
+        if future is not None and future.cancel():
+            # the job was not started yet
+            self.store.remove(job_id)
+            return
+
+        with self.store.lock(job_id):
+            record = self.store.read(job_id)
+            running = (
+                record["status"] not in FINISHED_STATUSES
+                and _is_alive(record["pid"])
+            )
+            if running:
+                record.update(cancel_requested=True, purge_requested=True)
+                self.store.write(job_id, record)
+
+        if not running:
+            self.store.remove(job_id)
+
+    def cancel(self, job_id, **kwargs):
+        record = self.store.update(job_id, cancel_requested=True)
+        future = self._futures.get(job_id)
+        if future is not None and future.cancel():
+            # the job was not started yet
+            self._finish(job_id, CANCELLED)
+        return record["status"] not in FINISHED_STATUSES
+
+    def pause(self, job_id, **kwargs):
+        # pausing is not supported
+        return False
+
+    def resume(self, job_id, **kwargs):
+        # resuming is not supported
+        return False
+
+    def purge_expired(self, force=False):
+        """ Removes all finished jobs whose retention period has passed. """
+        current = time.time()
+        if not force and current - self._last_purge < PURGE_INTERVAL:
+            return
+        self._last_purge = current
+
+        for job_id in self.store.iter_job_ids():
+            try:
+                record = self.store.read(job_id)
+            except (KeyError, ValueError):
+                continue
+
+            finished = record.get("finished")
+            if finished is not None and \
+                    finished + record["retention_period"] < current:
+                logger.debug("Purging expired WPS job %s", job_id)
+                self.store.remove(job_id)
+
+    def _run(self, job_id, process, raw_inputs, resp_form, extra_parts,
+             encoder):
+        context = LocalContext(self, job_id, encoder)
+        try:
+            context.check_cancelled()
+            self.store.update(job_id, status=STARTED)
+            self._write_response(job_id, encoder, encoder.encode_started())
+
+            input_defs = parse_params(process.inputs)
+            output_defs = parse_params(process.outputs)
+
+            inputs = {}
+            inputs.update(decode_output_requests(resp_form, output_defs))
+            inputs.update(decode_raw_inputs(
+                raw_inputs, input_defs,
+                InMemoryURLResolver(extra_parts, context.logger)
+            ))
+            encoder.inputs = inputs
+
+            kwargs = dict(inputs)
+            if "context" in inspect.signature(process.execute).parameters:
+                kwargs["context"] = context
+
+            outputs = process.execute(**kwargs)
+            context.check_cancelled()
+
+            packed_outputs = pack_outputs(outputs, resp_form, output_defs)
+            self._write_response(
+                job_id, encoder, encoder.encode_response(packed_outputs)
+            )
+            self._finish(job_id, SUCCEEDED)
+
+        except JobCancelled as exc:
+            context.logger.info("Job cancelled")
+            self._write_response(job_id, encoder, encoder.encode_failed(exc))
+            self._finish(job_id, CANCELLED)
+
+        except Exception as exc:
+            context.logger.exception("Job failed")
+            self._write_response(job_id, encoder, encoder.encode_failed(exc))
+            self._finish(job_id, FAILED)
+
+        finally:
+            # close the connections opened by this thread
+            connections.close_all()
+
+    def _finish(self, job_id, status):
+        record = self.store.update(
+            job_id, status=status, finished=time.time()
+        )
+        if record.get("purge_requested"):
+            self.store.remove(job_id)
+
+    def _write_response(self, job_id, encoder, response):
+        payload, _ = encoder.serialize(response)
+        self.store.write_response(job_id, payload)
+
+
+def _is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
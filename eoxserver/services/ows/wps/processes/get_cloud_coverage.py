@@ -30,16 +30,21 @@ import concurrent
 import functools
 from datetime import datetime
 import json
+import math
+import threading
 from uuid import uuid4
 from typing import List, Callable, Optional, Any
 
+from django.conf import settings
+from django.contrib.gis.geos import GEOSGeometry
 from osgeo import ogr, osr
 
 from eoxserver.core import Component
 from eoxserver.contrib import gdal
-from eoxserver.resources.coverages import models
+from eoxserver.resources.coverages import crss, models
 from eoxserver.backends.access import gdal_open
 from eoxserver.services.ows.wps.exceptions import InvalidInputValueError
+from eoxserver.services.ows.wps.util import has_async_backend
 from eoxserver.services.ows.wps.parameters import (
     LiteralData,
     ComplexData,
@@ -52,6 +57,17 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# coverage types usable for cloud coverage, in order of preference
+COVERAGE_TYPE_PRIORITY = ("CLM", "MG2", "SCL")
+
+DEFAULT_MAX_WORKERS = 5
+# the approximate number of pixels along the longer side of the geometry to
+# compute the histogram from
+DEFAULT_TARGET_SIZE = 1024
+
+_executor = None
+_executor_lock = threading.Lock()
+
 
 class CloudCoverageProcess(Component):
     identifier = "CloudCoverage"
@@ -60,6 +76,12 @@ class CloudCoverageProcess(Component):
     metadata = {}
     profiles = ["EOxServer:CloudCoverage"]
 
+    @property
+    def asynchronous(self):
+        # long running process: allow asynchronous execution whenever a
+        # back-end is available
+        return has_async_backend()
+
     inputs = {
         "begin_time": LiteralData(
             "begin_time",
@@ -137,56 +159,84 @@ class CloudCoverageProcess(Component):
             except ValueError:
                 raise InvalidInputValueError("cloud_mask", "Invalid cloud mask value")
 
-        # TODO Use queue object for more complex query if parent_product__footprint is not enough
-        relevant_coverages = models.Coverage.objects.filter(
-            parent_product__begin_time__lte=end_time,
-            parent_product__end_time__gte=begin_time,
-            parent_product__footprint__intersects=wkt_geometry,
-        ).order_by("parent_product__begin_time")
+        # resolve the data items of all candidate coverages in a single query
+        data_items = models.ArrayDataItem.objects.filter(
+            coverage__parent_product__begin_time__lte=end_time,
+            coverage__parent_product__end_time__gte=begin_time,
+            coverage__parent_product__footprint__intersects=wkt_geometry,
+            coverage__coverage_type__name__in=COVERAGE_TYPE_PRIORITY,
+        ).select_related(
+            "storage",
+            "coverage__coverage_type",
+            "coverage__parent_product",
+        ).order_by(
+            "coverage__parent_product__begin_time",
+            "coverage_id",
+            "field_index",
+        )
 
-        if coverages_clm := relevant_coverages.filter(coverage_type__name="CLM"):
-            logger.info("Matched %s CLM covs for cloud coverage", coverages_clm.count())
+        items_by_type = {}
+        seen_coverage_ids = set()
+        for data_item in data_items:
+            # only use the first data item of each coverage
+            if data_item.coverage_id not in seen_coverage_ids:
+                seen_coverage_ids.add(data_item.coverage_id)
+                items_by_type.setdefault(
+                    data_item.coverage.coverage_type.name, []
+                ).append(data_item)
+
+        if items := items_by_type.get("CLM"):
+            logger.info("Matched %s CLM covs for cloud coverage", len(items))
             calculation_fun = cloud_coverage_ratio_for_CLM
-            coverages = coverages_clm
             # CLM is a bitmask, this value would mean that all types of cloud were found
             # hopefully this never occurs naturally, so we can use it as no_data
             no_data_value = 0b11111111
 
-        elif coverages_mg2 := relevant_coverages.filter(coverage_type__name="MG2"):
-            logger.info("Matched %s MG2 covs for cloud coverage", coverages_mg2.count())
+        elif items := items_by_type.get("MG2"):
+            logger.info("Matched %s MG2 covs for cloud coverage", len(items))
             calculation_fun = cloud_coverage_ratio_for_MG2
-            coverages = coverages_mg2
             # MG2 is a bitmask, this value would mean that all types in mask were found
             # hopefully this never occurs naturally, so we can use it as no_data
             no_data_value = 0b11111111
 
-        elif coverages_scl := relevant_coverages.filter(coverage_type__name="SCL"):
-            logger.info("Matched %s SCL covs for cloud coverage", coverages_scl.count())
+        elif items := items_by_type.get("SCL"):
+            logger.info("Matched %s SCL covs for cloud coverage", len(items))
             calculation_fun = cloud_coverage_ratio_for_SCL
-            coverages = coverages_scl
             no_data_value = None
 
         else:
             calculation_fun = None
-            coverages = []
+            items = []
             no_data_value = None
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as e:
-            cloud_coverage_ratios = e.map(
-                functools.partial(
-                    cloud_coverage_ratio_in_geometry,
-                    calculation_fun=calculation_fun,
-                    wkt_geometry=wkt_geometry,
-                    no_data_value=no_data_value,
-                    cloud_mask=cloud_mask,
+        # the product footprint only roughly matched in the query, so drop
+        # the coverages not touching the geometry at all instead of
+        # reporting them as cloud free
+        geometry = GEOSGeometry(wkt_geometry, srid=4326)
+        items = [
+            data_item for data_item in items
+            if _intersects(data_item, geometry)
+        ]
+
+        cloud_coverage_ratios = get_executor().map(
+            functools.partial(
+                cloud_coverage_ratio_in_geometry,
+                calculation_fun=calculation_fun,
+                wkt_geometry=wkt_geometry,
+                no_data_value=no_data_value,
+                cloud_mask=cloud_mask,
+                target_size=getattr(
+                    settings, "EOXS_CLOUD_COVERAGE_TARGET_SIZE",
+                    DEFAULT_TARGET_SIZE
                 ),
-                [coverage.arraydata_items.get() for coverage in coverages],
-            )
+            ),
+            items,
+        )
 
         result = {
             "result": {
-                coverage.parent_product.begin_time.isoformat(): cloud_cover_ratio
-                for coverage, cloud_cover_ratio in zip(coverages, cloud_coverage_ratios)
+                data_item.coverage.parent_product.begin_time.isoformat(): ratio
+                for data_item, ratio in zip(items, cloud_coverage_ratios)
             }
         }
         return CDObject(
@@ -196,21 +246,58 @@ class CloudCoverageProcess(Component):
         )
 
 
+def get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """ Returns the thread pool shared by all cloud coverage computations of
+        this process. Its size is configured via the
+        ``EOXS_CLOUD_COVERAGE_MAX_WORKERS`` setting.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=getattr(
+                    settings, "EOXS_CLOUD_COVERAGE_MAX_WORKERS",
+                    DEFAULT_MAX_WORKERS
+                ),
+                thread_name_prefix="cloud-coverage",
+            )
+        return _executor
+
+
 def cloud_coverage_ratio_in_geometry(
     data_item: models.ArrayDataItem,
     wkt_geometry: str,
     calculation_fun: Callable[[List[int], Any], float],
     no_data_value: Optional[int],
     cloud_mask: Any,
+    target_size: int = DEFAULT_TARGET_SIZE,
 ) -> float:
+    geometry = GEOSGeometry(wkt_geometry, srid=4326)
+    footprint = _get_footprint(data_item)
+
     histogram = _histogram_in_geometry(
         data_item=data_item,
         wkt_geometry=wkt_geometry,
         no_data_value=no_data_value,
+        # when the geometry contains the whole coverage, no cutline is needed
+        covers_data=footprint is not None and geometry.contains(footprint),
+        target_size=target_size,
     )
     return calculation_fun(histogram, cloud_mask)
 
 
+def _get_footprint(data_item: models.ArrayDataItem):
+    return (
+        data_item.coverage.footprint
+        or data_item.coverage.parent_product.footprint
+    )
+
+
+def _intersects(data_item: models.ArrayDataItem, geometry) -> bool:
+    footprint = _get_footprint(data_item)
+    return footprint is None or geometry.intersects(footprint)
+
+
 def cloud_coverage_ratio_for_CLM(histogram: List[int], cloud_mask: Any) -> float:
     cloud_mask = (
         cloud_mask
@@ -256,13 +343,33 @@ def _histogram_in_geometry(
     data_item: models.ArrayDataItem,
     wkt_geometry: str,
     no_data_value: Optional[int],
+    covers_data: bool = False,
+    target_size: int = DEFAULT_TARGET_SIZE,
 ) -> List[int]:
     # NOTE: this is executed in threads, but all gdal operations are contained
     #       in here, so each thread has separate gdal data
 
-    tmp_ds = f"/vsimem/{uuid4()}.tif"
     original_ds = gdal_open(data_item)
 
+    if covers_data:
+        # the whole raster is within the geometry, so just read the histogram
+        # of the overview level best matching the target size
+        band = _get_overview_band(original_ds.GetRasterBand(1), target_size)
+        histogram = band.GetHistogram(
+            approx_ok=False,
+            include_out_of_range=True,
+        )
+        # the warped output below has ``no_data_value`` set as nodata, which
+        # excludes it from the histogram. Do the same here, as the band
+        # itself might not declare it
+        if no_data_value is not None and no_data_value < len(histogram):
+            histogram[no_data_value] = 0
+        return histogram
+
+    # limit the output size, so that GDAL reads from a matching overview level
+    width, height = _get_output_size(original_ds, wkt_geometry, target_size)
+
+    tmp_ds = f"/vsimem/{uuid4()}.tif"
     with _create_geometry_feature_in_memory(wkt_geometry) as geometry_mem_path:
         result_ds = gdal.Warp(
             tmp_ds,
@@ -274,6 +381,8 @@ def _histogram_in_geometry(
                 cropToCutline=True,
                 warpOptions=["CUTLINE_ALL_TOUCHED=TRUE"],
                 dstNodata=no_data_value,
+                width=width,
+                height=height,
             ),
         )
 
@@ -289,6 +398,45 @@ def _histogram_in_geometry(
     return histogram
 
 
+def _get_overview_band(band, target_size: int):
+    """ Returns the coarsest overview of the band that still has at least
+        ``target_size`` pixels along its longer side, or the band itself.
+    """
+    selected = band
+    for index in range(band.GetOverviewCount()):
+        overview = band.GetOverview(index)
+        size = max(overview.XSize, overview.YSize)
+        if size >= target_size and size < max(selected.XSize, selected.YSize):
+            selected = overview
+    return selected
+
+
+def _get_output_size(dataset, wkt_geometry: str, target_size: int):
+    """ Returns the ``(width, height)`` of the warped output, so that the
+        geometry spans at most ``target_size`` pixels. ``(0, 0)`` lets GDAL
+        use the native resolution.
+    """
+    projection = dataset.GetProjection()
+    if not projection:
+        return 0, 0
+
+    ogr_geometry = ogr.CreateGeometryFromWkt(wkt_geometry)
+    ogr_geometry.Transform(
+        crss.get_coordinate_transformation(4326, projection)
+    )
+    min_x, max_x, min_y, max_y = ogr_geometry.GetEnvelope()
+
+    geotransform = dataset.GetGeoTransform()
+    columns = (max_x - min_x) / abs(geotransform[1])
+    rows = (max_y - min_y) / abs(geotransform[5])
+
+    if max(columns, rows) <= target_size:
+        return 0, 0
+
+    scale = target_size / max(columns, rows)
+    return max(1, math.ceil(columns * scale)), max(1, math.ceil(rows * scale))
+
+
 @contextlib.contextmanager
 def _create_geometry_feature_in_memory(wkt_geometry: str):
     memory_path = f"/vsimem/{uuid4()}.shp"
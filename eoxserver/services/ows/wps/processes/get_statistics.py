@@ -26,19 +26,24 @@
 # THE SOFTWARE.
 # -----------------------------------------------------------------------------
 
-from uuid import uuid4
+import concurrent.futures
 import numpy as np
 
 from eoxserver.core import Component
 
-from eoxserver.contrib import gdal
+from eoxserver.processing.gdal.statistics import (
+    compute_band_statistics, get_window, rebin_histogram
+)
 
+from eoxserver.services.ows.wps.util import has_async_backend
 from eoxserver.services.ows.wps.parameters import (
     LiteralData, ComplexData, FormatJSON, CDObject, BoundingBoxData
 )
 
 from eoxserver.resources.coverages import models
 from eoxserver.backends.access import gdal_open
+from django.conf import settings
+from django.db import connections
 from django.db.models import Q, F
 
 from django.contrib.gis.geos import Polygon
@@ -46,6 +51,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# default number of coverages processed in parallel
+DEFAULT_MAX_WORKERS = 5
+
 
 class GetStatisticsProcess(Component):
     """ GetStatistics defines a WPS process for Raster image Statistics
@@ -57,6 +65,12 @@ class GetStatisticsProcess(Component):
     metadata = {}
     profiles = ['EOxServer:GetStatistics']
 
+    @property
+    def asynchronous(self):
+        # long running process: allow asynchronous execution whenever a
+        # back-end is available
+        return has_async_backend()
+
     inputs = {
         "bbox": BoundingBoxData(
             "bbox",
@@ -66,6 +80,10 @@ class GetStatisticsProcess(Component):
             "collection",
             title="The Identifier of the collection of intrest."
         ),
+        "approximate": LiteralData(
+            "approximate", bool, optional=True, default=False,
+            title="Compute approximate statistics using overviews.",
+        ),
     }
 
     outputs = {
@@ -78,7 +96,7 @@ class GetStatisticsProcess(Component):
     }
 
     @staticmethod
-    def execute(bbox, collection, **kwarg):
+    def execute(bbox, collection, approximate=False, **kwarg):
         """ The main execution function for the process.
         """
 
@@ -100,81 +118,32 @@ class GetStatisticsProcess(Component):
                     Q(footprint__intersects=parsed_bbox)
                     | Q(footprint__isnull=True, parent_product__footprint__intersects=parsed_bbox)
                 )
-            )
+            ).select_related('coverage_type', 'parent_product')
+
+        # collect all database information up front, so that the workers
+        # only read the data
+        tasks = [
+            get_coverage_task(coverage, parsed_bbox) for coverage in coverages
+        ]
+
+        max_workers = getattr(
+            settings, "EOXS_STATISTICS_MAX_WORKERS", DEFAULT_MAX_WORKERS
+        )
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_workers) as executor:
+            results = list(executor.map(
+                lambda task: compute_coverage_statistics(
+                    task, parsed_bbox, approximate
+                ),
+                tasks
+            ))
 
         report = {
-            "result": []}
-        for coverage in coverages:
-
-            coverage_id = coverage.identifier
-            coverage_type = coverage.coverage_type
-            fields = coverage_type.field_types.all()
-            stats_json = {
-                "id": coverage_id,
-                "bands": []
-            }
-
-            for field_idx, field in enumerate(fields):
-                nill_values = [float(item['value']) for item in field.nil_values.values('value')]
-                array_data_item = coverage.arraydata_items.get(
-                    field_index__lte=field_idx,
-                    field_index__gt=field_idx - F('band_count')
-                            )
-
-                ds = gdal_open(array_data_item, False)
-                geoTransform = ds.GetGeoTransform()
-                minx = geoTransform[0]
-                maxy = geoTransform[3]
-                maxx = minx + geoTransform[1] * ds.RasterXSize
-                miny = maxy + geoTransform[5] * ds.RasterYSize
-                coverage_bbox = Polygon.from_bbox((minx, miny, maxx, maxy))
-
-                if not parsed_bbox.contains(coverage_bbox):
-                    values_bbox = coverage_bbox.intersection(parsed_bbox)
-                    if round(values_bbox.area, 2) > 0:
-                        values = list(values_bbox.extent)
-                    else:
-                        logger.error('The provided bbox is not inside or intersecting with the coverage')
-                        continue
-
-                    tmp_ds = '/vsimem/%s.tif' % uuid4().hex
-                    ds = gdal.Warp(tmp_ds, ds, dstSRS=ds.GetProjection(), outputBounds=values, format='Gtiff')
-                    gdal.Unlink(tmp_ds)
-
-                band_number = array_data_item.field_index - field_idx + 1
-
-                band = ds.GetRasterBand(band_number)
-                image_array = band.ReadAsArray()
-                data_array = image_array
-                no_data_list = []
-                for no_data in nill_values:
-                    no_data_list.append(np.sum(image_array == no_data))
-                    data_array = data_array[data_array != no_data]
-                # if the image is empty GetStatistics will throw an error
-                # so we check if the number of the image pixels is greater
-                # than the number of noData pixels
-                nodata_number = np.sum(no_data_list).item()
-                if ((image_array.size - nodata_number) > 0):
-                    stats = ds.GetRasterBand(band_number).GetStatistics(0, 1)
-                    interval = (np.amax(data_array) - np.amin(data_array)) / 25
-
-                    bin_array, hist = np.histogram(data_array, bins=np.arange(
-                        int(stats[0]), int(stats[1]), interval, int))
-
-                    band_data = {
-                        "BAND_ID": band_number,
-                        "MINIMUM": stats[0],
-                        "MAXIMUM": stats[1],
-                        "MEAN": stats[2],
-                        "STDDEV": stats[3],
-                        "HISTOGRAM_FREQUENCY": bin_array.tolist(),
-                        "HISTOGRAM_PIXEL_VALUES": hist.tolist(),
-                        "NUMBER_OF_NODATA_PIXELS": nodata_number
-                        }
-                    stats_json["bands"].append(band_data)
-
-            if len(stats_json["bands"]) >= 1:
-                report["result"].append(stats_json)
+            "result": [
+                stats_json for stats_json in results
+                if len(stats_json["bands"]) >= 1
+            ]
+        }
 
         _output = CDObject(
             report, format=FormatJSON(),
@@ -182,3 +151,131 @@ class GetStatisticsProcess(Component):
         )
 
         return _output
+
+
+def get_coverage_task(coverage, bbox):
+    """ Collects the fields, nil values, data items and stored band
+        statistics of a coverage.
+    """
+    footprint = coverage.footprint or (
+        coverage.parent_product.footprint if coverage.parent_product else None
+    )
+    covered = footprint is not None and bbox.contains(footprint)
+    num_pixels = (coverage.axis_1_size or 0) * (coverage.axis_2_size or 0)
+
+    fields = []
+    for field_idx, field in enumerate(coverage.coverage_type.field_types.all()):
+        nil_values = [
+            float(item['value']) for item in field.nil_values.values('value')
+        ]
+        array_data_item = coverage.arraydata_items.select_related(
+            'storage'
+        ).get(
+            field_index__lte=field_idx,
+            field_index__gt=field_idx - F('band_count')
+        )
+        band_number = array_data_item.field_index - field_idx + 1
+
+        stored = None
+        if covered:
+            stored = get_stored_statistics(
+                array_data_item, band_number, num_pixels
+            )
+
+        fields.append((array_data_item, band_number, nil_values, stored))
+
+    return coverage.identifier, fields
+
+
+def get_stored_statistics(array_data_item, band_number, num_pixels):
+    """ Returns the band data from the registered ``BandStatistics``, if they
+        are complete.
+    """
+    stats = array_data_item.array_statistics.filter(
+        band_index=band_number
+    ).first()
+    if stats is None or None in (
+            stats.minimum, stats.maximum, stats.mean, stats.stddev):
+        return None
+
+    histogram = stats.histogram or {}
+    buckets = histogram.get("buckets")
+    if not buckets:
+        return None
+
+    nodata_number = 0
+    if stats.valid_percent is not None and num_pixels:
+        nodata_number = int(
+            round(num_pixels * (100 - stats.valid_percent) / 100)
+        )
+
+    # use the same bins as computed statistics, regardless of the number of
+    # buckets of the stored histogram
+    low = histogram.get("min", stats.minimum)
+    high = histogram.get("max", stats.maximum)
+    width = (high - low) / len(buckets)
+    frequencies, pixel_values = rebin_histogram(
+        buckets, low + (np.arange(len(buckets)) + 0.5) * width,
+        stats.minimum, stats.maximum
+    )
+
+    return {
+        "BAND_ID": band_number,
+        "MINIMUM": stats.minimum,
+        "MAXIMUM": stats.maximum,
+        "MEAN": stats.mean,
+        "STDDEV": stats.stddev,
+        "HISTOGRAM_FREQUENCY": frequencies,
+        "HISTOGRAM_PIXEL_VALUES": pixel_values,
+        "NUMBER_OF_NODATA_PIXELS": nodata_number,
+    }
+
+
+def compute_coverage_statistics(task, bbox, approximate):
+    """ Computes the statistics of all fields of a coverage within the bbox.
+    """
+    coverage_id, fields = task
+    stats_json = {
+        "id": coverage_id,
+        "bands": []
+    }
+
+    try:
+        for array_data_item, band_number, nil_values, stored in fields:
+            if stored is not None:
+                stats_json["bands"].append(stored)
+                continue
+
+            ds = gdal_open(array_data_item, False)
+            window = get_window(ds, bbox.extent)
+            if window is None:
+                logger.error(
+                    'The provided bbox is not inside or intersecting with '
+                    'the coverage'
+                )
+                continue
+
+            band = ds.GetRasterBand(band_number)
+            stats = compute_band_statistics(
+                band, nil_values, window, approximate
+            )
+            # empty images have no statistics
+            if stats is None:
+                continue
+
+            frequencies, pixel_values = stats["histogram"]
+            stats_json["bands"].append({
+                "BAND_ID": band_number,
+                "MINIMUM": stats["minimum"],
+                "MAXIMUM": stats["maximum"],
+                "MEAN": stats["mean"],
+                "STDDEV": stats["stddev"],
+                "HISTOGRAM_FREQUENCY": frequencies,
+                "HISTOGRAM_PIXEL_VALUES": pixel_values,
+                "NUMBER_OF_NODATA_PIXELS": stats["nodata_count"],
+            })
+    finally:
+        # close the connections opened by this worker thread
+        connections.close_all()
+
+    return stats_json
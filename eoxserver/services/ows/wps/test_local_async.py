@@ -0,0 +1,239 @@
+# ------------------------------------------------------------------------------
+#
+#  WPS local asynchronous back-end - job store unit-tests
+#
+# Project: EOxServer <http://eoxserver.org>
+#
+# ------------------------------------------------------------------------------
+# Copyright (C) 2026 EOX IT Services GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies of this Software or works derived from this Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# ------------------------------------------------------------------------------
+# pylint: disable=missing-docstring
+
+import threading
+import time
+from unittest import TestCase, main
+from tempfile import TemporaryDirectory
+
+from django.test import SimpleTestCase, override_settings
+
+from eoxserver.services.ows.wps.parameters import ResponseDocument
+from eoxserver.services.ows.wps.local_async import (
+    LocalJobStore, LocalAsyncBackend, FINISHED_STATUSES, SUCCEEDED,
+    CANCELLED,
+)
+
+# -----------------------------------------------------------------------------
+
+
+class TestLocalJobStore(TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.store = LocalJobStore(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_create_update(self):
+        self.store.create("job-1", {"status": "ACCEPTED", "published": []})
+        self.assertTrue(self.store.exists("job-1"))
+        self.assertRaises(ValueError, self.store.create, "job-1", {})
+
+        self.store.update("job-1", status="STARTED", progress=10)
+        record = self.store.read("job-1")
+        self.assertEqual(record["status"], "STARTED")
+        self.assertEqual(record["progress"], 10)
+
+        self.store.write_response("job-1", b"<response/>")
+        with self.store.open_file("job-1") as fobj:
+            self.assertEqual(fobj.read(), b"<response/>")
+
+        self.assertEqual(list(self.store.iter_job_ids()), ["job-1"])
+        self.store.remove("job-1")
+        self.assertFalse(self.store.exists("job-1"))
+        self.assertRaises(KeyError, self.store.read, "job-1")
+
+    def test_invalid_job_id(self):
+        self.assertRaises(KeyError, self.store.read, "../job")
+        self.assertFalse(self.store.exists("../job"))
+
+    def test_only_published_files(self):
+        self.store.create("job-2", {"published": ["result.tif"]})
+        path = self.store.get_job_path("job-2", "workspace", "result.tif")
+        with open(path, "wb") as fobj:
+            fobj.write(b"data")
+
+        with self.store.open_file("job-2", "result.tif") as fobj:
+            self.assertEqual(fobj.read(), b"data")
+        self.assertRaises(KeyError, self.store.open_file, "job-2", "other")
+
+    def test_concurrent_updates(self):
+        self.store.create("job-3", {})
+
+        def update(index):
+            for _ in range(20):
+                self.store.update("job-3", **{"key-%d" % index: index})
+
+        threads = [
+            threading.Thread(target=update, args=(i,)) for i in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        record = self.store.read("job-3")
+        for i in range(4):
+            self.assertEqual(record["key-%d" % i], i)
+
+        self.store.remove("job-3")
+        self.assertRaises(KeyError, self.store.update, "job-3", status="X")
+
+
+class MinimalProcess(object):
+    identifier = "MinimalProcess"
+    inputs = []
+    outputs = []
+
+    @staticmethod
+    def execute(**kwargs):
+        return {}
+
+
+class BlockingProcess(object):
+    """ Process waiting for the ``event`` and reporting its progress. """
+    identifier = "BlockingProcess"
+    inputs = []
+    outputs = []
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.event = threading.Event()
+
+    def execute(self, context, **kwargs):
+        self.started.set()
+        self.event.wait(10)
+        context.update_progress(50, "halfway")
+        return {}
+
+
+class TestLocalAsyncBackend(SimpleTestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        with override_settings(
+                EOXS_ASYNC_JOB_DIRECTORY=self.tmpdir.name,
+                EOXS_ASYNC_MAX_WORKERS=1):
+            self.backend = LocalAsyncBackend()
+
+    def tearDown(self):
+        self.backend.executor.shutdown(wait=True)
+        self.tmpdir.cleanup()
+
+    def _execute(self, process):
+        return self.backend.execute(
+            process, {}, ResponseDocument(status=True, store_response=True)
+        )
+
+    def _wait(self, job_id, timeout=10):
+        end = time.time() + timeout
+        while time.time() < end:
+            status = self.backend.get_status(job_id)
+            if status in FINISHED_STATUSES:
+                return status
+            time.sleep(0.01)
+        self.fail("Job %s did not finish." % job_id)
+
+    def test_execute(self):
+        job_id = self._execute(MinimalProcess())
+        self.assertEqual(self._wait(job_id), SUCCEEDED)
+
+        fobj, content_type = self.backend.open_job_file(job_id)
+        with fobj:
+            self.assertIn(b"ProcessSucceeded", fobj.read())
+        self.assertEqual(content_type, "application/xml")
+        self.assertFalse(self.backend.cancel(job_id))
+
+    def test_cancel_running(self):
+        process = BlockingProcess()
+        job_id = self._execute(process)
+        self.assertTrue(process.started.wait(10))
+
+        self.assertTrue(self.backend.cancel(job_id))
+        process.event.set()
+        self.assertEqual(self._wait(job_id), CANCELLED)
+        self.assertTrue(self.backend.store.read(job_id)["cancel_requested"])
+
+    def test_cancel_queued(self):
+        blocking = BlockingProcess()
+        blocking_id = self._execute(blocking)
+        self.assertTrue(blocking.started.wait(10))
+
+        # the only worker is busy, so the job was not started yet
+        job_id = self._execute(MinimalProcess())
+        self.assertTrue(self.backend.cancel(job_id))
+        self.assertEqual(self._wait(job_id), CANCELLED)
+
+        blocking.event.set()
+        self.assertEqual(self._wait(blocking_id), SUCCEEDED)
+
+    def test_purge(self):
+        job_id = self._execute(MinimalProcess())
+        self._wait(job_id)
+        self.backend.purge(job_id)
+        self.assertFalse(self.backend.store.exists(job_id))
+        self.assertRaises(KeyError, self.backend.get_status, job_id)
+
+    def test_purge_running(self):
+        process = BlockingProcess()
+        job_id = self._execute(process)
+        self.assertTrue(process.started.wait(10))
+
+        # the job is only cancelled while it is running
+        self.backend.purge(job_id)
+        self.assertTrue(self.backend.store.exists(job_id))
+        self.assertTrue(self.backend.store.read(job_id)["cancel_requested"])
+
+        process.event.set()
+        self.backend.executor.shutdown(wait=True)
+        self.assertFalse(self.backend.store.exists(job_id))
+
+    def test_purge_queued(self):
+        blocking = BlockingProcess()
+        blocking_id = self._execute(blocking)
+        self.assertTrue(blocking.started.wait(10))
+
+        job_id = self._execute(MinimalProcess())
+        self.backend.purge(job_id)
+        self.assertFalse(self.backend.store.exists(job_id))
+
+        blocking.event.set()
+        self.assertEqual(self._wait(blocking_id), SUCCEEDED)
+
+    def test_pause_resume_unsupported(self):
+        job_id = self._execute(MinimalProcess())
+        self._wait(job_id)
+        self.assertFalse(self.backend.pause(job_id))
+        self.assertFalse(self.backend.resume(job_id))
+
+# -----------------------------------------------------------------------------
+
+
+if __name__ == '__main__':
+    main()
@@ -151,3 +151,13 @@ def get_async_backends():
         _setup_async_backends()
 
     return ASYNC_BACKENDS
+
+
+def has_async_backend(version="1.0.0"):
+    """ Checks whether an asynchronous back-end supporting the given WPS
+        version is configured.
+    """
+    return any(
+        version in backend.supported_versions
+        for backend in get_async_backends()
+    )
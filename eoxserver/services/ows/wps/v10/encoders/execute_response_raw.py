@@ -114,7 +114,10 @@ class ResultAlt(ResultItem):
         if chunksize < 0:
             raise ValueError("Invalid chunk-size %d!" % chunksize)
         data_file = self.data_file
-        for chunk in iter(lambda: data_file.read(chunksize), ''):
+        while True:
+            chunk = data_file.read(chunksize)
+            if not chunk:
+                break
             yield chunk
 
 # ------------------------------------------------------------------------------
@@ -30,9 +30,19 @@ import os.path
 from io import StringIO
 from uuid import uuid4
 
-from django.http import HttpResponse
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
 
 from eoxserver.core.util import multiparttools as mp
+from eoxserver.contrib import vsi
+
+
+#: the default size of the chunks a response is streamed in
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+#: payloads larger than this (in bytes) are streamed instead of being buffered
+#: in memory
+DEFAULT_STREAMING_THRESHOLD = 16 * 1024 * 1024
 
 
 class ResultItem(object):
@@ -79,9 +89,14 @@ class ResultItem(object):
     size = property(lambda self: len(self))
 
     def chunked(self, chunksize):
-        """ Returns a chunk of the data, which has at most ``chunksize`` bytes.
+        """ Yields chunks of the data, which have at most ``chunksize`` bytes.
         """
-        yield ""
+        data = self.data
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        view = memoryview(data)
+        for i in range(0, view.nbytes, chunksize):
+            yield view[i:i + chunksize]
 
     def delete(self):
         """ Cleanup any associated files, allocated memory, etc.
@@ -122,41 +137,113 @@ class ResultFile(ResultItem):
         os.remove(self.path)
 
 
+class ResultVSIFile(ResultItem):
+    """ Class for results that wrap files accessible via GDALs VSI API, for
+        example in-memory files in ``/vsimem/`` or remote files.
+
+    :param path: the VSI path of the file
+    :param delete_on_close: whether the file shall be unlinked when the result
+                            item is deleted
+    """
+
+    def __init__(self, path, content_type=None, filename=None, identifier=None,
+                 delete_on_close=True):
+        super(ResultVSIFile, self).__init__(content_type, filename, identifier)
+        self.path = path
+        self.delete_on_close = delete_on_close
+
+    @property
+    def data(self):
+        with vsi.open(self.path, 'rb') as f:
+            return f.read()
+
+    @property
+    def data_file(self):
+        return vsi.open(self.path, 'rb')
+
+    def __len__(self):
+        return vsi.VSIStatL(self.path).size
+
+    def chunked(self, chunksize):
+        with vsi.open(self.path, 'rb') as f:
+            while True:
+                data = f.read(chunksize)
+                if not data:
+                    break
+
+                yield data
+
+    def delete(self):
+        if self.delete_on_close:
+            vsi.remove(self.path)
+
+
+class ResultStream(ResultItem):
+    """ Class for results that are produced lazily by an iterable of byte
+        chunks, for example a generator. As the chunks are produced on
+        demand, a :class:`ResultStream` can only be consumed once.
+
+    :param iterable: the iterable yielding the byte chunks
+    :param size: the total size of the result in bytes, if known beforehand
+    """
+
+    def __init__(self, iterable, content_type=None, filename=None,
+                 identifier=None, size=None):
+        super(ResultStream, self).__init__(content_type, filename, identifier)
+        self.iterable = iterable
+        self._size = size
+
+    @property
+    def data(self):
+        return b"".join(bytes(chunk) for chunk in self.iterable)
+
+    def __len__(self):
+        if self._size is None:
+            raise NotImplementedError
+        return self._size
+
+    def chunked(self, chunksize):
+        for chunk in self.iterable:
+            if chunk:
+                yield chunk
+
+    def delete(self):
+        close = getattr(self.iterable, 'close', None)
+        if close:
+            close()
+
+
 class ResultBuffer(ResultItem):
     """ Class for results that are actually a subset of a larger context.
-        Usually a buffer.
+        Usually a buffer. Buffers are referenced via a :class:`memoryview`,
+        so that no copies are made when slicing or chunking.
     """
 
     def __init__(self, buf, content_type=None, filename=None, identifier=None):
         super(ResultBuffer, self).__init__(content_type, filename, identifier)
-        if isinstance(buf, str) or isinstance(buf, bytes):
-            self.buf = buf
-        else:
-            self.buf = buf.tobytes()
+        if isinstance(buf, str):
+            buf = buf.encode('utf-8')
+
+        try:
+            self.buf = memoryview(buf).cast('B')
+        except TypeError:
+            # either not supporting the buffer protocol or not contiguous
+            self.buf = memoryview(buf.tobytes())
 
     @property
     def data(self):
-        return self.buf
-    # @property
-    # def data_file(self):
-    #     return StringIO(self.buf)
+        return self.buf.tobytes()
 
     def __len__(self):
-        return len(self.buf)
+        return self.buf.nbytes
 
     def chunked(self, chunksize):
-        if chunksize < 0:
-            raise ValueError
-
-        size = len(self.buf)
-        if chunksize >= size:
-            yield self.buf
-            return
+        if chunksize <= 0:
+            raise ValueError("Invalid chunksize %r." % chunksize)
 
-        i = 0
-        while i < size:
+        size = self.buf.nbytes
+        for i in range(0, size, chunksize):
             yield self.buf[i:i + chunksize]
-            i += chunksize
 
 
 def get_content_type(result_set):
@@ -193,38 +280,66 @@ def get_headers(result_item):
 
 def get_payload_size(result_set, boundary):
     """ Calculate the size of the result set and all entailed result items plus
-        headers.
+        headers. Returns ``None`` if the size of any result item is not known
+        beforehand.
     """
     boundary_str = b"%s--%s%s" % (mp.CRLF, boundary, mp.CRLF)
     boundary_str_end = b"%s--%s--" % (mp.CRLF, boundary)
 
     size = 0
     for item in result_set:
+        try:
+            item_size = len(item)
+        except NotImplementedError:
+            return None
+
         size += len(boundary_str)
         size += len(
             mp.CRLF.join(b"%s: %s" % (k, v) for k, v in get_headers(item))
         )
         size += len(mp.CRLFCRLF)
-        size += len(item)
+        size += item_size
     size += len(boundary_str_end)
     return size
 
 
-def to_http_response(result_set, response_type=HttpResponse, boundary=None):
+def get_streaming_threshold():
+    """ Returns the payload size in bytes from which on responses are streamed
+        instead of being buffered. Configurable via the
+        ``EOXS_STREAMING_RESPONSE_THRESHOLD`` setting.
+    """
+    return getattr(
+        settings, 'EOXS_STREAMING_RESPONSE_THRESHOLD',
+        DEFAULT_STREAMING_THRESHOLD
+    )
+
+
+def to_http_response(result_set, response_type=None, boundary=None,
+                     chunksize=DEFAULT_CHUNK_SIZE):
     """ Returns a response for a given result set. The ``response_type`` is the
         class to be used. It must be capable to work with iterators. This
         function is also responsible to delete any temporary files and buffers
         of the ``result_set``.
 
+        The data of the result items is passed to the response in chunks of
+        at most ``chunksize`` bytes, so that no complete copy of large
+        payloads is necessary when streaming. When the payload size cannot be
+        determined, no ``Content-Length`` header is set and the WSGI server
+        falls back to chunked transfer-encoding.
+
         :param result_set: an iterable of objects following the
                            :class:`ResultItem` interface
-        :param response_type: the response type class to use; defaults to
-                              :class:`HttpResponse <django.http.HttpResponse>`.
-                              For streaming responses use
-                              :class:`StreamingHttpResponse
-                              <django.http.StreamingHttpResponse>`
+        :param response_type: the response type class to use. For streaming
+                              responses use :class:`StreamingHttpResponse
+                              <django.http.StreamingHttpResponse>`. By default
+                              a :class:`StreamingHttpResponse
+                              <django.http.StreamingHttpResponse>` is used
+                              when the payload size is unknown or exceeds the
+                              streaming threshold, otherwise a
+                              :class:`HttpResponse <django.http.HttpResponse>`
         :param boundary: the multipart boundary; if omitted a UUID hex string is
                          computed and used
+        :param chunksize: the maximum size of each chunk passed to the response
         :returns: a response object of the desired type
     """
 
@@ -233,18 +348,33 @@ def to_http_response(result_set, response_type=HttpResponse, boundary=None):
     if len(result_set) > 1:
         boundary = boundary or (uuid4().hex).encode('utf-8')
         content_type = b"multipart/related; boundary=%s" % boundary
-        headers = (('Content-Length', get_payload_size(result_set, boundary)), )
+        payload_size = get_payload_size(result_set, boundary)
+        if payload_size is not None:
+            headers = (('Content-Length', payload_size), )
+        else:
+            headers = ()
 
     # otherwise, the content type is the content type of the first included item
     elif len(result_set) < 1 or result_set[0].content_type is None:
         boundary = None
         content_type = b"application/octet-stream"
+        payload_size = 0
         headers = (('Content-Length', 0),)
 
     else:
         boundary = None
         content_type = result_set[0].content_type or b"application/octet-stream"
         headers = tuple(get_headers(result_set[0]))
+        try:
+            payload_size = len(result_set[0])
+        except NotImplementedError:
+            payload_size = None
+
+    if response_type is None:
+        if payload_size is None or payload_size > get_streaming_threshold():
+            response_type = StreamingHttpResponse
+        else:
+            response_type = HttpResponse
 
     def response_iterator(items, boundary=None):
         try:
@@ -259,7 +389,8 @@ def to_http_response(result_set, response_type=HttpResponse, boundary=None):
                         b"%s: %s" % (key, value)
                         for key, value in get_headers(item)
                     ) + mp.CRLFCRLF
-                yield item.data
+                for chunk in item.chunked(chunksize):
+                    yield chunk
             if boundary:
                 yield boundary_str_end
         finally:
@@ -308,6 +439,32 @@ def parse_headers(headers):
     return content_type, filename, identifier
 
 
+def result_item_to_vsi_file(item, path=None, chunksize=DEFAULT_CHUNK_SIZE):
+    """ Writes the data of a result item to a VSI file, by default in
+        ``/vsimem/``, and returns a :class:`ResultVSIFile` for it. The data is
+        copied in chunks, so that the original item (for example a
+        :class:`ResultBuffer` referencing a large raw response) can be
+        released afterwards.
+
+        :param item: the result item to copy
+        :param path: the VSI path to write the file to
+        :param chunksize: the size of the chunks to copy
+        :returns: the :class:`ResultVSIFile` wrapping the written file
+    """
+    path = path or "/vsimem/%s" % uuid4().hex
+    try:
+        with vsi.open(path, 'wb') as f:
+            for chunk in item.chunked(chunksize):
+                f.write(bytes(chunk))
+    except Exception:
+        vsi.remove(path)
+        raise
+
+    return ResultVSIFile(
+        path, item.content_type, item.filename, item.identifier
+    )
+
+
 def result_set_from_raw_data(data):
     """ Create a result set from raw HTTP data. This can either be a single
         or a multipart string. It returns a list containing objects of the
@@ -33,8 +33,7 @@ from django.contrib.gis.geos import Polygon, LineString
 
 from eoxserver.core.config import get_eoxserver_config
 from eoxserver.core.decoders import config, enum
-from eoxserver.contrib.osr import SpatialReference
-from eoxserver.resources.coverages import crss
+from eoxserver.resources.coverages import crss, spatialindex
 from eoxserver.services.exceptions import (
     InvalidAxisLabelException, InvalidSubsettingException,
     InvalidSubsettingCrsException
@@ -144,6 +143,7 @@ class Subsets(list):
             return filters
 
         bbox = [None, None, None, None]
+        interval = None
         srid = self.srid
 
         if srid is None:
@@ -173,6 +173,7 @@ class Subsets(list):
                 value = low
 
             if subset.is_temporal:
+                interval = (value, value) if is_slice else (low, high)
                 if is_slice or (high == low and containment == "overlaps"):
                     filters['begin_time__lte'] = value
                     filters['end_time__gte'] = value
@@ -209,7 +210,7 @@ class Subsets(list):
                         )
                     line.srid = srid
                     if srid != 4326:
-                        line.transform(4326)
+                        crss.transform_geometry(line, 4326)
                     filters['footprint__intersects'] = line
 
                 else:
@@ -239,12 +240,22 @@ class Subsets(list):
             poly.srid = srid
 
             if srid != 4326:
-                poly.transform(4326)
+                crss.transform_geometry(poly, 4326)
             if containment == "overlaps":
                 filters['footprint__intersects'] = poly
             elif containment == "contains":
                 filters['footprint__within'] = poly
 
+        # pre-select the candidates using the in-process index, if enabled
+        candidates = spatialindex.get_candidates(
+            filters.get(
+                'footprint__intersects', filters.get('footprint__within')
+            ),
+            interval
+        )
+        if candidates is not None:
+            filters['pk__in'] = candidates
+
         return filters
 
     def filter(self, queryset, containment="overlaps"):
@@ -349,7 +360,7 @@ class Subsets(list):
                         )
                     line.srid = srid
                     if srid != 4326:
-                        line.transform(4326)
+                        crss.transform_geometry(line, 4326)
 
                     if not line.intersects(footprint):
                         return False
@@ -381,7 +392,7 @@ class Subsets(list):
             poly.srid = srid
 
             if srid != 4326:
-                poly.transform(4326)
+                crss.transform_geometry(poly, 4326)
             if containment == "overlaps":
                 if not footprint.intersects(poly):
                     return False
@@ -447,7 +458,9 @@ class Subsets(list):
         :returns: the calculated ``Polygon``
         """
 
-        srid = SpatialReference(coverage.grid.coordinate_reference_system).srid
+        srid = crss.get_spatial_reference(
+            coverage.grid.coordinate_reference_system
+        ).srid
         extent = coverage.extent
         size_x, size_y = coverage.size
         footprint = coverage.footprint
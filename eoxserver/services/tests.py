@@ -26,21 +26,66 @@
 # ------------------------------------------------------------------------------
 
 import http
+import io
+import json
+import os
+import tempfile
+import zipfile
 from textwrap import dedent
+from types import SimpleNamespace
 import importlib
 import sys
 
+import numpy as np
 from django.conf import settings
-from django.test import TestCase, TransactionTestCase, Client, override_settings
-from django.contrib.gis.geos import Polygon, MultiPolygon
+from django.test import (
+    TestCase, TransactionTestCase, Client, RequestFactory, override_settings
+)
+from django.contrib.gis.geos import Point, Polygon, MultiPolygon
+from django.db import connection
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
 from django.urls import clear_url_caches
+from lxml import etree
 
 from eoxserver.core.util import multiparttools as mp
 from eoxserver.core.util.timetools import parse_iso8601
-from eoxserver.core.config import get_eoxserver_config
+from eoxserver.core.util.rect import Rect
+from eoxserver.core.config import get_eoxserver_config, set_eoxserver_config
+from eoxserver.contrib import vsi
+from eoxserver.contrib.vsi import (
+    TemporaryVSIFile, VSIFileResponse, parse_range_header
+)
 from eoxserver.services.subset import Subsets, Trim, Slice
-from eoxserver.services.result import result_set_from_raw_data
-from eoxserver.resources.coverages import models
+from eoxserver.services.fragments import cached_fragments
+from eoxserver.services.ows.dseo.v10.archive import (
+    ZipEntry, ReadAhead, create_zip_stream, get_zip_size
+)
+from eoxserver.services.ecql import compile_filter, get_field_mapping_for_model
+from eoxserver.services.result import (
+    result_set_from_raw_data, result_item_to_vsi_file, to_http_response,
+    ResultBuffer, ResultStream
+)
+from eoxserver.services.ows.wms.featureinfo import (
+    Feature, encode_feature_info, query_features
+)
+from eoxserver.services.ows.wms.layermapper import LayerMapper
+from eoxserver.services import filters
+from eoxserver.services.ows.wcs.v20.coverageset import (
+    get_coverages_queryset, get_dataset_series_queryset,
+    get_parent_product_filters, paginate
+)
+from eoxserver.services.ows.wcs.v20.util import (
+    get_scaled_size, ScaleAxis, ScaleSize, ScaleExtent
+)
+from eoxserver.services.gdal.wcs.planner import (
+    select_overview_level, scale_rect
+)
+from eoxserver.services.gml.v32.encoders import GML32Encoder, ns_gml
+from eoxserver.processing.gdal.statistics import BandStatisticsAccumulator
+from eoxserver.render.coverage import objects as render_objects
+from eoxserver.render.mapserver.factories import _select_rectified_overview
+from eoxserver.resources.coverages import models, crss
 import eoxserver.services.config
 import eoxserver.services.views
 
@@ -158,6 +203,130 @@ class ResultSetTestCase(TestCase):
             b"B0aGUgYm9keSBvZiB0aGUgbWVzc2FnZS48L3A+CiAgPC9ib2R5Pgo8L2h0bWw+Cg=="
         )
 
+    def test_result_buffer_chunked(self):
+        data = b"0123456789"
+        result = ResultBuffer(data, "application/octet-stream")
+        chunks = list(result.chunked(4))
+        self.assertEqual(len(result), 10)
+        self.assertTrue(all(isinstance(c, memoryview) for c in chunks))
+        self.assertEqual(
+            [c.tobytes() for c in chunks], [b"0123", b"4567", b"89"]
+        )
+        self.assertEqual(result.data, data)
+
+    def test_to_http_response_buffered(self):
+        response = to_http_response([
+            ResultBuffer(b"abc", "text/plain"),
+            ResultBuffer(b"def", "text/plain"),
+        ], boundary=b"frontier")
+        self.assertFalse(response.streaming)
+        self.assertEqual(
+            int(response["Content-Length"]), len(response.content)
+        )
+        self.assertEqual(
+            [d.tobytes() for _, d in mp.iterate(
+                response.content, headers={
+                    b"Content-Type": response["Content-Type"].encode()
+                }
+            )][1:], [b"abc", b"def"]
+        )
+
+    def test_to_http_response_streaming_unknown_size(self):
+        def generate():
+            yield b"abc"
+            yield b"def"
+
+        response = to_http_response([
+            ResultBuffer(b"<xml/>", "text/xml"),
+            ResultStream(generate(), "application/octet-stream"),
+        ], boundary=b"frontier")
+        self.assertTrue(response.streaming)
+        self.assertNotIn("Content-Length", response)
+        content = b"".join(response.streaming_content)
+        self.assertIn(b"abcdef", content)
+        self.assertTrue(content.endswith(b"--frontier--"))
+
+    @override_settings(EOXS_STREAMING_RESPONSE_THRESHOLD=4)
+    def test_to_http_response_streaming_threshold(self):
+        response = to_http_response([ResultBuffer(b"0123456789", "text/plain")])
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Length"], "10")
+        self.assertEqual(b"".join(response.streaming_content), b"0123456789")
+
+    @override_settings(EOXS_STREAMING_RESPONSE_THRESHOLD=4)
+    def test_result_item_to_vsi_file(self):
+        item = result_item_to_vsi_file(
+            ResultBuffer(b"0123456789", "image/tiff", b"out.tif")
+        )
+        self.assertTrue(item.path.startswith("/vsimem/"))
+        self.assertEqual(len(item), 10)
+        self.assertEqual(item.filename, b"out.tif")
+
+        response = to_http_response([item], chunksize=4)
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            list(response.streaming_content), [b"0123", b"4567", b"89"]
+        )
+        # the file is removed once the response is consumed
+        self.assertIsNone(vsi.VSIStatL(item.path))
+
+
+class BandStatisticsTestCase(TestCase):
+    def test_histogram_follows_valid_values(self):
+        values = np.linspace(10, 20, 1000, dtype="float32")
+        accumulator = BandStatisticsAccumulator("float32", [-9999])
+        # growing values with a fill value, which must not widen the bins
+        for chunk in np.array_split(values, 10):
+            accumulator.add(np.append(chunk, -9999).astype("float32"))
+
+        counts, edges = accumulator.histogram(10)
+        self.assertEqual(accumulator.nodata_count, 10)
+        self.assertAlmostEqual(edges[0], 10)
+        self.assertAlmostEqual(edges[-1], 20)
+        self.assertEqual(sum(counts), 1000)
+        expected, _ = np.histogram(values, bins=10, range=(10, 20))
+        for count, expected_count in zip(counts, expected):
+            self.assertLessEqual(abs(count - expected_count), 2)
+
+
+class WindowPlanningTestCase(TestCase):
+    def test_scaled_size(self):
+        self.assertEqual(get_scaled_size((1000, 500)), (1000, 500))
+        self.assertEqual(get_scaled_size((1000, 500), 4), (250, 125))
+        self.assertEqual(
+            get_scaled_size((1000, 500), scales=[
+                ScaleSize("x", 100), ScaleAxis("y", 2)
+            ]), (100, 250)
+        )
+        self.assertEqual(
+            get_scaled_size((1000, 500), scales=[
+                ScaleExtent("lat", 10, 60)
+            ]), (1000, 50)
+        )
+
+    def test_select_overview_level(self):
+        overviews = [(500, 500), (250, 250), (125, 125)]
+        # thumbnail of the whole image: coarsest overview
+        self.assertEqual(
+            select_overview_level((1000, 1000), overviews, (1000, 1000), (100, 100)),
+            2
+        )
+        # half resolution: first overview
+        self.assertEqual(
+            select_overview_level((1000, 1000), overviews, (1000, 1000), (400, 400)),
+            0
+        )
+        # no downsampling: full resolution
+        self.assertIsNone(
+            select_overview_level((1000, 1000), overviews, (200, 200), (200, 200))
+        )
+
+    def test_scale_rect(self):
+        self.assertEqual(
+            scale_rect(Rect(101, 50, 300, 301), (1000, 1000), (250, 250)),
+            Rect(25, 12, 76, 76)
+        )
+
 
 class TemporalSubsetsTestCase(TransactionTestCase):
     def setUp(self):
@@ -263,20 +432,15 @@ class TemporalSubsetsTestCase(TransactionTestCase):
         ]
 
         self.config = get_eoxserver_config()
-        self.original_interval_interpretation = self.config.get(
-            "services.owscommon", "time_interval_interpretation"
-        )
-
         self.set_interpretation("closed")
 
     def tearDown(self):
-        self.set_interpretation()
+        set_eoxserver_config(self.config)
 
-    def set_interpretation(self, value=None):
-        self.config.set(
-            "services.owscommon", "time_interval_interpretation",
-            value if value else self.original_interval_interpretation
-        )
+    def set_interpretation(self, value):
+        set_eoxserver_config(self.config.replace({
+            "services.owscommon": {"time_interval_interpretation": value}
+        }))
 
     def evaluate_subsets(self, subsets, containment, expected_ids):
         """ Evaluates the subset via QuerySet filter and via the matches()
@@ -765,6 +929,607 @@ class TemporalSubsetsTestCase(TransactionTestCase):
         )
 
 
+class CoverageSetQueryTestCase(TestCase):
+    """ Checks that the UNION based coverage set queries resolve the same
+        objects as a single query combining all references with ``OR``.
+    """
+
+    def setUp(self):
+        grid = models.Grid.objects.create(
+            coordinate_reference_system='EPSG:4326',
+            axis_1_name='long',
+            axis_2_name='lat',
+            axis_1_type=0,
+            axis_2_type=0,
+            axis_1_offset=5 / 100,
+            axis_2_offset=5 / 100,
+        )
+        coverage_type = models.CoverageType.objects.create(name="RGB")
+
+        def create_coverage(identifier, bbox, **kwargs):
+            return models.Coverage.objects.create(
+                identifier=identifier,
+                footprint=MultiPolygon(Polygon.from_bbox(bbox)),
+                grid=grid,
+                axis_1_size=100, axis_2_size=100,
+                axis_1_origin=0, axis_2_origin=0,
+                coverage_type=coverage_type,
+                **kwargs
+            )
+
+        self.collection = models.Collection.objects.create(
+            identifier="collection"
+        )
+        self.product = models.Product.objects.create(
+            identifier="product",
+            footprint=MultiPolygon(Polygon.from_bbox((0, 0, 10, 10))),
+        )
+        self.product.collections.add(self.collection)
+        self.other_product = models.Product.objects.create(
+            identifier="other_product",
+            footprint=MultiPolygon(Polygon.from_bbox((20, 20, 30, 30))),
+        )
+        self.mosaic = models.Mosaic.objects.create(
+            identifier="mosaic",
+            footprint=MultiPolygon(Polygon.from_bbox((0, 0, 5, 5))),
+            grid=grid, axis_1_size=100, axis_2_size=100,
+            coverage_type=coverage_type,
+        )
+        self.mosaic.collections.add(self.collection)
+
+        # a coverage without a footprint of its own
+        product_coverage = create_coverage(
+            "product_coverage", (0, 0, 10, 10), parent_product=self.product
+        )
+        product_coverage.footprint = None
+        product_coverage.save()
+
+        create_coverage(
+            "other_product_coverage", (20, 20, 30, 30),
+            parent_product=self.other_product
+        )
+        create_coverage(
+            "collection_coverage", (0, 0, 5, 5)
+        ).collections.add(self.collection)
+        create_coverage(
+            "mosaic_coverage", (5, 5, 10, 10)
+        ).mosaics.add(self.mosaic)
+        # a coverage referenced in multiple ways
+        coverage = create_coverage(
+            "shared_coverage", (40, 40, 50, 50), parent_product=self.product
+        )
+        coverage.collections.add(self.collection)
+        coverage.mosaics.add(self.mosaic)
+        self.coverage = create_coverage("coverage", (0, 0, 1, 1))
+
+    def get_or_coverages_queryset(self, collections, mosaics, products,
+                                  coverages, filters):
+        return models.EOObject.objects.filter(
+            *get_parent_product_filters(filters)
+        ).filter(
+            Q(identifier__in=[coverage.identifier for coverage in coverages]) |
+            Q(coverage__parent_product__in=products) |
+            Q(coverage__parent_product__collections__in=collections) |
+            Q(coverage__collections__in=collections) |
+            Q(coverage__mosaics__in=mosaics) |
+            Q(identifier__in=[mosaic.identifier for mosaic in mosaics]) |
+            Q(mosaic__collections__in=collections)
+        ).distinct()
+
+    def get_or_dataset_series_queryset(self, collections, products, filters):
+        return models.EOObject.objects.filter(
+            Q(
+                collection__isnull=False,
+                identifier__in=[
+                    collection.identifier for collection in collections
+                ],
+            ) |
+            Q(
+                product__isnull=False,
+                identifier__in=[product.identifier for product in products],
+            ) |
+            Q(
+                product__isnull=False,
+                product__collections__in=collections,
+                **filters
+            )
+        ).distinct()
+
+    def assertSameResult(self, *references, bbox=None):
+        filters = {}
+        if bbox:
+            subsets = Subsets([
+                Trim("x", bbox[0], bbox[2]), Trim("y", bbox[1], bbox[3])
+            ], crs="http://www.opengis.net/def/crs/EPSG/0/4326")
+            filters = subsets.get_filters(containment="overlaps")
+
+        collections, mosaics, products, coverages = references
+        expected = self.get_or_coverages_queryset(
+            collections, mosaics, products, coverages, filters
+        )
+        result = get_coverages_queryset(
+            collections, mosaics, products, coverages, filters
+        )
+        self.assertCountEqual(
+            expected.values_list("identifier", flat=True),
+            [eo_object.identifier for eo_object in result]
+        )
+
+        expected = self.get_or_dataset_series_queryset(
+            collections, products, filters
+        )
+        result = get_dataset_series_queryset(collections, products, filters)
+        self.assertCountEqual(
+            expected.values_list("identifier", flat=True),
+            result.values_list("identifier", flat=True)
+        )
+
+    def test_collection(self):
+        self.assertSameResult([self.collection], [], [], [])
+        self.assertSameResult([self.collection], [], [], [], bbox=(0, 0, 4, 4))
+
+    def test_product_and_mosaic(self):
+        self.assertSameResult([], [self.mosaic], [self.product], [])
+        self.assertSameResult(
+            [], [self.mosaic], [self.product, self.other_product], [],
+            bbox=(6, 6, 8, 8)
+        )
+
+    def test_all_references(self):
+        references = (
+            [self.collection], [self.mosaic], [self.other_product],
+            [self.coverage]
+        )
+        self.assertSameResult(*references)
+        self.assertSameResult(*references, bbox=(0, 0, 2, 2))
+
+    def test_no_references(self):
+        self.assertSameResult([], [], [], [])
+
+    def test_paginate(self):
+        queryset = get_coverages_queryset(
+            [self.collection], [self.mosaic], [self.product], [], {}
+        )
+        identifiers = list(queryset.values_list("identifier", flat=True))
+
+        items, number_matched = paginate(queryset, 0, 2)
+        self.assertEqual(
+            [item.identifier for item in items], identifiers[:2]
+        )
+        self.assertEqual(number_matched, len(identifiers))
+
+        items, number_matched = paginate(queryset, 2, 10)
+        self.assertEqual(
+            [item.identifier for item in items], identifiers[2:]
+        )
+        self.assertEqual(number_matched, len(identifiers))
+
+        # empty pages and pages of size 0 still report the number of matches
+        self.assertEqual(paginate(queryset, 100, 2), ([], len(identifiers)))
+        self.assertEqual(paginate(queryset, 0, 0), ([], len(identifiers)))
+
+
+class BatchedRenderObjectsTestCase(TestCase):
+    def setUp(self):
+        self.grid = models.Grid.objects.create(
+            coordinate_reference_system='EPSG:4326',
+            axis_1_name='long',
+            axis_2_name='lat',
+            axis_1_type=0,
+            axis_2_type=0,
+            axis_1_offset=5 / 100,
+            axis_2_offset=5 / 100,
+        )
+        self.coverage_type = models.CoverageType.objects.create(name="RGB")
+        for index, name in enumerate(("red", "green", "blue")):
+            models.FieldType.objects.create(
+                coverage_type=self.coverage_type, index=index,
+                identifier=name,
+            )
+
+    def create_coverages(self, count):
+        start = models.Coverage.objects.count()
+        for i in range(start, start + count):
+            coverage = models.Coverage.objects.create(
+                identifier="coverage_%d" % i,
+                grid=self.grid,
+                axis_1_size=100, axis_2_size=100,
+                axis_1_origin=0, axis_2_origin=0,
+                coverage_type=self.coverage_type,
+            )
+            models.ArrayDataItem.objects.create(
+                coverage=coverage, location="coverage_%d.tif" % i,
+                field_index=0, band_count=3,
+            )
+
+    def get_render_coverages(self):
+        qs = models.EOObject.objects.filter(
+            coverage__isnull=False
+        ).select_subclasses(models.Coverage)
+        with CaptureQueriesContext(connection) as context:
+            coverages = render_objects.from_models(qs)
+        return coverages, len(context.captured_queries)
+
+    def test_constant_number_of_queries(self):
+        self.create_coverages(2)
+        coverages, few_queries = self.get_render_coverages()
+        self.assertEqual(len(coverages), 2)
+
+        self.create_coverages(5)
+        coverages, many_queries = self.get_render_coverages()
+        self.assertEqual(len(coverages), 7)
+        self.assertEqual(few_queries, many_queries)
+
+        # the range type is only created once per coverage type
+        self.assertIs(coverages[0].range_type, coverages[1].range_type)
+        self.assertEqual(
+            [field.identifier for field in coverages[0].range_type],
+            ["red", "green", "blue"]
+        )
+
+
+class FeatureInfoEncodingTestCase(TestCase):
+    def setUp(self):
+        product = models.Product(
+            identifier="product",
+            begin_time=parse_iso8601("2000-01-01T00:00:00Z"),
+            end_time=parse_iso8601("2000-01-01T00:00:05Z"),
+        )
+        self.feature = Feature("collection", product)
+        self.feature.values = [("red", 12), ("green", None)]
+
+    def test_encode_json(self):
+        result, content_type = encode_feature_info(
+            [self.feature], "application/json"
+        )
+        self.assertEqual(content_type, "application/json")
+        feature = json.loads(result)["features"][0]
+        self.assertEqual(feature["id"], "product")
+        self.assertEqual(feature["properties"]["layer"], "collection")
+        self.assertEqual(
+            feature["properties"]["begin_time"], "2000-01-01T00:00:00Z"
+        )
+        self.assertEqual(
+            feature["properties"]["values"], {"red": 12, "green": None}
+        )
+
+    def test_encode_gml(self):
+        result, content_type = encode_feature_info(
+            [self.feature], "application/vnd.ogc.gml"
+        )
+        self.assertEqual(content_type, "application/vnd.ogc.gml")
+        self.assertEqual(
+            etree.fromstring(result).xpath("//identifier/text()"), ["product"]
+        )
+
+
+class FeatureInfoQueryTestCase(TestCase):
+    def setUp(self):
+        grid = models.Grid.objects.create(
+            coordinate_reference_system='EPSG:4326',
+            axis_1_name='long',
+            axis_2_name='lat',
+            axis_1_type=0,
+            axis_2_type=0,
+            axis_1_offset=1 / 10,
+            axis_2_offset=1 / 10,
+        )
+        coverage_type = models.CoverageType.objects.create(name="RGB")
+
+        def create_coverage(identifier, year):
+            return models.Coverage.objects.create(
+                identifier=identifier,
+                footprint=MultiPolygon(Polygon.from_bbox((0, 0, 10, 10))),
+                begin_time=parse_iso8601("%d-01-01T00:00:00Z" % year),
+                end_time=parse_iso8601("%d-01-02T00:00:00Z" % year),
+                grid=grid,
+                axis_1_size=100, axis_2_size=100,
+                axis_1_origin=0, axis_2_origin=10,
+                coverage_type=coverage_type,
+            )
+
+        create_coverage("coverage", 2000)
+        mosaic = models.Mosaic.objects.create(
+            identifier="mosaic",
+            footprint=MultiPolygon(Polygon.from_bbox((0, 0, 10, 10))),
+            grid=grid, axis_1_size=100, axis_2_size=100,
+            coverage_type=coverage_type,
+        )
+        for identifier, year in [("mosaic_2000", 2000), ("mosaic_2010", 2010)]:
+            create_coverage(identifier, year).mosaics.add(mosaic)
+
+        self.point = Point(5, 5, srid=4326)
+
+    def query(self, layer_name, filter_expressions):
+        features = query_features(
+            LayerMapper([]), [layer_name], self.point, filter_expressions,
+            feature_count=10
+        )
+        return sorted(feature.identifier for feature in features)
+
+    def time_filter(self, year):
+        return filters.time_interval((
+            parse_iso8601("%d-01-01T12:00:00Z" % year),
+            parse_iso8601("%d-01-01T13:00:00Z" % year),
+        ))
+
+    def test_coverage_time_filter(self):
+        self.assertEqual(
+            self.query("coverage", self.time_filter(2000)), ["coverage"]
+        )
+        self.assertEqual(self.query("coverage", self.time_filter(2010)), [])
+
+    def test_coverage_cql_filter(self):
+        self.assertEqual(
+            self.query("coverage", compile_filter(
+                "identifier = 'coverage'", models.Product
+            )), ["coverage"]
+        )
+        self.assertEqual(
+            self.query("coverage", compile_filter(
+                "identifier = 'other'", models.Product
+            )), []
+        )
+
+    def test_mosaic_time_filter(self):
+        self.assertEqual(
+            self.query("mosaic", Q()), ["mosaic_2000", "mosaic_2010"]
+        )
+        self.assertEqual(
+            self.query("mosaic", self.time_filter(2010)), ["mosaic_2010"]
+        )
+
+    def test_mosaic_cql_filter(self):
+        self.assertEqual(
+            self.query("mosaic", compile_filter(
+                "identifier = 'mosaic_2000'", models.Product
+            )), ["mosaic_2000"]
+        )
+
+
+class GMLEncodingTestCase(TestCase):
+    def test_encode_multi_surface(self):
+        polygon = Polygon(
+            ((0, 0), (0, 10), (10, 10), (10, 0), (0, 0)),
+            ((2, 2), (2, 4), (4, 4), (2, 2)),
+        )
+        multi_surface = GML32Encoder().encode_multi_surface(
+            MultiPolygon(polygon, srid=4326), "test"
+        )
+
+        nsmap = {"gml": ns_gml.uri}
+
+        # EPSG:4326 uses the latitude/longitude axis order
+        self.assertEqual(
+            multi_surface.xpath("//gml:posList/text()", namespaces=nsmap), [
+                " ".join(
+                    "%.8f %.8f" % (y, x) for x, y in ring
+                ) for ring in polygon
+            ]
+        )
+        self.assertEqual(
+            multi_surface.xpath("//gml:Polygon/@gml:id", namespaces=nsmap),
+            ["polygon_test_1"]
+        )
+
+
+class CQLCompilationTestCase(TestCase):
+    def test_compile_filter_cached(self):
+        cql = "identifier = 'product' AND beginTime AFTER 2000-01-01T00:00:00Z"
+        filters = compile_filter(cql, models.Product)
+        self.assertIsInstance(filters, Q)
+        self.assertIs(compile_filter(cql, models.Product), filters)
+        self.assertIsNot(compile_filter(cql, models.Coverage), filters)
+
+    def test_field_mapping_cached(self):
+        self.assertIs(
+            get_field_mapping_for_model(models.Product),
+            get_field_mapping_for_model(models.Product)
+        )
+
+
+class FragmentCacheTestCase(TestCase):
+    @override_settings(
+        EOXS_FRAGMENT_CACHE="fragments",
+        CACHES={
+            "fragments": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            }
+        }
+    )
+    def test_cached_fragments(self):
+        calls = []
+
+        def encode():
+            calls.append(None)
+            return [etree.Element("fragment", count=str(len(calls)))]
+
+        product = models.Product(
+            identifier="product",
+            updated=parse_iso8601("2000-01-01T00:00:00Z"),
+        )
+        for _ in range(2):
+            fragments = cached_fragments("test", product, encode)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(fragments[0].get("count"), "1")
+
+        product.updated = parse_iso8601("2000-01-02T00:00:00Z")
+        fragments = cached_fragments("test", product, encode)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(fragments[0].get("count"), "2")
+
+
+class RectifiedOverviewSelectionTestCase(TestCase):
+    def test_cached_spatial_reference_unchanged(self):
+        sr = crss.get_spatial_reference("EPSG:4326")
+        strategy = sr.sr.GetAxisMappingStrategy()
+
+        overview = render_objects.RectifiedOverviewLocation(
+            "/vsimem/overview.tif", {}, "image/tiff", "EPSG:4326",
+            (0, 0, 10, 10), (100, 100)
+        )
+        coverage = SimpleNamespace(rectified_overviews=[overview])
+        map_obj = SimpleNamespace(
+            getProjection=lambda: "+init=epsg:4326",
+            extent=SimpleNamespace(minx=0, miny=0, maxx=10, maxy=10),
+            width=10, height=10,
+        )
+
+        self.assertIs(_select_rectified_overview(coverage, map_obj), overview)
+        self.assertIs(crss.get_spatial_reference("EPSG:4326"), sr)
+        self.assertEqual(sr.sr.GetAxisMappingStrategy(), strategy)
+
+
+class RangeResponseTestCase(TestCase):
+    def _response(self, **headers):
+        request = RequestFactory().get('/', **headers)
+        return VSIFileResponse(
+            TemporaryVSIFile.from_buffer(b'0123456789'), request=request
+        )
+
+    def test_parse_range_header(self):
+        self.assertEqual(parse_range_header('bytes=2-5', 10), (2, 5))
+        self.assertEqual(parse_range_header('bytes=2-', 10), (2, 9))
+        self.assertEqual(parse_range_header('bytes=-3', 10), (7, 9))
+        self.assertEqual(parse_range_header('bytes=8-20', 10), (8, 9))
+        self.assertIsNone(parse_range_header('bytes=0-1,4-5', 10))
+        self.assertIsNone(parse_range_header('lines=0-1', 10))
+        with self.assertRaises(ValueError):
+            parse_range_header('bytes=10-', 10)
+
+    def test_full_response(self):
+        response = self._response()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('ETag', response)
+        self.assertEqual(b''.join(response.streaming_content), b'0123456789')
+
+    def test_partial_response(self):
+        response = self._response(HTTP_RANGE='bytes=2-5')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 2-5/10')
+        self.assertEqual(response['Content-Length'], '4')
+        self.assertEqual(b''.join(response.streaming_content), b'2345')
+
+    def test_if_range_mismatch(self):
+        response = self._response(
+            HTTP_RANGE='bytes=2-5', HTTP_IF_RANGE='"outdated"'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'0123456789')
+
+    def test_unsatisfiable_range(self):
+        response = self._response(HTTP_RANGE='bytes=20-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */10')
+
+
+class ZipArchiveTestCase(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.paths = []
+        for name, size in [('image.tif', 5000), ('preview.png', 300)]:
+            path = os.path.join(self.tmpdir.name, name)
+            with open(path, 'wb') as f:
+                f.write(os.urandom(size))
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _entries(self):
+        return [
+            ZipEntry('product/%s' % os.path.basename(path), path=path)
+            for path in self.paths
+        ]
+
+    def test_compress_type(self):
+        self.assertEqual(
+            ZipEntry('a.tif').compress_type, zipfile.ZIP_STORED
+        )
+        self.assertEqual(
+            ZipEntry('a.xml').compress_type, zipfile.ZIP_DEFLATED
+        )
+        self.assertEqual(
+            ZipEntry('a', format='image/jp2').compress_type, zipfile.ZIP_STORED
+        )
+
+    def test_zip_size(self):
+        entries = self._entries()
+        content = b''.join(create_zip_stream(entries))
+        self.assertEqual(get_zip_size(entries), len(content))
+
+        archive = zipfile.ZipFile(io.BytesIO(content))
+        self.assertEqual(
+            [info.compress_type for info in archive.infolist()],
+            [zipfile.ZIP_STORED, zipfile.ZIP_STORED]
+        )
+
+    def test_zip_size_deflated(self):
+        path = os.path.join(self.tmpdir.name, 'metadata.xml')
+        with open(path, 'w') as f:
+            f.write('<metadata/>')
+        entries = self._entries() + [ZipEntry('product/metadata.xml', path=path)]
+        self.assertIsNone(get_zip_size(entries))
+
+    def _remote_data_items(self, sizes):
+        data_items = []
+        for i, size in enumerate(sizes):
+            data_item = models.ArrayDataItem(
+                location='/vsimem/archive_%d.tif' % i
+            )
+            with vsi.open(data_item.location, 'wb') as f:
+                f.write(os.urandom(size))
+            self.addCleanup(vsi.remove, data_item.location)
+            data_items.append(data_item)
+        return data_items
+
+    def test_zip_size_remote(self):
+        data_items = self._remote_data_items([200000, 3000])
+        entries = [
+            ZipEntry('product/%d.tif' % i, data_item=data_item)
+            for i, data_item in enumerate(data_items)
+        ]
+
+        for read_ahead in (0, 2):
+            with self.settings(EOXS_DSEO_READ_AHEAD=read_ahead):
+                content = b''.join(create_zip_stream(entries))
+            self.assertEqual(get_zip_size(entries), len(content))
+
+            archive = zipfile.ZipFile(io.BytesIO(content))
+            for i, data_item in enumerate(data_items):
+                with vsi.open(data_item.location) as f:
+                    self.assertEqual(
+                        archive.read('product/%d.tif' % i), f.read()
+                    )
+
+    def test_read_ahead_aborted(self):
+        first, second = [
+            ReadAhead(data_item, max_chunks=1, chunk_size=1024)
+            for data_item in self._remote_data_items([100000, 100000])
+        ]
+        first.next = second
+
+        iterator = iter(first)
+        next(iterator)
+        # simulate a client disconnect
+        iterator.close()
+
+        for read_ahead in (first, second):
+            read_ahead._thread.join(5)
+            self.assertFalse(read_ahead._thread.is_alive())
+
+    def test_read_ahead_completed(self):
+        first, second = [
+            ReadAhead(data_item, max_chunks=1, chunk_size=1024)
+            for data_item in self._remote_data_items([3000, 3000])
+        ]
+        first.next = second
+
+        self.assertEqual(len(b''.join(first)), 3000)
+        self.assertEqual(len(b''.join(second)), 3000)
+
+
 class CachingTest(TestCase):
     def _reload_ows_views(self):
         # NOTE: we have to do this dance because the setting
@@ -37,7 +37,15 @@ except ImportError:
 from eoxserver.services import views
 
 urlpatterns = [
-    re_path(r'^$', views.ows, name='ows',)
+    re_path(r'^$', views.ows, name='ows',),
+    re_path(
+        r'^/wps/jobs/(?P<job_id>[A-Za-z0-9_-]+)$',
+        views.wps_job, name='wps_job'
+    ),
+    re_path(
+        r'^/wps/jobs/(?P<job_id>[A-Za-z0-9_-]+)/(?P<filename>[^/]+)$',
+        views.wps_job, name='wps_job_file'
+    ),
 ]
 
 
@@ -34,18 +34,21 @@ import logging
 import traceback
 
 from django.conf import settings
-from django.http import HttpResponse
+from django.http import HttpResponse, FileResponse, Http404
 from django.http import StreamingHttpResponse
 
 from django.views.decorators.csrf import csrf_exempt
 
 from eoxserver.core import env
+from eoxserver.core.config import pinned_eoxserver_config
+from eoxserver.core.decoders.cache import parse_cache
 from eoxserver.services.ows.component import ServiceComponent
 from eoxserver.services.exceptions import HTTPMethodNotAllowedError
 from eoxserver.services.ows.dispatch import (
     query_service_handler, query_exception_handler
 )
 from eoxserver.services.config import apply_cache_header
+from eoxserver.services.ows.wps.util import get_async_backends
 
 
 logger = logging.getLogger(__name__)
@@ -69,23 +72,27 @@ def ows(request):
 
     # component = ServiceComponent(env)
 
-    try:
-        handler = query_service_handler(request)
-        result = handler.handle(request)
-        default_status = 200
-    except HTTPMethodNotAllowedError as e:
-        handler = query_exception_handler(request)
-        result = handler.handle_exception(request, e)
-        content, content_type = handler.handle_exception(request, e)[:2]
-        result = HttpResponse(
-            content=content, content_type=content_type, status=405
-        )
-        result["Allow"] = ", ".join(e.allowed_methods)
-    except Exception as e:
-        logger.debug(traceback.format_exc())
-        handler = query_exception_handler(request)
-        result = handler.handle_exception(request, e)
-        default_status = 400
+    # share the parsed request between all decoders of this request and use
+    # the same config snapshot throughout the request
+    with parse_cache(), pinned_eoxserver_config() as config:
+        request.eoxserver_config = config
+        try:
+            handler = query_service_handler(request)
+            result = handler.handle(request)
+            default_status = 200
+        except HTTPMethodNotAllowedError as e:
+            handler = query_exception_handler(request)
+            result = handler.handle_exception(request, e)
+            content, content_type = handler.handle_exception(request, e)[:2]
+            result = HttpResponse(
+                content=content, content_type=content_type, status=405
+            )
+            result["Allow"] = ", ".join(e.allowed_methods)
+        except Exception as e:
+            logger.debug(traceback.format_exc())
+            handler = query_exception_handler(request)
+            result = handler.handle_exception(request, e)
+            default_status = 400
 
     # try to return a django compatible response
     if isinstance(result, (HttpResponse, StreamingHttpResponse)):
@@ -112,6 +119,37 @@ def ows(request):
         pass
 
 
+@csrf_exempt
+def wps_job(request, job_id, filename=None):
+    """ Serves the status document or a published file of an asynchronous WPS
+        job, when the configured asynchronous back-end stores them locally.
+        A ``DELETE`` request cancels the job and removes all its resources.
+    """
+    for backend in get_async_backends():
+        if not hasattr(backend, 'open_job_file'):
+            continue
+
+        try:
+            if request.method == 'DELETE' and filename is None:
+                backend.purge(job_id)
+                return HttpResponse(status=204)
+            elif request.method != 'GET':
+                return HttpResponse(status=405, headers={
+                    'Allow': 'GET, DELETE' if filename is None else 'GET'
+                })
+
+            f, content_type = backend.open_job_file(job_id, filename)
+        except (KeyError, IOError):
+            raise Http404('No such job or file.')
+
+        response = FileResponse(f, content_type=content_type)
+        # the status document changes until the job is finished
+        response['Cache-Control'] = 'no-cache'
+        return response
+
+    raise Http404('No such job.')
+
+
 # NOTE: we need to apply caching here because the name `views.ows`
 # is being url-reversed at some point, so this name needs to be registered
 # with django